@@ -4,15 +4,23 @@ Streamlit 기반 UI로, 에세이 업로드 -> OCR -> 제출물 식별 ->
 채점기준 검증 -> 3-LLM 평가 -> report.xlsx 생성 파이프라인을 제공한다.
 """
 
+import threading
 from collections.abc import Callable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import streamlit as st
 
-from src import auth, config, essay_splitter, evaluator, file_handler, ocr, report, rubric, submission
+from src import (
+    auth, config, essay_splitter, evaluator, file_handler, ocr, ocr_batch,
+    ocr_header, ocr_offline, ocr_scheduler, pdf_text, report, rubric, submission,
+)
 
 _RUBRIC_TEMPLATE_PATH = Path(__file__).parent / "src" / "채점기준표_템플릿.xlsx"
 
+# 끝난 파일의 essay_splitter 분리(LLM 호출)를 OCR과 동시에 진행하는 스레드 수
+_SPLIT_WORKERS = 4
+
 st.set_page_config(page_title="에세이 자동 채점", layout="wide")
 
 SPLITTER_PROMPT_DESCRIPTION = (
@@ -27,6 +35,24 @@ def show_prompts_section() -> None:
     with st.expander("사용 중인 프롬프트 확인"):
         st.subheader("OCR 프롬프트")
         st.code(ocr.OCR_PROMPT, language=None)
+        if config.OCR_TWO_TIER:
+            st.subheader("2단 OCR 머리글(학번/이름) 프롬프트")
+            st.code(ocr_header.HEADER_PROMPT, language=None)
+            st.subheader("2단 OCR 본문 프롬프트")
+            st.code(ocr_header.TEXT_PROMPT, language=None)
+        if config.OCR_BATCH_SIZE > 1:
+            st.subheader("묶음 OCR 프롬프트")
+            template = (
+                ocr_batch.TEXT_BATCH_PROMPT if config.OCR_TWO_TIER
+                else ocr_batch.OCR_BATCH_PROMPT
+            )
+            st.code(
+                ocr_batch.build_batch_prompt(config.OCR_BATCH_SIZE, template),
+                language=None,
+            )
+        if config.PDF_TEXT_ENABLED and config.PDF_TEXT_HEADER:
+            st.subheader("텍스트 PDF 머리글(학번/이름) 프롬프트")
+            st.code(pdf_text.build_header_prompt("(페이지 텍스트 앞부분)"), language=None)
         st.subheader("에세이 분할 프롬프트")
         st.text(SPLITTER_PROMPT_DESCRIPTION)
         st.code(essay_splitter.build_splitter_prompt([
@@ -49,6 +75,10 @@ def init_session_state() -> None:
         "grading_complete": False,
         "report_bytes": b"",
         "grading_error": None,
+        "page_report": [],
+        "duplicate_files": [],
+        "failed_pages": [],
+        "ocr_cancelled": False,
     }
     for key, value in defaults.items():
         if key not in st.session_state:
@@ -68,17 +98,178 @@ def format_progress_message(total: int, current: int) -> str:
     return f"{total}개의 제출물 중 {current}번째 문서를 채점중..."
 
 
-def format_ocr_progress_message(total: int, current: int) -> str:
+def format_ocr_progress_message(total: int, current: int, skipped: int = 0) -> str:
     """OCR 진행률 메시지를 생성한다.
 
     Args:
-        total: 전체 파일 수.
-        current: 현재 OCR 중인 파일 번호 (1-based).
+        total: 전체 페이지 수 (모든 파일 합계).
+        current: OCR이 완료된 페이지 수 (건너뛴 빈 페이지 포함).
+        skipped: 빈 페이지로 판정되어 OCR을 건너뛴 페이지 수.
+
+    Returns:
+        "N개 페이지 중 K개 페이지 OCR 완료..." 형식 문자열.
+        skipped가 있으면 "(빈 페이지 S개 건너뜀)"이 덧붙는다.
+    """
+    message = f"{total}개 페이지 중 {current}개 페이지 OCR 완료..."
+    if skipped:
+        message += f" (빈 페이지 {skipped}개 건너뜀)"
+    return message
+
+
+def format_upload_savings(page_report: list[dict]) -> str | None:
+    """페이지 보고에서 업로드 인코딩으로 절감한 바이트 요약 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "업로드 N.NMB → M.MMB (K.KMB 절감, P페이지)" 형식 문자열.
+        절감 측정값이 없으면 None.
+    """
+    measured = [p for p in page_report if "bytes_saved" in p]
+    if not measured:
+        return None
+    baseline = sum(p["baseline_bytes"] for p in measured) / 1_000_000
+    upload = sum(p["upload_bytes"] for p in measured) / 1_000_000
+    return (
+        f"업로드 {baseline:.1f}MB → {upload:.1f}MB "
+        f"({baseline - upload:.1f}MB 절감, {len(measured)}페이지)"
+    )
+
+
+def format_cache_hits(page_report: list[dict]) -> str | None:
+    """페이지 보고에서 OCR 캐시로 모델 호출을 건너뛴 페이지 수 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "OCR 캐시 재사용 N페이지 (모델 호출 생략)" 문자열. 적중이 없으면 None.
+    """
+    hits = sum(1 for p in page_report if p.get("cache_hit"))
+    if not hits:
+        return None
+    return f"OCR 캐시 재사용 {hits}페이지 (모델 호출 생략)"
+
+
+def format_text_layer_pages(page_report: list[dict]) -> str | None:
+    """페이지 보고에서 PDF 텍스트 레이어로 읽어 이미지 OCR을 건너뛴 페이지 수 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "텍스트 레이어로 읽은 페이지 N개 (래스터화/이미지 OCR 생략)" 문자열. 없으면 None.
+    """
+    pages = sum(1 for p in page_report if p.get("text_layer"))
+    if not pages:
+        return None
+    return f"텍스트 레이어로 읽은 페이지 {pages}개 (래스터화/이미지 OCR 생략)"
+
+
+def format_embedded_image_pages(page_report: list[dict]) -> str | None:
+    """페이지 보고에서 PDF 내장 스캔 이미지를 그대로 쓴 페이지 수 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "원본 스캔 이미지를 그대로 쓴 페이지 N개 (래스터화 생략)" 문자열. 없으면 None.
+    """
+    pages = sum(1 for p in page_report if p.get("embedded_image"))
+    if not pages:
+        return None
+    return f"원본 스캔 이미지를 그대로 쓴 페이지 {pages}개 (래스터화 생략)"
+
+
+def format_input_tokens(page_report: list[dict]) -> str | None:
+    """페이지 보고의 OCR 입력 토큰(usage_metadata) 합계와 페이지당 평균 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "OCR 입력 토큰 N (P페이지, 페이지당 평균 M, media_resolution=R)" 문자열.
+        측정값이 없으면 None.
+    """
+    counts = [p["input_tokens"] for p in page_report if "input_tokens" in p]
+    if not counts:
+        return None
+    total = sum(counts)
+    resolution = config.OCR_MEDIA_RESOLUTION or "기본값"
+    return (
+        f"OCR 입력 토큰 {total:,} ({len(counts)}페이지, "
+        f"페이지당 평균 {total / len(counts):,.0f}, media_resolution={resolution})"
+    )
+
+
+def format_duplicate_report(page_report: list[dict]) -> list[str]:
+    """페이지 보고에서 OCR 결과를 재사용한 중복 페이지 목록 문구를 만든다.
+
+    빈 페이지끼리의 중복은 의미가 없으므로 제외한다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "파일명 N페이지 = 원본파일 M페이지 (해밍 거리 D)" 형식 문자열 리스트.
+    """
+    return [
+        f"{p['file']} {p['page']}페이지 = {p['duplicate_of']} "
+        f"(해밍 거리 {p['hash_distance']})"
+        for p in page_report
+        if "duplicate_of" in p and not p.get("blank")
+    ]
+
+
+def format_parse_fallbacks(page_report: list[dict]) -> str | None:
+    """페이지 보고에서 OCR JSON 파싱 폴백이 일어난 페이지 안내 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
+
+    Returns:
+        "OCR 응답 JSON 파싱 실패 N페이지: 파일명 M페이지, ..." 형식 문자열.
+        폴백이 없으면 None.
+    """
+    failed = [
+        f"{p['file']} {p['page']}페이지"
+        for p in page_report if p.get("parse_fallback")
+    ]
+    if not failed:
+        return None
+    return f"OCR 응답 JSON 파싱 실패 {len(failed)}페이지: " + ", ".join(failed)
+
+
+def format_model_fallbacks(page_report: list[dict]) -> str | None:
+    """페이지 보고에서 대체 모델(OCR_MODEL_CHAIN의 뒤 모델)로 OCR한 페이지 안내 문구를 만든다.
+
+    Args:
+        page_report: 페이지별 처리 정보 dict 리스트.
 
     Returns:
-        "N개 파일 중 K번째 파일 OCR 중..." 형식 문자열.
+        "대체 모델로 OCR한 페이지 N개: 파일명 M페이지 (모델), ..." 형식 문자열.
+        대체가 없으면 None.
     """
-    return f"{total}개 파일 중 {current}번째 파일 OCR 중..."
+    pages = [
+        f"{p['file']} {p['page']}페이지 ({p['model']})"
+        for p in page_report if p.get("model_fallback")
+    ]
+    if not pages:
+        return None
+    return f"대체 모델로 OCR한 페이지 {len(pages)}개: " + ", ".join(pages)
+
+
+def format_failed_pages(failed_pages: list[dict]) -> list[str]:
+    """재시도 후에도 OCR에 실패한 페이지 목록 문구를 만든다.
+
+    Args:
+        failed_pages: ocr_scheduler.ocr_files가 채운 {"file", "page", "error"} 리스트.
+
+    Returns:
+        "파일명 N페이지 (오류)" 형식 문자열 리스트.
+    """
+    return [f"{p['file']} {p['page']}페이지 ({p['error']})" for p in failed_pages]
 
 
 def build_error_message(k: int) -> str:
@@ -100,25 +291,122 @@ def build_error_message(k: int) -> str:
 def run_ocr_and_identify(
     files_data: list[tuple[str, bytes]],
     on_progress: Callable[[int, int], None] | None = None,
+    page_report: list[dict] | None = None,
+    on_skip: Callable[[int], None] | None = None,
+    duplicates: list[str] | None = None,
+    failed_pages: list[dict] | None = None,
+    on_identified: Callable[[list[dict], list[str]], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> tuple[list[dict], list[str]]:
     """파일 목록에 대해 OCR을 수행하고 제출물을 식별한다.
 
+    모든 파일의 페이지를 ocr_scheduler.ocr_files의 공유 작업 큐로 OCR하며,
+    페이지가 모두 끝난 파일부터 바로 별도 스레드에서 essay_splitter로 분리한다 (OCR
+    호출자 스레드는 분리를 기다리지 않고 다음 페이지를 제출). 작업이 끝나면 남은
+    분리를 기다려 입력 파일 순서로 모아 제출물을 만든다.
+    config.OCR_OFFLINE_BATCH가 켜져 있으면 ocr_offline.ocr_files_offline로 Gemini
+    배치 작업에 맡기며, 이때 on_skip과 on_identified는 호출되지 않고 모든 파일을
+    작업이 끝난 뒤 분리한다.
+
     Args:
         files_data: (파일명, 바이트) 튜플 리스트.
-        on_progress: 각 파일 OCR 시작 전 호출되는 콜백(current, total).
+        on_progress: 페이지 OCR 완료 시마다 호출되는 콜백(완료_페이지_수, 전체_페이지_수).
+        page_report: 주어지면 페이지별 처리 정보(선택 DPI 등)가 추가되는 리스트.
+        on_skip: 빈 페이지를 건너뛸 때마다 호출되는 콜백(누적_건너뛴_페이지_수).
+        duplicates: 주어지면 앞선 제출물과 내용이 같아 채점에서 제외된
+            파일명이 추가되는 리스트.
+        failed_pages: 주어지면 재시도 후에도 OCR에 실패한 페이지가 예외 대신
+            {"file", "page", "error"}로 추가되는 리스트 (나머지 페이지로 계속 진행).
+        on_identified: 파일 하나의 분리가 끝날 때마다 호출되는 콜백(지금까지_식별된_제출물,
+            미식별_파일명). 끝난 파일만으로 만든 중간 결과이며 입력 파일 순서를 따른다.
+        cancel: 작업 취소 토큰. ocr_scheduler.ocr_files(오프라인 배치 모드면
+            ocr_offline.ocr_files_offline)에 전달되며, 설정되면 OCR을 멈추고
+            CancelledError를 올린다.
 
     Returns:
         (식별된_제출물_리스트, 미식별_파일명_리스트) 튜플.
+
+    Raises:
+        CancelledError: cancel이 설정되어 OCR이 중단된 경우.
     """
-    file_ocr_results: list[tuple[str, list[dict]]] = []
-    total = len(files_data)
-    for i, (filename, file_bytes) in enumerate(files_data, start=1):
-        if on_progress is not None:
-            on_progress(i, total)
-        ocr_results = ocr.ocr_file(filename, file_bytes)
-        file_ocr_results.append((filename, ocr_results))
-    split_results = essay_splitter.split_essays(file_ocr_results)
-    return submission.build_submissions(split_results)
+    if config.OCR_OFFLINE_BATCH:
+        file_ocr_results = ocr_offline.ocr_files_offline(
+            files_data, on_progress=on_progress, page_report=page_report,
+            failed_pages=failed_pages, cancel=cancel,
+        )
+        split_results = essay_splitter.split_essays(file_ocr_results)
+    else:
+        split_results = _ocr_and_split(
+            files_data, on_identified,
+            on_progress=on_progress, page_report=page_report, on_skip=on_skip,
+            failed_pages=failed_pages, cancel=cancel,
+        )
+    return submission.build_submissions(split_results, duplicates=duplicates)
+
+
+def _ocr_and_split(
+    files_data: list[tuple[str, bytes]],
+    on_identified: Callable[[list[dict], list[str]], None] | None,
+    **ocr_kwargs,
+) -> list[tuple[str, list[dict]]]:
+    """ocr_scheduler.ocr_files로 OCR하며 끝난 파일부터 분리 스레드에서 분리한다.
+
+    분리 결과는 OCR 호출자 스레드(on_file_done, 작업이 끝난 뒤)에서 모으고
+    on_identified를 부르므로 Streamlit 화면 갱신은 스크립트 스레드에서 일어난다.
+    작업이 예외(취소 포함)로 끝나면 아직 시작하지 않은 분리는 취소하고, 이미 시작한
+    분리는 끝날 때까지 기다린 뒤 결과를 버린다.
+
+    Returns:
+        입력 파일 순서로 모은 essay_splitter 분리 결과. 통지되지 않은 파일은
+        작업이 끝난 뒤 그 파일만 분리한다.
+    """
+    splitter = ThreadPoolExecutor(max_workers=_SPLIT_WORKERS)
+    pending: dict[int, Future] = {}
+    split_files: dict[int, list[tuple[str, list[dict]]]] = {}
+
+    def _on_file_done(file_index: int, filename: str, pages: list[dict]) -> None:
+        pending[file_index] = splitter.submit(
+            essay_splitter.split_essays, [(filename, pages)]
+        )
+        _collect_splits(pending, split_files, on_identified, wait=False)
+
+    try:
+        file_ocr_results = ocr_scheduler.ocr_files(
+            files_data, on_file_done=_on_file_done, **ocr_kwargs,
+        )
+        _collect_splits(pending, split_files, on_identified, wait=True)
+    finally:
+        splitter.shutdown(wait=True, cancel_futures=True)
+    for index, file_result in enumerate(file_ocr_results):
+        if index not in split_files:
+            split_files[index] = essay_splitter.split_essays([file_result])
+    return [item for index in sorted(split_files) for item in split_files[index]]
+
+
+def _collect_splits(
+    pending: dict[int, Future],
+    split_files: dict[int, list[tuple[str, list[dict]]]],
+    on_identified: Callable[[list[dict], list[str]], None] | None,
+    wait: bool,
+) -> None:
+    """끝난 분리 작업(pending)의 결과를 split_files로 옮기고 그때마다 on_identified로
+    중간 식별 결과(끝난 파일만, 입력 파일 순서)를 알린다.
+
+    wait가 참이면 남은 분리가 모두 끝날 때까지 끝나는 순서대로 기다린다. 분리
+    중 예외는 그대로 올라간다.
+    """
+    index_of = {future: index for index, future in pending.items()}
+    finished = (
+        as_completed(index_of) if wait else [f for f in index_of if f.done()]
+    )
+    for future in finished:
+        index = index_of[future]
+        split_files[index] = future.result()
+        del pending[index]
+        if on_identified is not None:
+            on_identified(*submission.build_submissions(
+                [item for i in sorted(split_files) for item in split_files[i]]
+            ))
 
 
 def run_grading(
@@ -205,31 +493,90 @@ def show_upload_section() -> None:
         type=["pdf", "png", "jpg", "jpeg", "zip"],
         accept_multiple_files=True,
         key="essay_uploader",
+        on_change=_reset_ocr_cancel,
     )
 
+    if uploaded_files and st.session_state.ocr_cancelled:
+        st.info("OCR을 중단했습니다. 파일을 바꾸면 다시 시작합니다.")
+        return
+
     if uploaded_files and not st.session_state.ocr_complete:
         all_files = _process_essay_uploads(uploaded_files)
         if all_files:
             st.session_state.uploaded_files_data = all_files
             st.session_state.submissions = []
             st.session_state.unidentified = []
+            st.session_state.page_report = []
+            st.session_state.duplicate_files = []
+            st.session_state.failed_pages = []
             _run_ocr_with_progress()
-            st.session_state.ocr_complete = True
+            st.session_state.ocr_complete = not st.session_state.ocr_cancelled
+
+
+def _reset_ocr_cancel() -> None:
+    """업로드 파일이 바뀌면 중단 상태를 풀어 OCR을 다시 시작하게 한다."""
+    st.session_state.ocr_cancelled = False
+
+
+def _cancel_ocr(cancel: threading.Event) -> None:
+    """OCR 중단 버튼 콜백: 작업 취소 토큰을 설정하고 중단 상태를 기록한다."""
+    cancel.set()
+    st.session_state.ocr_cancelled = True
 
 
 def _run_ocr_with_progress() -> None:
-    """OCR 및 제출물 식별을 진행률 바와 함께 실행한다."""
+    """OCR 및 제출물 식별을 진행률 바와 함께 실행한다.
+
+    파일의 페이지가 끝날 때마다 그때까지 식별된 제출물로 식별 결과(3단계)를
+    채워 나가므로, 잘못 식별된 파일을 작업이 끝나기 전에 발견할 수 있다.
+    중단 버튼을 누르면 스크립트가 다음 화면 갱신에서 멈추고 작업 취소 토큰이
+    설정되어, 남은 페이지와 진행 중인 호출이 OCR 호출 자리를 바로 내준다.
+    """
     files_data = st.session_state.uploaded_files_data
+    cancel = threading.Event()
+    cancel_slot = st.empty()
+    cancel_slot.button(
+        "OCR 중단", key="ocr_cancel_btn", on_click=_cancel_ocr, args=(cancel,)
+    )
     progress_bar = st.progress(0)
     status_text = st.empty()
+    partial_results = st.empty()
 
-    def _on_progress(current: int, total: int) -> None:
-        status_text.text(format_ocr_progress_message(total, current))
-        progress_bar.progress((current - 1) / total if total > 0 else 0)
+    skipped = 0
 
-    subs, unid = run_ocr_and_identify(files_data, on_progress=_on_progress)
+    def _on_skip(count: int) -> None:
+        nonlocal skipped
+        skipped = count
+
+    def _on_progress(current: int, total: int) -> None:
+        status_text.text(format_ocr_progress_message(total, current, skipped))
+        progress_bar.progress(current / total if total > 0 else 0)
+
+    def _on_identified(subs: list[dict], unid: list[str]) -> None:
+        with partial_results.container():
+            show_identification_results(subs, unid)
+
+    page_report: list[dict] = []
+    duplicates: list[str] = []
+    failed_pages: list[dict] = []
+    try:
+        subs, unid = run_ocr_and_identify(
+            files_data, on_progress=_on_progress, page_report=page_report,
+            on_skip=_on_skip, duplicates=duplicates, failed_pages=failed_pages,
+            on_identified=_on_identified, cancel=cancel,
+        )
+    except CancelledError:
+        st.session_state.ocr_cancelled = True
+        status_text.text("OCR을 중단했습니다.")
+        return
+    finally:
+        cancel_slot.empty()
+    partial_results.empty()
     st.session_state.submissions = subs
     st.session_state.unidentified = unid
+    st.session_state.page_report = page_report
+    st.session_state.duplicate_files = duplicates
+    st.session_state.failed_pages = failed_pages
     progress_bar.progress(1.0)
     status_text.text("OCR 완료!")
 
@@ -261,6 +608,76 @@ def show_identification_results(
         )
 
 
+def show_duplicate_report(
+    page_report: list[dict], duplicate_files: list[str]
+) -> None:
+    """중복 페이지(OCR 재사용)와 채점에서 제외된 중복 제출물을 표시한다.
+
+    Args:
+        page_report: ocr_scheduler.ocr_files가 채운 페이지별 dict 리스트.
+        duplicate_files: 앞선 제출물과 내용이 같아 제외된 파일명 리스트.
+    """
+    lines = format_duplicate_report(page_report)
+    if lines:
+        st.info(
+            f"중복 페이지 {len(lines)}개는 OCR 결과를 재사용했습니다.\n\n"
+            + "\n".join(f"- {line}" for line in lines)
+        )
+    if duplicate_files:
+        st.info(
+            "다음 파일은 앞선 제출물과 내용이 같아 한 번만 채점합니다: "
+            f"{', '.join(duplicate_files)}"
+        )
+
+
+def show_failed_pages(failed_pages: list[dict]) -> None:
+    """재시도 후에도 OCR에 실패하여 빈 페이지로 처리된 페이지를 표시한다.
+
+    Args:
+        failed_pages: {"file", "page", "error"} dict 리스트.
+    """
+    lines = format_failed_pages(failed_pages)
+    if lines:
+        st.error(
+            f"{len(lines)}개 페이지는 재시도 후에도 OCR에 실패하여 빈 페이지로 "
+            "처리했습니다. 나머지 페이지의 결과는 유지됩니다.\n\n"
+            + "\n".join(f"- {line}" for line in lines)
+        )
+
+
+def show_page_report(page_report: list[dict]) -> None:
+    """페이지별 처리 정보(선택 DPI, 픽셀 수 등)를 튜닝용 표로 표시한다.
+
+    Args:
+        page_report: ocr_scheduler.ocr_files가 채운 페이지별 dict 리스트.
+    """
+    if not page_report:
+        return
+    fallbacks = format_parse_fallbacks(page_report)
+    if fallbacks:
+        st.warning(fallbacks + " (원문을 에세이텍스트로 보존했습니다)")
+    model_fallbacks = format_model_fallbacks(page_report)
+    if model_fallbacks:
+        st.warning(model_fallbacks + " (첫 모델이 과부하이거나 제한 시간을 넘겼습니다)")
+    with st.expander("페이지별 처리 정보 (튜닝용)"):
+        savings = format_upload_savings(page_report)
+        if savings:
+            st.caption(savings)
+        cache_hits = format_cache_hits(page_report)
+        if cache_hits:
+            st.caption(cache_hits)
+        text_layer_pages = format_text_layer_pages(page_report)
+        if text_layer_pages:
+            st.caption(text_layer_pages)
+        embedded_pages = format_embedded_image_pages(page_report)
+        if embedded_pages:
+            st.caption(embedded_pages)
+        input_tokens = format_input_tokens(page_report)
+        if input_tokens:
+            st.caption(input_tokens)
+        st.dataframe(page_report)
+
+
 def _validate_and_parse_rubric(rubric_file) -> None:
     """채점기준표 파일을 검증하고 파싱하여 세션 상태에 저장한다."""
     file_bytes = rubric_file.getvalue()
@@ -385,11 +802,18 @@ def main() -> None:
     if st.session_state.rubric_data:
         show_upload_section()
 
+    show_failed_pages(st.session_state.failed_pages)
+
     if st.session_state.submissions:
         show_identification_results(
             st.session_state.submissions,
             st.session_state.unidentified,
         )
+        show_duplicate_report(
+            st.session_state.page_report,
+            st.session_state.duplicate_files,
+        )
+        show_page_report(st.session_state.page_report)
 
     if st.session_state.rubric_data and st.session_state.submissions:
         show_grading_section()
@@ -0,0 +1,136 @@
+"""OCR 업로드 전처리 처리량 벤치마크.
+
+합성 답안지 이미지(A4 200dpi, 넓은 여백과 인쇄 테두리)에 대해
+preprocess.crop_margins와 preprocess.encode_for_upload의 pages/minute를
+단일 스레드 기준으로 측정한다. 휴대폰 사진(EXIF 방향이 붙은 큰 JPEG)은
+기존 전체 해상도 디코딩(Image.open)과 preprocess.open_image(draft 디코딩)를
+파일 바이트부터 디코딩까지, 업로드 인코딩까지 비교한다.
+poppler나 API 키가 필요 없다.
+
+실행:
+    python -m benchmarks.bench_preprocess --pages 200 --photos 50 --megapixels 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import math
+import random
+import time
+from collections.abc import Callable
+
+from PIL import Image, ImageDraw
+
+from src import config
+from src import preprocess
+
+
+def make_sheet(seed: int = 0) -> Image.Image:
+    """인쇄 테두리 안쪽에 손 글씨 같은 짧은 획이 있는 A4(200dpi) 답안지를 만든다."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (1654, 2339), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, 1614, 2299), outline="black", width=4)
+    for y in range(400, 1500, 40):
+        x = 300
+        while x < 1300:
+            width = rng.randint(8, 30)
+            draw.line(
+                (x, y, x + width, y + rng.randint(-10, 10)),
+                fill=(60, 60, 60), width=3,
+            )
+            x += width + rng.randint(5, 25)
+    return image
+
+
+def make_photo(megapixels: float = 12, seed: int = 0) -> bytes:
+    """답안지를 찍은 휴대폰 사진 같은 JPEG 바이트를 만든다.
+
+    센서 방향(가로)으로 저장하고 EXIF 방향 6(시계 방향 90도 회전)을 붙인다.
+    """
+    height = round(math.sqrt(megapixels * 1e6 * 3 / 4))
+    width = round(height * 4 / 3)
+    photo = make_sheet(seed).rotate(90, expand=True).resize((width, height))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    photo.save(buffer, "JPEG", quality=92, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def decode_full(data: bytes) -> Image.Image:
+    """기존 경로: 전체 해상도로 디코딩한다 (EXIF 방향 미적용)."""
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+def decode_draft(data: bytes) -> Image.Image:
+    """preprocess.open_image 경로: 업로드 크기에 맞춘 draft 디코딩과 EXIF 방향 적용."""
+    image = preprocess.open_image(data)
+    image.load()
+    return image
+
+
+def decoded_megabytes(image: Image.Image) -> float:
+    """디코딩한 픽셀 버퍼 크기(MB). 디코딩 단계의 최대 메모리를 가늠한다."""
+    return image.width * image.height * len(image.getbands()) / 1e6
+
+
+def pages_per_minute(
+    func: Callable[[object], object], image: object, pages: int
+) -> float:
+    """func를 pages번 실행하고 분당 처리 페이지 수를 반환한다."""
+    start = time.perf_counter()
+    for _ in range(pages):
+        func(image)
+    return pages / (time.perf_counter() - start) * 60
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="측정 페이지 수")
+    parser.add_argument("--photos", type=int, default=50, help="측정 사진 수")
+    parser.add_argument(
+        "--megapixels", type=float, default=12, help="합성 휴대폰 사진 화소 수(MP)"
+    )
+    args = parser.parse_args()
+
+    sheet = make_sheet()
+    cropped = preprocess.crop_margins(sheet)
+    print(f"{args.pages} pages, {sheet.size[0]}x{sheet.size[1]} -> "
+          f"{cropped.size[0]}x{cropped.size[1]} after crop")
+    print("stage               pages/min")
+    for name, func in [
+        ("crop_margins", preprocess.crop_margins),
+        ("encode_for_upload", preprocess.encode_for_upload),
+    ]:
+        rate = pages_per_minute(func, sheet, args.pages)
+        print(f"{name:18s}  {rate:9.0f}")
+
+    photo = make_photo(args.megapixels)
+    full, draft = decode_full(photo), decode_draft(photo)
+    print(f"\n{args.photos} photos, {len(photo) / 1e6:.1f} MB JPEG, "
+          f"UPLOAD_MAX_EDGE={config.UPLOAD_MAX_EDGE}")
+    print(f"full decode  {full.size[0]}x{full.size[1]} {full.mode} "
+          f"{decoded_megabytes(full):6.1f} MB")
+    print(f"draft decode {draft.size[0]}x{draft.size[1]} {draft.mode} "
+          f"{decoded_megabytes(draft):6.1f} MB")
+    print("stage                     full/min  draft/min  speedup")
+    for name, full_func, draft_func in [
+        ("decode", decode_full, decode_draft),
+        (
+            "decode+encode_for_upload",
+            lambda data: preprocess.encode_for_upload(decode_full(data)),
+            lambda data: preprocess.encode_for_upload(decode_draft(data)),
+        ),
+    ]:
+        full_rate = pages_per_minute(full_func, photo, args.photos)
+        draft_rate = pages_per_minute(draft_func, photo, args.photos)
+        print(f"{name:24s}  {full_rate:8.0f}  {draft_rate:9.0f}  "
+              f"{draft_rate / full_rate:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""PDF 래스터화 처리량 벤치마크.
+
+합성 다중 페이지 PDF 여러 개를 raster_pool.iter_pdf_pages로 변환하며
+코어(프로세스) 수별 pages/second를 측정한다. poppler가 설치되어 있어야 한다.
+
+실행:
+    python -m benchmarks.bench_rasterize --docs 8 --pages 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import time
+
+from PIL import Image, ImageDraw
+
+from src import raster_pool
+
+
+def make_pdf(pages: int) -> bytes:
+    """손 글씨 답안지와 비슷한 줄 무늬가 있는 A4(150dpi) 합성 PDF를 만든다."""
+    images = []
+    for page in range(pages):
+        image = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(image)
+        for line in range(60):
+            y = 120 + line * 26
+            draw.line((100, y, 1140, y), fill=(200, 200, 200))
+            text = f"page {page} line {line} " * 6
+            draw.text((110, y - 18), text, fill="black")
+        images.append(image)
+    buf = io.BytesIO()
+    images[0].save(
+        buf, format="PDF", save_all=True,
+        append_images=images[1:], resolution=150,
+    )
+    return buf.getvalue()
+
+
+def measure(
+    docs: list[tuple[bytes, int]], processes: int, chunk_size: int
+) -> float:
+    """주어진 프로세스 수로 모든 문서를 변환하고 pages/second를 반환한다."""
+    executor = raster_pool.new_executor(processes)
+    try:
+        # 작업자 프로세스 기동 비용은 측정에서 제외한다.
+        for _ in raster_pool.iter_pdf_pages(
+            docs[:1], processes, chunk_size, executor
+        ):
+            pass
+        start = time.perf_counter()
+        count = sum(1 for _ in raster_pool.iter_pdf_pages(
+            docs, processes, chunk_size, executor
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+    return count / elapsed
+
+
+def core_counts(max_cores: int) -> list[int]:
+    """1, 2, 4, ... max_cores 형태의 측정 대상 코어 수 목록."""
+    counts = [1]
+    while counts[-1] * 2 <= max_cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_cores:
+        counts.append(max_cores)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=8, help="PDF 개수")
+    parser.add_argument("--pages", type=int, default=10, help="PDF당 페이지 수")
+    parser.add_argument("--chunk", type=int, default=4, help="구간 크기(페이지)")
+    parser.add_argument("--max-cores", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    pdf = make_pdf(args.pages)
+    docs = [(pdf, args.pages)] * args.docs
+    print(f"{args.docs} docs x {args.pages} pages, chunk={args.chunk}")
+    print("cores  pages/s  speedup")
+    baseline = None
+    for cores in core_counts(args.max_cores):
+        rate = measure(docs, cores, args.chunk)
+        baseline = baseline or rate
+        print(f"{cores:5d}  {rate:7.1f}  {rate / baseline:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,112 @@ PASSWORD_HASH = os.environ.get("APP_PASSWORD_HASH", "")
 # 학번 형식: 5자리 숫자 [학년1][학급2][번호2]
 STUDENT_ID_PATTERN = r"^\d{5}$"
 
+# OCR 동시 호출 수 (페이지 단위 작업자 스레드 수)
+OCR_MAX_WORKERS = int(os.environ.get("OCR_MAX_WORKERS", "8"))
+# asyncio OCR(google-genai aio 클라이언트) 사용 여부와 동시 진행 요청 수
+OCR_ASYNC = os.environ.get("OCR_ASYNC", "1") == "1"
+OCR_ASYNC_CONCURRENCY = int(os.environ.get("OCR_ASYNC_CONCURRENCY", "32"))
+# 묶음 OCR: 한 호출에 보낼 최대 페이지 수(1이면 페이지별 호출)와
+# 묶음 크기를 조정할 때 목표로 하는 호출 하나의 응답 시간(초)
+OCR_BATCH_SIZE = int(os.environ.get("OCR_BATCH_SIZE", "1"))
+OCR_BATCH_TARGET_SECONDS = float(os.environ.get("OCR_BATCH_TARGET_SECONDS", "60"))
+# OCR 응답을 response_mime_type/response_schema로 JSON 스키마에 강제할지 여부
+OCR_RESPONSE_SCHEMA = os.environ.get("OCR_RESPONSE_SCHEMA", "1") == "1"
+# 에세이 본문 OCR 호출의 이미지 media_resolution (low/medium/high, 빈 값이면 모델 기본값)
+OCR_MEDIA_RESOLUTION = os.environ.get("OCR_MEDIA_RESOLUTION", "high")
+# 2단 OCR: 페이지 상단(비율)만 빠른 모델로 학번/이름을 읽고, 본문은 따로 동시에 OCR
+OCR_TWO_TIER = os.environ.get("OCR_TWO_TIER", "0") == "1"
+OCR_HEADER_FRACTION = float(os.environ.get("OCR_HEADER_FRACTION", "0.25"))
+OCR_HEADER_MEDIA_RESOLUTION = os.environ.get("OCR_HEADER_MEDIA_RESOLUTION", "low")
+# OCR 모델 대체 순서: "모델[:제한초],..." (예: gemini-3.1-pro-preview:90,gemini-3-flash-preview:60).
+# 앞 모델이 제한 시간을 넘기거나 429/503이면 다음 모델로 넘어간다.
+# 빈 값이면 ocr.MODEL_NAME 하나 (클라이언트 기본 제한 시간)
+OCR_MODEL_CHAIN = os.environ.get("OCR_MODEL_CHAIN", "")
+# OCR 페이지 이미지를 Files API로 한 번만 올리고 재시도/대체 모델/추가 호출에서 URI로
+# 참조할지 여부 (작업이 끝나면 삭제)
+OCR_FILES_API = os.environ.get("OCR_FILES_API", "0") == "1"
+# 페이지 OCR 재시도: 최대 시도 횟수(첫 호출 포함)와 지수 백오프 기준/상한(초)
+OCR_RETRY_ATTEMPTS = int(os.environ.get("OCR_RETRY_ATTEMPTS", "4"))
+OCR_RETRY_BASE_SECONDS = float(os.environ.get("OCR_RETRY_BASE_SECONDS", "2"))
+OCR_RETRY_MAX_SECONDS = float(os.environ.get("OCR_RETRY_MAX_SECONDS", "30"))
+# 페이지 하나의 OCR(재시도, 대체 모델 포함)을 끝내야 하는 제한 시간(초). 0이면 제한 없음
+# (클라이언트 기본 제한 시간만 적용). 켤 때는 클라이언트 제한 시간(180초)보다 길게 잡는다.
+OCR_PAGE_DEADLINE_SECONDS = float(os.environ.get("OCR_PAGE_DEADLINE_SECONDS", "0"))
+# OCR 결과 메모리 캐시: 사용 여부, 바이트 예산, 항목 유효 시간(초). 디스크에 쓰지 않는다.
+OCR_CACHE_ENABLED = os.environ.get("OCR_CACHE_ENABLED", "1") == "1"
+OCR_CACHE_MAX_BYTES = int(os.environ.get("OCR_CACHE_MAX_BYTES", "67108864"))
+OCR_CACHE_TTL_SECONDS = float(os.environ.get("OCR_CACHE_TTL_SECONDS", "3600"))
+# 오프라인 OCR(Gemini Batch API): 사용 여부, 작업 하나의 인라인 요청 크기 상한(바이트),
+# 상태 폴링 간격(초), 전체 대기 제한(초)
+OCR_OFFLINE_BATCH = os.environ.get("OCR_OFFLINE_BATCH", "0") == "1"
+OCR_OFFLINE_JOB_BYTES = int(os.environ.get("OCR_OFFLINE_JOB_BYTES", "18000000"))
+OCR_OFFLINE_POLL_SECONDS = float(os.environ.get("OCR_OFFLINE_POLL_SECONDS", "30"))
+OCR_OFFLINE_TIMEOUT_SECONDS = float(
+    os.environ.get("OCR_OFFLINE_TIMEOUT_SECONDS", "86400")
+)
+
+# 스트리밍 PDF 변환: 한 번에 변환할 페이지 수와 OCR 대기 큐 깊이
+PDF_CHUNK_PAGES = int(os.environ.get("PDF_CHUNK_PAGES", "4"))
+OCR_QUEUE_DEPTH = int(os.environ.get("OCR_QUEUE_DEPTH", "8"))
+
+# PDF 텍스트 레이어: 텍스트가 있는 디지털 PDF 페이지는 래스터화/이미지 OCR 없이
+# pdftotext 텍스트를 쓴다. 텍스트 레이어로 볼 최소 글자 수(공백 제외), 학번/이름
+# 머리글 호출(빠른 모델, 텍스트만) 여부와 그 호출에 보낼 페이지 앞부분 글자 수
+PDF_TEXT_ENABLED = os.environ.get("PDF_TEXT_ENABLED", "1") == "1"
+PDF_TEXT_MIN_CHARS = int(os.environ.get("PDF_TEXT_MIN_CHARS", "200"))
+PDF_TEXT_HEADER = os.environ.get("PDF_TEXT_HEADER", "1") == "1"
+PDF_TEXT_HEADER_CHARS = int(os.environ.get("PDF_TEXT_HEADER_CHARS", "400"))
+
+# PDF 내장 스캔 이미지: 페이지 전체를 덮는 JPEG 한 장으로 된 스캔 페이지는 래스터화하지
+# 않고 pdfimages로 내장 JPEG를 그대로 꺼내 쓴다
+PDF_IMAGES_ENABLED = os.environ.get("PDF_IMAGES_ENABLED", "1") == "1"
+
+# 다중 코어 PDF 래스터화: 프로세스 수(0이면 코어 수 기준 자동)와 구간당 poppler 스레드 수
+RASTER_PROCESSES = int(os.environ.get("RASTER_PROCESSES", "0"))
+RASTER_THREAD_COUNT = int(os.environ.get("RASTER_THREAD_COUNT", "2"))
+
+# 래스터화 출력: "pil"(PIL Image) 또는 "jpeg"(poppler가 직접 만든 흑백 JPEG 바이트)
+RASTER_OUTPUT = os.environ.get("RASTER_OUTPUT", "pil")
+RASTER_JPEG_LONG_EDGE = int(os.environ.get("RASTER_JPEG_LONG_EDGE", "2000"))
+RASTER_JPEG_QUALITY = int(os.environ.get("RASTER_JPEG_QUALITY", "80"))
+
+# 적응형 해상도: 페이지당 픽셀 예산(0이면 비활성, pdf2image 기본 200dpi)과 DPI 범위
+RASTER_PIXEL_BUDGET = int(os.environ.get("RASTER_PIXEL_BUDGET", "3000000"))
+RASTER_MIN_DPI = int(os.environ.get("RASTER_MIN_DPI", "100"))
+RASTER_MAX_DPI = int(os.environ.get("RASTER_MAX_DPI", "200"))
+
+# OCR 업로드 인코딩: 긴 변 상한(0이면 제한 없음), 흑백 변환, 형식(jpeg/webp/png)과 품질
+UPLOAD_MAX_EDGE = int(os.environ.get("UPLOAD_MAX_EDGE", "2000"))
+UPLOAD_GRAYSCALE = os.environ.get("UPLOAD_GRAYSCALE", "1") == "1"
+UPLOAD_FORMAT = os.environ.get("UPLOAD_FORMAT", "jpeg").lower()
+UPLOAD_QUALITY = int(os.environ.get("UPLOAD_QUALITY", "85"))
+# 페이지별 절감 바이트 기록을 위해 SDK 기본 인코딩 크기를 함께 측정할지 여부
+# (페이지마다 원본 크기 PNG 인코딩이 한 번 더 들므로 기본은 끔)
+UPLOAD_MEASURE_SAVINGS = os.environ.get("UPLOAD_MEASURE_SAVINGS", "0") == "1"
+# 업로드한 JPEG 사진을 draft 모드로 업로드 크기(UPLOAD_MAX_EDGE)에 맞춰 줄여 디코딩할지 여부
+JPEG_DRAFT_ENABLED = os.environ.get("JPEG_DRAFT_ENABLED", "1") == "1"
+
+# 여백 자동 자르기: 잉크 판정 밝기 임계값(0~255), 잉크로 인정할 최소 행/열 비율,
+# 테두리/괘선으로 보고 제외할 행/열 비율, 자른 뒤 남길 여백(px)
+AUTOCROP_ENABLED = os.environ.get("AUTOCROP_ENABLED", "1") == "1"
+AUTOCROP_THRESHOLD = int(os.environ.get("AUTOCROP_THRESHOLD", "180"))
+AUTOCROP_MIN_INK = float(os.environ.get("AUTOCROP_MIN_INK", "0.003"))
+AUTOCROP_LINE_RATIO = float(os.environ.get("AUTOCROP_LINE_RATIO", "0.6"))
+AUTOCROP_PADDING = int(os.environ.get("AUTOCROP_PADDING", "32"))
+
+# 빈 페이지 건너뛰기: 잉크 판정 밝기 임계값(0~255)과 빈 페이지로 볼 최대 잉크 비율
+BLANK_SKIP_ENABLED = os.environ.get("BLANK_SKIP_ENABLED", "1") == "1"
+BLANK_THRESHOLD = int(os.environ.get("BLANK_THRESHOLD", "160"))
+BLANK_MAX_INK = float(os.environ.get("BLANK_MAX_INK", "0.002"))
+
+# 중복 페이지 재사용: 지각 해시 방식(phash/dhash), 한 변의 비트 수
+# (해시는 약 그 제곱 비트)와 같은 페이지로 볼 최대 해밍 거리
+# (바이트가 다른 중복은 본문만 재사용하고 학번/이름은 머리글 호출로 다시 읽음)
+DEDUP_ENABLED = os.environ.get("DEDUP_ENABLED", "1") == "1"
+DEDUP_METHOD = os.environ.get("DEDUP_METHOD", "phash").lower()
+DEDUP_HASH_SIZE = int(os.environ.get("DEDUP_HASH_SIZE", "16"))
+DEDUP_MAX_DISTANCE = int(os.environ.get("DEDUP_MAX_DISTANCE", "4"))
+
 _genai_client: genai.Client | None = None
 
 
@@ -2,13 +2,21 @@
 
 import io
 import os
+import re
 import zipfile
+from collections.abc import Iterator
 
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_bytes, pdfinfo_from_bytes
 from PIL import Image
 
+from src import config
+
 VALID_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg"}
 
+_PAGE_SIZE_KEY = re.compile(r"^Page\s+(\d+) size$")
+_PAGE_SIZE_VALUE = re.compile(r"^([\d.]+) x ([\d.]+) pts")
+_PAGE_ROT_KEY = re.compile(r"^Page\s+(\d+) rot$")
+
 
 def validate_file_type(filename: str) -> bool:
     """파일 확장자가 허용 목록(pdf/png/jpg/jpeg)에 포함되는지 검사한다.
@@ -63,6 +71,99 @@ def pdf_to_images(pdf_bytes: bytes) -> list[Image.Image]:
     return convert_from_bytes(pdf_bytes)
 
 
+def iter_pdf_pages(
+    pdf_bytes: bytes, chunk_size: int | None = None
+) -> Iterator[Image.Image]:
+    """PDF 바이트를 chunk_size 페이지씩 변환하며 페이지 이미지를 차례로 생성한다.
+
+    first_page/last_page 구간으로 나누어 convert_from_bytes를 호출하므로,
+    한 번에 메모리에 올라가는 페이지는 문서 길이와 무관하게 최대 chunk_size개다.
+
+    Args:
+        pdf_bytes: PDF 파일의 바이트 데이터.
+        chunk_size: 한 번에 변환할 페이지 수. None이면 config.PDF_CHUNK_PAGES.
+
+    Yields:
+        페이지 순서대로의 PIL Image 객체.
+    """
+    step = max(1, chunk_size or config.PDF_CHUNK_PAGES)
+    page_count = int(pdfinfo_from_bytes(pdf_bytes)["Pages"])
+    for first in range(1, page_count + 1, step):
+        last = min(first + step - 1, page_count)
+        yield from convert_from_bytes(
+            pdf_bytes, first_page=first, last_page=last
+        )
+
+
+def count_pages(filename: str, file_bytes: bytes) -> int:
+    """파일의 페이지 수를 반환한다.
+
+    PDF는 poppler의 pdfinfo로 이미지 변환 없이 페이지 수만 읽고,
+    이미지 파일은 1페이지로 간주한다.
+
+    Args:
+        filename: 파일 이름 (확장자로 유형 판별).
+        file_bytes: 파일의 바이트 데이터.
+
+    Returns:
+        페이지 수.
+    """
+    _, ext = os.path.splitext(filename)
+    if ext.lower() == ".pdf":
+        return int(pdfinfo_from_bytes(file_bytes)["Pages"])
+    return 1
+
+
+def pdf_page_sizes(
+    pdf_bytes: bytes, page_count: int
+) -> list[tuple[float, float] | None]:
+    """PDF 각 페이지의 크기(pt, 1/72인치)를 래스터화 없이 읽는다.
+
+    Args:
+        pdf_bytes: PDF 파일의 바이트 데이터.
+        page_count: 페이지 수 (count_pages로 미리 구한 값).
+
+    Returns:
+        페이지 순서대로의 (너비, 높이) 튜플 리스트. 크기를 읽지 못한 페이지는 None.
+    """
+    return pdf_page_geometry(pdf_bytes, page_count)[0]
+
+
+def pdf_page_geometry(
+    pdf_bytes: bytes, page_count: int
+) -> tuple[list[tuple[float, float] | None], list[int]]:
+    """PDF 각 페이지의 크기(pt)와 /Rotate 값(도)을 pdfinfo 한 번으로 읽는다.
+
+    pdfinfo에 -f/-l 범위를 주면 "Page    N size: W x H pts"와 "Page    N rot: R"
+    형식으로 페이지별 크기와 회전을 함께 출력한다.
+
+    Args:
+        pdf_bytes: PDF 파일의 바이트 데이터.
+        page_count: 페이지 수 (count_pages로 미리 구한 값).
+
+    Returns:
+        (크기 리스트, 회전 리스트) 튜플. 크기를 읽지 못한 페이지는 None,
+        회전을 읽지 못한 페이지는 0이다.
+    """
+    if page_count <= 0:
+        return [], []
+    info = pdfinfo_from_bytes(pdf_bytes, first_page=1, last_page=page_count)
+    sizes: list[tuple[float, float] | None] = [None] * page_count
+    rotations = [0] * page_count
+    for key, value in info.items():
+        size_key = _PAGE_SIZE_KEY.match(key)
+        size_value = _PAGE_SIZE_VALUE.match(str(value))
+        rot_key = _PAGE_ROT_KEY.match(key)
+        if size_key and size_value and 1 <= int(size_key.group(1)) <= page_count:
+            sizes[int(size_key.group(1)) - 1] = (
+                float(size_value.group(1)), float(size_value.group(2))
+            )
+        elif rot_key and str(value).strip().lstrip("-").isdigit():
+            if 1 <= int(rot_key.group(1)) <= page_count:
+                rotations[int(rot_key.group(1)) - 1] = int(str(value).strip()) % 360
+    return sizes, rotations
+
+
 def process_uploaded_file(
     filename: str, file_bytes: bytes
 ) -> list[tuple[str, bytes]]:
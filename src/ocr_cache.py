@@ -0,0 +1,97 @@
+"""OCR 결과 메모리 캐시 모듈.
+
+교사가 문제 파일 하나를 빼고 다시 업로드하면 나머지 파일도 처음부터 다시
+OCR된다. 업로드용으로 인코딩한 페이지 바이트, OCR 프롬프트, 모델 이름의
+SHA-256을 키로 OCR 결과를 프로세스 메모리의 LRU 캐시에 보관하여, 거의 같은
+업로드를 다시 돌릴 때 모델 호출을 건너뛴다. 디스크에 쓰지 않으며 항목은
+TTL이 지나면 만료되고, 전체 크기는 바이트 예산을 넘지 않는다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from google.genai import types
+
+from src import config
+
+# key -> (만료 시각(time.monotonic), 크기(바이트), 결과 dict)
+_entries: OrderedDict[str, tuple[float, int, dict]] = OrderedDict()
+_total_bytes = 0
+_lock = threading.Lock()
+
+
+def cache_key(part: types.Part, prompt: str, model: str) -> str:
+    """이미지 Part 바이트, 프롬프트, 모델 이름의 SHA-256 16진 문자열을 반환한다."""
+    digest = hashlib.sha256()
+    for chunk in (part.inline_data.data, prompt.encode(), model.encode()):
+        digest.update(len(chunk).to_bytes(8, "big"))
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _entry_size(key: str, result: dict) -> int:
+    """항목이 차지하는 대략적인 바이트 수 (키 + UTF-8 JSON 결과)."""
+    return len(key) + len(json.dumps(result, ensure_ascii=False).encode())
+
+
+def _drop(key: str) -> None:
+    global _total_bytes  # noqa: PLW0603
+    _, size, _ = _entries.pop(key)
+    _total_bytes -= size
+
+
+def lookup(key: str) -> dict | None:
+    """캐시된 OCR 결과의 사본을 반환한다. 없거나 만료되었으면 None.
+
+    찾은 항목은 가장 최근에 쓴 항목으로 옮긴다 (LRU).
+    """
+    if not config.OCR_CACHE_ENABLED:
+        return None
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            _drop(key)
+            return None
+        _entries.move_to_end(key)
+        return dict(entry[2])
+
+
+def store(key: str, result: dict) -> None:
+    """OCR 결과를 캐시에 넣고, 바이트 예산을 넘으면 오래 쓰지 않은 항목부터 버린다.
+
+    항목 하나가 예산보다 크면 넣지 않는다.
+    """
+    global _total_bytes  # noqa: PLW0603
+    if not config.OCR_CACHE_ENABLED:
+        return
+    size = _entry_size(key, result)
+    if size > config.OCR_CACHE_MAX_BYTES:
+        return
+    expires = time.monotonic() + config.OCR_CACHE_TTL_SECONDS
+    with _lock:
+        if key in _entries:
+            _drop(key)
+        _entries[key] = (expires, size, dict(result))
+        _total_bytes += size
+        while _total_bytes > config.OCR_CACHE_MAX_BYTES:
+            _drop(next(iter(_entries)))
+
+
+def clear() -> None:
+    """캐시를 비운다."""
+    global _total_bytes  # noqa: PLW0603
+    with _lock:
+        _entries.clear()
+        _total_bytes = 0
+
+
+def cache_bytes() -> int:
+    """현재 캐시가 차지하는 바이트 수."""
+    return _total_bytes
@@ -0,0 +1,332 @@
+"""OCR 동시 실행 엔진 모듈.
+
+페이지 단위 OCR 작업을 제한된 수의 작업자 스레드로(run_ordered), 또는 하나의
+asyncio 이벤트 루프에서 세마포어로 제한된 코루틴으로(run_ordered_async) 동시에
+실행하고, 결과를 입력 순서대로 정렬하여 반환한다. 실패는 페이지(인덱스) 단위로 기록한다.
+작업 취소 토큰(threading.Event)이 설정되거나 호출자 콜백이 예외를 올리면 새 항목을
+꺼내지 않고 시작하지 않은 작업을 버린다. 코루틴은 진행 중인 요청째 취소한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import queue
+import threading
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any
+
+from src import config
+
+_END = object()
+
+# 취소 토큰이 있을 때 완료를 기다리면서 토큰을 다시 확인하는 간격(초)
+_CANCEL_POLL_SECONDS = 0.1
+
+_event_loop: asyncio.AbstractEventLoop | None = None
+_event_loop_lock = threading.Lock()
+
+
+def _collect_done(
+    done: set[Future],
+    pending: dict[Future, int],
+    results: dict[int, Any],
+    failures: dict[int, Exception],
+    on_done: Callable[[int, Any], None] | None,
+) -> None:
+    """완료된 future의 결과(또는 예외)를 인덱스별로 기록한다."""
+    for future in done:
+        index = pending.pop(future)
+        try:
+            results[index] = future.result()
+        except Exception as exc:  # noqa: BLE001
+            failures[index] = exc
+            results[index] = None
+        if on_done is not None:
+            on_done(index, results[index])
+
+
+def _check_cancel(cancel: threading.Event | None) -> None:
+    """취소 토큰이 설정되었으면 CancelledError를 올린다."""
+    if cancel is not None and cancel.is_set():
+        raise CancelledError("OCR 작업이 취소되었습니다")
+
+
+def _wait_some(
+    pending: dict[Future, int],
+    results: dict[int, Any],
+    failures: dict[int, Exception],
+    on_done: Callable[[int, Any], None] | None,
+    cancel: threading.Event | None,
+) -> None:
+    """진행 중인 작업이 하나 이상 끝날 때까지 기다려 기록한다.
+
+    취소 토큰이 있으면 _CANCEL_POLL_SECONDS마다 깨어나 토큰을 확인한다.
+    """
+    while True:
+        _check_cancel(cancel)
+        done, _ = wait(
+            pending, return_when=FIRST_COMPLETED,
+            timeout=None if cancel is None else _CANCEL_POLL_SECONDS,
+        )
+        if done:
+            _collect_done(done, pending, results, failures, on_done)
+            return
+
+
+def run_ordered(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int | None = None,
+    on_done: Callable[[int, Any], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[list[Any], dict[int, Exception]]:
+    """items 각각에 func를 동시에 적용하고 입력 순서대로 결과를 반환한다.
+
+    동시에 실행되는 작업 수는 max_workers로 제한된다. items는 필요한 만큼만
+    소비하므로(대기 작업 수 최대 2 * max_workers) 제너레이터를 넘기면
+    메모리 사용량이 입력 길이와 무관하게 제한된다.
+
+    Args:
+        func: 각 항목에 적용할 함수 (작업자 스레드에서, 호출자 컨텍스트의 복사본으로 실행).
+        items: 처리할 항목들 (리스트 또는 제너레이터).
+        max_workers: 최대 작업자 수. None이면 config.OCR_MAX_WORKERS.
+        on_done: 각 항목 완료 시 호출자 스레드에서 호출되는 콜백(index, result).
+            실패한 항목은 result=None으로 호출된다.
+        cancel: 작업 취소 토큰. 설정되면 새 항목을 꺼내지 않고, 시작하지 않은 작업을
+            버린 뒤 CancelledError를 올린다. 이미 작업자 스레드에서 진행 중인 호출은
+            끝나기를 기다리지 않는다 (결과는 버려짐).
+
+    Returns:
+        (결과_리스트, {인덱스: 예외}) 튜플. 실패한 인덱스의 결과는 None.
+
+    Raises:
+        CancelledError: cancel이 설정된 경우.
+    """
+    workers = max(1, max_workers or config.OCR_MAX_WORKERS)
+    results: dict[int, Any] = {}
+    failures: dict[int, Exception] = {}
+    pending: dict[Future, int] = {}
+    count = 0
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for index, item in enumerate(items):
+            _check_cancel(cancel)
+            if len(pending) >= 2 * workers:
+                _wait_some(pending, results, failures, on_done, cancel)
+            # 작업마다 호출자 컨텍스트를 복사해 넘긴다 (업로드 작업 등의 ContextVar)
+            context = contextvars.copy_context()
+            pending[executor.submit(context.run, func, item)] = index
+            count = index + 1
+        while pending:
+            _wait_some(pending, results, failures, on_done, cancel)
+    finally:
+        # 취소나 호출자 콜백의 예외로 끝나면 대기 중인 작업은 버리고 기다리지 않는다
+        executor.shutdown(wait=not pending, cancel_futures=True)
+    # 마지막 항목이 끝난 뒤(on_done 등에서) 설정된 취소도 결과 대신 CancelledError로 알린다
+    _check_cancel(cancel)
+    return [results[i] for i in range(count)], failures
+
+
+def prefetch(items: Iterable[Any], depth: int | None = None) -> Iterator[Any]:
+    """items를 백그라운드 스레드에서 미리 생성하여 최대 depth개까지 버퍼링한다.
+
+    PDF 페이지 변환(생산자)과 OCR 제출(소비자)을 겹쳐 실행하기 위한
+    제한된 큐다. 큐가 가득 차면 생산자가 멈추므로 버퍼링되는 페이지 수는
+    문서 길이가 아니라 depth로 제한된다. 생산자에서 발생한 예외는
+    소비자 쪽에서 다시 발생하며, 소비자가 순회를 중단하면 생산자도 멈춘다.
+
+    Args:
+        items: 미리 생성할 항목들 (보통 제너레이터).
+        depth: 큐 최대 깊이. None이면 config.OCR_QUEUE_DEPTH.
+
+    Yields:
+        items의 항목 (원래 순서 유지).
+    """
+    maxsize = max(1, depth or config.OCR_QUEUE_DEPTH)
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _put(entry: tuple[Any, Exception | None]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if not _put((item, None)):
+                    return
+        except Exception as exc:  # noqa: BLE001
+            _put((_END, exc))
+            return
+        _put((_END, None))
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            item, exc = buffer.get()
+            if item is _END:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """백그라운드 데몬 스레드에서 실행 중인 프로세스 공용 이벤트 루프를 반환한다.
+
+    최초 호출 시 lazy 생성한다. google-genai aio 클라이언트의 연결 풀은 생성된
+    루프에 묶이므로 호출마다 asyncio.run으로 새 루프를 만들지 않고 이 루프 하나를
+    재사용한다.
+    """
+    global _event_loop  # noqa: PLW0603
+    with _event_loop_lock:
+        if _event_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+            _event_loop = loop
+    return _event_loop
+
+
+async def _gather_ordered(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    limit: int,
+    events: queue.Queue,
+    stop: threading.Event,
+) -> tuple[list[Any], dict[int, Exception]]:
+    """items 각각에 코루틴 함수 func를 최대 limit개까지 동시에 적용한다.
+
+    세마포어 자리가 나야 다음 항목을 꺼내므로 메모리에 올라가는 항목 수는
+    limit로 제한된다. 항목 꺼내기(제너레이터의 래스터화 등)는 루프를 막지 않도록
+    기본 실행기 스레드에서 한다. 완료될 때마다 (index, result)를 events에 넣고,
+    끝나면 (_END, None)을 넣는다. stop이 설정된 채 취소되면 진행 중인 작업도
+    모두 취소한다 (진행 중인 aio 요청이 끊기고 연결이 반환됨).
+    """
+    results: dict[int, Any] = {}
+    failures: dict[int, Exception] = {}
+    semaphore = asyncio.Semaphore(limit)
+    tasks: list[asyncio.Task] = []
+    iterator = iter(items)
+
+    async def _run(index: int, item: Any) -> None:
+        try:
+            results[index] = await func(item)
+        except Exception as exc:  # noqa: BLE001
+            failures[index] = exc
+            results[index] = None
+        finally:
+            semaphore.release()
+        events.put((index, results[index]))
+
+    try:
+        while not stop.is_set():
+            await semaphore.acquire()
+            item = await asyncio.to_thread(next, iterator, _END)
+            if item is _END:
+                break
+            tasks.append(asyncio.create_task(_run(len(tasks), item)))
+    finally:
+        try:
+            if stop.is_set():
+                for task in tasks:
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            events.put((_END, None))
+    return [results[i] for i in range(len(tasks))], failures
+
+
+def _drain_events(
+    events: queue.Queue,
+    stop: threading.Event,
+    request_stop: Callable[[], None],
+    on_done: Callable[[int, Any], None] | None,
+    cancel: threading.Event | None,
+) -> None:
+    """_gather_ordered가 넣는 완료 이벤트를 (_END, None)까지 호출자 스레드에서 꺼낸다.
+
+    항목마다 on_done(index, result)을 호출하고(중단된 뒤에는 호출하지 않음), cancel이
+    있으면 _CANCEL_POLL_SECONDS마다 확인하여 설정되면 request_stop을 부른다.
+    """
+    while True:
+        if cancel is not None and cancel.is_set():
+            request_stop()
+        try:
+            index, result = events.get(
+                timeout=None if cancel is None else _CANCEL_POLL_SECONDS
+            )
+        except queue.Empty:
+            continue
+        if index is _END:
+            return
+        if on_done is not None and not stop.is_set():
+            on_done(index, result)
+
+
+def run_ordered_async(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    max_concurrency: int | None = None,
+    on_done: Callable[[int, Any], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> tuple[list[Any], dict[int, Exception]]:
+    """run_ordered의 asyncio 버전: 코루틴 함수 func를 items에 동시에 적용한다.
+
+    호출은 공용 이벤트 루프(get_event_loop)에서 세마포어로 최대 max_concurrency개까지
+    동시에 진행되므로, 수백 개의 요청이 진행 중이어도 스레드는 루프 하나와 항목
+    꺼내기/CPU 전처리용 기본 실행기 스레드 몇 개뿐이다. 호출자 스레드는 결과를
+    기다리며 on_done만 실행하므로 동기 코드(Streamlit 스크립트 등)에서 그대로 쓸 수 있다.
+
+    Args:
+        func: 각 항목에 적용할 코루틴 함수 (이벤트 루프에서 실행).
+        items: 처리할 항목들 (리스트 또는 제너레이터).
+        max_concurrency: 최대 동시 진행 수. None이면 config.OCR_ASYNC_CONCURRENCY.
+        on_done: 각 항목 완료 시 호출자 스레드에서 호출되는 콜백(index, result).
+            실패한 항목은 result=None으로 호출된다.
+        cancel: 작업 취소 토큰. 설정되면 새 항목을 꺼내지 않고 진행 중인 코루틴을
+            (진행 중인 요청째) 취소한 뒤 CancelledError를 올린다.
+
+    Returns:
+        (결과_리스트, {인덱스: 예외}) 튜플. 실패한 인덱스의 결과는 None.
+
+    Raises:
+        CancelledError: cancel이 설정된 경우.
+    """
+    limit = max(1, max_concurrency or config.OCR_ASYNC_CONCURRENCY)
+    events: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    future = asyncio.run_coroutine_threadsafe(
+        _gather_ordered(func, items, limit, events, stop), get_event_loop()
+    )
+
+    def _stop() -> None:
+        if not stop.is_set():
+            stop.set()
+            future.cancel()
+
+    try:
+        _drain_events(events, stop, _stop, on_done, cancel)
+    except BaseException:
+        # 호출자 콜백의 예외(Streamlit 중지 등)로 끝나도 남은 작업을 모두 취소한다
+        _stop()
+        raise
+    results = future.result()
+    # 모든 코루틴이 끝난 뒤 설정된 취소도 run_ordered처럼 CancelledError로 알린다
+    _check_cancel(cancel)
+    return results
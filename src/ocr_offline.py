@@ -0,0 +1,493 @@
+"""Gemini Batch API 오프라인 OCR 모듈.
+
+학기 말 수천 페이지 업로드처럼 대화형 페이지별 호출이 느리고 요청 한도에
+걸리는 작업을 위해, 페이지 OCR 요청을 Gemini 배치 작업(client.batches)으로
+묶어 제출하고 완료될 때까지 폴링한 뒤 결과를 (파일, 페이지)로 되돌린다.
+페이지는 대화형 OCR(ocr_scheduler)과 같이 ocr_pages.iter_page_tasks로 만들므로
+텍스트 레이어 페이지(머리글 호출만), 내장 스캔 JPEG, 중복 페이지(머리글 호출만
+또는 호출 없음), 래스터화 DPI 계획이 똑같이 적용된다. 작업은 모델마다 따로 낸다.
+요청은 인라인으로 보내며, 작업 하나의 인라인 크기가 config.OCR_OFFLINE_JOB_BYTES를
+넘지 않도록 여러 작업으로 나눈다. 페이지는 읽는 대로 인코딩하여 작업을 채우고,
+작업을 제출하면 그 페이지의 이미지 바이트는 버린다. 제출한 작업은 결과를 읽은
+뒤(또는 제한 시간 초과, 취소, 예외로 끝날 때) 취소하고 삭제하여 답안지 이미지와
+OCR 결과가 서버 쪽에 남지 않게 한다.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import CancelledError
+
+from google.genai import types
+from PIL import Image
+
+from src import config
+from src import file_handler
+from src import ocr
+from src import ocr_header
+from src import ocr_pages
+from src import pdf_text
+
+logger = logging.getLogger(__name__)
+
+_DONE_STATES = {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+}
+
+_FAILED_STATES = {
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+}
+
+
+def build_request(
+    contents: list[types.Part | str],
+    key: str,
+    model: str,
+    generate_config: types.GenerateContentConfig | None,
+) -> types.InlinedRequest:
+    """contents(이미지 Part와 프롬프트 문자열) 하나의 배치 요청을 만든다.
+
+    metadata의 "key"로 응답을 페이지에 되돌린다. 배치 작업에는 모델 대체가
+    없으므로 호출자는 대화형 호출의 모델 대체 순서의 첫 모델을 넘긴다.
+    """
+    return types.InlinedRequest(
+        model=model,
+        contents=[types.Content(role="user", parts=[
+            part if isinstance(part, types.Part) else types.Part(text=part)
+            for part in contents
+        ])],
+        metadata={"key": key},
+        config=generate_config,
+    )
+
+
+def _request_bytes(contents: list[types.Part | str]) -> int:
+    """인라인 요청 크기 추정: 이미지 바이트의 base64 길이 + 프롬프트."""
+    return sum(
+        len(part.inline_data.data) * 4 // 3 if isinstance(part, types.Part)
+        else len(part.encode())
+        for part in contents
+    )
+
+
+def _ocr_result(response: types.GenerateContentResponse, stats: dict) -> dict:
+    """페이지 OCR 응답의 입력 토큰을 기록하고 결과 dict로 파싱한다."""
+    ocr.record_usage(response, [stats])
+    return ocr.parse_ocr_response(response.text, stats)
+
+
+def _header_result(response: types.GenerateContentResponse, stats: dict) -> dict:
+    """머리글 응답의 입력 토큰과 "header_pass"를 기록하고 {"학번", "이름"}으로 파싱한다."""
+    stats["header_pass"] = True
+    ocr.record_usage(response, [stats])
+    return ocr_header.parse_header_response(response.text, stats)
+
+
+def _text_page_request(
+    page: types.Part, stats: dict,
+) -> tuple[dict, tuple | None]:
+    """텍스트 페이지의 (결과, 머리글 요청). pdf_text.extract_text_page와 같은 경로다."""
+    result = pdf_text.start_text_page(page, stats)
+    if not config.PDF_TEXT_HEADER:
+        return result, None
+    cache_key, cached = pdf_text.cached_text_page(page, stats)
+    if cached is not None:
+        return cached, None
+    return result, (
+        [pdf_text.build_header_prompt(page.text)],
+        ocr.build_generate_config(ocr_header.HEADER_RESPONSE_SCHEMA, ""),
+        ocr_header.HEADER_MODEL_NAME, cache_key,
+        functools.partial(pdf_text.merge_header_response, result),
+    )
+
+
+def _page_request(
+    page: Image.Image | types.Part, stats: dict,
+) -> tuple[dict | None, tuple | None]:
+    """페이지 하나의 (초기 결과, 요청 또는 None)을 대화형 페이지 작업과 같은 경로로 정한다.
+
+    요청은 (contents, 생성 설정, 모델, 캐시 키 또는 None, 응답 -> 결과 함수)다.
+
+    텍스트 페이지는 머리글 요청만, 바이트까지 같은 중복 페이지는 요청 없이 None
+    결과(원본 결과를 복사), 나머지 중복 페이지는 머리글 영역 요청만 만든다. 빈
+    페이지와 OCR 캐시 적중 페이지는 결과만 채운다.
+    """
+    if pdf_text.is_text_page(page):
+        return _text_page_request(page, stats)
+    if stats.get("duplicate_exact"):
+        return None, None
+    part = ocr.prepare_part(page, stats)
+    if "duplicate_of" in stats:
+        header = {"학번": "", "이름": ""}
+        if part is None:
+            return header, None
+        return header, (
+            [ocr_header.header_part(part), ocr_header.HEADER_PROMPT],
+            ocr.build_generate_config(
+                ocr_header.HEADER_RESPONSE_SCHEMA, config.OCR_HEADER_MEDIA_RESOLUTION
+            ),
+            ocr_header.HEADER_MODEL_NAME, None, _header_result,
+        )
+    if part is None:
+        return dict(ocr.BLANK_PAGE_RESULT), None
+    cache_key, cached = ocr.cached_result(part, stats)
+    if cached is not None:
+        return cached, None
+    return dict(ocr.BLANK_PAGE_RESULT), (
+        [part, ocr.OCR_PROMPT], ocr.build_generate_config(), ocr.primary_model(),
+        cache_key, _ocr_result,
+    )
+
+
+def submit_job(
+    requests: list[types.InlinedRequest], number: int, model: str,
+) -> str:
+    """같은 모델의 인라인 요청 묶음을 배치 작업으로 제출하고 작업 이름을 반환한다."""
+    job = config.get_genai_client().batches.create(
+        model=model,
+        src=requests,
+        config=types.CreateBatchJobConfig(display_name=f"essay-ocr-{number}"),
+    )
+    return job.name
+
+
+def _check_cancel(cancel: threading.Event | None) -> None:
+    """취소 토큰이 설정되었으면 CancelledError를 올린다."""
+    if cancel is not None and cancel.is_set():
+        raise CancelledError("OCR 작업이 취소되었습니다")
+
+
+def wait_for_jobs(
+    names: list[str],
+    on_job_done: Callable[[types.BatchJob], None],
+    cancel: threading.Event | None = None,
+) -> None:
+    """모든 배치 작업이 끝날 때까지 config.OCR_OFFLINE_POLL_SECONDS 간격으로 폴링한다.
+
+    끝난 작업(성공, 실패, 취소, 만료)마다 on_job_done(작업)을 한 번 호출한다.
+    cancel이 설정되면 폴링 대기 중에도 바로 깨어나 멈춘다.
+
+    Raises:
+        TimeoutError: config.OCR_OFFLINE_TIMEOUT_SECONDS 안에 끝나지 않은 경우.
+        CancelledError: cancel이 설정된 경우.
+    """
+    client = config.get_genai_client()
+    deadline = time.monotonic() + config.OCR_OFFLINE_TIMEOUT_SECONDS
+    pending = list(names)
+    while True:
+        _check_cancel(cancel)
+        for name in list(pending):
+            job = client.batches.get(name=name)
+            if job.state in _DONE_STATES or job.state in _FAILED_STATES:
+                pending.remove(name)
+                on_job_done(job)
+        if not pending:
+            return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"배치 OCR 작업이 제한 시간 안에 끝나지 않았습니다: {', '.join(pending)}"
+            )
+        if cancel is None:
+            time.sleep(config.OCR_OFFLINE_POLL_SECONDS)
+        else:
+            cancel.wait(config.OCR_OFFLINE_POLL_SECONDS)
+
+
+def delete_jobs(names: list[str], finished: set[str]) -> None:
+    """배치 작업을 삭제한다. finished에 없는(끝나지 않은) 작업은 먼저 취소한다.
+
+    작업에는 답안지 이미지(인라인 요청)와 OCR 결과가 들어 있으므로 결과를 읽었거나
+    더 기다리지 않을 때 바로 지운다. 실패는 경고만 남긴다 (원래 예외를 가리지 않음).
+    """
+    if not names:
+        return
+    client = config.get_genai_client()
+    for name in names:
+        try:
+            if name not in finished:
+                client.batches.cancel(name=name)
+            client.batches.delete(name=name)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("배치 작업 정리 실패 %s: %s", name, exc)
+
+
+def _job_error(job: types.BatchJob) -> str:
+    """실패한 작업의 오류 문구."""
+    message = job.error.message if job.error is not None else None
+    return f"BatchJobError: {job.state.value}" + (f" ({message})" if message else "")
+
+
+def _response_error(inlined: types.InlinedResponse) -> str:
+    """실패한 인라인 응답의 오류 문구."""
+    error = inlined.error
+    if error is None:
+        return "BatchRequestError: 빈 응답"
+    return f"BatchRequestError: {error.code} {error.message}"
+
+
+def _page_requests(
+    files_data: list[tuple[str, bytes]],
+    owners: list[int],
+    page_stats: list[dict],
+    raster_report: list[dict],
+    results: list[dict | None],
+    pending: dict[str, tuple],
+    cancel: threading.Event | None = None,
+) -> Iterator[tuple[str, str, types.InlinedRequest, int]]:
+    """모든 파일의 페이지를 읽는 대로 (모델, 요청 키, 배치 요청, 추정 바이트)로 생성한다.
+
+    페이지는 ocr_pages.iter_page_tasks가 대화형 OCR과 같은 순서와 경로로 만들고
+    owners/page_stats/raster_report를 채운다. 페이지마다 results에 초기 결과
+    (_page_request)를 추가하고, 요청을 만든 페이지는 pending["파일:페이지"] =
+    (페이지 인덱스, 캐시 키, 응답 -> 결과 함수)로 기록한다.
+    """
+    page_counts = [file_handler.count_pages(name, data) for name, data in files_data]
+    tasks = ocr_pages.iter_page_tasks(
+        files_data, page_counts, owners, page_stats, raster_report
+    )
+    first_pages: dict[int, int] = {}
+    try:
+        for index, (page, stats) in enumerate(tasks):
+            _check_cancel(cancel)
+            first = first_pages.setdefault(owners[index], index)
+            result, request = _page_request(page, stats)
+            results.append(result)
+            if request is None:
+                continue
+            contents, generate_config, model, cache_key, parse = request
+            key = f"{owners[index]}:{index - first}"
+            pending[key] = (index, cache_key, parse)
+            yield (
+                model, key, build_request(contents, key, model, generate_config),
+                _request_bytes(contents),
+            )
+    finally:
+        tasks.close()
+
+
+def _submit_jobs(
+    requests: Iterator[tuple[str, str, types.InlinedRequest, int]],
+    job_keys: dict[str, list[str]],
+) -> None:
+    """요청을 모델별로, config.OCR_OFFLINE_JOB_BYTES 안의 작업으로 나눠 제출한다.
+
+    제출한 작업마다 job_keys[작업 이름] = 요청 키 목록을 바로 기록하므로, 제출
+    도중 예외가 나도 호출자가 이미 제출한 작업을 정리할 수 있다.
+    """
+    batches: dict[str, tuple[list[types.InlinedRequest], list[str]]] = {}
+    sizes: dict[str, int] = {}
+    for model, key, request, request_size in requests:
+        batch, keys = batches.setdefault(model, ([], []))
+        if batch and sizes[model] + request_size > config.OCR_OFFLINE_JOB_BYTES:
+            job_keys[submit_job(batch, len(job_keys) + 1, model)] = keys
+            batch, keys = batches[model] = ([], [])
+            sizes[model] = 0
+        batch.append(request)
+        keys.append(key)
+        sizes[model] = sizes.get(model, 0) + request_size
+    for model, (batch, keys) in batches.items():
+        if batch:
+            job_keys[submit_job(batch, len(job_keys) + 1, model)] = keys
+
+
+def _job_responses(
+    job: types.BatchJob, keys: list[str],
+) -> dict[str, types.InlinedResponse]:
+    """끝난 작업의 인라인 응답을 요청 키별로 모은다.
+
+    응답은 metadata의 키로, 없으면 작업 안의 요청 순서로 대응시킨다. 작업에 없는
+    키와 같은 키의 두 번째 응답은 버린다.
+    """
+    responses: dict[str, types.InlinedResponse] = {}
+    inlined = job.dest.inlined_responses if job.dest else None
+    for position, response in enumerate(inlined or []):
+        key = (response.metadata or {}).get("key")
+        if key is None and position < len(keys):
+            key = keys[position]
+        if key in keys and key not in responses:
+            responses[key] = response
+    return responses
+
+
+def _apply_job(
+    job: types.BatchJob,
+    keys: list[str],
+    pending: dict[str, tuple],
+    results: list[dict | None],
+    page_stats: list[dict],
+    fail: Callable[[str, str], None],
+) -> None:
+    """끝난 작업 하나의 응답을 페이지 결과로 채우고 캐시 키가 있으면 캐시에 넣는다.
+
+    실패한 작업은 모든 페이지를, 요청 오류나 응답 누락은 그 페이지만
+    fail(키, 오류 문구)로 넘긴다.
+    """
+    for key in keys:
+        page_stats[pending[key][0]]["batch_job"] = job.name
+    if job.state in _FAILED_STATES:
+        for key in keys:
+            fail(key, _job_error(job))
+        return
+    responses = _job_responses(job, keys)
+    for key in keys:
+        response = responses.get(key)
+        if response is None:
+            fail(key, "BatchRequestError: 응답 없음")
+            continue
+        if response.error is not None or response.response is None:
+            fail(key, _response_error(response))
+            continue
+        index, cache_key, parse = pending[key]
+        stats = page_stats[index]
+        results[index] = parse(response.response, stats)
+        if cache_key is not None:
+            ocr.cache_result(cache_key, results[index], stats)
+
+
+def _failure_recorder(
+    files_data: list[tuple[str, bytes]],
+    owners: list[int],
+    pending: dict[str, tuple],
+    failures: dict[int, str],
+    failed_pages: list[dict] | None,
+) -> Callable[[str, str], None]:
+    """요청 키의 실패를 기록하는 함수 fail(키, 오류 문구)를 만든다.
+
+    failed_pages가 있으면 failures[페이지 인덱스]에 오류 문구를 남기고(_settle_results가
+    정리), 없으면 RuntimeError를 올린다.
+    """
+
+    def _fail(key: str, error: str) -> None:
+        index = pending[key][0]
+        if failed_pages is None:
+            file_index = owners[index]
+            page = index - owners.index(file_index) + 1
+            raise RuntimeError(f"{files_data[file_index][0]} {page}페이지: {error}")
+        failures[index] = error
+
+    return _fail
+
+
+def _collect_jobs(
+    job_keys: dict[str, list[str]],
+    finished: set[str],
+    pending: dict[str, tuple],
+    results: list[dict | None],
+    page_stats: list[dict],
+    fail: Callable[[str, str], None],
+    on_progress: Callable[[int, int], None] | None,
+    cancel: threading.Event | None,
+) -> None:
+    """제출한 작업을 폴링하며 끝난 작업마다 결과를 채우고 진행률을 알린다.
+
+    요청이 없는 페이지(빈 페이지, 캐시 적중, 바이트까지 같은 중복)는 처음부터 완료로 센다. 끝난 작업 이름은
+    finished에 추가한다 (delete_jobs가 취소 없이 삭제).
+    """
+    total = len(results)
+    done = total - len(pending)
+    if on_progress is not None:
+        on_progress(done, total)
+
+    def _on_job_done(job: types.BatchJob) -> None:
+        nonlocal done
+        finished.add(job.name)
+        _apply_job(job, job_keys[job.name], pending, results, page_stats, fail)
+        done += len(job_keys[job.name])
+        if on_progress is not None:
+            on_progress(done, total)
+
+    wait_for_jobs(list(job_keys), _on_job_done, cancel)
+
+
+def _settle_results(
+    files_data: list[tuple[str, bytes]],
+    owners: list[int],
+    raster_report: list[dict],
+    page_stats: list[dict],
+    results: list[dict | None],
+    failures: dict[int, str],
+    failed_pages: list[dict] | None,
+    page_report: list[dict] | None,
+) -> None:
+    """끝난 작업의 결과를 정리하고 페이지 리포트(ocr_pages.build_page_report)를 남긴다.
+
+    중복 페이지에 원본 결과(또는 실패)를 복사하고, 실패한 페이지는 빈 결과로 채워
+    오류를 페이지 통계("ocr_error")와 failed_pages({"file", "page", "error"})에 남긴다.
+    page_report가 있으면 페이지 리포트를 추가한다.
+    """
+    ocr_pages.copy_duplicates(results, failures, page_stats)
+    for index, error in failures.items():
+        results[index] = dict(ocr.BLANK_PAGE_RESULT)
+        page_stats[index]["ocr_error"] = error
+    report = ocr_pages.build_page_report(files_data, owners, raster_report, page_stats)
+    if failed_pages is not None:
+        failed_pages.extend(
+            {"file": entry["file"], "page": entry["page"], "error": entry["ocr_error"]}
+            for entry in report if "ocr_error" in entry
+        )
+    if page_report is not None:
+        page_report.extend(report)
+
+
+def ocr_files_offline(
+    files_data: list[tuple[str, bytes]],
+    on_progress: Callable[[int, int], None] | None = None,
+    page_report: list[dict] | None = None,
+    failed_pages: list[dict] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[tuple[str, list[dict]]]:
+    """모든 파일의 페이지를 Gemini 배치 작업으로 OCR한다.
+
+    ocr_scheduler.ocr_files와 같은 반환 형식이라 essay_splitter에 그대로 넘길
+    수 있다. 페이지는 대화형 OCR과 같은 경로(ocr_pages.iter_page_tasks,
+    _page_request)로 요청을 만든다. 제출한 작업은 성공, 제한 시간 초과, 취소,
+    예외 어느 경우에도 끝날 때 삭제한다 (끝나지 않은 작업은 먼저 취소, delete_jobs).
+
+    Args:
+        files_data: (파일명, 바이트) 튜플 리스트.
+        on_progress: 페이지를 모두 제출한 뒤, 그리고 작업이 끝날 때마다 호출되는
+            콜백(완료_페이지_수, 전체_페이지_수).
+        page_report: 주어지면 페이지별 처리 정보({"file", "page", "batch_job", "dpi", ...})가
+            추가되는 리스트.
+        failed_pages: 주어지면 실패한 요청/작업의 페이지를 빈 결과로 채우고
+            {"file", "page", "error"}를 추가한다. 없으면 첫 실패에서 RuntimeError.
+        cancel: 작업 취소 토큰. 설정되면 페이지 읽기나 폴링을 멈추고 CancelledError.
+
+    Returns:
+        [(파일명, [페이지별 OCR 결과 dict, ...]), ...] 파일 순서대로.
+
+    Raises:
+        RuntimeError: failed_pages가 없고 실패한 요청이나 작업이 있는 경우.
+        TimeoutError: 작업이 config.OCR_OFFLINE_TIMEOUT_SECONDS 안에 끝나지 않은 경우.
+        CancelledError: cancel이 설정되어 작업이 중단된 경우.
+    """
+    owners: list[int] = []
+    page_stats: list[dict] = []
+    raster_report: list[dict] = []
+    results: list[dict | None] = []
+    failures: dict[int, str] = {}
+    pending: dict[str, tuple] = {}  # key -> (페이지 인덱스, 캐시 키, 응답 -> 결과 함수)
+    job_keys: dict[str, list[str]] = {}
+    finished: set[str] = set()
+    fail = _failure_recorder(files_data, owners, pending, failures, failed_pages)
+    try:
+        _submit_jobs(_page_requests(
+            files_data, owners, page_stats, raster_report, results, pending, cancel,
+        ), job_keys)
+        _collect_jobs(
+            job_keys, finished, pending, results, page_stats, fail, on_progress, cancel
+        )
+    finally:
+        delete_jobs(list(job_keys), finished)
+    _settle_results(
+        files_data, owners, raster_report, page_stats, results, failures,
+        failed_pages, page_report,
+    )
+    return ocr_pages.group_by_file(files_data, owners, results)
@@ -0,0 +1,259 @@
+"""OCR 작업의 페이지 생성 모듈.
+
+업로드된 모든 파일의 페이지를 OCR 작업 큐에 넣을 순서대로 만든다. PDF는 페이지마다
+텍스트 레이어(pdf_text), 내장 스캔 JPEG(pdf_images), 래스터화(raster_pool) 중 한
+경로로 내보내고, 이미지 파일은 ocr.iter_file_pages로 로드한다. 작업 안에서 지각
+해시가 거의 같은 페이지는 원본 페이지를 기록한다. 대화형(ocr_scheduler)과 배치
+작업(ocr_offline) OCR이 같은 페이지 경로를 쓰도록, 끝난 페이지 결과의 중복 복사,
+페이지 리포트, 파일별 재그룹도 여기서 한다.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterator
+
+from google.genai import types
+from PIL import Image
+
+from src import config
+from src import ocr
+from src import page_hash
+from src import pdf_images
+from src import pdf_text
+from src import raster_pool
+
+
+def is_pdf(filename: str) -> bool:
+    """확장자로 PDF 파일인지 판정한다."""
+    return os.path.splitext(filename)[1].lower() == ".pdf"
+
+
+def _mark_duplicate(
+    image: Image.Image | types.Part, stats: dict, hashes: list[int],
+    roots: list[int], digests: dict[int, bytes], index: int,
+) -> None:
+    """페이지 해시를 이전 페이지들과 비교해 중복이면 stats에 원본 인덱스를 기록한다.
+
+    가장 가까운 이전 페이지와의 해밍 거리를 "hash_distance"에 (임계값 튜닝용),
+    거리가 config.DEDUP_MAX_DISTANCE 이하이면 그 페이지의 원본(처음 나온 페이지)
+    인덱스를 "duplicate_of"에 기록한다. 원본과 내용 요약(page_hash.content_digest)까지
+    같으면 "duplicate_exact"도 기록한다. 바이트가 다른 중복은 머리글만 다른 같은
+    양식의 다른 학생 답안일 수 있으므로 스케줄러가 학번/이름을 따로 읽는다.
+    hashes/roots에는 이 페이지(작업 안의 페이지 인덱스 index)가, digests에는 페이지
+    인덱스별 내용 요약이 추가된다. 해시하지 않는 텍스트 페이지가 있어 hashes의
+    위치와 페이지 인덱스는 다를 수 있다.
+    """
+    value = page_hash.page_hash(image)
+    digests[index] = page_hash.content_digest(image)
+    root = index
+    found = page_hash.nearest(hashes, value)
+    if found is not None:
+        position, distance = found
+        stats["hash_distance"] = distance
+        if distance <= config.DEDUP_MAX_DISTANCE:
+            root = roots[position]
+            stats["duplicate_of"] = root
+            if digests[root] == digests[index]:
+                stats["duplicate_exact"] = True
+    hashes.append(value)
+    roots.append(root)
+
+
+def iter_page_tasks(
+    files_data: list[tuple[str, bytes]],
+    page_counts: list[int],
+    owners: list[int],
+    page_stats: list[dict],
+    raster_report: list[dict] | None = None,
+) -> Iterator[tuple[Image.Image | types.Part, dict]]:
+    """모든 파일의 페이지를 (페이지, 페이지별_통계_dict) 순서대로 생성한다.
+
+    각 페이지의 파일 인덱스는 owners에, 통계 dict는 page_stats에 기록한다.
+    통계 dict는 OCR 작업자가 채운다(업로드 바이트 등). config.DEDUP_ENABLED면
+    페이지를 내보내기 전에 해시로 중복 여부를 기록한다(_mark_duplicate).
+
+    PDF 페이지 중 텍스트 레이어가 있는 페이지(pdf_text.text_pages)는 래스터화하지
+    않고 텍스트 Part로 내보내고, 전체 페이지 스캔 JPEG 한 장으로 된 페이지
+    (pdf_images.scan_pages)는 내장 JPEG를 그대로 꺼내 내보낸다. 이 판정은 문서마다
+    그 문서의 페이지가 필요해질 때 한다(_pdf_layers). 나머지 PDF 페이지는
+    raster_pool.iter_pdf_pages가 여러 문서에 걸쳐 프로세스 풀에서 미리 변환한
+    순서대로 꺼낸다. 이미지 파일은 ocr.iter_file_pages로 로드한다. raster_report가
+    주어지면 래스터화한 PDF 페이지별 DPI 선택 결과가 추가된다. 텍스트 페이지는
+    중복 검사를 하지 않는다.
+    """
+    pdf_files = [
+        (file_bytes, count)
+        for (filename, file_bytes), count in zip(files_data, page_counts)
+        if is_pdf(filename)
+    ]
+    layers = _pdf_layers(pdf_files)
+    rendered = raster_pool.iter_pdf_pages(
+        pdf_files, report=raster_report,
+        skip=lambda doc_index: _skipped_pages(*layers(doc_index)),
+    )
+    pdf_indexes = iter(range(len(pdf_files)))
+    hashes: list[int] = []
+    roots: list[int] = []
+    digests: dict[int, bytes] = {}
+    try:
+        for file_index, (filename, file_bytes) in enumerate(files_data):
+            if is_pdf(filename):
+                pdf_index = next(pdf_indexes)
+                pages = _pdf_pages(pdf_files[pdf_index], *layers(pdf_index), rendered)
+            else:
+                pages = (
+                    (image, {}) for image in ocr.iter_file_pages(filename, file_bytes)
+                )
+            for image, stats in pages:
+                if config.DEDUP_ENABLED and not pdf_text.is_text_page(image):
+                    _mark_duplicate(
+                        image, stats, hashes, roots, digests, len(page_stats)
+                    )
+                owners.append(file_index)
+                page_stats.append(stats)
+                yield image, stats
+    finally:
+        rendered.close()
+
+
+def _pdf_layers(
+    pdf_files: list[tuple[bytes, int]],
+) -> Callable[[int], tuple[list[types.Part | None], dict[int, dict]]]:
+    """PDF 인덱스 -> (텍스트 페이지 리스트, 스캔 페이지)를 문서마다 처음 물을 때 한 번만
+    판정하는 함수를 만든다.
+
+    판정(pdftotext, pdfimages, pdftocairo, pdfinfo)을 그 문서의 페이지가 필요해질
+    때까지 미루므로 첫 문서의 페이지가 나머지 문서의 판정을 기다리지 않는다.
+    pdftotext 텍스트, pdfimages 이미지 목록과 pdfinfo 페이지 크기(pdf_images.page_layout)는
+    문서마다 한 번만 구해 텍스트 페이지 판정과 스캔 페이지 판정(글자가 있는 페이지
+    제외)에 함께 쓴다. 생산자 스레드 하나에서만 부른다.
+    """
+    layers: dict[int, tuple[list[types.Part | None], dict[int, dict]]] = {}
+
+    def _layers(pdf_index: int) -> tuple[list[types.Part | None], dict[int, dict]]:
+        if pdf_index not in layers:
+            data, count = pdf_files[pdf_index]
+            texts = (
+                pdf_text.extract_page_texts(data, count)
+                if config.PDF_TEXT_ENABLED or config.PDF_IMAGES_ENABLED
+                else [""] * count
+            )
+            layout = pdf_images.page_layout(data, count) if _needs_layout(texts) else None
+            pages = pdf_text.text_pages(data, count, texts, layout)
+            layers[pdf_index] = pages, pdf_images.scan_pages(
+                data, count, texts, _skipped_pages(pages, {}), layout
+            )
+        return layers[pdf_index]
+
+    return _layers
+
+
+def _needs_layout(texts: list[str]) -> bool:
+    """텍스트 페이지나 스캔 페이지 후보가 있어 이미지 목록과 페이지 크기가 필요한지."""
+    return (
+        config.PDF_TEXT_ENABLED and any(pdf_text.has_text_layer(text) for text in texts)
+    ) or (config.PDF_IMAGES_ENABLED and not all(texts))
+
+
+def _skipped_pages(texts: list[types.Part | None], scans: dict[int, dict]) -> set[int]:
+    """래스터화하지 않는 페이지 번호(1부터): 텍스트 페이지와 스캔 페이지."""
+    return {n for n, text in enumerate(texts, start=1) if text is not None} | set(scans)
+
+
+def _pdf_pages(
+    pdf_file: tuple[bytes, int],
+    texts: list[types.Part | None],
+    scans: dict[int, dict],
+    rendered: Iterator[Image.Image | types.Part],
+) -> Iterator[tuple[Image.Image | types.Part, dict]]:
+    """PDF 하나의 페이지를 (페이지, 초기 통계_dict) 순서대로 생성한다.
+
+    텍스트 페이지는 텍스트 Part, 스캔 페이지는 pdf_images.iter_scan_pages가 꺼낸
+    내장 JPEG(통계에 "embedded_image"), 나머지는 rendered의 다음 페이지다.
+    """
+    extracted = pdf_images.iter_scan_pages(pdf_file[0], scans)
+    try:
+        for number, text in enumerate(texts, start=1):
+            if text is not None:
+                yield text, {}
+            elif number in scans:
+                yield next(extracted), {"embedded_image": True}
+            else:
+                yield next(rendered), {}
+    finally:
+        extracted.close()
+
+
+def copy_duplicates(
+    results: list[dict | None],
+    failures: dict[int, Exception | str],
+    page_stats: list[dict],
+) -> None:
+    """중복 페이지에 원본 페이지의 OCR 결과(또는 실패)를 복사한다.
+
+    failures는 페이지 인덱스 -> 실패(ocr_scheduler는 예외, ocr_offline은 오류 문구)다.
+
+    머리글만 읽은 중복 페이지는 자기 학번/이름을 유지하고, 그 호출이 실패했으면
+    원본 결과를 복사하지 않고 실패로 남는다.
+    """
+    for index, stats in enumerate(page_stats):
+        source = stats.get("duplicate_of")
+        if source is None or index in failures:
+            continue
+        if source in failures:
+            failures[index] = failures[source]
+        elif results[source] is not None:
+            results[index] = {**results[source], **(results[index] or {})}
+        if page_stats[source].get("blank"):
+            stats["blank"] = True
+
+
+def build_page_report(
+    files_data: list[tuple[str, bytes]],
+    owners: list[int],
+    raster_report: list[dict],
+    page_stats: list[dict],
+) -> list[dict]:
+    """페이지별 처리 정보 목록을 만든다.
+
+    {"file", "page"}에 PDF면 "dpi", "pixels", 그리고 OCR 작업자가 기록한
+    페이지 통계(업로드 바이트 등)를 합친다. 중복 페이지의 "duplicate_of"는
+    원본 페이지를 가리키는 "파일명 N페이지" 문자열로 바꾼다.
+    """
+    pdf_files = [i for i, (name, _) in enumerate(files_data) if is_pdf(name)]
+    raster = {
+        (pdf_files[entry["doc"]], entry["page"]): entry
+        for entry in raster_report
+    }
+    page_numbers = [0] * len(files_data)
+    report: list[dict] = []
+    for file_index in owners:
+        page_numbers[file_index] += 1
+        entry = {
+            "file": files_data[file_index][0],
+            "page": page_numbers[file_index],
+        }
+        info = raster.get((file_index, page_numbers[file_index]))
+        if info is not None:
+            entry["dpi"] = info["dpi"]
+            entry["pixels"] = info["pixels"]
+        report.append(entry)
+    for entry, stats in zip(report, page_stats):
+        entry.update(stats)
+        if "duplicate_of" in stats:
+            source = report[stats["duplicate_of"]]
+            entry["duplicate_of"] = f"{source['file']} {source['page']}페이지"
+    return report
+
+
+def group_by_file(
+    files_data: list[tuple[str, bytes]],
+    owners: list[int],
+    results: list[dict | None],
+) -> list[tuple[str, list[dict]]]:
+    """페이지 결과를 입력 파일 순서의 (파일명, [페이지별_dict, ...])로 묶는다."""
+    grouped: list[tuple[str, list[dict]]] = [(name, []) for name, _ in files_data]
+    for file_index, result in zip(owners, results):
+        grouped[file_index][1].append(result)
+    return grouped
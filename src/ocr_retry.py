@@ -0,0 +1,212 @@
+"""OCR 호출 재시도 모듈.
+
+페이지(또는 묶음) OCR 호출이 일시적 오류(429, 5xx, 시간 초과, 연결 끊김)로
+실패하면 지수 백오프와 지터(full jitter)를 두고 다시 시도한다. 영구적 오류
+(잘못된 요청, 인증 실패 등)는 다시 시도해도 같으므로 즉시 실패시킨다.
+재시도를 포함한 페이지 작업 하나는 config.OCR_PAGE_DEADLINE_SECONDS 안에 끝나야
+하며, 작업 취소 토큰(threading.Event)이 설정되면 다음 시도 전에 멈춘다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import CancelledError
+from typing import Any
+
+import httpx
+from google.genai import errors
+
+from src import config
+
+# 다시 시도할 HTTP 상태 코드 (시간 초과, 요청 한도 초과). 5xx는 모두 다시 시도한다.
+_TRANSIENT_CODES = {408, 429}
+
+# 다음 모델로 넘어갈 HTTP 상태 코드 (요청 한도 초과, 모델 과부하)
+_FALLBACK_CODES = {429, 503}
+
+# 진행 중인 페이지 작업의 (마감 시각(time.monotonic) 또는 None, 취소 토큰 또는 None).
+# call_with_retry가 작업 동안 설정하고 ocr.generate_ocr가 모델 호출마다 확인한다.
+# 스레드마다, asyncio 작업마다 따로 보이도록 ContextVar로 둔다.
+_page_limits: contextvars.ContextVar[
+    tuple[float | None, threading.Event | None]
+] = contextvars.ContextVar("ocr_page_limits", default=(None, None))
+
+
+def check_page() -> float | None:
+    """진행 중인 페이지 작업의 취소와 제한 시간을 확인하고 남은 시간(초)을 반환한다.
+
+    call_with_retry 밖이거나 페이지 제한 시간이 없으면 None을 반환한다.
+
+    Raises:
+        CancelledError: 작업 취소 토큰이 설정된 경우.
+        TimeoutError: 페이지 제한 시간(config.OCR_PAGE_DEADLINE_SECONDS)을 넘은 경우.
+    """
+    deadline, cancel = _page_limits.get()
+    if cancel is not None and cancel.is_set():
+        raise CancelledError("OCR 작업이 취소되었습니다")
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError(
+            f"페이지 OCR 제한 시간({config.OCR_PAGE_DEADLINE_SECONDS:g}초)을 넘었습니다"
+        )
+    return remaining
+
+
+def _page_deadline() -> float | None:
+    """지금 시작하는 페이지 작업의 마감 시각. 제한이 없으면(0 이하) None."""
+    if config.OCR_PAGE_DEADLINE_SECONDS <= 0:
+        return None
+    return time.monotonic() + config.OCR_PAGE_DEADLINE_SECONDS
+
+
+def _can_wait(deadline: float | None, delay: float) -> bool:
+    """백오프 뒤에도 페이지 마감 전에 다시 시도할 수 있는지 여부."""
+    return deadline is None or time.monotonic() + delay < deadline
+
+
+def is_transient(exc: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 일시적 오류인지 분류한다.
+
+    google-genai APIError는 상태 코드로(408, 429, 5xx면 일시적), 그 밖에는
+    httpx 전송 오류(시간 초과, 연결 오류)와 TimeoutError, ConnectionError를
+    일시적 오류로 본다. 나머지(4xx, ValueError 등)는 영구적 오류다.
+    """
+    if isinstance(exc, errors.APIError):
+        return exc.code in _TRANSIENT_CODES or exc.code >= 500
+    return isinstance(
+        exc, (httpx.TransportError, TimeoutError, ConnectionError)
+    )
+
+
+def should_fall_back(exc: Exception) -> bool:
+    """모델 대체 순서(ocr.generate_ocr)에서 다음 모델로 넘어갈 오류인지 분류한다.
+
+    모델 과부하(429, 503)와 제한 시간 초과(httpx 시간 초과, TimeoutError)만
+    해당한다. 다른 일시적 오류(500 등)는 같은 모델로 재시도한다.
+    """
+    if isinstance(exc, errors.APIError):
+        return exc.code in _FALLBACK_CODES
+    return isinstance(exc, (httpx.TimeoutException, TimeoutError))
+
+
+def backoff_delay(attempt: int, rng: random.Random | None = None) -> float:
+    """attempt번째 재시도 전에 기다릴 시간(초)을 반환한다.
+
+    full jitter: 0과 min(OCR_RETRY_MAX_SECONDS, OCR_RETRY_BASE_SECONDS * 2^attempt)
+    사이의 균등 난수. 동시에 실패한 페이지들이 같은 순간에 다시 몰리지 않는다.
+
+    Args:
+        attempt: 0부터 시작하는 재시도 순번.
+        rng: 난수 생성기. None이면 random 모듈 전역 생성기.
+    """
+    cap = min(
+        config.OCR_RETRY_MAX_SECONDS,
+        config.OCR_RETRY_BASE_SECONDS * 2 ** attempt,
+    )
+    return (rng or random).uniform(0, cap)
+
+
+def _record(stats_list: list[dict] | None, attempts: int) -> None:
+    """다시 시도할 때 통계 dict마다 시도 횟수를 기록한다 (재시도가 없으면 기록 없음)."""
+    for stats in stats_list or []:
+        stats["attempts"] = attempts
+
+
+def _sleep(seconds: float, cancel: threading.Event | None) -> None:
+    """백오프 대기. 취소 토큰이 있으면 토큰이 설정되는 즉시 깨어난다."""
+    if cancel is None:
+        time.sleep(seconds)
+    else:
+        cancel.wait(seconds)
+
+
+def call_with_retry(
+    func: Callable[..., Any],
+    *args: Any,
+    stats_list: list[dict] | None = None,
+    cancel: threading.Event | None = None,
+    **kwargs: Any,
+) -> Any:
+    """func(*args, **kwargs)를 일시적 오류에 한해 최대 config.OCR_RETRY_ATTEMPTS번 시도한다.
+
+    호출 전체(재시도와 백오프 포함)를 페이지 작업 하나로 보고
+    config.OCR_PAGE_DEADLINE_SECONDS 마감을 건다. 마감과 취소 토큰은 시도마다
+    확인하고(check_page), func 안의 ocr.generate_ocr가 요청 제한 시간을 남은
+    시간으로 줄이는 데 쓴다. 백오프가 마감을 넘기면 기다리지 않고 마지막 예외를 올린다.
+
+    Args:
+        func: 호출할 함수.
+        *args, **kwargs: func에 넘길 인자.
+        stats_list: 주어지면 다시 시도할 때마다 각 통계 dict에 시도 횟수("attempts")를
+            기록한다. 첫 호출에 끝나면 기록하지 않는다.
+        cancel: 작업 취소 토큰. 설정되면 다음 시도 전에(백오프 중이면 즉시) 멈춘다.
+
+    Returns:
+        func의 반환값.
+
+    Raises:
+        CancelledError: 취소 토큰이 설정된 경우.
+        TimeoutError: 다음 시도 전에 페이지 마감을 넘은 경우.
+        Exception: 영구적 오류이거나 시도 횟수를 다 쓴 경우 마지막 예외.
+    """
+    attempts = max(1, config.OCR_RETRY_ATTEMPTS)
+    deadline = _page_deadline()
+    token = _page_limits.set((deadline, cancel))
+    try:
+        attempt = 0
+        while True:
+            attempt += 1
+            check_page()
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:  # noqa: BLE001
+                if attempt >= attempts or not is_transient(exc):
+                    raise
+                delay = backoff_delay(attempt - 1)
+                if not _can_wait(deadline, delay):
+                    raise
+                _record(stats_list, attempt + 1)
+                _sleep(delay, cancel)
+    finally:
+        _page_limits.reset(token)
+
+
+async def call_with_retry_async(
+    func: Callable[..., Awaitable[Any]],
+    *args: Any,
+    stats_list: list[dict] | None = None,
+    cancel: threading.Event | None = None,
+    **kwargs: Any,
+) -> Any:
+    """call_with_retry의 asyncio 버전. 백오프 동안 이벤트 루프를 막지 않는다.
+
+    취소된 작업은 보통 ocr_engine.run_ordered_async가 asyncio 작업을 취소하여
+    진행 중인 요청째 멈추고, cancel 토큰은 다음 시도 전에 한 번 더 확인한다.
+    """
+    attempts = max(1, config.OCR_RETRY_ATTEMPTS)
+    deadline = _page_deadline()
+    token = _page_limits.set((deadline, cancel))
+    try:
+        attempt = 0
+        while True:
+            attempt += 1
+            check_page()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as exc:  # noqa: BLE001
+                if attempt >= attempts or not is_transient(exc):
+                    raise
+                delay = backoff_delay(attempt - 1)
+                if not _can_wait(deadline, delay):
+                    raise
+                _record(stats_list, attempt + 1)
+                await asyncio.sleep(delay)
+    finally:
+        _page_limits.reset(token)
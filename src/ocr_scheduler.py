@@ -0,0 +1,475 @@
+"""작업 단위 OCR 스케줄러 모듈.
+
+업로드된 모든 파일의 페이지를 하나의 작업 큐로 펼쳐 공유 작업자 풀에서
+OCR한 뒤, 결과를 다시 파일별로 묶어 essay_splitter가 받는 형식으로 반환한다.
+작업 안에서 지각 해시가 거의 같은 페이지는 OCR하지 않고 앞 페이지의 결과를 재사용한다
+(바이트가 다른 페이지는 학번/이름만 머리글 호출로 다시 읽는다).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+from google.genai import types
+from PIL import Image
+
+from src import config
+from src import file_handler
+from src import ocr
+from src import ocr_batch
+from src import ocr_engine
+from src import ocr_header
+from src import ocr_pages
+from src import ocr_retry
+from src import ocr_uploads
+from src import pdf_text
+
+
+def _header_only(stats: dict) -> bool:
+    """바이트가 다른 중복 페이지라서 머리글(학번/이름)만 OCR할 페이지인지."""
+    return "duplicate_of" in stats and not stats.get("duplicate_exact")
+
+
+def _ocr_task(
+    task: tuple[Image.Image | types.Part, dict],
+    cancel: threading.Event | None = None,
+) -> dict | None:
+    """(페이지, 통계_dict) 작업 하나를 OCR한다 (작업자 스레드에서 실행).
+
+    바이트까지 같은 중복 페이지는 모델을 호출하지 않고 None을 반환하고, 나머지
+    중복 페이지는 ocr_header.extract_header로 학번/이름만 읽는다 (본문은
+    ocr_pages.copy_duplicates가 원본 결과로 채움).
+    텍스트 페이지는 pdf_text.extract_text_page(이미지 OCR 없음)로, 그 밖에는
+    config.OCR_TWO_TIER면 ocr_header.extract_two_tier(머리글 + 본문 동시 호출)를 쓴다.
+    일시적 오류는 ocr_retry.call_with_retry로 백오프 후 다시 시도하며, 페이지 마감과
+    작업 취소 토큰(cancel)도 거기서 확인한다.
+    """
+    image, stats = task
+    if stats.get("duplicate_exact"):
+        return None
+    if _header_only(stats):
+        extract = ocr_header.extract_header
+    elif pdf_text.is_text_page(image):
+        extract = pdf_text.extract_text_page
+    elif config.OCR_TWO_TIER:
+        extract = ocr_header.extract_two_tier
+    else:
+        extract = ocr.extract_text_from_image
+    return ocr_retry.call_with_retry(
+        extract, image, stats=stats, stats_list=[stats], cancel=cancel,
+    )
+
+
+async def _ocr_task_async(
+    task: tuple[Image.Image | types.Part, dict],
+    cancel: threading.Event | None = None,
+) -> dict | None:
+    """_ocr_task의 asyncio 버전 (공용 이벤트 루프에서 실행)."""
+    image, stats = task
+    if stats.get("duplicate_exact"):
+        return None
+    if _header_only(stats):
+        extract = ocr_header.extract_header_async
+    elif pdf_text.is_text_page(image):
+        extract = pdf_text.extract_text_page_async
+    elif config.OCR_TWO_TIER:
+        extract = ocr_header.extract_two_tier_async
+    else:
+        extract = ocr.extract_text_from_image_async
+    return await ocr_retry.call_with_retry_async(
+        extract, image, stats=stats, stats_list=[stats], cancel=cancel,
+    )
+
+
+def _iter_batches(
+    tasks: Iterable[tuple[Image.Image | types.Part, dict]],
+    batch_state: dict,
+    batch_pages: list[list[int]],
+) -> Iterator[list[tuple[Image.Image | types.Part, dict]]]:
+    """페이지 작업을 batch_state["size"]개씩 묶어 생성한다.
+
+    묶음 크기는 묶음을 만들 때마다 다시 읽으므로 _adapt_batch_size의 조정이
+    다음 묶음부터 반영된다. 각 묶음의 페이지 인덱스는 batch_pages에 기록한다.
+    """
+    batch: list[tuple[Image.Image | types.Part, dict]] = []
+    start = 0
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= batch_state["size"]:
+            batch_pages.append(list(range(start, start + len(batch))))
+            start += len(batch)
+            yield batch
+            batch = []
+    if batch:
+        batch_pages.append(list(range(start, start + len(batch))))
+        yield batch
+
+
+def _adapt_batch_size(batch_state: dict, seconds: float, pages: int) -> None:
+    """관측한 호출 시간으로 다음 묶음 크기를 조정한다.
+
+    페이지당 응답 시간으로 config.OCR_BATCH_TARGET_SECONDS 안에 끝날 페이지 수를
+    구해 1 ~ config.OCR_BATCH_SIZE 범위로 제한한다.
+    """
+    if pages <= 0 or seconds <= 0:
+        return
+    fit = int(config.OCR_BATCH_TARGET_SECONDS / (seconds / pages))
+    batch_state["size"] = max(1, min(config.OCR_BATCH_SIZE, fit))
+
+
+def _split_batch(
+    batch: list[tuple[Image.Image | types.Part, dict]],
+) -> tuple[list, list[dict]]:
+    """묶음에서 이미지로 묶어 보낼 페이지(중복, 텍스트 페이지 제외)의 이미지와 통계를 고른다."""
+    pending = [
+        (i, s) for i, s in batch
+        if "duplicate_of" not in s and not pdf_text.is_text_page(i)
+    ]
+    return [i for i, _ in pending], [s for _, s in pending]
+
+
+def _is_single(image: Image.Image | types.Part, stats: dict) -> bool:
+    """묶음 요청에 넣지 않고 _ocr_task로 따로 처리할 페이지(텍스트, 머리글만 읽는 중복)인지."""
+    return _header_only(stats) or pdf_text.is_text_page(image)
+
+
+def _single_tasks(
+    batch: list[tuple[Image.Image | types.Part, dict]],
+) -> list[tuple[Image.Image | types.Part, dict]]:
+    """묶음에서 따로 처리할 페이지 작업을 고른다 (텍스트 페이지, 머리글만 읽는 중복 페이지)."""
+    return [(i, s) for i, s in batch if _is_single(i, s)]
+
+
+def _merge_batch(
+    batch: list[tuple[Image.Image | types.Part, dict]], results: Sequence[dict],
+    text_results: Sequence[dict | None] = (),
+) -> list[dict | None]:
+    """묶음 결과와 따로 처리한 페이지 결과를 페이지 순서로 펼친다 (바이트까지 같은 중복 자리는 None)."""
+    found = iter(results)
+    texts = iter(text_results)
+    return [
+        next(texts) if _is_single(i, s)
+        else None if "duplicate_of" in s
+        else next(found)
+        for i, s in batch
+    ]
+
+
+def _batch_task(
+    batch: list[tuple[Image.Image | types.Part, dict]], batch_state: dict,
+    cancel: threading.Event | None = None,
+) -> list[dict | None]:
+    """페이지 묶음 하나를 한 번의 호출로 OCR한다 (작업자 스레드에서 실행).
+
+    config.OCR_TWO_TIER면 ocr_header.extract_two_tier_batch(페이지별 머리글 호출과
+    본문 묶음 호출)를 쓴다. 일시적 오류는 묶음 단위로 ocr_retry.call_with_retry로
+    다시 시도한다. 텍스트 페이지와 머리글만 읽는 중복 페이지는 묶음 요청에 넣지 않고 페이지마다
+    _ocr_task로 처리한다.
+    """
+    images, stats_list = _split_batch(batch)
+    started = time.monotonic()
+    extract = (
+        ocr_header.extract_two_tier_batch if config.OCR_TWO_TIER
+        else ocr_batch.extract_text_from_batch
+    )
+    results = ocr_retry.call_with_retry(
+        extract, images, stats_list, stats_list=stats_list, cancel=cancel,
+    ) if images else []
+    _adapt_batch_size(batch_state, time.monotonic() - started, len(images))
+    text_results = [_ocr_task(task, cancel) for task in _single_tasks(batch)]
+    return _merge_batch(batch, results, text_results)
+
+
+async def _batch_task_async(
+    batch: list[tuple[Image.Image | types.Part, dict]], batch_state: dict,
+    cancel: threading.Event | None = None,
+) -> list[dict | None]:
+    """_batch_task의 asyncio 버전 (공용 이벤트 루프에서 실행)."""
+    images, stats_list = _split_batch(batch)
+    started = time.monotonic()
+    extract = (
+        ocr_header.extract_two_tier_batch_async if config.OCR_TWO_TIER
+        else ocr_batch.extract_text_from_batch_async
+    )
+    results = await ocr_retry.call_with_retry_async(
+        extract, images, stats_list, stats_list=stats_list, cancel=cancel,
+    ) if images else []
+    _adapt_batch_size(batch_state, time.monotonic() - started, len(images))
+    text_results = await asyncio.gather(*(
+        _ocr_task_async(task, cancel) for task in _single_tasks(batch)
+    ))
+    return _merge_batch(batch, results, text_results)
+
+
+def _run_batches(
+    run: Callable,
+    task: Callable,
+    tasks: Iterable[tuple[Image.Image | types.Part, dict]],
+    max_workers: int | None,
+    on_done: Callable[[int, Any], None],
+    cancel: threading.Event | None = None,
+) -> tuple[list[dict | None], dict[int, Exception]]:
+    """페이지 작업을 묶음 단위로 실행하고 결과와 실패를 페이지 단위로 펼친다.
+
+    on_done은 묶음이 끝날 때 그 묶음의 페이지마다 (페이지 인덱스, 페이지 결과)로
+    호출한다. 실패한 묶음의 페이지 결과는 None이다.
+    """
+    batch_state = {"size": config.OCR_BATCH_SIZE}
+    batch_pages: list[list[int]] = []
+
+    def _on_batch_done(batch_index: int, result: list[dict | None] | None) -> None:
+        for position, index in enumerate(batch_pages[batch_index]):
+            on_done(index, None if result is None else result[position])
+
+    batch_results, batch_failures = run(
+        functools.partial(task, batch_state=batch_state, cancel=cancel),
+        _iter_batches(tasks, batch_state, batch_pages),
+        max_workers,
+        on_done=_on_batch_done,
+        cancel=cancel,
+    )
+    results: list[dict | None] = []
+    failures: dict[int, Exception] = {}
+    for batch_index, pages in enumerate(batch_pages):
+        if batch_index in batch_failures:
+            failures.update(dict.fromkeys(pages, batch_failures[batch_index]))
+            results.extend([None] * len(pages))
+        else:
+            results.extend(batch_results[batch_index])
+    return results, failures
+
+
+def _run_pages(
+    tasks: Iterable[tuple[Image.Image | types.Part, dict]],
+    max_workers: int | None,
+    on_done: Callable[[int, Any], None],
+    cancel: threading.Event | None = None,
+) -> tuple[list[dict | None], dict[int, Exception]]:
+    """페이지 작업을 설정에 맞는 실행 방식으로 OCR한다.
+
+    config.OCR_ASYNC면 공용 이벤트 루프의 코루틴으로, 아니면 작업자 스레드로
+    실행하고, config.OCR_BATCH_SIZE가 1보다 크면 페이지를 묶음 단위로 보낸다
+    (2단 OCR이면 본문만 묶고 머리글은 페이지마다 보냄).
+    """
+    if config.OCR_BATCH_SIZE > 1:
+        if config.OCR_ASYNC:
+            run, task = ocr_engine.run_ordered_async, _batch_task_async
+        else:
+            run, task = ocr_engine.run_ordered, _batch_task
+        return _run_batches(run, task, tasks, max_workers, on_done, cancel)
+    if config.OCR_ASYNC:
+        run, task = ocr_engine.run_ordered_async, _ocr_task_async
+    else:
+        run, task = ocr_engine.run_ordered, _ocr_task
+    return run(
+        functools.partial(task, cancel=cancel), tasks, max_workers,
+        on_done=on_done, cancel=cancel,
+    )
+
+
+def _finished_file(
+    indices: list[int],
+    page_results: dict[int, dict | None],
+    page_stats: list[dict],
+    isolate: bool,
+) -> list[dict] | None:
+    """파일 하나의 페이지가 모두 끝났으면 페이지 순서대로의 결과를, 아니면 None을 반환한다.
+
+    중복 페이지는 원본 페이지가 끝나야 결과가 정해지고, 머리글만 읽은 중복 페이지는
+    원본 결과에 자기 학번/이름을 덮어쓴다. 실패한 페이지(결과 None)는 isolate면 빈
+    결과로 채우고, 아니면 작업이 예외로 끝나므로 None을 반환한다.
+    """
+    pages: list[dict] = []
+    for index in indices:
+        source = page_stats[index].get("duplicate_of", index)
+        if source not in page_results:
+            return None
+        result = page_results[source]
+        header = page_results[index] if _header_only(page_stats[index]) else {}
+        if result is None or header is None:
+            if not isolate:
+                return None
+            result, header = ocr.BLANK_PAGE_RESULT, {}
+        pages.append({**result, **header})
+    return pages
+
+
+def _file_notifier(
+    files_data: list[tuple[str, bytes]],
+    page_counts: list[int],
+    owners: list[int],
+    page_stats: list[dict],
+    on_file_done: Callable[[int, str, list[dict]], None],
+    isolate: bool,
+) -> Callable[[int, dict | None], None]:
+    """페이지 결과를 받아 페이지가 모두 끝난 파일을 on_file_done으로 통지하는 함수를 만든다.
+
+    중복 원본을 기다리는 등 아직 결과가 정해지지 않은 파일(_finished_file)은 다음
+    페이지가 끝날 때 다시 확인한다. 페이지가 없는 파일은 여기서 바로 통지한다.
+    """
+    page_results: dict[int, dict | None] = {}
+    file_indices: list[list[int]] = [[] for _ in files_data]
+    # 페이지가 모두 끝났지만 아직 통지하지 않은 파일 (중복 원본 대기 등)
+    waiting: set[int] = set()
+    for file_index, count in enumerate(page_counts):
+        if count == 0:
+            on_file_done(file_index, files_data[file_index][0], [])
+
+    def _notify(index: int, result: dict | None) -> None:
+        page_results[index] = result
+        file_index = owners[index]
+        file_indices[file_index].append(index)
+        if len(file_indices[file_index]) == page_counts[file_index]:
+            waiting.add(file_index)
+        for candidate in sorted(waiting):
+            pages = _finished_file(
+                sorted(file_indices[candidate]), page_results, page_stats, isolate,
+            )
+            if pages is not None:
+                waiting.discard(candidate)
+                on_file_done(candidate, files_data[candidate][0], pages)
+
+    return _notify
+
+
+def _progress_callback(
+    total: int,
+    page_stats: list[dict],
+    on_progress: Callable[[int, int], None] | None,
+    on_skip: Callable[[int], None] | None,
+    notify: Callable[[int, dict | None], None] | None,
+) -> Callable[[int, dict | None], None]:
+    """페이지 완료 콜백(ocr_engine의 on_done)을 만든다.
+
+    빈 페이지면 on_skip(누적 수)을, 이어서 on_progress(완료 수, total)와
+    notify(_file_notifier)를 부른다.
+    """
+    done_count = 0
+    skipped_count = 0
+
+    def _on_done(index: int, result: dict | None) -> None:
+        nonlocal done_count, skipped_count
+        done_count += 1
+        if page_stats[index].get("blank"):
+            skipped_count += 1
+            if on_skip is not None:
+                on_skip(skipped_count)
+        if on_progress is not None:
+            on_progress(done_count, total)
+        if notify is not None:
+            notify(index, result)
+
+    return _on_done
+
+
+def _run_job(
+    tasks: Iterable[tuple[Image.Image | types.Part, dict]],
+    max_workers: int | None,
+    on_done: Callable[[int, Any], None],
+    cancel: threading.Event | None,
+) -> tuple[list[dict | None], dict[int, Exception]]:
+    """작업 하나의 페이지를 하나의 업로드 범위(ocr_uploads.upload_job)에서 OCR한다.
+
+    예외(Streamlit 중지, 호출자 콜백의 예외 포함)로 끝나면 cancel을 설정하여
+    작업자가 남은 재시도를 이어 가지 않게 한다.
+    """
+    with ocr_uploads.upload_job():
+        try:
+            return _run_pages(ocr_engine.prefetch(tasks), max_workers, on_done, cancel)
+        except BaseException:
+            if cancel is not None:
+                cancel.set()
+            raise
+
+
+def _settle_results(
+    files_data: list[tuple[str, bytes]],
+    owners: list[int],
+    raster_report: list[dict],
+    page_stats: list[dict],
+    results: list[dict | None],
+    failures: dict[int, Exception],
+    failed_pages: list[dict] | None,
+) -> list[dict]:
+    """끝난 작업의 결과를 정리하고 페이지 리포트(ocr_pages.build_page_report)를 반환한다.
+
+    중복 페이지에 원본 결과를 복사한다. failed_pages가 있으면 실패한 페이지만 빈
+    결과로 채우고 오류를 페이지 통계("ocr_error")에 남겨 {"file", "page", "error"}로
+    모으며(나머지 페이지는 그대로), 없으면 실패한 페이지 중 가장 앞 페이지의 예외를 올린다.
+    """
+    ocr_pages.copy_duplicates(results, failures, page_stats)
+    if failed_pages is not None:
+        for index, exc in failures.items():
+            results[index] = dict(ocr.BLANK_PAGE_RESULT)
+            page_stats[index]["ocr_error"] = f"{type(exc).__name__}: {exc}"
+    report = ocr_pages.build_page_report(files_data, owners, raster_report, page_stats)
+    if failed_pages is not None:
+        failed_pages.extend(
+            {"file": entry["file"], "page": entry["page"], "error": entry["ocr_error"]}
+            for entry in report if "ocr_error" in entry
+        )
+    elif failures:
+        raise failures[min(failures)]
+    return report
+
+
+def ocr_files(
+    files_data: list[tuple[str, bytes]],
+    on_progress: Callable[[int, int], None] | None = None,
+    max_workers: int | None = None,
+    page_report: list[dict] | None = None,
+    on_skip: Callable[[int], None] | None = None,
+    failed_pages: list[dict] | None = None,
+    on_file_done: Callable[[int, str, list[dict]], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[tuple[str, list[dict]]]:
+    """여러 파일을 페이지 단위 공유 작업 큐로 OCR하고 파일별로 다시 묶는다.
+
+    페이지는 ocr_pages.iter_page_tasks가 만들어 제한된 큐로 넘기고(_run_job), 호출자
+    스레드는 진행률 갱신과 파일 완료 통지만 한다(_progress_callback, _file_notifier).
+    결과 정리(중복 페이지, 실패 페이지 격리)는 _settle_results가 한다.
+
+    Args:
+        files_data: (파일명, 바이트) 튜플 리스트.
+        on_progress: 페이지 OCR 완료 시마다 호출되는 콜백(완료_페이지_수, 전체_페이지_수).
+        max_workers: 최대 동시 OCR 호출(묶음) 수. None이면 config 기본값.
+        page_report: 주어지면 페이지별 처리 정보 dict를 처리 순서대로 추가한다.
+        on_skip: 빈 페이지가 끝날 때마다 호출되는 콜백(누적_건너뛴_페이지_수).
+        failed_pages: 주어지면 실패한 페이지를 예외 대신 {"file", "page", "error"}로 추가한다.
+        on_file_done: 파일 하나의 페이지가 모두 끝날 때마다 호출자 스레드에서 호출되는
+            콜백(파일_인덱스, 파일명, [페이지별_dict, ...]).
+        cancel: 작업 취소 토큰(threading.Event).
+
+    Returns:
+        (파일명, [페이지별_dict, ...]) 튜플 리스트 (입력 파일 순서, 페이지 순서 유지).
+
+    Raises:
+        ValueError: 지원하지 않는 파일 형식이 포함된 경우.
+        CancelledError: cancel이 설정되어 작업이 중단된 경우.
+        Exception: failed_pages 없이 OCR에 실패한 페이지가 있으면 가장 앞 페이지의 예외.
+    """
+    page_counts = [file_handler.count_pages(name, data) for name, data in files_data]
+    owners: list[int] = []
+    raster_report: list[dict] = []
+    page_stats: list[dict] = []
+    total = sum(page_counts)
+    if on_progress is not None:
+        on_progress(0, total)
+    notify = None if on_file_done is None else _file_notifier(
+        files_data, page_counts, owners, page_stats, on_file_done,
+        failed_pages is not None,
+    )
+    on_done = _progress_callback(total, page_stats, on_progress, on_skip, notify)
+    tasks = ocr_pages.iter_page_tasks(files_data, page_counts, owners, page_stats, raster_report)
+    results, failures = _run_job(tasks, max_workers, on_done, cancel)
+    report = _settle_results(
+        files_data, owners, raster_report, page_stats, results, failures, failed_pages,
+    )
+    if page_report is not None:
+        page_report.extend(report)
+    return ocr_pages.group_by_file(files_data, owners, results)
@@ -0,0 +1,176 @@
+"""OCR 페이지 이미지 Files API 업로드 재사용 모듈.
+
+고해상도 스캔은 호출마다 이미지 바이트를 인라인으로 다시 보내는 시간이 호출
+시간의 대부분을 차지한다. 재시도, 다른 모델로의 대체, 묶음 폴백, 2단 OCR의
+본문 호출처럼 같은 페이지를 여러 번 보낼 때 페이지를 Gemini Files API로 한
+번만 올리고 URI로 참조한다. 업로드는 작업(upload_job) 안에서만 하며, 파일은
+그 파일을 쓴 작업이 모두 끝나면 삭제한다 (업로드 데이터 영구 저장 금지).
+작업이 끝난 뒤에도 돌던 작업자(취소나 제한 시간 뒤 ocr_engine이 기다리지 않은
+스레드)가 마친 업로드는 등록하지 않고 바로 삭제한다.
+호출이 어느 작업에 속하는지는 ContextVar로 전달하므로, 동시에 도는 다른
+작업(다른 사용자 세션)의 파일 수명에는 영향을 주지 않는다.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import io
+import itertools
+import logging
+import threading
+from collections.abc import Iterator
+from concurrent.futures import CancelledError
+from contextlib import contextmanager
+
+from google.genai import types
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+# 페이지 바이트 SHA-256 -> {"name", "uri", "mime_type", "jobs": 이 파일을 쓴 진행 중 작업 id}
+_files: dict[str, dict] = {}
+_job_ids = itertools.count(1)
+# 진행 중인(upload_job 범위가 끝나지 않은) 작업 id
+_live_jobs: set[int] = set()
+_lock = threading.Lock()
+
+# 현재 호출이 속한 업로드 작업 id. 작업자 스레드와 asyncio 작업은 작업을 연
+# 호출자의 컨텍스트를 물려받는다 (ocr_engine).
+_current_job: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "ocr_upload_job", default=None
+)
+
+
+def active() -> bool:
+    """현재 컨텍스트가 업로드 작업 안에 있는지 여부."""
+    return _current_job.get() is not None
+
+
+def _delete(names: list[str]) -> None:
+    """업로드한 파일을 삭제한다. 실패는 경고만 남긴다 (파일은 Files API 보관 기간 뒤 만료)."""
+    if not names:
+        return
+    client = config.get_genai_client()
+    for name in names:
+        try:
+            client.files.delete(name=name)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("업로드 파일 삭제 실패 %s: %s", name, exc)
+
+
+@contextmanager
+def upload_job() -> Iterator[None]:
+    """OCR 작업 하나의 업로드 범위.
+
+    범위 안에서(범위를 연 컨텍스트와 그 컨텍스트를 물려받은 작업자에서)
+    ocr.generate_ocr가 올린(또는 재사용한) 파일은 범위가 끝날 때, 그 파일을
+    함께 쓴 다른 진행 중 작업이 없으면 삭제한다.
+    """
+    job = next(_job_ids)
+    with _lock:
+        _live_jobs.add(job)
+    token = _current_job.set(job)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+        expired: list[str] = []
+        with _lock:
+            _live_jobs.discard(job)
+            for key, entry in list(_files.items()):
+                entry["jobs"].discard(job)
+                if not entry["jobs"]:
+                    expired.append(entry["name"])
+                    del _files[key]
+        _delete(expired)
+
+
+def _upload(data: bytes, mime_type: str) -> types.File:
+    return config.get_genai_client().files.upload(
+        file=io.BytesIO(data), config=types.UploadFileConfig(mime_type=mime_type),
+    )
+
+
+def file_part(part: types.Part) -> tuple[types.Part, str]:
+    """인라인 이미지 Part를 업로드한 파일을 가리키는 Part와 파일 이름으로 바꾼다.
+
+    같은 바이트를 이미 올렸으면 다시 올리지 않고 그 파일을 쓴다. 두 작업자가
+    같은 페이지를 동시에 올렸으면 먼저 등록된 파일을 쓰고 나중 것은 지운다.
+    파일은 현재 컨텍스트의 업로드 작업에만 귀속되며, 업로드하는 사이 그 작업이
+    끝났으면 올린 파일을 등록하지 않고 바로 지운다.
+
+    Raises:
+        RuntimeError: 업로드 작업(upload_job) 밖에서 호출한 경우.
+        CancelledError: 현재 컨텍스트의 업로드 작업이 이미 끝난 경우.
+        Exception: 업로드 실패 (호출자의 재시도 대상).
+    """
+    job = _current_job.get()
+    if job is None:
+        raise RuntimeError("file_part는 upload_job 범위 안에서만 호출할 수 있습니다")
+    data = part.inline_data.data
+    mime_type = part.inline_data.mime_type
+    key = hashlib.sha256(data).hexdigest()
+    with _lock:
+        if job not in _live_jobs:
+            raise CancelledError("업로드 작업이 이미 끝났습니다")
+        entry = _files.get(key)
+        if entry is not None:
+            entry["jobs"].add(job)
+    if entry is None:
+        uploaded = _upload(data, mime_type)
+        extra: list[str] = []
+        with _lock:
+            live = job in _live_jobs
+            entry = _files.get(key)
+            if not live:
+                extra.append(uploaded.name)
+            elif entry is None:
+                entry = _files[key] = {
+                    "name": uploaded.name, "uri": uploaded.uri,
+                    "mime_type": uploaded.mime_type or mime_type,
+                    "jobs": {job},
+                }
+            else:
+                entry["jobs"].add(job)
+                extra.append(uploaded.name)
+        _delete(extra)
+        if not live:
+            raise CancelledError("업로드 작업이 이미 끝났습니다")
+    return (
+        types.Part.from_uri(file_uri=entry["uri"], mime_type=entry["mime_type"]),
+        entry["name"],
+    )
+
+
+def upload_contents(contents: list, stats_list: list[dict]) -> list:
+    """contents의 인라인 이미지 Part를 업로드한 파일 Part로 바꾼 새 리스트를 반환한다.
+
+    이미지 Part 수가 stats_list와 같으면(단일/묶음 OCR) 페이지마다, 아니면 모든
+    통계에 파일 이름을 "upload_file"로 기록한다.
+    """
+    replaced: list = []
+    names: list[str] = []
+    for item in contents:
+        if (
+            isinstance(item, types.Part) and item.inline_data is not None
+            and (item.inline_data.mime_type or "").startswith("image/")
+        ):
+            item, name = file_part(item)
+            names.append(name)
+        replaced.append(item)
+    if not names:
+        return replaced
+    if len(names) == len(stats_list):
+        for stats, name in zip(stats_list, names):
+            stats["upload_file"] = name
+    else:
+        for stats in stats_list:
+            stats["upload_file"] = ", ".join(names)
+    return replaced
+
+
+def uploaded_count() -> int:
+    """현재 등록된(삭제되지 않은) 업로드 파일 수."""
+    return len(_files)
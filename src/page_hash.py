@@ -0,0 +1,137 @@
+"""페이지 지각 해시(perceptual hash) 모듈.
+
+같은 스캔을 두 번 올리거나(ZIP과 개별 파일) 같은 페이지를 다시 스캔한 경우를
+찾기 위해 페이지마다 NumPy로 pHash(저주파 DCT 계수의 중앙값 대비 부호) 또는
+dHash(인접 픽셀 밝기 차이의 부호)를 계산하고, 해밍 거리로 작업 전체에서
+가장 가까운 이전 페이지를 찾는다.
+ocr_scheduler의 페이지 생성 스레드에서 OCR 제출 전에 실행된다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+
+import numpy as np
+from google.genai import types
+from PIL import Image
+
+from src import config
+
+# pHash: 해시 크기의 몇 배로 줄인 이미지에서 DCT를 계산할지
+_PHASH_OVERSAMPLE = 4
+
+
+def _open_gray(image: Image.Image | types.Part, size: int) -> Image.Image:
+    """페이지를 흑백 PIL Image로 연다.
+
+    이미지 Part의 JPEG는 draft 모드로 size의 4배 이상인 축소본만 디코딩한다.
+    """
+    if isinstance(image, types.Part):
+        image = Image.open(io.BytesIO(image.inline_data.data))
+        image.draft("L", (size * 4, size * 4))
+    return image.convert("L")
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """n점 DCT-II 기저 행렬 (정규화 없음, 부호 비교에는 충분)."""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * x + 1) * k / (2 * n))
+
+
+def phash(image: Image.Image | types.Part, hash_size: int | None = None) -> int:
+    """페이지의 pHash를 정수로 반환한다.
+
+    (hash_size * 4)² 흑백 이미지의 2차원 DCT를 행렬 곱으로 구하고, 왼쪽 위
+    hash_size x hash_size 저주파 계수(DC 제외)가 중앙값보다 큰지를 비트로 만든다
+    (hash_size² - 1 비트). 밝기 변화, 재압축, 약간의 기울어짐에 dHash보다 강하다.
+
+    Args:
+        image: 페이지 PIL Image 또는 이미지 Part.
+        hash_size: 한 변의 비트 수. None이면 config.DEDUP_HASH_SIZE.
+
+    Returns:
+        hash_size² - 1 비트 정수 해시.
+    """
+    size = hash_size or config.DEDUP_HASH_SIZE
+    n = size * _PHASH_OVERSAMPLE
+    gray = _open_gray(image, n).resize((n, n), Image.Resampling.BOX)
+    basis = _dct_matrix(n)
+    coefficients = basis @ np.asarray(gray, dtype=np.float64) @ basis.T
+    low = coefficients[:size, :size].ravel()[1:]
+    bits = low > np.median(low)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def dhash(image: Image.Image | types.Part, hash_size: int | None = None) -> int:
+    """페이지의 dHash를 정수로 반환한다.
+
+    (hash_size + 1) x hash_size로 줄인 흑백 이미지에서 각 행의 왼쪽 픽셀보다
+    오른쪽 픽셀이 밝은지를 비트로 만든다 (hash_size² 비트). pHash보다 빠르지만
+    여백처럼 평평한 영역의 비트가 밝기 변화에 쉽게 뒤집힌다.
+
+    Args:
+        image: 페이지 PIL Image 또는 이미지 Part.
+        hash_size: 한 변의 비트 수. None이면 config.DEDUP_HASH_SIZE.
+
+    Returns:
+        hash_size² 비트 정수 해시.
+    """
+    size = hash_size or config.DEDUP_HASH_SIZE
+    gray = _open_gray(image, size).resize(
+        (size + 1, size), Image.Resampling.BOX
+    )
+    pixels = np.asarray(gray, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def page_hash(image: Image.Image | types.Part) -> int:
+    """config.DEDUP_METHOD("phash"/"dhash")에 따라 페이지 해시를 계산한다.
+
+    Raises:
+        ValueError: 지원하지 않는 해시 방식인 경우.
+    """
+    if config.DEDUP_METHOD == "phash":
+        return phash(image)
+    if config.DEDUP_METHOD == "dhash":
+        return dhash(image)
+    raise ValueError(f"지원하지 않는 해시 방식입니다: {config.DEDUP_METHOD}")
+
+
+def content_digest(image: Image.Image | types.Part) -> bytes:
+    """페이지 내용의 BLAKE2b 요약을 반환한다 (바이트 단위로 같은 페이지 판정용).
+
+    이미지 Part는 인코딩된 바이트를, PIL Image는 모드/크기와 픽셀 바이트를 요약한다.
+    지각 해시와 달리 픽셀 하나만 달라도 요약이 달라진다.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(image, types.Part):
+        digest.update(image.inline_data.data)
+    else:
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+    return digest.digest()
+
+
+def hamming(a: int, b: int) -> int:
+    """두 해시 사이의 해밍 거리(다른 비트 수)를 반환한다."""
+    return (a ^ b).bit_count()
+
+
+def nearest(hashes: list[int], value: int) -> tuple[int, int] | None:
+    """hashes 중 value와 해밍 거리가 가장 가까운 항목을 찾는다.
+
+    Args:
+        hashes: 이전 페이지들의 해시 (처리 순서).
+        value: 새 페이지의 해시.
+
+    Returns:
+        (인덱스, 거리) 튜플. 거리가 같으면 앞선 페이지. hashes가 비어 있으면 None.
+    """
+    if not hashes:
+        return None
+    distances = [hamming(value, h) for h in hashes]
+    index = min(range(len(distances)), key=distances.__getitem__)
+    return index, distances[index]
@@ -0,0 +1,379 @@
+"""PDF 내장 스캔 이미지 추출 모듈.
+
+스캐너로 만든 PDF는 보통 페이지마다 JPEG 한 장을 페이지 전체에 깔아 둔다.
+이런 페이지는 poppler로 다시 래스터화하지 않고, pdfimages로 내장 JPEG 바이트를
+디코딩/재인코딩 없이 그대로 꺼내 업로드용 이미지 Part로 쓴다. 페이지에 이미지가
+여러 장이거나, JPEG가 아니거나, 페이지를 덮지 않거나, 회전되었거나, 글자나
+다른 그리기가 함께 있는 페이지는 기존 래스터화 경로(raster_pool)로 처리한다. 페이지에 글자나 선 같은 벡터
+그리기가 있는지(drawn_pages)도 여기서 판정한다 (pdf_text가 함께 사용).
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import math
+import re
+import subprocess
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+from google.genai import types
+from PIL import Image
+
+from src import config
+from src import file_handler
+from src import raster_pool
+
+logger = logging.getLogger(__name__)
+
+# pdfimages 한 번(목록 또는 구간 추출)의 제한 시간(초). 넘으면 래스터화 경로로 돌아간다.
+_PDFIMAGES_TIMEOUT_SECONDS = 60
+
+# 이미지가 페이지 너비/높이를 이 비율 이상 덮어야 전체 페이지 스캔으로 본다.
+_FULL_PAGE_COVERAGE = 0.9
+
+# pdftocairo -svg 한 번(연속 페이지 구간)의 제한 시간(초). 넘으면 그리기가 있는 페이지로 본다.
+_PDFTOCAIRO_TIMEOUT_SECONDS = 60
+
+# 여러 페이지를 한 파일로 쓴 pdftocairo -svg 출력(SVG 1.2 <pageSet>)의 페이지 요소
+_SVG_PAGE = re.compile(r"<page\b.*?</page>", re.S)
+
+# pdftocairo -svg 출력에서 글꼴 글리프 정의(<defs>)를 뺀 뒤 찾는 도형/이미지 요소.
+# 글자는 <defs>의 글리프를 <use>로 참조하므로 여기에 걸리지 않는다.
+_SVG_DEFS = re.compile(r"<defs>.*?</defs>", re.S)
+_SVG_SHAPE = re.compile(
+    r"<(?:path|rect|line|polyline|polygon|circle|ellipse|image)\b[^>]*>", re.S
+)
+# 흰색으로 채우고 선이 없는 도형(페이지 배경 등)은 종이에 보이지 않으므로 그리기가 아니다.
+_SVG_WHITE_FILL = re.compile(
+    r"fill(?::\s*|=\")(?:rgb\(100%,\s*100%,\s*100%\)|#fff(?:fff)?\b|white\b)", re.I
+)
+_SVG_STROKE = re.compile(r"stroke(?::\s*|=\")(?!none)", re.I)
+# 이미지 패턴으로 채운 도형 (cairo가 이미지를 그리는 방식 중 하나)
+_SVG_PATTERN_FILL = re.compile(r"fill(?::\s*|=\")url\(", re.I)
+
+# pdfimages -j -p 출력 파일 이름: <접두어>-<페이지>-<번호>.jpg
+_OUTPUT_NAME = re.compile(r"^page-(\d+)-(\d+)\.jpg$")
+
+
+def list_images(pdf_bytes: bytes) -> dict[int, list[dict]]:
+    """pdfimages -list로 PDF 페이지별 이미지 목록을 디코딩 없이 읽는다.
+
+    pdfimages가 없거나 실패하면 경고를 남기고 빈 dict를 반환하므로, 호출자는
+    모든 페이지를 래스터화 경로로 처리한다.
+
+    Returns:
+        페이지 번호(1부터) -> 이미지 dict 리스트. 이미지 dict는
+        {"type", "width", "height", "color", "bpc", "enc", "x_ppi", "y_ppi"}.
+    """
+    with tempfile.TemporaryDirectory(dir=raster_pool.tmpfs_dir()) as tmp_dir:
+        path = Path(tmp_dir) / "input.pdf"
+        path.write_bytes(pdf_bytes)
+        try:
+            completed = subprocess.run(
+                ["pdfimages", "-list", str(path)],
+                capture_output=True,
+                check=True,
+                timeout=_PDFIMAGES_TIMEOUT_SECONDS,
+            )
+        except (OSError, subprocess.SubprocessError) as exc:
+            logger.warning("pdfimages로 이미지 목록을 읽지 못했습니다: %s", exc)
+            return {}
+    return _parse_list(completed.stdout.decode("utf-8", errors="replace"))
+
+
+def page_layout(
+    pdf_bytes: bytes, page_count: int,
+) -> tuple[dict[int, list[dict]], list[tuple[float, float] | None], list[int]]:
+    """페이지별 이미지 목록(list_images)과 페이지 크기/회전(pdf_page_geometry)을 함께 읽는다.
+
+    ocr_pages가 문서마다 한 번 구해 pdf_text.text_pages와 scan_pages에 함께 넘기므로
+    같은 문서에 pdfimages와 pdfinfo를 두 번씩 부르지 않는다. 이미지가 없는 문서는
+    pdfinfo를 부르지 않는다 (크기 None, 회전 0).
+
+    Returns:
+        (페이지 번호 -> 이미지 dict 리스트, 크기 리스트, 회전 리스트) 튜플.
+    """
+    images = list_images(pdf_bytes)
+    if not images:
+        return images, [None] * page_count, [0] * page_count
+    sizes, rotations = file_handler.pdf_page_geometry(pdf_bytes, page_count)
+    return images, sizes, rotations
+
+
+def _parse_list(output: str) -> dict[int, list[dict]]:
+    """pdfimages -list 출력(머리글 두 줄 뒤 이미지마다 한 줄)을 페이지별로 묶는다."""
+    images: dict[int, list[dict]] = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) < 14 or not fields[0].isdigit():
+            continue
+        try:
+            image = {
+                "type": fields[2], "width": int(fields[3]),
+                "height": int(fields[4]), "color": fields[5],
+                "bpc": int(fields[7]), "enc": fields[8],
+                "x_ppi": float(fields[12]), "y_ppi": float(fields[13]),
+            }
+        except ValueError:
+            continue
+        images.setdefault(int(fields[0]), []).append(image)
+    return images
+
+
+def is_full_page_jpeg(
+    images: list[dict], size: tuple[float, float] | None, rotation: int = 0,
+) -> bool:
+    """페이지가 전체 페이지를 덮는 JPEG 한 장으로만 이루어졌는지 판정한다.
+
+    이미지가 정확히 하나(마스크 없음)이고, 8비트 흑백/RGB JPEG(DCT)이며,
+    페이지를 덮어야 한다(covers_page). 회전된 페이지(/Rotate)는 래스터화해야 방향이 맞으므로
+    제외한다.
+    """
+    if len(images) != 1 or rotation % 360:
+        return False
+    image = images[0]
+    return (
+        image["enc"] == "jpeg" and image["bpc"] == 8
+        and image["color"] in ("gray", "rgb") and covers_page(image, size)
+    )
+
+
+def covers_page(image: dict, size: tuple[float, float] | None) -> bool:
+    """이미지(마스크 제외)의 배치된 크기(픽셀 / ppi)가 페이지 너비와 높이를
+    _FULL_PAGE_COVERAGE 이상, 그 역수 이하로 덮는지 판정한다."""
+    if (
+        size is None or image["type"] != "image"
+        or image["x_ppi"] <= 0 or image["y_ppi"] <= 0
+    ):
+        return False
+    placed = (
+        image["width"] / image["x_ppi"] * 72, image["height"] / image["y_ppi"] * 72,
+    )
+    return all(
+        _FULL_PAGE_COVERAGE <= extent / page <= 1 / _FULL_PAGE_COVERAGE
+        for extent, page in zip(placed, size)
+        if page > 0
+    )
+
+
+def has_drawing(svg: str, images: bool = True) -> bool:
+    """pdftocairo -svg로 만든 페이지에 글자 외의 보이는 그리기(선, 채운 도형, 이미지)가
+    있는지 판정한다. 흰색으로 채우고 선이 없는 도형(배경)은 무시한다.
+
+    images가 False면 이미지(<image>, 이미지 패턴으로 채운 도형)는 그리기로 보지
+    않는다 (스캔 페이지의 스캔 이미지 자체).
+    """
+    for tag in _SVG_SHAPE.findall(_SVG_DEFS.sub("", svg)):
+        stroked = _SVG_STROKE.search(tag) is not None
+        if not images and not stroked and (
+            tag.startswith("<image") or _SVG_PATTERN_FILL.search(tag)
+        ):
+            continue
+        if stroked or not _SVG_WHITE_FILL.search(tag):
+            return True
+    return False
+
+
+def _svg_pages(svg: str, count: int) -> list[str] | None:
+    """pdftocairo -svg가 count페이지 구간을 한 파일로 쓴 SVG를 페이지별로 나눈다.
+
+    여러 페이지면 <pageSet> 안에 페이지마다 <page> 요소가 하나씩 있고, 한 페이지면
+    문서 전체가 그 페이지다. 글리프 정의(<defs>)는 페이지 밖에 함께 있어도
+    has_drawing이 빼고 보므로 페이지에 붙이지 않는다. 페이지 수가 맞지 않으면 None.
+    """
+    if count == 1:
+        return [svg]
+    pages = _SVG_PAGE.findall(svg)
+    return pages if len(pages) == count else None
+
+
+def drawn_pages(
+    pdf_bytes: bytes, pages: list[int], images: bool = True,
+) -> set[int]:
+    """pages 중 글자 외의 그리기(태블릿 필기, 밑줄, 표 선, 이미지 등)가 있는 페이지를 고른다.
+
+    연속 페이지를 config.PDF_CHUNK_PAGES개씩 pdftocairo -svg 한 번으로 꺼내
+    (_runs, _svg_pages) 페이지마다 has_drawing(svg, images)으로 판정한다 (래스터화
+    없음). pdftocairo가 없거나 실패하면 경고를 남기고 남은 페이지를 모두 그리기가 있는
+    페이지로 본다 (호출자는 이미지 경로로 처리한다). 출력을 페이지로 나누지 못한
+    구간도 그리기가 있는 페이지로 본다.
+    """
+    drawn: set[int] = set()
+    pages = sorted(pages)
+    if not pages:
+        return drawn
+    with tempfile.TemporaryDirectory(dir=raster_pool.tmpfs_dir()) as tmp_dir:
+        root = Path(tmp_dir)
+        path = root / "input.pdf"
+        path.write_bytes(pdf_bytes)
+        for first, last in _runs(pages, max(1, config.PDF_CHUNK_PAGES)):
+            output = root / f"pages-{first}.svg"
+            try:
+                subprocess.run(
+                    [
+                        "pdftocairo", "-svg", "-f", str(first), "-l", str(last),
+                        str(path), str(output),
+                    ],
+                    capture_output=True,
+                    check=True,
+                    timeout=_PDFTOCAIRO_TIMEOUT_SECONDS,
+                )
+                svg = output.read_text(encoding="utf-8", errors="replace")
+            except (OSError, subprocess.SubprocessError) as exc:
+                logger.warning("pdftocairo로 페이지 내용을 읽지 못했습니다: %s", exc)
+                return drawn | {page for page in pages if page >= first}
+            svgs = _svg_pages(svg, last - first + 1)
+            if svgs is None:
+                logger.warning("pdftocairo 출력을 페이지로 나누지 못했습니다: %d-%d", first, last)
+                drawn.update(range(first, last + 1))
+                continue
+            drawn.update(
+                page for page, page_svg in zip(range(first, last + 1), svgs)
+                if has_drawing(page_svg, images)
+            )
+    return drawn
+
+
+def scan_pages(
+    pdf_bytes: bytes,
+    page_count: int,
+    texts: list[str],
+    skip: set[int] | frozenset[int] = frozenset(),
+    layout: tuple | None = None,
+) -> dict[int, dict]:
+    """내장 JPEG를 그대로 쓸 수 있는 페이지와 그 이미지 정보를 고른다.
+
+    페이지가 전체 페이지 JPEG 한 장(is_full_page_jpeg)이어도 글자(pdftotext
+    텍스트)나 이미지 외의 그리기(주석, 도장 등)가 있으면 JPEG에 그 내용이 없으므로
+    고르지 않는다 (래스터화 경로). config.PDF_IMAGES_ENABLED가 꺼져 있거나 후보
+    페이지가 없으면 pdfimages를 부르지 않는다.
+
+    Args:
+        pdf_bytes: PDF 파일의 바이트 데이터.
+        page_count: 페이지 수 (file_handler.count_pages로 미리 구한 값).
+        texts: 페이지별 pdftotext 텍스트 (pdf_text.extract_page_texts).
+        skip: 고르지 않을 페이지 번호(1부터) 집합 (예: 텍스트 레이어 페이지).
+        layout: page_layout으로 미리 구한 (이미지 목록, 크기, 회전). 없으면 필요할 때
+            pdfimages와 pdfinfo를 부른다.
+
+    Returns:
+        페이지 번호(1부터) -> list_images의 이미지 dict.
+    """
+    candidates = [
+        page for page in range(1, page_count + 1)
+        if page not in skip and not texts[page - 1]
+    ]
+    if not config.PDF_IMAGES_ENABLED or not candidates:
+        return {}
+    images = list_images(pdf_bytes) if layout is None else layout[0]
+    if not any(page in images for page in candidates):
+        return {}
+    sizes, rotations = (
+        file_handler.pdf_page_geometry(pdf_bytes, page_count)
+        if layout is None else layout[1:]
+    )
+    scans = {
+        page: images[page][0]
+        for page in candidates
+        if is_full_page_jpeg(
+            images.get(page, []), sizes[page - 1], rotations[page - 1]
+        )
+    }
+    drawn = drawn_pages(pdf_bytes, sorted(scans), images=False)
+    return {page: image for page, image in scans.items() if page not in drawn}
+
+
+def extract_jpegs(pdf_bytes: bytes, first_page: int, last_page: int) -> dict[int, bytes]:
+    """pdfimages -j로 [first_page, last_page] 구간의 내장 JPEG 바이트를 그대로 꺼낸다.
+
+    -j는 DCT 이미지를 디코딩하지 않고 스트림 그대로 .jpg로 쓰고, -p는 파일
+    이름에 페이지 번호를 넣는다. 출력은 tmpfs의 비공개 임시 디렉터리에 쓰고
+    읽은 직후 디렉터리째 삭제한다.
+
+    Returns:
+        페이지 번호 -> JPEG 바이트 (페이지의 첫 이미지). 실패하면 빈 dict.
+    """
+    with tempfile.TemporaryDirectory(dir=raster_pool.tmpfs_dir()) as tmp_dir:
+        root = Path(tmp_dir)
+        path = root / "input.pdf"
+        path.write_bytes(pdf_bytes)
+        try:
+            subprocess.run(
+                [
+                    "pdfimages", "-j", "-p",
+                    "-f", str(first_page), "-l", str(last_page),
+                    str(path), str(root / "page"),
+                ],
+                capture_output=True,
+                check=True,
+                timeout=_PDFIMAGES_TIMEOUT_SECONDS,
+            )
+        except (OSError, subprocess.SubprocessError) as exc:
+            logger.warning("pdfimages로 스캔 이미지를 꺼내지 못했습니다: %s", exc)
+            return {}
+        jpegs: dict[int, bytes] = {}
+        for output in sorted(root.iterdir()):
+            match = _OUTPUT_NAME.match(output.name)
+            if match:
+                jpegs.setdefault(int(match.group(1)), output.read_bytes())
+        return jpegs
+
+
+def page_image(data: bytes, image: dict) -> Image.Image | types.Part:
+    """꺼낸 JPEG를 OCR 페이지로 만든다.
+
+    업로드 설정(config.UPLOAD_MAX_EDGE, config.UPLOAD_GRAYSCALE)에 이미 맞는
+    JPEG는 바이트 그대로 image/jpeg Part로 감싸 재인코딩 없이 업로드한다.
+    긴 변이 상한보다 크거나 흑백 업로드인데 컬러인 JPEG는 draft 모드로
+    필요한 크기/흑백으로만 디코딩한 PIL Image를 돌려주어 업로드 인코딩을 거친다.
+    """
+    long_edge = max(image["width"], image["height"])
+    max_edge = config.UPLOAD_MAX_EDGE
+    fits = max_edge <= 0 or long_edge <= max_edge
+    if fits and (image["color"] == "gray" or not config.UPLOAD_GRAYSCALE):
+        return types.Part.from_bytes(data=data, mime_type="image/jpeg")
+    decoded = Image.open(io.BytesIO(data))
+    scale = 1.0 if fits else max_edge / long_edge
+    decoded.draft(
+        "L" if config.UPLOAD_GRAYSCALE else decoded.mode,
+        (math.ceil(decoded.width * scale), math.ceil(decoded.height * scale)),
+    )
+    decoded.load()
+    return decoded
+
+
+def _runs(pages: list[int], chunk_size: int) -> Iterator[tuple[int, int]]:
+    """정렬된 페이지 번호를 chunk_size 이하의 연속 구간 (시작, 끝)으로 나눈다."""
+    start = previous = None
+    for page in pages:
+        if start is not None and page == previous + 1 and page - start < chunk_size:
+            previous = page
+            continue
+        if start is not None:
+            yield start, previous
+        start = previous = page
+    if start is not None:
+        yield start, previous
+
+
+def iter_scan_pages(
+    pdf_bytes: bytes, scans: dict[int, dict], chunk_size: int | None = None,
+) -> Iterator[Image.Image | types.Part]:
+    """scan_pages가 고른 페이지를 페이지 순서대로 구간 단위로 꺼내며 생성한다.
+
+    연속 페이지를 chunk_size(기본 config.PDF_CHUNK_PAGES)개씩 pdfimages 한 번으로
+    꺼내므로 메모리에는 한 구간의 JPEG만 올라간다. 꺼내지 못한 페이지는 경고를
+    남기고 그 페이지만 raster_pool.render_window로 래스터화한다.
+    """
+    step = max(1, chunk_size or config.PDF_CHUNK_PAGES)
+    for first, last in _runs(sorted(scans), step):
+        jpegs = extract_jpegs(pdf_bytes, first, last)
+        for page in range(first, last + 1):
+            if page in jpegs:
+                yield page_image(jpegs[page], scans[page])
+            else:
+                logger.warning("%d페이지 스캔 이미지가 없어 래스터화합니다", page)
+                yield from raster_pool.render_window(pdf_bytes, page, page)
@@ -0,0 +1,266 @@
+"""OCR 업로드 전처리 모듈.
+
+페이지 이미지를 Gemini에 보내기 전에 업로드용으로 준비한다.
+NumPy 히스토그램으로 빈 페이지를 판정하고(모델 호출 생략용),
+NumPy 행/열 투영으로 잉크가 있는 영역만 남기고(여백 자르기), 긴 변 상한,
+흑백 변환, 출력 형식(JPEG/WebP/PNG)과 품질을 config로 정해 인코딩한다.
+OCR 작업자 스레드 안에서 실행된다(ocr.extract_text_from_image에서 호출).
+"""
+
+from __future__ import annotations
+
+import io
+import math
+
+import numpy as np
+from google.genai import types
+from PIL import Image, ImageOps
+
+from src import config
+
+_FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+    "png": ("PNG", "image/png"),
+}
+
+# EXIF Orientation 태그 번호 (1이면 정방향)
+_EXIF_ORIENTATION = 0x0112
+
+# 잉크 영역 분석용 축소 이미지의 긴 변 (분석만 축소본에서 하고 자르기는 원본에 적용)
+_ANALYSIS_EDGE = 1024
+
+
+def sdk_default_encoding(image: Image.Image) -> tuple[bytes, str]:
+    """전처리 없이 SDK에 PIL Image를 넘겼을 때 전송되는 바이트와 MIME 형식.
+
+    google-genai는 파일에서 연 JPEG만 원본 품질 JPEG로, 나머지(바이트에서 연
+    JPEG 포함)는 PNG로 인코딩한다.
+    """
+    buffer = io.BytesIO()
+    if image.format == "JPEG" and getattr(image, "filename", ""):
+        image.save(buffer, "JPEG", quality="keep")
+        return buffer.getvalue(), "image/jpeg"
+    image.save(buffer, "PNG")
+    return buffer.getvalue(), "image/png"
+
+
+def sdk_default_size(image: Image.Image) -> int:
+    """전처리 없이 SDK에 PIL Image를 넘겼을 때 전송되는 바이트 수를 계산한다."""
+    return len(sdk_default_encoding(image)[0])
+
+
+def fit_long_edge(image: Image.Image, max_edge: int) -> Image.Image:
+    """긴 변이 max_edge를 넘으면 비율을 유지하여 줄인다 (0 이하면 그대로)."""
+    if max_edge <= 0 or max(image.size) <= max_edge:
+        return image
+    scale = max_edge / max(image.size)
+    size = (
+        max(1, round(image.width * scale)), max(1, round(image.height * scale))
+    )
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
+def open_image(data: bytes) -> Image.Image:
+    """업로드한 이미지 파일 바이트를 OCR 페이지 이미지로 연다.
+
+    config.JPEG_DRAFT_ENABLED이고 JPEG면 Image.draft로 디코더가 DCT 단계에서
+    1/2, 1/4, 1/8로 줄여(긴 변이 config.UPLOAD_MAX_EDGE 이상으로 남는 가장 작은
+    배율) 디코딩하고, config.UPLOAD_GRAYSCALE이면 밝기 채널만 디코딩한다.
+    휴대폰 사진의 EXIF 방향(Orientation)은 줄여 디코딩한 이미지에 적용한다.
+
+    Args:
+        data: png/jpg/jpeg 파일의 바이트 데이터.
+
+    Returns:
+        방향을 바로잡은 PIL Image. 정방향이면 디코딩은 처음 접근할 때 일어난다.
+    """
+    image = Image.open(io.BytesIO(data))
+    if config.JPEG_DRAFT_ENABLED and image.format == "JPEG":
+        max_edge = config.UPLOAD_MAX_EDGE
+        long_edge = max(image.size)
+        scale = 1.0 if max_edge <= 0 or long_edge <= max_edge else max_edge / long_edge
+        image.draft(
+            "L" if config.UPLOAD_GRAYSCALE else image.mode,
+            (math.ceil(image.width * scale), math.ceil(image.height * scale)),
+        )
+    if image.getexif().get(_EXIF_ORIENTATION, 1) != 1:
+        image = ImageOps.exif_transpose(image)
+    return image
+
+
+def ink_density(gray: np.ndarray) -> float:
+    """흑백 배열의 밝기 히스토그램에서 잉크(config.BLANK_THRESHOLD 미만) 비율을 구한다."""
+    if gray.size == 0:
+        return 0.0
+    histogram = np.bincount(gray.ravel(), minlength=256)
+    return float(histogram[:config.BLANK_THRESHOLD].sum() / gray.size)
+
+
+def is_blank(image: Image.Image | types.Part, stats: dict | None = None) -> bool:
+    """잉크 비율이 config.BLANK_MAX_INK 미만인 빈(또는 거의 빈) 페이지인지 판정한다.
+
+    가는 연필 획이 흐려지지 않도록 축소하지 않은 원본 해상도에서 계산한다.
+    이미 인코딩된 이미지 Part는 디코딩하여 판정하되, JPEG는 draft 모드로 휘도
+    성분만 디코딩한다 (색 성분 디코딩과 흑백 변환 생략).
+
+    Args:
+        image: 페이지 PIL Image 또는 이미지 Part.
+        stats: 주어지면 "ink_density"를, 빈 페이지면 "blank": True를 기록한다.
+
+    Returns:
+        빈 페이지면 True.
+    """
+    if isinstance(image, types.Part):
+        image = Image.open(io.BytesIO(image.inline_data.data))
+        image.draft("L", image.size)
+    density = ink_density(np.asarray(image.convert("L")))
+    blank = density < config.BLANK_MAX_INK
+    if stats is not None:
+        stats["ink_density"] = round(density, 5)
+        if blank:
+            stats["blank"] = True
+    return blank
+
+
+def ink_bbox(gray: np.ndarray) -> tuple[int, int, int, int] | None:
+    """흑백 배열에서 잉크가 있는 영역의 (left, top, right, bottom)을 찾는다.
+
+    밝기가 config.AUTOCROP_THRESHOLD 미만인 픽셀을 잉크로 보고,
+    잉크 비율이 config.AUTOCROP_LINE_RATIO 이상인 행/열(인쇄 테두리, 스캔
+    가장자리 그림자)은 먼저 지운다. 남은 잉크의 행/열 투영에서 비율이
+    config.AUTOCROP_MIN_INK 이상인 첫/마지막 행과 열이 경계가 된다.
+
+    Returns:
+        right/bottom은 배타적 경계. 잉크가 없으면 None.
+    """
+    ink = gray < config.AUTOCROP_THRESHOLD
+    ink &= (ink.mean(axis=0) < config.AUTOCROP_LINE_RATIO)[np.newaxis, :]
+    ink &= (ink.mean(axis=1) < config.AUTOCROP_LINE_RATIO)[:, np.newaxis]
+    rows = np.flatnonzero(ink.mean(axis=1) >= config.AUTOCROP_MIN_INK)
+    cols = np.flatnonzero(ink.mean(axis=0) >= config.AUTOCROP_MIN_INK)
+    if rows.size == 0 or cols.size == 0:
+        return None
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def crop_margins(image: Image.Image, stats: dict | None = None) -> Image.Image:
+    """빈 여백과 인쇄 테두리를 잘라 잉크가 있는 영역만 남긴다.
+
+    분석은 긴 변 _ANALYSIS_EDGE 이하로 축소한 흑백 사본에서 하고, 찾은
+    경계를 원본 좌표로 되돌려 config.AUTOCROP_PADDING만큼 여유를 둔 뒤 자른다.
+    잉크가 없는 페이지는 그대로 반환한다.
+
+    Args:
+        image: 페이지 PIL Image.
+        stats: 주어지면 남은 면적 비율("crop_area")을 기록한다.
+
+    Returns:
+        잘라낸 PIL Image (자를 것이 없으면 원본).
+    """
+    factor = max(1, -(-max(image.size) // _ANALYSIS_EDGE))
+    small = image.convert("L").reduce(factor)
+    box = ink_bbox(np.asarray(small))
+    if box is None:
+        return image
+    pad = config.AUTOCROP_PADDING
+    left, top, right, bottom = box
+    crop = (
+        max(0, left * factor - pad),
+        max(0, top * factor - pad),
+        min(image.width, right * factor + pad),
+        min(image.height, bottom * factor + pad),
+    )
+    if stats is not None:
+        kept = (crop[2] - crop[0]) * (crop[3] - crop[1])
+        stats["crop_area"] = round(kept / (image.width * image.height), 3)
+    if crop == (0, 0, image.width, image.height):
+        return image
+    return image.crop(crop)
+
+
+def crop_header(
+    image: Image.Image | types.Part, fraction: float
+) -> Image.Image:
+    """페이지 위쪽 fraction 비율(학번/이름 머리글 영역)만 잘라 반환한다.
+
+    이미 인코딩된 이미지 Part는 디코딩하여 자른다. fraction은 0과 1 사이로
+    제한하며 최소 한 줄은 남긴다.
+    """
+    if isinstance(image, types.Part):
+        image = Image.open(io.BytesIO(image.inline_data.data))
+    fraction = min(1.0, max(0.0, fraction))
+    height = max(1, round(image.height * fraction))
+    return image.crop((0, 0, image.width, height))
+
+
+def _to_upload_mode(image: Image.Image, pil_format: str) -> Image.Image:
+    """흑백 설정과 출력 형식에 맞는 색상 모드로 변환한다."""
+    if config.UPLOAD_GRAYSCALE:
+        return image if image.mode == "L" else image.convert("L")
+    if pil_format == "JPEG" and image.mode not in ("L", "RGB"):
+        return image.convert("RGB")
+    if image.mode not in ("L", "RGB", "RGBA"):
+        return image.convert("RGBA" if "A" in image.mode else "RGB")
+    return image
+
+
+def _save(image: Image.Image, pil_format: str) -> bytes:
+    """업로드 형식으로 저장한 바이트 (PNG는 optimize, 나머지는 config.UPLOAD_QUALITY)."""
+    buffer = io.BytesIO()
+    if pil_format == "PNG":
+        image.save(buffer, pil_format, optimize=True)
+    else:
+        image.save(buffer, pil_format, quality=config.UPLOAD_QUALITY)
+    return buffer.getvalue()
+
+
+def encode_for_upload(
+    image: Image.Image | types.Part, stats: dict | None = None
+) -> types.Part:
+    """페이지 이미지를 업로드용 이미지 Part로 인코딩한다.
+
+    config.AUTOCROP_ENABLED이면 먼저 crop_margins로 여백을 자른다.
+    긴 변을 config.UPLOAD_MAX_EDGE로 제한하고, config.UPLOAD_GRAYSCALE이면
+    흑백으로 바꾼 뒤 config.UPLOAD_FORMAT(jpeg/webp/png) 형식,
+    config.UPLOAD_QUALITY 품질로 저장한다. 이미 인코딩된 Part
+    (raster_pool.render_jpeg_window 결과)는 그대로 반환한다.
+
+    Args:
+        image: PIL Image 또는 이미 인코딩된 이미지 Part.
+        stats: 주어지면 "upload_bytes"(전송 바이트), 여백을 자른 경우
+            "crop_area"(남은 면적 비율)를 기록하고,
+            config.UPLOAD_MEASURE_SAVINGS이면 "baseline_bytes"(SDK 기본 인코딩
+            바이트)와 "bytes_saved"도 기록한다. 측정만 하며 전송 바이트는 바꾸지
+            않으므로, 깨끗한 페이지처럼 SDK 기본 인코딩이 더 작으면 절감 바이트는
+            음수다.
+
+    Returns:
+        업로드할 이미지 바이트를 담은 types.Part.
+
+    Raises:
+        ValueError: config.UPLOAD_FORMAT이 지원하지 않는 형식인 경우.
+    """
+    if isinstance(image, types.Part):
+        if stats is not None and image.inline_data is not None:
+            stats["upload_bytes"] = len(image.inline_data.data or b"")
+        return image
+    if config.UPLOAD_FORMAT not in _FORMATS:
+        raise ValueError(
+            f"지원하지 않는 업로드 형식입니다: {config.UPLOAD_FORMAT}"
+        )
+    pil_format, mime_type = _FORMATS[config.UPLOAD_FORMAT]
+
+    prepared = crop_margins(image, stats) if config.AUTOCROP_ENABLED else image
+    prepared = _to_upload_mode(
+        fit_long_edge(prepared, config.UPLOAD_MAX_EDGE), pil_format
+    )
+    data = _save(prepared, pil_format)
+
+    if stats is not None:
+        if config.UPLOAD_MEASURE_SAVINGS:
+            baseline, _ = sdk_default_encoding(image)
+            stats["baseline_bytes"] = len(baseline)
+            stats["bytes_saved"] = len(baseline) - len(data)
+        stats["upload_bytes"] = len(data)
+    return types.Part.from_bytes(data=data, mime_type=mime_type)
@@ -0,0 +1,367 @@
+"""다중 코어 PDF 래스터화 모듈.
+
+여러 PDF의 페이지 구간을 프로세스 풀에 나누어 변환하고(문서 간 병렬),
+각 구간은 pdf2image의 thread_count로 여러 poppler 프로세스에 나누어 변환한다
+(문서 내 병렬). 결과는 문서 순서, 페이지 순서대로 생성한다.
+출력은 PIL Image 또는 poppler가 직접 만든 흑백 JPEG(업로드용 Part) 중 선택한다.
+해상도는 페이지 크기와 픽셀 예산(config.RASTER_PIXEL_BUDGET)으로 페이지마다 정한다.
+PDF는 문서마다 tmpfs에 한 번 써 두고 작업자에는 경로만 넘기며, 프로세스 풀은
+프로세스 전체에서 하나를 재사용한다.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from google.genai import types
+from pdf2image import convert_from_bytes, convert_from_path
+from PIL import Image
+
+from src import config
+from src import file_handler
+
+_TMPFS_DIR = "/dev/shm"
+_DEFAULT_DPI = 200  # pdf2image 기본값
+_POINTS_PER_INCH = 72
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _convert(pdf: bytes | str, **kwargs) -> list:
+    """pdf가 파일 경로면 convert_from_path, PDF 바이트면 convert_from_bytes로 변환한다."""
+    if isinstance(pdf, str):
+        return convert_from_path(pdf, **kwargs)
+    return convert_from_bytes(pdf, **kwargs)
+
+
+def render_window(
+    pdf: bytes | str,
+    first_page: int,
+    last_page: int,
+    thread_count: int = 1,
+    dpi: int | None = None,
+) -> list[Image.Image]:
+    """PDF의 [first_page, last_page] 구간을 PIL Image 리스트로 변환한다.
+
+    프로세스 풀 작업자에서 실행되므로 모듈 최상위 함수로 둔다(pickle 가능).
+    pdf는 PDF 바이트 또는 파일 경로(iter_pdf_pages가 문서마다 한 번 써 둔 임시 파일).
+    dpi가 None이면 pdf2image 기본 해상도(200dpi)를 사용한다.
+    """
+    return _convert(
+        pdf,
+        first_page=first_page,
+        last_page=last_page,
+        thread_count=thread_count,
+        dpi=dpi or _DEFAULT_DPI,
+    )
+
+
+def tmpfs_dir() -> str | None:
+    """메모리 기반 임시 디렉터리 위치(/dev/shm)를 반환한다. 없으면 None(시스템 기본)."""
+    if os.path.isdir(_TMPFS_DIR) and os.access(_TMPFS_DIR, os.W_OK):
+        return _TMPFS_DIR
+    return None
+
+
+def render_jpeg_window(
+    pdf: bytes | str,
+    first_page: int,
+    last_page: int,
+    thread_count: int = 1,
+    dpi: int | None = None,
+) -> list[types.Part]:
+    """PDF 구간을 poppler가 직접 만든 흑백 JPEG로 변환하여 업로드용 Part로 반환한다.
+
+    pdftocairo에 JPEG/흑백/해상도를 지정하고, 결과 파일은 tmpfs의
+    비공개(0700) 임시 디렉터리에 쓴 뒤 바이트만 읽고 즉시 삭제한다.
+    PPM 디코드 → PIL → 업로드용 재인코딩 과정이 없다. dpi가 None이면
+    DPI 대신 긴 변 크기(-scale-to, config.RASTER_JPEG_LONG_EDGE)로 정한다.
+    pdf는 render_window처럼 PDF 바이트 또는 파일 경로다.
+    """
+    with tempfile.TemporaryDirectory(dir=tmpfs_dir()) as tmp_dir:
+        paths = _convert(
+            pdf,
+            first_page=first_page,
+            last_page=last_page,
+            thread_count=thread_count,
+            dpi=dpi or _DEFAULT_DPI,
+            fmt="jpeg",
+            jpegopt={"quality": config.RASTER_JPEG_QUALITY, "optimize": True},
+            grayscale=True,
+            size=None if dpi else config.RASTER_JPEG_LONG_EDGE,
+            use_pdftocairo=True,
+            output_folder=tmp_dir,
+            paths_only=True,
+        )
+        return [
+            types.Part.from_bytes(
+                data=Path(path).read_bytes(), mime_type="image/jpeg"
+            )
+            for path in paths
+        ]
+
+
+def plan_windows(
+    page_counts: list[int], chunk_size: int
+) -> list[tuple[int, int, int]]:
+    """문서별 페이지 수로부터 (문서_인덱스, 시작_페이지, 끝_페이지) 구간 목록을 만든다."""
+    step = max(1, chunk_size)
+    windows: list[tuple[int, int, int]] = []
+    for doc_index, count in enumerate(page_counts):
+        for first in range(1, count + 1, step):
+            windows.append((doc_index, first, min(first + step - 1, count)))
+    return windows
+
+
+def choose_dpi(width_pt: float, height_pt: float) -> int:
+    """페이지 픽셀 수가 config.RASTER_PIXEL_BUDGET을 넘지 않는 최대 DPI를 고른다.
+
+    픽셀 수 = (너비/72 x DPI) x (높이/72 x DPI)이므로
+    DPI = 72 x sqrt(예산 / (너비 x 높이))이며, 결과는
+    [config.RASTER_MIN_DPI, config.RASTER_MAX_DPI] 범위로 자른다.
+    """
+    area = width_pt * height_pt
+    if area <= 0:
+        return config.RASTER_MAX_DPI
+    dpi = int(_POINTS_PER_INCH * math.sqrt(config.RASTER_PIXEL_BUDGET / area))
+    return max(config.RASTER_MIN_DPI, min(config.RASTER_MAX_DPI, dpi))
+
+
+def plan_page_dpis(
+    docs: list[tuple[bytes, int]], report: list[dict] | None = None
+) -> list[list[int | None]]:
+    """문서별로 각 페이지의 변환 DPI를 정하고, 선택 결과를 report에 기록한다.
+
+    config.RASTER_PIXEL_BUDGET이 0 이하이거나 크기를 읽지 못한 페이지는
+    None(기본 해상도)이다. report 항목은
+    {"doc", "page", "width_pt", "height_pt", "dpi", "pixels"} dict다.
+    """
+    return [
+        _page_dpis(doc_index, pdf_bytes, count, report)
+        for doc_index, (pdf_bytes, count) in enumerate(docs)
+    ]
+
+
+def _page_dpis(
+    doc_index: int, pdf_bytes: bytes, count: int, report: list[dict] | None,
+) -> list[int | None]:
+    """문서 하나의 페이지별 DPI (plan_page_dpis 참고). 예산이 꺼져 있으면 pdfinfo를 부르지 않는다."""
+    if config.RASTER_PIXEL_BUDGET <= 0:
+        return [None] * count
+    dpis: list[int | None] = []
+    sizes = file_handler.pdf_page_sizes(pdf_bytes, count)
+    for page, size in enumerate(sizes, start=1):
+        dpi = choose_dpi(*size) if size else None
+        dpis.append(dpi)
+        if report is not None and size:
+            width, height = size
+            report.append({
+                "doc": doc_index, "page": page,
+                "width_pt": width, "height_pt": height, "dpi": dpi,
+                "pixels": round(width / _POINTS_PER_INCH * dpi)
+                * round(height / _POINTS_PER_INCH * dpi),
+            })
+    return dpis
+
+
+def split_by_dpi(
+    windows: list[tuple[int, int, int]], page_dpis: list[list[int | None]]
+) -> list[tuple[int, int, int, int | None]]:
+    """구간을 DPI가 같은 연속 페이지 단위로 나누어 (문서, 시작, 끝, DPI)로 만든다.
+
+    pdftoppm은 호출당 하나의 해상도만 받으므로, 크기가 다른 페이지가 섞인
+    구간은 DPI가 바뀌는 지점에서 나눈다.
+    """
+    split: list[tuple[int, int, int, int | None]] = []
+    for doc_index, first, last in windows:
+        dpis = page_dpis[doc_index]
+        start = first
+        for page in range(first + 1, last + 2):
+            if page > last or dpis[page - 1] != dpis[start - 1]:
+                split.append((doc_index, start, page - 1, dpis[start - 1]))
+                start = page
+    return split
+
+
+def drop_pages(
+    windows: list[tuple[int, int, int, int | None]],
+    skip: list[set[int]] | dict[int, set[int]],
+) -> list[tuple[int, int, int, int | None]]:
+    """구간에서 변환하지 않을 페이지(문서별 1부터의 번호 집합)를 빼고 남은 연속 구간으로 나눈다.
+
+    텍스트 레이어로 읽는 페이지(pdf_text)는 래스터화하지 않는다.
+    """
+    kept: list[tuple[int, int, int, int | None]] = []
+    for doc_index, first, last, dpi in windows:
+        pages = skip[doc_index]
+        start = None
+        for page in range(first, last + 2):
+            if page <= last and page not in pages:
+                start = page if start is None else start
+            elif start is not None:
+                kept.append((doc_index, start, page - 1, dpi))
+                start = None
+    return kept
+
+
+def default_processes() -> int:
+    """코어 수와 구간당 poppler 스레드 수로부터 기본 프로세스 수를 계산한다."""
+    if config.RASTER_PROCESSES > 0:
+        return config.RASTER_PROCESSES
+    cores = os.cpu_count() or 1
+    return max(1, cores // max(1, config.RASTER_THREAD_COUNT))
+
+
+def new_executor(processes: int | None = None) -> ProcessPoolExecutor:
+    """래스터화용 프로세스 풀을 만든다.
+
+    Streamlit 프로세스는 여러 스레드를 사용하므로 fork 대신 spawn으로 시작한다.
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes or default_processes(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shared_executor(processes: int | None = None) -> ProcessPoolExecutor:
+    """프로세스 공용 래스터화 풀을 반환한다.
+
+    최초 호출 시 new_executor로 lazy 생성하고 이후 호출은 같은 풀을 재사용하므로,
+    OCR 요청마다 spawn 작업자(인터프리터 기동과 import)를 새로 띄우지 않는다.
+    작업자 수가 바뀌면 이전 풀을 닫고 새로 만든다.
+    """
+    global _executor, _executor_workers  # noqa: PLW0603
+    workers = processes or default_processes()
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor, _executor_workers = new_executor(workers), workers
+        return _executor
+
+
+def _discard_shared(pool: Executor | None) -> None:
+    """깨진(BrokenProcessPool) 공용 풀을 버려 다음 shared_executor 호출이 새로 만들게 한다."""
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if pool is not None and pool is _executor:
+            _executor = None
+
+
+def _doc_windows(
+    docs: list[tuple[bytes, int]],
+    chunk_size: int | None,
+    skip: Callable[[int], set[int]] | None,
+    report: list[dict] | None,
+) -> Iterator[tuple[int, int, int, int | None]]:
+    """iter_pdf_pages의 변환 구간을 문서 순서대로 계획하며 내보낸다.
+
+    문서마다 그 문서의 첫 구간이 필요해질 때 skip 집합을 구하고, 남은 페이지가 있으면
+    그때 페이지별 DPI(pdfinfo)를 정한다. 앞 문서의 변환이 뒤 문서들의 pdfinfo를
+    기다리지 않는다. report가 주어지면 내보내는 구간 페이지의 DPI 선택 결과를 추가한다.
+    """
+    step = chunk_size or config.PDF_CHUNK_PAGES
+    for doc_index, (pdf_bytes, count) in enumerate(docs):
+        skipped = skip(doc_index) if skip is not None and count > 0 else set()
+        if all(page in skipped for page in range(1, count + 1)):
+            continue
+        planned: list[dict] | None = [] if report is not None else None
+        windows = split_by_dpi(
+            plan_windows([count], step), [_page_dpis(doc_index, pdf_bytes, count, planned)]
+        )
+        for _, first, last, dpi in drop_pages(windows, [skipped]):
+            if report is not None:
+                report.extend(entry for entry in planned if first <= entry["page"] <= last)
+            yield doc_index, first, last, dpi
+
+
+def _pdf_path(tmp_dir: str, paths: dict[int, str], doc_index: int, pdf_bytes: bytes) -> str:
+    """문서의 PDF를 tmp_dir에 한 번만 써 두고 그 경로를 반환한다."""
+    if doc_index not in paths:
+        path = Path(tmp_dir) / f"doc-{doc_index}.pdf"
+        path.write_bytes(pdf_bytes)
+        paths[doc_index] = str(path)
+    return paths[doc_index]
+
+
+def _finished(
+    pending: deque[tuple[int, Future]], paths: dict[int, str], current: int | None,
+) -> list[Image.Image | types.Part]:
+    """가장 앞 구간의 변환 결과를 기다려 반환한다.
+
+    구간이 더 남지 않은 문서(제출 중인 current 문서가 아니고 대기 중인 구간도 없음)의
+    임시 PDF는 바로 지운다.
+    """
+    pages = pending.popleft()[1].result()
+    busy = {doc for doc, _ in pending}
+    for done in [doc for doc in paths if doc != current and doc not in busy]:
+        Path(paths.pop(done)).unlink(missing_ok=True)
+    return pages
+
+
+def iter_pdf_pages(
+    docs: list[tuple[bytes, int]],
+    processes: int | None = None,
+    chunk_size: int | None = None,
+    executor: Executor | None = None,
+    report: list[dict] | None = None,
+    skip: Callable[[int], set[int]] | None = None,
+) -> Iterator[Image.Image | types.Part]:
+    """여러 PDF를 구간 단위로 병렬 변환하며 페이지를 문서/페이지 순서대로 생성한다.
+
+    작업자 수만큼의 구간을 미리 제출하고 앞 구간부터 결과를 내보내므로,
+    한 문서의 마지막 구간을 기다리는 동안 다음 문서의 구간이 다른 코어에서
+    변환된다. 미리 변환되는 페이지 수는 (작업자 수 x 구간 크기)로 제한된다.
+    PDF는 문서마다 tmpfs에 한 번 써 두고 작업자에는 경로만 넘기며(구간마다 바이트를
+    pickle하지 않음) 그 문서를 다 내보내면 지운다. DPI는 문서마다 그 차례에 정한다.
+
+    Args:
+        docs: (PDF 바이트, 페이지 수) 튜플 리스트.
+        processes: 작업자 수. None이면 default_processes().
+        chunk_size: 구간 크기(페이지). None이면 config.PDF_CHUNK_PAGES.
+        executor: 구간 변환에 사용할 풀. None이면 shared_executor()의 공용 풀을 쓴다.
+        report: 주어지면 페이지별 DPI 선택 결과(plan_page_dpis 참고)를 추가한다.
+        skip: 주어지면 문서 인덱스 -> 변환하지 않을 페이지 번호(1부터) 집합을
+            돌려주는 함수. 문서마다 그 문서의 첫 구간을 제출하기 직전에 한 번 부르므로
+            호출자는 페이지 판정(텍스트/스캔)을 문서 단위로 미룰 수 있다. 그 페이지는
+            생성하지 않고 report에도 넣지 않는다.
+
+    Yields:
+        문서 순서, 페이지 순서대로의 페이지(skip 제외). config.RASTER_OUTPUT이 "jpeg"이면
+        흑백 JPEG 바이트를 담은 types.Part, 아니면 PIL Image.
+    """
+    workers = processes or default_processes()
+    pool = executor
+    render = render_jpeg_window if config.RASTER_OUTPUT == "jpeg" else render_window
+    pending: deque[tuple[int, Future]] = deque()
+    paths: dict[int, str] = {}
+    with tempfile.TemporaryDirectory(dir=tmpfs_dir()) as tmp_dir:
+        try:
+            for doc_index, first, last, dpi in _doc_windows(docs, chunk_size, skip, report):
+                if pool is None:
+                    # 변환할 구간이 하나도 없으면(모두 skip) 풀을 가져오지 않는다
+                    pool = shared_executor(workers)
+                path = _pdf_path(tmp_dir, paths, doc_index, docs[doc_index][0])
+                future = pool.submit(render, path, first, last, config.RASTER_THREAD_COUNT, dpi)
+                pending.append((doc_index, future))
+                if len(pending) >= workers:
+                    yield from _finished(pending, paths, doc_index)
+            while pending:
+                yield from _finished(pending, paths, None)
+        except BrokenProcessPool:
+            _discard_shared(pool)
+            raise
+        finally:
+            for _, future in pending:
+                future.cancel()
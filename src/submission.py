@@ -40,24 +40,36 @@ def merge_ocr_pages(pages: list[dict]) -> dict:
 
 def build_submissions(
     file_ocr_results: list[tuple[str, list[dict]]],
+    duplicates: list[str] | None = None,
 ) -> tuple[list[dict], list[str]]:
     """파일별 OCR 결과로부터 제출물 목록을 구성한다.
 
+    학번, 이름, 에세이텍스트가 모두 앞선 제출물과 같은 제출물(같은 스캔을
+    두 번 올린 경우)은 한 번만 채점되도록 제외한다.
+
     Args:
         file_ocr_results: (파일명, [페이지별_dict, ...]) 튜플 리스트.
+        duplicates: 주어지면 중복으로 제외된 파일명이 추가된다.
 
     Returns:
         (식별된_제출물_리스트, 미식별_파일명_리스트) 튜플.
     """
     submissions: list[dict] = []
     unidentified: list[str] = []
+    seen: set[tuple[str, str, str]] = set()
 
     for filename, pages in file_ocr_results:
         merged = merge_ocr_pages(pages)
-        if merged["학번"]:
-            submissions.append(merged)
-        else:
+        if not merged["학번"]:
             unidentified.append(filename)
+            continue
+        key = (merged["학번"], merged["이름"], merged["에세이텍스트"])
+        if key in seen:
+            if duplicates is not None:
+                duplicates.append(filename)
+            continue
+        seen.add(key)
+        submissions.append(merged)
 
     return submissions, unidentified
 
@@ -1 +1,22 @@
 """pytest 공용 fixture 모듈."""
+
+import pytest
+
+from src import ocr_cache
+from tests.genai_stub import GenaiStubServer
+
+
+@pytest.fixture(autouse=True)
+def _clear_ocr_cache():
+    """테스트마다 OCR 메모리 캐시를 비워 앞선 테스트의 결과가 재사용되지 않게 한다."""
+    ocr_cache.clear()
+    yield
+    ocr_cache.clear()
+
+
+@pytest.fixture
+def genai_stub():
+    """Gemini API 엔드포인트를 흉내 내는 로컬 대역 서버를 띄우고 테스트 뒤 내린다."""
+    server = GenaiStubServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,267 @@
+"""Gemini API 로컬 대역(stand-in) HTTP 서버.
+
+google-genai 클라이언트의 base_url을 이 서버로 돌려, 네트워크 없이 배치 작업,
+Files API, generateContent 엔드포인트를 실제 HTTP 요청/응답 형식 그대로 흉내 낸다.
+
+- POST /v1beta/models/{model}:batchGenerateContent: 인라인 요청으로 작업 생성
+- GET /v1beta/batches/{id}: 작업 상태. polls_until_done번째 조회부터 완료되고,
+  완료 시 요청마다 responder(요청, metadata)의 결과를 인라인 응답으로 돌려준다
+- POST /v1beta/batches/{id}:cancel, DELETE /v1beta/batches/{id}: 작업 취소와 삭제
+- POST /upload/v1beta/files: 재개 가능 업로드 시작(start)과 바이트 전송(upload, finalize)
+- DELETE /v1beta/files/{id}: 업로드한 파일 삭제
+- POST /v1beta/models/{model}:generateContent: content_responder(모델, 요청)의 응답
+  (error_response면 그 상태 코드). 삭제되었거나 없는 파일을 참조하면 403
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from urllib.parse import parse_qs, urlparse
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from google import genai
+from google.genai import types
+
+
+def text_response(text: str, tokens: int = 0) -> dict:
+    """generateContent 응답 하나를 담은 인라인 응답 (wire 형식)."""
+    return {"response": {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+        "usageMetadata": {"promptTokenCount": tokens},
+    }}
+
+
+def error_response(code: int, message: str) -> dict:
+    """요청 하나가 실패한 인라인 응답 (wire 형식)."""
+    return {"error": {"code": code, "message": message}}
+
+
+class GenaiStubServer:
+    """배치 작업 엔드포인트를 흉내 내는 로컬 HTTP 서버."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, dict] = {}
+        self.polls_until_done = 1
+        self.failed_jobs: set[str] = set()
+        self.cancelled_jobs: list[str] = []
+        self.deleted_jobs: list[str] = []
+        self.responder: Callable[[dict, dict], dict] = (
+            lambda request, metadata: text_response(
+                '{"학번": "", "이름": "", "에세이텍스트": ""}'
+            )
+        )
+        self.requests_log: list[tuple[str, str]] = []
+        self.files: dict[str, dict] = {}
+        self.deleted: list[str] = []
+        self.fail_deletes = False
+        self.generate_log: list[tuple[str, dict]] = []
+        self.content_responder: Callable[[str, dict], dict] = (
+            lambda model, request: text_response(
+                '{"학번": "", "이름": "", "에세이텍스트": ""}'
+            )["response"]
+        )
+        self._uploads: dict[str, dict] = {}
+        self._client: genai.Client | None = None
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def client(self) -> genai.Client:
+        """이 서버로 요청을 보내는 genai 클라이언트 (config.get_genai_client처럼 싱글턴)."""
+        if self._client is None:
+            self._client = genai.Client(
+                api_key="stub-key", http_options=types.HttpOptions(base_url=self.url)
+            )
+        return self._client
+
+    def start(self) -> GenaiStubServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _create_batch(self, model: str, body: dict) -> dict:
+        batch = body["batch"]
+        with self._lock:
+            name = f"batches/job-{len(self.jobs) + 1}"
+            self.jobs[name] = {
+                "model": model,
+                "display_name": batch.get("displayName", ""),
+                "requests": batch["inputConfig"]["requests"]["requests"],
+                "polls": 0,
+            }
+        return {"name": name, "metadata": {
+            "state": "BATCH_STATE_PENDING", "model": model,
+            "displayName": self.jobs[name]["display_name"],
+        }}
+
+    def _get_batch(self, name: str) -> dict | None:
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None or name in self.deleted_jobs:
+                return None
+            job["polls"] += 1
+            polls = job["polls"]
+        metadata = {"model": job["model"], "displayName": job["display_name"]}
+        if name in self.cancelled_jobs:
+            metadata["state"] = "BATCH_STATE_CANCELLED"
+        elif polls < self.polls_until_done:
+            metadata["state"] = "BATCH_STATE_RUNNING"
+        elif name in self.failed_jobs:
+            metadata["state"] = "BATCH_STATE_FAILED"
+            return {"name": name, "metadata": metadata,
+                    "error": {"code": 500, "message": "stub failure"}}
+        else:
+            metadata["state"] = "BATCH_STATE_SUCCEEDED"
+            responses = []
+            for item in job["requests"]:
+                response = dict(self.responder(item["request"], item.get("metadata", {})))
+                if "metadata" in item:
+                    response["metadata"] = item["metadata"]
+                responses.append(response)
+            metadata["output"] = {"inlinedResponses": {"inlinedResponses": responses}}
+        return {"name": name, "metadata": metadata}
+
+    def _end_batch(self, name: str, registry: list[str]) -> bool:
+        """작업 이름을 취소/삭제 목록(registry)에 기록한다. 없는 작업이면 False."""
+        with self._lock:
+            if name not in self.jobs or name in self.deleted_jobs:
+                return False
+            registry.append(name)
+        return True
+
+    def _start_upload(self, body: dict, mime_type: str) -> str:
+        with self._lock:
+            upload_id = str(len(self._uploads) + 1)
+            self._uploads[upload_id] = {"mime_type": mime_type}
+        return f"{self.url}/upload/v1beta/files?upload_id={upload_id}"
+
+    def _finish_upload(self, upload_id: str, data: bytes) -> dict:
+        with self._lock:
+            upload = self._uploads[upload_id]
+            name = f"files/file-{len(self.files) + len(self.deleted) + 1}"
+            self.files[name] = {"data": data, "mime_type": upload["mime_type"]}
+        return {"file": {
+            "name": name, "uri": f"{self.url}/v1beta/{name}",
+            "mimeType": upload["mime_type"], "sizeBytes": str(len(data)),
+            "state": "ACTIVE",
+        }}
+
+    def _delete_file(self, name: str) -> bool:
+        with self._lock:
+            if name not in self.files:
+                return False
+            del self.files[name]
+            self.deleted.append(name)
+        return True
+
+    def _generate(self, model: str, body: dict) -> tuple[int, dict]:
+        self.generate_log.append((model, body))
+        for content in body.get("contents", []):
+            for part in content.get("parts", []):
+                file_data = part.get("fileData", {})
+                uri = file_data.get("fileUri", file_data.get("file_uri"))
+                if uri is not None and uri.split("/v1beta/")[-1] not in self.files:
+                    return 403, {"error": {
+                        "code": 403, "message": f"File {uri} not found",
+                        "status": "PERMISSION_DENIED",
+                    }}
+        payload = self.content_responder(model, body)
+        return payload["error"]["code"] if "error" in payload else 200, payload
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def _reply(
+                self, status: int, payload: dict, headers: dict | None = None,
+            ) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:  # noqa: N802
+                url = urlparse(self.path)
+                path = url.path
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                stub.requests_log.append(("POST", path))
+                if path == "/upload/v1beta/files":
+                    command = self.headers.get("X-Goog-Upload-Command", "")
+                    if command == "start":
+                        upload_url = stub._start_upload(
+                            json.loads(raw or b"{}"),
+                            self.headers.get("X-Goog-Upload-Header-Content-Type", ""),
+                        )
+                        self._reply(200, {}, {"X-Goog-Upload-URL": upload_url})
+                        return
+                    upload_id = parse_qs(url.query)["upload_id"][0]
+                    self._reply(
+                        200, stub._finish_upload(upload_id, raw),
+                        {"X-Goog-Upload-Status": "final"},
+                    )
+                    return
+                body = json.loads(raw or b"{}")
+                if path.startswith("/v1beta/models/") and path.endswith(":batchGenerateContent"):
+                    model = path[len("/v1beta/"):-len(":batchGenerateContent")]
+                    self._reply(200, stub._create_batch(model, body))
+                    return
+                if path.startswith("/v1beta/batches/") and path.endswith(":cancel"):
+                    name = path[len("/v1beta/"):-len(":cancel")]
+                    if stub._end_batch(name, stub.cancelled_jobs):
+                        self._reply(200, {})
+                        return
+                if path.startswith("/v1beta/models/") and path.endswith(":generateContent"):
+                    model = path[len("/v1beta/models/"):-len(":generateContent")]
+                    self._reply(*stub._generate(model, body))
+                    return
+                self._reply(404, {"error": {"code": 404, "message": path}})
+
+            def do_DELETE(self) -> None:  # noqa: N802
+                path = self.path.split("?")[0]
+                stub.requests_log.append(("DELETE", path))
+                if stub.fail_deletes:
+                    self._reply(500, {"error": {"code": 500, "message": "stub failure"}})
+                    return
+                if path.startswith("/v1beta/files/") and stub._delete_file(
+                    path[len("/v1beta/"):]
+                ):
+                    self._reply(200, {})
+                    return
+                if path.startswith("/v1beta/batches/") and stub._end_batch(
+                    path[len("/v1beta/"):], stub.deleted_jobs
+                ):
+                    self._reply(200, {})
+                    return
+                self._reply(404, {"error": {"code": 404, "message": path}})
+
+            def do_GET(self) -> None:  # noqa: N802
+                path = self.path.split("?")[0]
+                stub.requests_log.append(("GET", path))
+                if path.startswith("/v1beta/batches/"):
+                    payload = stub._get_batch(path[len("/v1beta/"):])
+                    if payload is not None:
+                        self._reply(200, payload)
+                        return
+                self._reply(404, {"error": {"code": 404, "message": path}})
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return _Handler
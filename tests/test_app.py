@@ -19,14 +19,14 @@ class TestRunOcrAndIdentify:
 
     @patch("app.essay_splitter")
     @patch("app.submission")
-    @patch("app.ocr")
-    def test_returns_submissions_and_unidentified(self, mock_ocr, mock_sub, mock_splitter):
+    @patch("app.ocr_scheduler")
+    def test_returns_submissions_and_unidentified(self, mock_sched, mock_sub, mock_splitter):
         """OCR 결과를 기반으로 제출물과 미식별 파일을 반환한다."""
         from app import run_ocr_and_identify
 
-        mock_ocr.ocr_file.side_effect = [
-            [{"학번": "10301", "이름": "홍길동", "에세이텍스트": "에세이 내용"}],
-            [{"학번": "", "이름": "", "에세이텍스트": "식별불가 텍스트"}],
+        mock_sched.ocr_files.return_value = [
+            ("essay1.png", [{"학번": "10301", "이름": "홍길동", "에세이텍스트": "에세이 내용"}]),
+            ("unknown.png", [{"학번": "", "이름": "", "에세이텍스트": "식별불가 텍스트"}]),
         ]
         mock_splitter.split_essays.side_effect = lambda x: x
         expected_subs = [{"학번": "10301", "이름": "홍길동", "에세이텍스트": "에세이 내용"}]
@@ -42,21 +42,18 @@ class TestRunOcrAndIdentify:
 
         assert subs == expected_subs
         assert unid == expected_unid
-        assert mock_ocr.ocr_file.call_count == 2
         mock_sub.build_submissions.assert_called_once()
 
     @patch("app.essay_splitter")
     @patch("app.submission")
-    @patch("app.ocr")
-    def test_builds_correct_file_ocr_results_structure(self, mock_ocr, mock_sub, mock_splitter):
-        """ocr_file 결과를 (filename, [dict,...]) 형태로 essay_splitter에 전달한다."""
+    @patch("app.ocr_scheduler")
+    def test_builds_correct_file_ocr_results_structure(self, mock_sched, mock_sub, mock_splitter):
+        """스케줄러 결과를 (filename, [dict,...]) 형태로 essay_splitter에 전달한다."""
         from app import run_ocr_and_identify
 
         page1 = {"학번": "10305", "이름": "홍길동", "에세이텍스트": "페이지1"}
         page2 = {"학번": "", "이름": "", "에세이텍스트": "페이지2"}
-        mock_ocr.ocr_file.side_effect = [
-            [page1, page2],
-        ]
+        mock_sched.ocr_files.return_value = [("doc.pdf", [page1, page2])]
         mock_splitter.split_essays.side_effect = lambda x: x
         mock_sub.build_submissions.return_value = ([], [])
 
@@ -69,11 +66,12 @@ class TestRunOcrAndIdentify:
 
     @patch("app.essay_splitter")
     @patch("app.submission")
-    @patch("app.ocr")
-    def test_empty_file_list(self, mock_ocr, mock_sub, mock_splitter):
+    @patch("app.ocr_scheduler")
+    def test_empty_file_list(self, mock_sched, mock_sub, mock_splitter):
         """빈 파일 리스트 입력 시 빈 결과를 반환한다."""
         from app import run_ocr_and_identify
 
+        mock_sched.ocr_files.return_value = []
         mock_splitter.split_essays.side_effect = lambda x: x
         mock_sub.build_submissions.return_value = ([], [])
 
@@ -81,19 +79,18 @@ class TestRunOcrAndIdentify:
 
         assert subs == []
         assert unid == []
-        mock_ocr.ocr_file.assert_not_called()
 
     @patch("app.essay_splitter")
     @patch("app.submission")
-    @patch("app.ocr")
-    def test_multiple_files_ocr_called_for_each(self, mock_ocr, mock_sub, mock_splitter):
-        """여러 파일에 대해 각각 ocr_file을 호출한다."""
+    @patch("app.ocr_scheduler")
+    def test_all_files_scheduled_in_one_job(self, mock_sched, mock_sub, mock_splitter):
+        """모든 파일을 한 번의 스케줄러 호출(공유 작업 큐)로 OCR한다."""
         from app import run_ocr_and_identify
 
-        mock_ocr.ocr_file.side_effect = [
-            [{"학번": "", "이름": "", "에세이텍스트": "t1"}],
-            [{"학번": "", "이름": "", "에세이텍스트": "t2"}],
-            [{"학번": "", "이름": "", "에세이텍스트": "t3"}],
+        mock_sched.ocr_files.return_value = [
+            ("a.png", [{"학번": "", "이름": "", "에세이텍스트": "t1"}]),
+            ("b.jpg", [{"학번": "", "이름": "", "에세이텍스트": "t2"}]),
+            ("c.pdf", [{"학번": "", "이름": "", "에세이텍스트": "t3"}]),
         ]
         mock_splitter.split_essays.side_effect = lambda x: x
         mock_sub.build_submissions.return_value = ([], [])
@@ -105,19 +102,20 @@ class TestRunOcrAndIdentify:
         ]
         run_ocr_and_identify(files)
 
-        assert mock_ocr.ocr_file.call_count == 3
+        mock_sched.ocr_files.assert_called_once()
+        assert mock_sched.ocr_files.call_args[0][0] == files
         call_args_list = mock_sub.build_submissions.call_args[0][0]
         assert len(call_args_list) == 3
 
     @patch("app.submission")
     @patch("app.essay_splitter")
-    @patch("app.ocr")
-    def test_calls_essay_splitter_before_build_submissions(self, mock_ocr, mock_splitter, mock_sub):
+    @patch("app.ocr_scheduler")
+    def test_calls_essay_splitter_before_build_submissions(self, mock_sched, mock_splitter, mock_sub):
         """OCR 결과를 essay_splitter.split_essays에 전달한다."""
         from app import run_ocr_and_identify
 
         page = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "내용"}
-        mock_ocr.ocr_file.return_value = [page]
+        mock_sched.ocr_files.return_value = [("essay1.png", [page])]
         mock_splitter.split_essays.return_value = [("essay1.png", [page])]
         mock_sub.build_submissions.return_value = ([{"학번": "10301"}], [])
 
@@ -130,58 +128,289 @@ class TestRunOcrAndIdentify:
 
     @patch("app.submission")
     @patch("app.essay_splitter")
-    @patch("app.ocr")
-    def test_passes_split_results_to_build_submissions(self, mock_ocr, mock_splitter, mock_sub):
+    @patch("app.ocr_scheduler")
+    def test_passes_split_results_to_build_submissions(self, mock_sched, mock_splitter, mock_sub):
         """essay_splitter 결과가 build_submissions에 전달된다."""
         from app import run_ocr_and_identify
 
         page1 = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "내용1"}
         page2 = {"학번": "10302", "이름": "김영희", "에세이텍스트": "내용2"}
-        mock_ocr.ocr_file.return_value = [page1, page2]
+        mock_sched.ocr_files.return_value = [("scan.pdf", [page1, page2])]
         split_output = [("scan.pdf#1", [page1]), ("scan.pdf#2", [page2])]
         mock_splitter.split_essays.return_value = split_output
         mock_sub.build_submissions.return_value = ([], [])
 
         run_ocr_and_identify([("scan.pdf", b"fake")])
 
-        mock_sub.build_submissions.assert_called_once_with(split_output)
+        mock_sub.build_submissions.assert_called_once_with(split_output, duplicates=None)
 
     @patch("app.essay_splitter")
     @patch("app.submission")
-    @patch("app.ocr")
-    def test_on_progress_callback_called_per_file(self, mock_ocr, mock_sub, mock_splitter):
-        """on_progress 콜백이 파일별로 OCR 시작 전 호출된다."""
+    @patch("app.ocr_scheduler")
+    def test_on_progress_passed_to_scheduler(self, mock_sched, mock_sub, mock_splitter):
+        """on_progress 콜백을 스케줄러에 전달한다."""
         from app import run_ocr_and_identify
 
-        mock_ocr.ocr_file.side_effect = [
-            [{"학번": "10301", "이름": "홍길동", "에세이텍스트": "내용1"}],
-            [{"학번": "10302", "이름": "김영희", "에세이텍스트": "내용2"}],
-        ]
+        mock_sched.ocr_files.return_value = []
         mock_splitter.split_essays.side_effect = lambda x: x
         mock_sub.build_submissions.return_value = ([], [])
 
-        calls = []
-        run_ocr_and_identify(
-            [("a.png", b"a"), ("b.png", b"b")],
-            on_progress=lambda cur, tot: calls.append((cur, tot)),
-        )
+        def _cb(cur, tot):
+            return None
+
+        run_ocr_and_identify([("a.png", b"a")], on_progress=_cb)
+
+        assert mock_sched.ocr_files.call_args.kwargs["on_progress"] is _cb
+
+    @patch("app.submission")
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_on_skip_passed_to_scheduler(self, mock_sched, mock_sub, mock_splitter):
+        """on_skip 콜백을 스케줄러에 전달한다."""
+        from app import run_ocr_and_identify
+
+        mock_sched.ocr_files.return_value = []
+        mock_splitter.split_essays.side_effect = lambda x: x
+        mock_sub.build_submissions.return_value = ([], [])
+
+        def _cb(count):
+            return None
+
+        run_ocr_and_identify([("a.pdf", b"a")], on_skip=_cb)
+
+        assert mock_sched.ocr_files.call_args.kwargs["on_skip"] is _cb
+
+    @patch("app.submission")
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_page_report_passed_to_scheduler(self, mock_sched, mock_sub, mock_splitter):
+        """page_report 리스트를 스케줄러에 전달한다."""
+        from app import run_ocr_and_identify
+
+        mock_sched.ocr_files.return_value = []
+        mock_splitter.split_essays.side_effect = lambda x: x
+        mock_sub.build_submissions.return_value = ([], [])
+        report: list[dict] = []
+
+        run_ocr_and_identify([("a.pdf", b"a")], page_report=report)
+
+        assert mock_sched.ocr_files.call_args.kwargs["page_report"] is report
+
+    @patch("app.submission")
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_duplicates_passed_to_build_submissions(self, mock_sched, mock_splitter, mock_sub):
+        """duplicates 리스트를 build_submissions에 전달한다."""
+        from app import run_ocr_and_identify
+
+        mock_sched.ocr_files.return_value = []
+        mock_splitter.split_essays.side_effect = lambda x: x
+        mock_sub.build_submissions.return_value = ([], [])
+        duplicates: list[str] = []
+
+        run_ocr_and_identify([("a.pdf", b"a")], duplicates=duplicates)
+
+        assert mock_sub.build_submissions.call_args.kwargs["duplicates"] is duplicates
+
+    @patch("app.submission")
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_failed_pages_passed_to_scheduler(self, mock_sched, mock_splitter, mock_sub):
+        """failed_pages 리스트를 스케줄러에 전달한다 (실패 페이지 격리)."""
+        from app import run_ocr_and_identify
+
+        mock_sched.ocr_files.return_value = []
+        mock_splitter.split_essays.side_effect = lambda x: x
+        mock_sub.build_submissions.return_value = ([], [])
+        failed: list[dict] = []
 
-        assert calls == [(1, 2), (2, 2)]
+        run_ocr_and_identify([("a.pdf", b"a")], failed_pages=failed)
+
+        assert mock_sched.ocr_files.call_args.kwargs["failed_pages"] is failed
+
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_cancelled_job_propagates(self, mock_sched, mock_splitter):
+        """취소 토큰을 스케줄러에 전달하고, 취소되면 CancelledError를 그대로 올린다."""
+        import threading
+        from concurrent.futures import CancelledError
+
+        from app import run_ocr_and_identify
+
+        mock_sched.ocr_files.side_effect = CancelledError()
+        cancel = threading.Event()
+
+        with pytest.raises(CancelledError):
+            run_ocr_and_identify([("a.pdf", b"a")], cancel=cancel)
+
+        assert mock_sched.ocr_files.call_args.kwargs["cancel"] is cancel
+        mock_splitter.split_essays.assert_not_called()
 
     @patch("app.essay_splitter")
     @patch("app.submission")
-    @patch("app.ocr")
-    def test_on_progress_none_is_safe(self, mock_ocr, mock_sub, mock_splitter):
+    @patch("app.ocr_scheduler")
+    def test_on_progress_none_is_safe(self, mock_sched, mock_sub, mock_splitter):
         """on_progress=None이면 콜백 없이 정상 동작한다."""
         from app import run_ocr_and_identify
 
-        mock_ocr.ocr_file.return_value = [{"학번": "", "이름": "", "에세이텍스트": "t"}]
+        mock_sched.ocr_files.return_value = [
+            ("a.png", [{"학번": "", "이름": "", "에세이텍스트": "t"}])
+        ]
         mock_splitter.split_essays.side_effect = lambda x: x
         mock_sub.build_submissions.return_value = ([], [])
 
         subs, unid = run_ocr_and_identify([("a.png", b"a")], on_progress=None)
         assert subs == []
 
+    @patch("app.config.OCR_OFFLINE_BATCH", True)
+    @patch("app.submission")
+    @patch("app.essay_splitter")
+    @patch("app.ocr_offline")
+    @patch("app.ocr_scheduler")
+    def test_offline_mode_uses_batch_jobs(
+        self, mock_sched, mock_offline, mock_splitter, mock_sub,
+    ):
+        """OCR_OFFLINE_BATCH가 켜져 있으면 스케줄러 대신 배치 작업으로 OCR한다."""
+        from app import run_ocr_and_identify
+
+        page = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "내용"}
+        mock_offline.ocr_files_offline.return_value = [("a.pdf", [page])]
+        mock_splitter.split_essays.side_effect = lambda x: x
+        mock_sub.build_submissions.return_value = ([], [])
+        failed: list[dict] = []
+
+        run_ocr_and_identify([("a.pdf", b"a")], failed_pages=failed)
+
+        mock_sched.ocr_files.assert_not_called()
+        kwargs = mock_offline.ocr_files_offline.call_args.kwargs
+        assert kwargs["failed_pages"] is failed
+        assert "cancel" in kwargs
+        assert mock_splitter.split_essays.call_args[0][0] == [("a.pdf", [page])]
+
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_files_identified_as_scheduler_finishes_them(self, mock_sched, mock_splitter):
+        """파일이 끝나는 대로 분리하여 중간 식별 결과를 알리고, 최종 결과는 입력 순서다."""
+        from app import run_ocr_and_identify
+
+        page_a = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "가"}
+        page_b = {"학번": "10302", "이름": "김영희", "에세이텍스트": "나"}
+
+        def _ocr_files(files_data, on_file_done=None, **kwargs):
+            on_file_done(1, "b.png", [page_b])
+            on_file_done(0, "a.png", [page_a])
+            return [("a.png", [page_a]), ("b.png", [page_b])]
+
+        mock_sched.ocr_files.side_effect = _ocr_files
+        mock_splitter.split_essays.side_effect = lambda x: x
+        identified: list[tuple[list[str], list[str]]] = []
+
+        subs, unid = run_ocr_and_identify(
+            [("a.png", b"a"), ("b.png", b"b")],
+            on_identified=lambda s, u: identified.append(([x["학번"] for x in s], u)),
+        )
+
+        # 분리는 별도 스레드에서 끝나는 순서대로 알리므로 첫 중간 결과는 둘 중 하나다
+        assert identified[0] in ((["10302"], []), (["10301"], []))
+        assert identified[1:] == [(["10301", "10302"], [])]
+        assert [s["학번"] for s in subs] == ["10301", "10302"]
+        assert unid == []
+        assert sorted(c.args[0][0][0] for c in mock_splitter.split_essays.call_args_list) == [
+            "a.png", "b.png",
+        ]
+
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_split_runs_off_ocr_caller_thread(self, mock_sched, mock_splitter):
+        """분리(LLM 호출)는 별도 스레드에서 돌아 on_file_done이 기다리지 않고,
+        중간 결과 알림은 호출자 스레드에서 한다."""
+        import threading
+
+        from app import run_ocr_and_identify
+
+        page = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "가"}
+        release = threading.Event()
+        split_threads: list[int] = []
+        notify_threads: list[int] = []
+
+        def _split(files):
+            split_threads.append(threading.get_ident())
+            assert release.wait(5)
+            return files
+
+        def _ocr_files(files_data, on_file_done=None, **kwargs):
+            on_file_done(0, "a.png", [page])  # 분리가 막혀 있어도 바로 돌아와야 함
+            release.set()
+            return [("a.png", [page])]
+
+        mock_sched.ocr_files.side_effect = _ocr_files
+        mock_splitter.split_essays.side_effect = _split
+
+        subs, _ = run_ocr_and_identify(
+            [("a.png", b"a")],
+            on_identified=lambda s, u: notify_threads.append(threading.get_ident()),
+        )
+
+        assert [s["학번"] for s in subs] == ["10301"]
+        assert split_threads and split_threads[0] != threading.get_ident()
+        assert notify_threads == [threading.get_ident()]
+
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_unnotified_files_split_alone(self, mock_sched, mock_splitter):
+        """통지되지 않은 파일만 작업이 끝난 뒤 분리하고, 이미 분리한 파일은 다시 보내지 않는다."""
+        from app import run_ocr_and_identify
+
+        page_a = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "가"}
+        page_b = {"학번": "10302", "이름": "김영희", "에세이텍스트": "나"}
+
+        def _ocr_files(files_data, on_file_done=None, **kwargs):
+            on_file_done(1, "b.png", [page_b])
+            return [("a.png", [page_a]), ("b.png", [page_b])]
+
+        mock_sched.ocr_files.side_effect = _ocr_files
+        mock_splitter.split_essays.side_effect = lambda x: x
+
+        subs, _ = run_ocr_and_identify([("a.png", b"a"), ("b.png", b"b")])
+
+        assert [s["학번"] for s in subs] == ["10301", "10302"]
+        assert sorted(c.args[0] for c in mock_splitter.split_essays.call_args_list) == [
+            [("a.png", [page_a])], [("b.png", [page_b])],
+        ]
+
+    @patch("app.essay_splitter")
+    @patch("app.ocr_scheduler")
+    def test_cancel_waits_for_started_split(self, mock_sched, mock_splitter):
+        """작업이 취소되면 이미 시작한 분리가 끝난 뒤에 CancelledError를 올린다."""
+        import threading
+        import time
+        from concurrent.futures import CancelledError
+
+        from app import run_ocr_and_identify
+
+        page = {"학번": "10301", "이름": "홍길동", "에세이텍스트": "가"}
+        started = threading.Event()
+        finished = threading.Event()
+
+        def _split(files):
+            started.set()
+            time.sleep(0.05)
+            finished.set()
+            return files
+
+        def _ocr_files(files_data, on_file_done=None, **kwargs):
+            on_file_done(0, "a.png", [page])
+            assert started.wait(5)
+            raise CancelledError()
+
+        mock_sched.ocr_files.side_effect = _ocr_files
+        mock_splitter.split_essays.side_effect = _split
+
+        with pytest.raises(CancelledError):
+            run_ocr_and_identify([("a.png", b"a"), ("b.png", b"b")])
+
+        assert finished.is_set()
+
 
 # ---------------------------------------------------------------------------
 # run_grading 테스트
@@ -507,21 +736,258 @@ class TestFormatOcrProgressMessage:
         from app import format_ocr_progress_message
 
         msg = format_ocr_progress_message(total=5, current=2)
-        assert msg == "5개 파일 중 2번째 파일 OCR 중..."
+        assert msg == "5개 페이지 중 2개 페이지 OCR 완료..."
 
     def test_format_ocr_progress_message_first(self):
-        """첫 번째 파일의 OCR 진행률 메시지."""
+        """첫 페이지 완료 시 OCR 진행률 메시지."""
         from app import format_ocr_progress_message
 
         msg = format_ocr_progress_message(total=3, current=1)
-        assert msg == "3개 파일 중 1번째 파일 OCR 중..."
+        assert msg == "3개 페이지 중 1개 페이지 OCR 완료..."
 
     def test_format_ocr_progress_message_last(self):
-        """마지막 파일의 OCR 진행률 메시지."""
+        """마지막 페이지 완료 시 OCR 진행률 메시지."""
         from app import format_ocr_progress_message
 
         msg = format_ocr_progress_message(total=3, current=3)
-        assert msg == "3개 파일 중 3번째 파일 OCR 중..."
+        assert msg == "3개 페이지 중 3개 페이지 OCR 완료..."
+
+    def test_format_ocr_progress_message_with_skipped(self):
+        """건너뛴 빈 페이지 수가 있으면 메시지에 덧붙인다."""
+        from app import format_ocr_progress_message
+
+        msg = format_ocr_progress_message(total=10, current=6, skipped=2)
+        assert msg == "10개 페이지 중 6개 페이지 OCR 완료... (빈 페이지 2개 건너뜀)"
+
+
+# ---------------------------------------------------------------------------
+# format_upload_savings 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFormatUploadSavings:
+    """format_upload_savings 함수 테스트."""
+
+    def test_sums_measured_pages(self):
+        """측정된 페이지의 SDK 기본/전송 바이트 합계와 절감량을 표시한다."""
+        from app import format_upload_savings
+
+        report = [
+            {"file": "a.pdf", "page": 1, "baseline_bytes": 3_000_000,
+             "upload_bytes": 400_000, "bytes_saved": 2_600_000},
+            {"file": "a.pdf", "page": 2, "baseline_bytes": 2_000_000,
+             "upload_bytes": 300_000, "bytes_saved": 1_700_000},
+            {"file": "b.jpg", "page": 1, "upload_bytes": 10},
+        ]
+
+        assert format_upload_savings(report) == (
+            "업로드 5.0MB → 0.7MB (4.3MB 절감, 2페이지)"
+        )
+
+    def test_none_without_measurements(self):
+        """절감 측정값이 없으면 None을 반환한다."""
+        from app import format_upload_savings
+
+        assert format_upload_savings([{"file": "a.pdf", "page": 1}]) is None
+
+
+# ---------------------------------------------------------------------------
+# format_duplicate_report 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFormatDuplicateReport:
+    """format_duplicate_report 함수 테스트."""
+
+    def test_lists_duplicate_pages_with_source(self):
+        """중복 페이지마다 원본 페이지와 해밍 거리를 표시한다."""
+        from app import format_duplicate_report
+
+        report = [
+            {"file": "a.pdf", "page": 1},
+            {"file": "b.pdf", "page": 1, "duplicate_of": "a.pdf 1페이지",
+             "hash_distance": 3},
+        ]
+
+        assert format_duplicate_report(report) == [
+            "b.pdf 1페이지 = a.pdf 1페이지 (해밍 거리 3)"
+        ]
+
+    def test_blank_duplicates_excluded(self):
+        """빈 페이지끼리의 중복은 표시하지 않는다."""
+        from app import format_duplicate_report
+
+        report = [
+            {"file": "a.pdf", "page": 2, "blank": True,
+             "duplicate_of": "a.pdf 1페이지", "hash_distance": 0},
+        ]
+
+        assert format_duplicate_report(report) == []
+
+
+# ---------------------------------------------------------------------------
+# format_parse_fallbacks 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFormatParseFallbacks:
+    """format_parse_fallbacks 함수 테스트."""
+
+    def test_counts_and_lists_fallback_pages(self):
+        """파싱 폴백 페이지 수와 위치를 표시한다."""
+        from app import format_parse_fallbacks
+
+        report = [
+            {"file": "a.pdf", "page": 1, "parse_fallback": True},
+            {"file": "a.pdf", "page": 2},
+            {"file": "b.png", "page": 1, "parse_fallback": True},
+        ]
+
+        assert format_parse_fallbacks(report) == (
+            "OCR 응답 JSON 파싱 실패 2페이지: a.pdf 1페이지, b.png 1페이지"
+        )
+
+    def test_no_fallback_returns_none(self):
+        """폴백이 없으면 None."""
+        from app import format_parse_fallbacks
+
+        assert format_parse_fallbacks([{"file": "a.pdf", "page": 1}]) is None
+
+
+# ---------------------------------------------------------------------------
+# format_model_fallbacks 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFormatModelFallbacks:
+    """format_model_fallbacks 함수 테스트."""
+
+    def test_lists_pages_with_model(self):
+        """대체 모델로 OCR한 페이지와 그 모델을 표시한다."""
+        from app import format_model_fallbacks
+
+        report = [
+            {"file": "a.pdf", "page": 1, "model": "gemini-3.1-pro-preview"},
+            {"file": "a.pdf", "page": 2, "model": "gemini-3-flash-preview",
+             "model_fallback": True},
+        ]
+
+        assert format_model_fallbacks(report) == (
+            "대체 모델로 OCR한 페이지 1개: a.pdf 2페이지 (gemini-3-flash-preview)"
+        )
+
+    def test_no_fallback_returns_none(self):
+        """대체가 없으면 None."""
+        from app import format_model_fallbacks
+
+        assert format_model_fallbacks([{"file": "a.pdf", "page": 1}]) is None
+
+
+# ---------------------------------------------------------------------------
+# format_cache_hits 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFormatInputTokens:
+    """format_input_tokens 함수 테스트."""
+
+    @patch("app.config.OCR_MEDIA_RESOLUTION", "low")
+    def test_total_and_average_with_resolution(self):
+        """측정된 페이지의 입력 토큰 합계, 페이지당 평균, 해상도 설정을 표시한다."""
+        from app import format_input_tokens
+
+        report = [{"input_tokens": 1000}, {"blank": True}, {"input_tokens": 1290}]
+
+        assert format_input_tokens(report) == (
+            "OCR 입력 토큰 2,290 (2페이지, 페이지당 평균 1,145, media_resolution=low)"
+        )
+
+    def test_no_usage_returns_none(self):
+        """측정값이 없으면 None."""
+        from app import format_input_tokens
+
+        assert format_input_tokens([{"blank": True}]) is None
+
+
+class TestFormatCacheHits:
+    """format_cache_hits 함수 테스트."""
+
+    def test_counts_cache_hit_pages(self):
+        """캐시 적중 페이지 수를 표시한다."""
+        from app import format_cache_hits
+
+        report = [{"cache_hit": True}, {}, {"cache_hit": True}]
+
+        assert format_cache_hits(report) == "OCR 캐시 재사용 2페이지 (모델 호출 생략)"
+
+    def test_no_hits_returns_none(self):
+        """적중이 없으면 None."""
+        from app import format_cache_hits
+
+        assert format_cache_hits([{}]) is None
+
+
+class TestFormatTextLayerPages:
+    """format_text_layer_pages 함수 테스트."""
+
+    def test_counts_text_layer_pages(self):
+        """텍스트 레이어로 읽은 페이지 수를 표시한다."""
+        from app import format_text_layer_pages
+
+        report = [{"text_layer": True}, {"dpi": 150}, {"text_layer": True}]
+
+        assert format_text_layer_pages(report) == (
+            "텍스트 레이어로 읽은 페이지 2개 (래스터화/이미지 OCR 생략)"
+        )
+
+    def test_no_text_pages_returns_none(self):
+        """텍스트 레이어 페이지가 없으면 None."""
+        from app import format_text_layer_pages
+
+        assert format_text_layer_pages([{"dpi": 150}]) is None
+
+
+class TestFormatEmbeddedImagePages:
+    """format_embedded_image_pages 함수 테스트."""
+
+    def test_counts_embedded_image_pages(self):
+        """내장 스캔 이미지를 그대로 쓴 페이지 수를 표시한다."""
+        from app import format_embedded_image_pages
+
+        report = [{"embedded_image": True}, {"dpi": 150}]
+
+        assert format_embedded_image_pages(report) == (
+            "원본 스캔 이미지를 그대로 쓴 페이지 1개 (래스터화 생략)"
+        )
+
+    def test_no_embedded_pages_returns_none(self):
+        """내장 스캔 이미지 페이지가 없으면 None."""
+        from app import format_embedded_image_pages
+
+        assert format_embedded_image_pages([{"dpi": 150}]) is None
+
+
+# ---------------------------------------------------------------------------
+# format_failed_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFormatFailedPages:
+    """format_failed_pages 함수 테스트."""
+
+    def test_lists_file_page_and_error(self):
+        """실패 페이지마다 파일명, 페이지 번호, 오류를 표시한다."""
+        from app import format_failed_pages
+
+        failed = [{"file": "a.pdf", "page": 37, "error": "ServerError: 503"}]
+
+        assert format_failed_pages(failed) == ["a.pdf 37페이지 (ServerError: 503)"]
+
+    def test_empty(self):
+        """실패 페이지가 없으면 빈 리스트."""
+        from app import format_failed_pages
+
+        assert format_failed_pages([]) == []
 
 
 # ---------------------------------------------------------------------------
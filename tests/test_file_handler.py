@@ -10,6 +10,10 @@ from src.file_handler import (
     validate_file_type,
     extract_zip,
     pdf_to_images,
+    iter_pdf_pages,
+    count_pages,
+    pdf_page_geometry,
+    pdf_page_sizes,
     process_uploaded_file,
 )
 
@@ -193,6 +197,157 @@ class TestPdfToImages:
         assert result[0] is fake_img
 
 
+# ---------------------------------------------------------------------------
+# iter_pdf_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestIterPdfPages:
+    """iter_pdf_pages 함수 테스트 (pdf2image 의존성 mock)."""
+
+    @patch("src.file_handler.convert_from_bytes")
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_converts_in_page_windows(
+        self, mock_info: MagicMock, mock_convert: MagicMock
+    ) -> None:
+        """first_page/last_page 구간 단위로 변환한다."""
+        mock_info.return_value = {"Pages": 5}
+        mock_convert.side_effect = lambda _b, first_page, last_page: [
+            f"p{n}" for n in range(first_page, last_page + 1)
+        ]
+
+        pages = list(iter_pdf_pages(b"pdf", chunk_size=2))
+
+        assert pages == ["p1", "p2", "p3", "p4", "p5"]
+        windows = [
+            (c.kwargs["first_page"], c.kwargs["last_page"])
+            for c in mock_convert.call_args_list
+        ]
+        assert windows == [(1, 2), (3, 4), (5, 5)]
+
+    @patch("src.file_handler.convert_from_bytes")
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_first_page_available_before_full_conversion(
+        self, mock_info: MagicMock, mock_convert: MagicMock
+    ) -> None:
+        """첫 구간만 변환한 시점에 첫 페이지를 받을 수 있다."""
+        mock_info.return_value = {"Pages": 100}
+        mock_convert.side_effect = lambda _b, first_page, last_page: [
+            f"p{n}" for n in range(first_page, last_page + 1)
+        ]
+
+        stream = iter_pdf_pages(b"pdf", chunk_size=4)
+
+        assert next(stream) == "p1"
+        assert mock_convert.call_count == 1
+
+    @patch("src.file_handler.config.PDF_CHUNK_PAGES", 3)
+    @patch("src.file_handler.convert_from_bytes")
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_default_chunk_size_from_config(
+        self, mock_info: MagicMock, mock_convert: MagicMock
+    ) -> None:
+        """chunk_size 미지정 시 config.PDF_CHUNK_PAGES를 사용한다."""
+        mock_info.return_value = {"Pages": 6}
+        mock_convert.return_value = []
+
+        list(iter_pdf_pages(b"pdf"))
+
+        assert mock_convert.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# count_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestCountPages:
+    """count_pages 함수 테스트 (pdf2image 의존성 mock)."""
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_pdf_reads_page_count_from_pdfinfo(self, mock_info: MagicMock) -> None:
+        """PDF는 pdfinfo의 Pages 값을 반환한다."""
+        mock_info.return_value = {"Pages": 12}
+
+        assert count_pages("scan.PDF", b"pdf") == 12
+        mock_info.assert_called_once_with(b"pdf")
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_image_is_single_page(self, mock_info: MagicMock) -> None:
+        """이미지 파일은 pdfinfo 호출 없이 1페이지로 간주한다."""
+        assert count_pages("photo.jpg", b"jpg") == 1
+        mock_info.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# pdf_page_sizes 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestPdfPageSizes:
+    """pdf_page_sizes 함수 테스트 (pdf2image 의존성 mock)."""
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_reads_per_page_sizes_in_points(self, mock_info: MagicMock) -> None:
+        """pdfinfo -f/-l 출력에서 페이지별 크기(pt)를 페이지 순서대로 읽는다."""
+        mock_info.return_value = {
+            "Pages": 2,
+            "Page    1 size": "595.276 x 841.89 pts (A4)",
+            "Page    1 rot": "0",
+            "Page    2 size": "297.638 x 420.945 pts (A6)",
+        }
+
+        assert pdf_page_sizes(b"pdf", 2) == [
+            (595.276, 841.89), (297.638, 420.945),
+        ]
+        mock_info.assert_called_once_with(b"pdf", first_page=1, last_page=2)
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_missing_size_is_none(self, mock_info: MagicMock) -> None:
+        """크기를 읽지 못한 페이지는 None이다."""
+        mock_info.return_value = {
+            "Pages": 2, "Page    2 size": "612 x 792 pts (letter)",
+        }
+
+        assert pdf_page_sizes(b"pdf", 2) == [None, (612.0, 792.0)]
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_zero_pages_skips_pdfinfo(self, mock_info: MagicMock) -> None:
+        """페이지가 없으면 pdfinfo를 호출하지 않는다."""
+        assert pdf_page_sizes(b"pdf", 0) == []
+        mock_info.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# pdf_page_geometry 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestPdfPageGeometry:
+    """pdf_page_geometry 함수 테스트 (pdf2image 의존성 mock)."""
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_reads_sizes_and_rotations_from_one_call(self, mock_info: MagicMock) -> None:
+        """pdfinfo 한 번의 출력에서 크기와 회전을 함께 읽고, 회전이 없는 페이지는 0이다."""
+        mock_info.return_value = {
+            "Pages": 3,
+            "Page    1 rot": "0",
+            "Page    2 rot": "90",
+            "Page    2 size": "595.276 x 841.89 pts (A4)",
+        }
+
+        assert pdf_page_geometry(b"pdf", 3) == (
+            [None, (595.276, 841.89), None], [0, 90, 0],
+        )
+        mock_info.assert_called_once_with(b"pdf", first_page=1, last_page=3)
+
+    @patch("src.file_handler.pdfinfo_from_bytes")
+    def test_zero_pages_skips_pdfinfo(self, mock_info: MagicMock) -> None:
+        """페이지가 없으면 pdfinfo를 호출하지 않는다."""
+        assert pdf_page_geometry(b"pdf", 0) == ([], [])
+        mock_info.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # process_uploaded_file 테스트
 # ---------------------------------------------------------------------------
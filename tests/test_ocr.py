@@ -1,18 +1,31 @@
 """ocr 모듈 단위 테스트."""
 
+import asyncio
 import io
-from unittest.mock import patch, MagicMock, call
+import time
+from unittest.mock import AsyncMock, patch, MagicMock, call
 
+import httpx
 import pytest
+from google.genai import errors, types
 from PIL import Image
 
 from src.ocr import (
     OCR_PROMPT,
+    build_generate_config,
     extract_text_from_image,
+    extract_text_from_image_async,
     extract_text_from_images,
+    generate_ocr,
+    generate_ocr_async,
+    iter_file_pages,
+    load_file_pages,
+    model_chain,
     ocr_file,
     parse_ocr_response,
+    record_usage,
 )
+from src.ocr_retry import call_with_retry
 
 MODEL_NAME = "gemini-3.1-pro-preview"
 
@@ -112,6 +125,246 @@ class TestParseOcrResponse:
         """OCR 프롬프트에 prompt injection 방어 문구가 포함된다."""
         assert "prompt injection" in OCR_PROMPT
 
+    def test_fallback_recorded_in_stats(self) -> None:
+        """폴백하면 stats에 parse_fallback을 기록하고, 성공하면 기록하지 않는다."""
+        failed: dict = {}
+        ok: dict = {}
+        parse_ocr_response('{"학번": "10305"}', failed)
+        parse_ocr_response('{"학번": "", "이름": "", "에세이텍스트": ""}', ok)
+
+        assert failed == {"parse_fallback": True}
+        assert ok == {}
+
+
+# ---------------------------------------------------------------------------
+# build_generate_config 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestBuildGenerateConfig:
+    """build_generate_config 함수 테스트."""
+
+    @patch("src.ocr.config.OCR_RESPONSE_SCHEMA", True)
+    def test_enforces_json_schema_with_required_keys(self) -> None:
+        """JSON 응답과 세 필수 키(문자열)의 객체 스키마를 강제한다."""
+        generate_config = build_generate_config()
+
+        assert generate_config.response_mime_type == "application/json"
+        schema = generate_config.response_schema
+        assert schema.type == types.Type.OBJECT
+        assert schema.required == ["학번", "이름", "에세이텍스트"]
+        assert all(
+            p.type == types.Type.STRING for p in schema.properties.values()
+        )
+
+    @patch("src.ocr.config.OCR_MEDIA_RESOLUTION", "")
+    @patch("src.ocr.config.OCR_RESPONSE_SCHEMA", False)
+    def test_disabled_returns_none(self) -> None:
+        """스키마와 media_resolution이 모두 꺼져 있으면 None(프롬프트만 사용)."""
+        assert build_generate_config() is None
+
+    @patch("src.ocr.config.OCR_MEDIA_RESOLUTION", "high")
+    @patch("src.ocr.config.OCR_RESPONSE_SCHEMA", False)
+    def test_media_resolution_from_config_or_argument(self) -> None:
+        """기본은 config.OCR_MEDIA_RESOLUTION, resolution 인자가 있으면 그 값을 쓴다."""
+        assert build_generate_config().media_resolution == (
+            types.MediaResolution.MEDIA_RESOLUTION_HIGH
+        )
+        low = build_generate_config(resolution="LOW")
+        assert low.media_resolution == types.MediaResolution.MEDIA_RESOLUTION_LOW
+        assert low.response_schema is None
+
+    def test_unknown_media_resolution_raises(self) -> None:
+        """알 수 없는 media_resolution 값은 ValueError."""
+        with pytest.raises(ValueError, match="media_resolution"):
+            build_generate_config(resolution="ultra")
+
+
+# ---------------------------------------------------------------------------
+# model_chain / generate_ocr 테스트
+# ---------------------------------------------------------------------------
+
+
+def _api_error(code: int) -> errors.APIError:
+    cls = errors.ServerError if code >= 500 else errors.ClientError
+    return cls(code, {"error": {"message": "error", "status": "STATUS"}})
+
+
+_CHAIN = "gemini-3.1-pro-preview:90, gemini-3-flash-preview:30"
+
+
+class TestModelChain:
+    """model_chain 함수 테스트."""
+
+    @patch("src.ocr.config.OCR_MODEL_CHAIN", "")
+    def test_empty_uses_model_name_without_deadline(self) -> None:
+        """빈 값이면 MODEL_NAME 하나, 제한 시간은 클라이언트 기본값."""
+        assert model_chain() == [(MODEL_NAME, None)]
+
+    @patch("src.ocr.config.OCR_MODEL_CHAIN", _CHAIN + ",gemini-2.5-flash,")
+    def test_parses_models_and_deadlines(self) -> None:
+        """"모델:초" 항목을 순서대로 파싱하고, 초가 없으면 None."""
+        assert model_chain() == [
+            ("gemini-3.1-pro-preview", 90.0),
+            ("gemini-3-flash-preview", 30.0),
+            ("gemini-2.5-flash", None),
+        ]
+
+    @pytest.mark.parametrize("chain", ["gemini-3-flash-preview:abc", "m:0"])
+    def test_invalid_deadline_raises(self, chain: str) -> None:
+        """제한 시간이 양의 숫자가 아니면 ValueError."""
+        with patch("src.ocr.config.OCR_MODEL_CHAIN", chain):
+            with pytest.raises(ValueError, match="OCR_MODEL_CHAIN"):
+                model_chain()
+
+
+@patch("src.ocr.config.OCR_MODEL_CHAIN", _CHAIN)
+@patch("src.ocr.config.get_genai_client")
+class TestGenerateOcr:
+    """generate_ocr / generate_ocr_async 함수 테스트."""
+
+    @pytest.mark.parametrize("error", [
+        _api_error(429), _api_error(503), httpx.ReadTimeout("timeout"),
+    ])
+    def test_falls_back_on_overload_or_timeout(
+        self, mock_get_client: MagicMock, error: Exception,
+    ) -> None:
+        """429/503/시간 초과면 다음 모델로 넘어가고 응답을 만든 모델을 기록한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = [error, MagicMock(text="ok")]
+        stats: dict = {}
+
+        response = generate_ocr(["page"], None, [stats])
+
+        assert response.text == "ok"
+        assert [c.kwargs["model"] for c in generate.call_args_list] == [
+            "gemini-3.1-pro-preview", "gemini-3-flash-preview",
+        ]
+        assert stats == {"model": "gemini-3-flash-preview", "model_fallback": True}
+
+    def test_per_model_deadline_on_request(self, mock_get_client: MagicMock) -> None:
+        """모델별 제한 시간을 요청 단위 http_options.timeout(밀리초)으로 건다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = [_api_error(503), MagicMock(text="ok")]
+
+        generate_ocr(
+            ["page"], types.GenerateContentConfig(response_mime_type="application/json"),
+            [{}],
+        )
+
+        configs = [c.kwargs["config"] for c in generate.call_args_list]
+        assert [c.http_options.timeout for c in configs] == [90_000, 30_000]
+        assert all(c.response_mime_type == "application/json" for c in configs)
+
+    def test_first_model_success_records_model(self, mock_get_client: MagicMock) -> None:
+        """첫 모델이 성공하면 그 모델만 기록하고 대체 표시는 없다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text="ok")
+        stats_list: list[dict] = [{}, {}]
+
+        generate_ocr(["page"], None, stats_list)
+
+        assert generate.call_count == 1
+        assert stats_list == [{"model": "gemini-3.1-pro-preview"}] * 2
+
+    @pytest.mark.parametrize("error", [_api_error(400), _api_error(500)])
+    def test_other_errors_not_fallen_back(
+        self, mock_get_client: MagicMock, error: Exception,
+    ) -> None:
+        """400이나 500은 다음 모델로 넘어가지 않고 그대로 올린다 (재시도는 ocr_retry)."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = error
+
+        with pytest.raises(errors.APIError):
+            generate_ocr(["page"], None, [{}])
+
+        assert generate.call_count == 1
+
+    def test_last_model_failure_raises(self, mock_get_client: MagicMock) -> None:
+        """마지막 모델까지 실패하면 마지막 예외를 올린다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = [_api_error(429), httpx.ReadTimeout("timeout")]
+
+        with pytest.raises(httpx.ReadTimeout):
+            generate_ocr(["page"], None, [{}])
+
+    def test_async_falls_back(self, mock_get_client: MagicMock) -> None:
+        """aio 버전도 같은 순서로 다음 모델로 넘어간다."""
+        generate = AsyncMock(side_effect=[_api_error(503), MagicMock(text="ok")])
+        mock_get_client.return_value.aio.models.generate_content = generate
+        stats: dict = {}
+
+        response = asyncio.run(generate_ocr_async(["page"], None, [stats]))
+
+        assert response.text == "ok"
+        assert stats["model"] == "gemini-3-flash-preview"
+        assert generate.call_args.kwargs["config"].http_options.timeout == 30_000
+
+    def test_page_deadline_caps_request_timeout(self, mock_get_client: MagicMock) -> None:
+        """페이지 작업 안에서는 요청 제한 시간이 마감까지 남은 시간을 넘지 않는다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = [_api_error(503), MagicMock(text="ok")]
+
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 10.0):
+            call_with_retry(generate_ocr, ["page"], None, [{}])
+
+        timeouts = [c.kwargs["config"].http_options.timeout for c in generate.call_args_list]
+        assert 9_000 < timeouts[0] <= 10_000
+        assert 9_000 < timeouts[1] <= 10_000
+
+    def test_expired_page_deadline_stops_chain(self, mock_get_client: MagicMock) -> None:
+        """대체 모델로 넘어가기 전에 페이지 마감이 지났으면 TimeoutError로 멈춘다."""
+        generate = mock_get_client.return_value.models.generate_content
+
+        def _slow(**kwargs):
+            time.sleep(0.06)
+            raise httpx.ReadTimeout("timeout")
+
+        generate.side_effect = _slow
+
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 0.05):
+            with pytest.raises(TimeoutError, match="제한 시간"):
+                call_with_retry(generate_ocr, ["page"], None, [{}])
+        assert generate.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# record_usage 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestRecordUsage:
+    """record_usage 함수 테스트."""
+
+    def test_records_prompt_tokens(self) -> None:
+        """usage_metadata.prompt_token_count를 input_tokens로 기록한다."""
+        response = MagicMock()
+        response.usage_metadata.prompt_token_count = 1290
+        stats: dict = {}
+
+        record_usage(response, [stats])
+
+        assert stats == {"input_tokens": 1290}
+
+    def test_splits_evenly_and_accumulates(self) -> None:
+        """여러 페이지에 고르게 나누고(나머지는 앞 페이지부터), 기존 값에 더한다."""
+        response = MagicMock()
+        response.usage_metadata.prompt_token_count = 10
+        stats_list = [{"input_tokens": 100}, {}, {}]
+
+        record_usage(response, stats_list)
+
+        assert [s["input_tokens"] for s in stats_list] == [104, 3, 3]
+
+    def test_missing_usage_not_recorded(self) -> None:
+        """usage_metadata가 없으면 기록하지 않는다."""
+        stats: dict = {}
+
+        record_usage(MagicMock(usage_metadata=None), [stats])
+        record_usage(MagicMock(spec=["text"]), [stats])
+
+        assert stats == {}
+
 
 # ---------------------------------------------------------------------------
 # extract_text_from_image 테스트
@@ -132,7 +385,7 @@ class TestExtractTextFromImage:
         mock_response.text = '{"학번": "10305", "이름": "홍길동", "에세이텍스트": "텍스트"}'
         mock_client.models.generate_content.return_value = mock_response
 
-        fake_image = MagicMock(spec=Image.Image)
+        fake_image = Image.new("RGB", (40, 30), "black")
         extract_text_from_image(fake_image)
 
         mock_client.models.generate_content.assert_called_once()
@@ -150,14 +403,84 @@ class TestExtractTextFromImage:
         mock_response.text = '{"학번": "", "이름": "", "에세이텍스트": "텍스트"}'
         mock_client.models.generate_content.return_value = mock_response
 
-        fake_image = MagicMock(spec=Image.Image)
+        fake_image = Image.new("RGB", (40, 30), "black")
         extract_text_from_image(fake_image)
 
         call_kwargs = mock_client.models.generate_content.call_args
         contents = call_kwargs.kwargs["contents"]
-        assert fake_image in contents
+        assert isinstance(contents[0], types.Part)
+        assert contents[0].inline_data.mime_type.startswith("image/")
         assert OCR_PROMPT in contents
 
+    @patch("src.ocr.preprocess.encode_for_upload")
+    @patch("src.ocr.config.get_genai_client")
+    def test_encodes_image_for_upload_with_stats(
+        self, mock_get_client: MagicMock, mock_encode: MagicMock
+    ) -> None:
+        """이미지를 업로드용으로 인코딩하고 stats dict를 전달한다."""
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.text = '{"학번": "", "이름": "", "에세이텍스트": "텍스트"}'
+        mock_client.models.generate_content.return_value = mock_response
+        encoded = types.Part.from_bytes(data=b"enc", mime_type="image/jpeg")
+        mock_encode.return_value = encoded
+        image = Image.new("RGB", (40, 30), "black")
+        stats: dict = {}
+
+        extract_text_from_image(image, stats=stats)
+
+        mock_encode.assert_called_once_with(image, stats)
+        contents = mock_client.models.generate_content.call_args.kwargs["contents"]
+        assert contents[0] is encoded
+
+    @patch("src.ocr.config.get_genai_client")
+    def test_sends_encoded_part_as_is(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """인코딩된 이미지 Part는 재인코딩 없이 그대로 전달한다."""
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.text = '{"학번": "", "이름": "", "에세이텍스트": "텍스트"}'
+        mock_client.models.generate_content.return_value = mock_response
+
+        buffer = io.BytesIO()
+        Image.new("L", (40, 30), 0).save(buffer, "JPEG")
+        part = types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+        extract_text_from_image(part)
+
+        contents = mock_client.models.generate_content.call_args.kwargs["contents"]
+        assert contents[0] is part
+
+    @patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+    @patch("src.ocr.config.get_genai_client")
+    def test_blank_page_skips_model_call(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """빈 페이지는 모델을 호출하지 않고 빈 결과를 반환한다."""
+        stats: dict = {}
+
+        result = extract_text_from_image(Image.new("RGB", (40, 30), "white"), stats)
+
+        assert result == {"학번": "", "이름": "", "에세이텍스트": ""}
+        assert stats["blank"] is True
+        mock_get_client.assert_not_called()
+
+    @patch("src.ocr.config.BLANK_SKIP_ENABLED", False)
+    @patch("src.ocr.config.get_genai_client")
+    def test_blank_skip_can_be_disabled(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """BLANK_SKIP_ENABLED가 꺼져 있으면 빈 페이지도 OCR한다."""
+        mock_response = MagicMock()
+        mock_response.text = '{"학번": "", "이름": "", "에세이텍스트": ""}'
+        mock_get_client.return_value.models.generate_content.return_value = mock_response
+
+        extract_text_from_image(Image.new("RGB", (40, 30), "white"))
+
+        mock_get_client.return_value.models.generate_content.assert_called_once()
+
     @patch("src.ocr.config.get_genai_client")
     def test_returns_parsed_dict(self, mock_get_client: MagicMock) -> None:
         """API 응답을 파싱하여 dict를 반환한다."""
@@ -167,7 +490,7 @@ class TestExtractTextFromImage:
         mock_response.text = '{"학번": "10305", "이름": "홍길동", "에세이텍스트": "에세이 본문"}'
         mock_client.models.generate_content.return_value = mock_response
 
-        fake_image = MagicMock(spec=Image.Image)
+        fake_image = Image.new("RGB", (40, 30), "black")
         result = extract_text_from_image(fake_image)
 
         assert isinstance(result, dict)
@@ -186,7 +509,7 @@ class TestExtractTextFromImage:
         mock_response.text = "일반 텍스트 응답"
         mock_client.models.generate_content.return_value = mock_response
 
-        fake_image = MagicMock(spec=Image.Image)
+        fake_image = Image.new("RGB", (40, 30), "black")
         result = extract_text_from_image(fake_image)
 
         assert isinstance(result, dict)
@@ -194,6 +517,41 @@ class TestExtractTextFromImage:
         assert result["이름"] == ""
         assert result["에세이텍스트"] == "일반 텍스트 응답"
 
+    @patch("src.ocr.config.OCR_RESPONSE_SCHEMA", True)
+    @patch("src.ocr.config.get_genai_client")
+    def test_requests_schema_and_counts_fallback(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """응답 스키마 설정으로 호출하고, 파싱 폴백을 stats에 기록한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text="일반 텍스트 응답")
+        stats: dict = {}
+
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"), stats)
+
+        generate_config = generate.call_args.kwargs["config"]
+        assert generate_config.response_mime_type == "application/json"
+        assert stats["parse_fallback"] is True
+
+    @patch("src.ocr.config.OCR_MEDIA_RESOLUTION", "medium")
+    @patch("src.ocr.config.get_genai_client")
+    def test_requests_media_resolution_and_records_tokens(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """설정한 media_resolution으로 호출하고 입력 토큰 수를 stats에 기록한다."""
+        response = MagicMock(text='{"학번": "", "이름": "", "에세이텍스트": "텍스트"}')
+        response.usage_metadata.prompt_token_count = 560
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = response
+        stats: dict = {}
+
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"), stats)
+
+        assert generate.call_args.kwargs["config"].media_resolution == (
+            types.MediaResolution.MEDIA_RESOLUTION_MEDIUM
+        )
+        assert stats["input_tokens"] == 560
+
     @patch("src.ocr.config.get_genai_client")
     def test_uses_genai_singleton(
         self, mock_get_client: MagicMock
@@ -205,7 +563,7 @@ class TestExtractTextFromImage:
         mock_response.text = '{"학번": "", "이름": "", "에세이텍스트": "텍스트"}'
         mock_client.models.generate_content.return_value = mock_response
 
-        fake_image = MagicMock(spec=Image.Image)
+        fake_image = Image.new("RGB", (40, 30), "black")
         extract_text_from_image(fake_image)
 
         mock_get_client.assert_called_once()
@@ -216,6 +574,7 @@ class TestExtractTextFromImage:
 # ---------------------------------------------------------------------------
 
 
+@patch("src.ocr.config.OCR_ASYNC", False)
 class TestExtractTextFromImages:
     """extract_text_from_images 함수 테스트."""
 
@@ -224,17 +583,18 @@ class TestExtractTextFromImages:
         self, mock_extract: MagicMock
     ) -> None:
         """모든 이미지에 대해 extract_text_from_image를 호출한다."""
-        mock_extract.side_effect = [
-            {"학번": "10305", "이름": "홍길동", "에세이텍스트": "텍스트1"},
-            {"학번": "20407", "이름": "김영희", "에세이텍스트": "텍스트2"},
-            {"학번": "", "이름": "", "에세이텍스트": "텍스트3"},
-        ]
-
         images = [
             MagicMock(spec=Image.Image),
             MagicMock(spec=Image.Image),
             MagicMock(spec=Image.Image),
         ]
+        by_image = {
+            id(images[0]): {"학번": "10305", "이름": "홍길동", "에세이텍스트": "텍스트1"},
+            id(images[1]): {"학번": "20407", "이름": "김영희", "에세이텍스트": "텍스트2"},
+            id(images[2]): {"학번": "", "이름": "", "에세이텍스트": "텍스트3"},
+        }
+        mock_extract.side_effect = lambda img: by_image[id(img)]
+
         result = extract_text_from_images(images)
 
         assert mock_extract.call_count == 3
@@ -245,19 +605,58 @@ class TestExtractTextFromImages:
     @patch("src.ocr.extract_text_from_image")
     def test_preserves_order(self, mock_extract: MagicMock) -> None:
         """이미지 순서대로 결과를 반환한다."""
-        mock_extract.side_effect = [
-            {"학번": "10305", "이름": "홍길동", "에세이텍스트": "첫째"},
-            {"학번": "20407", "이름": "김영희", "에세이텍스트": "둘째"},
-        ]
-
         img1 = MagicMock(spec=Image.Image)
         img2 = MagicMock(spec=Image.Image)
+
+        def _slow_first(img):
+            if img is img1:
+                time.sleep(0.05)
+                return {"학번": "10305", "이름": "홍길동", "에세이텍스트": "첫째"}
+            return {"학번": "20407", "이름": "김영희", "에세이텍스트": "둘째"}
+
+        mock_extract.side_effect = _slow_first
         result = extract_text_from_images([img1, img2])
 
-        mock_extract.assert_has_calls([call(img1), call(img2)])
+        mock_extract.assert_has_calls([call(img1), call(img2)], any_order=True)
         assert result[0]["에세이텍스트"] == "첫째"
         assert result[1]["에세이텍스트"] == "둘째"
 
+    @patch("src.ocr.extract_text_from_image")
+    def test_runs_pages_concurrently(self, mock_extract: MagicMock) -> None:
+        """페이지 OCR을 동시에 실행하여 전체 시간이 페이지 수에 비례하지 않는다."""
+
+        def _slow(img):
+            time.sleep(0.1)
+            return {"학번": "", "이름": "", "에세이텍스트": "텍스트"}
+
+        mock_extract.side_effect = _slow
+        images = [MagicMock(spec=Image.Image) for _ in range(8)]
+
+        start = time.monotonic()
+        result = extract_text_from_images(images, max_workers=8)
+        elapsed = time.monotonic() - start
+
+        assert len(result) == 8
+        assert elapsed < 0.5
+
+    @patch("src.ocr.extract_text_from_image")
+    def test_failed_page_raises_after_others_finish(
+        self, mock_extract: MagicMock
+    ) -> None:
+        """실패한 페이지가 있으면 나머지 페이지 처리 후 해당 예외를 발생시킨다."""
+        images = [MagicMock(spec=Image.Image) for _ in range(3)]
+
+        def _fail_second(img):
+            if img is images[1]:
+                raise RuntimeError("page 2 failed")
+            return {"학번": "", "이름": "", "에세이텍스트": "텍스트"}
+
+        mock_extract.side_effect = _fail_second
+
+        with pytest.raises(RuntimeError, match="page 2 failed"):
+            extract_text_from_images(images)
+        assert mock_extract.call_count == 3
+
     @patch("src.ocr.extract_text_from_image")
     def test_empty_list_returns_empty(
         self, mock_extract: MagicMock
@@ -282,6 +681,148 @@ class TestExtractTextFromImages:
         assert result[0]["에세이텍스트"] == "유일한 텍스트"
 
 
+@patch("src.ocr.config.OCR_ASYNC", True)
+class TestExtractTextFromImagesAsync:
+    """aio 클라이언트 경로(extract_text_from_image_async, run_ordered_async) 테스트."""
+
+    @patch("src.ocr.config.get_genai_client")
+    def test_async_calls_aio_generate_content(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """client.aio.models.generate_content를 이미지 Part와 프롬프트로 호출한다."""
+        mock_client = mock_get_client.return_value
+        mock_client.aio.models.generate_content = AsyncMock(
+            return_value=MagicMock(
+                text='{"학번": "10305", "이름": "홍길동", "에세이텍스트": "본문"}'
+            )
+        )
+        stats: dict = {}
+
+        result = asyncio.run(extract_text_from_image_async(
+            Image.new("RGB", (40, 30), "black"), stats
+        ))
+
+        assert result["학번"] == "10305"
+        kwargs = mock_client.aio.models.generate_content.call_args.kwargs
+        assert kwargs["model"] == MODEL_NAME
+        assert isinstance(kwargs["contents"][0], types.Part)
+        assert kwargs["contents"][1] == OCR_PROMPT
+        assert stats["upload_bytes"] > 0
+        mock_client.models.generate_content.assert_not_called()
+
+    @patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+    @patch("src.ocr.config.get_genai_client")
+    def test_async_blank_page_skips_model_call(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """빈 페이지는 비동기 경로에서도 모델을 호출하지 않는다."""
+        result = asyncio.run(extract_text_from_image_async(
+            Image.new("RGB", (40, 30), "white")
+        ))
+
+        assert result == {"학번": "", "이름": "", "에세이텍스트": ""}
+        mock_get_client.assert_not_called()
+
+    @patch("src.ocr.extract_text_from_image")
+    @patch("src.ocr.extract_text_from_image_async")
+    def test_images_use_async_path_in_order(
+        self, mock_async: MagicMock, mock_sync: MagicMock
+    ) -> None:
+        """OCR_ASYNC이면 코루틴으로 동시에 OCR하고 이미지 순서대로 반환한다."""
+        images = [MagicMock(spec=Image.Image) for _ in range(8)]
+
+        async def _slow(img, stats=None):
+            await asyncio.sleep(0.1 if img is images[0] else 0.01)
+            return {"학번": "", "이름": "", "에세이텍스트": str(images.index(img))}
+
+        mock_async.side_effect = _slow
+
+        start = time.monotonic()
+        result = extract_text_from_images(images, max_workers=8)
+        elapsed = time.monotonic() - start
+
+        assert [r["에세이텍스트"] for r in result] == [str(i) for i in range(8)]
+        assert elapsed < 0.5
+        mock_sync.assert_not_called()
+
+    @patch("src.ocr.extract_text_from_image_async")
+    def test_async_failed_page_raises(self, mock_async: MagicMock) -> None:
+        """비동기 경로에서도 실패한 가장 앞 페이지의 예외를 발생시킨다."""
+        images = [MagicMock(spec=Image.Image) for _ in range(3)]
+
+        async def _fail_second(img, stats=None):
+            if img is images[1]:
+                raise RuntimeError("page 2 failed")
+            return {"학번": "", "이름": "", "에세이텍스트": "텍스트"}
+
+        mock_async.side_effect = _fail_second
+
+        with pytest.raises(RuntimeError, match="page 2 failed"):
+            extract_text_from_images(images)
+        assert mock_async.call_count == 3
+
+
+# ---------------------------------------------------------------------------
+# load_file_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestLoadFilePages:
+    """load_file_pages 함수 테스트."""
+
+    @patch("src.ocr.file_handler.pdf_to_images")
+    def test_pdf_returns_converted_pages(self, mock_pdf_to_images: MagicMock) -> None:
+        """PDF는 pdf_to_images 결과를 그대로 반환한다."""
+        pages = [MagicMock(spec=Image.Image), MagicMock(spec=Image.Image)]
+        mock_pdf_to_images.return_value = pages
+
+        assert load_file_pages("a.pdf", b"pdf") == pages
+
+    @patch("src.ocr.preprocess.open_image")
+    def test_image_returns_single_page(self, mock_open_image: MagicMock) -> None:
+        """이미지 파일은 단일 페이지 리스트를 반환한다."""
+        fake_img = MagicMock(spec=Image.Image)
+        mock_open_image.return_value = fake_img
+
+        assert load_file_pages("a.png", b"png") == [fake_img]
+
+    def test_invalid_type_raises_value_error(self) -> None:
+        """지원하지 않는 형식은 ValueError를 발생시킨다."""
+        with pytest.raises(ValueError, match="지원하지 않는 파일 형식"):
+            load_file_pages("a.txt", b"t")
+
+
+# ---------------------------------------------------------------------------
+# iter_file_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestIterFilePages:
+    """iter_file_pages 함수 테스트."""
+
+    @patch("src.ocr.file_handler.iter_pdf_pages")
+    def test_pdf_streams_pages(self, mock_iter_pdf: MagicMock) -> None:
+        """PDF는 iter_pdf_pages로 스트리밍 변환한다."""
+        pages = [MagicMock(spec=Image.Image), MagicMock(spec=Image.Image)]
+        mock_iter_pdf.return_value = iter(pages)
+
+        assert list(iter_file_pages("a.PDF", b"pdf")) == pages
+        mock_iter_pdf.assert_called_once_with(b"pdf")
+
+    @patch("src.ocr.preprocess.open_image")
+    def test_image_yields_single_page(self, mock_open_image: MagicMock) -> None:
+        """이미지 파일은 한 페이지를 생성한다."""
+        fake_img = MagicMock(spec=Image.Image)
+        mock_open_image.return_value = fake_img
+
+        assert list(iter_file_pages("a.jpg", b"jpg")) == [fake_img]
+
+    def test_invalid_type_raises_value_error(self) -> None:
+        """지원하지 않는 형식은 순회 시 ValueError를 발생시킨다."""
+        with pytest.raises(ValueError, match="지원하지 않는 파일 형식"):
+            list(iter_file_pages("a.txt", b"t"))
+
+
 # ---------------------------------------------------------------------------
 # ocr_file 테스트
 # ---------------------------------------------------------------------------
@@ -332,62 +873,62 @@ class TestOcrFile:
         assert len(result) == 1
 
     @patch("src.ocr.extract_text_from_image")
-    @patch("src.ocr.Image.open")
+    @patch("src.ocr.preprocess.open_image")
     def test_png_image_loads_and_ocrs(
         self,
-        mock_image_open: MagicMock,
+        mock_open_image: MagicMock,
         mock_extract_text: MagicMock,
     ) -> None:
         """PNG 이미지 파일을 로드하여 OCR을 수행한다."""
         fake_img = MagicMock(spec=Image.Image)
-        mock_image_open.return_value = fake_img
+        mock_open_image.return_value = fake_img
         mock_extract_text.return_value = {
             "학번": "10305", "이름": "홍길동", "에세이텍스트": "이미지 텍스트"
         }
 
         result = ocr_file("scan.png", b"fake-png-bytes")
 
-        mock_image_open.assert_called_once()
+        mock_open_image.assert_called_once()
         mock_extract_text.assert_called_once_with(fake_img)
         assert result == [{"학번": "10305", "이름": "홍길동", "에세이텍스트": "이미지 텍스트"}]
 
     @patch("src.ocr.extract_text_from_image")
-    @patch("src.ocr.Image.open")
+    @patch("src.ocr.preprocess.open_image")
     def test_jpg_image_loads_and_ocrs(
         self,
-        mock_image_open: MagicMock,
+        mock_open_image: MagicMock,
         mock_extract_text: MagicMock,
     ) -> None:
         """JPG 이미지 파일을 로드하여 OCR을 수행한다."""
         fake_img = MagicMock(spec=Image.Image)
-        mock_image_open.return_value = fake_img
+        mock_open_image.return_value = fake_img
         mock_extract_text.return_value = {
             "학번": "", "이름": "", "에세이텍스트": "JPG 텍스트"
         }
 
         result = ocr_file("photo.jpg", b"fake-jpg-bytes")
 
-        mock_image_open.assert_called_once()
+        mock_open_image.assert_called_once()
         mock_extract_text.assert_called_once_with(fake_img)
         assert result == [{"학번": "", "이름": "", "에세이텍스트": "JPG 텍스트"}]
 
     @patch("src.ocr.extract_text_from_image")
-    @patch("src.ocr.Image.open")
+    @patch("src.ocr.preprocess.open_image")
     def test_jpeg_image_loads_and_ocrs(
         self,
-        mock_image_open: MagicMock,
+        mock_open_image: MagicMock,
         mock_extract_text: MagicMock,
     ) -> None:
         """JPEG 이미지 파일을 로드하여 OCR을 수행한다."""
         fake_img = MagicMock(spec=Image.Image)
-        mock_image_open.return_value = fake_img
+        mock_open_image.return_value = fake_img
         mock_extract_text.return_value = {
             "학번": "", "이름": "", "에세이텍스트": "JPEG 텍스트"
         }
 
         result = ocr_file("image.jpeg", b"fake-jpeg-bytes")
 
-        mock_image_open.assert_called_once()
+        mock_open_image.assert_called_once()
         mock_extract_text.assert_called_once_with(fake_img)
         assert result == [{"학번": "", "이름": "", "에세이텍스트": "JPEG 텍스트"}]
 
@@ -402,15 +943,15 @@ class TestOcrFile:
             ocr_file("data.xlsx", b"xlsx-data")
 
     @patch("src.ocr.extract_text_from_image")
-    @patch("src.ocr.Image.open")
+    @patch("src.ocr.preprocess.open_image")
     def test_image_wraps_single_result_in_list(
         self,
-        mock_image_open: MagicMock,
+        mock_open_image: MagicMock,
         mock_extract_text: MagicMock,
     ) -> None:
         """이미지 파일의 OCR 결과는 단일 요소 리스트로 반환한다."""
         fake_img = MagicMock(spec=Image.Image)
-        mock_image_open.return_value = fake_img
+        mock_open_image.return_value = fake_img
         mock_extract_text.return_value = {
             "학번": "30101", "이름": "박철수", "에세이텍스트": "단일 결과"
         }
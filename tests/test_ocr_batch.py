@@ -0,0 +1,233 @@
+"""ocr_batch 모듈 단위 테스트."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from google.genai import types
+from PIL import Image
+
+from src.ocr import OCR_PROMPT
+from src.ocr_batch import (
+    build_batch_prompt,
+    build_batch_schema,
+    extract_text_from_batch,
+    extract_text_from_batch_async,
+    parse_batch_response,
+)
+
+
+def _result(text: str) -> dict:
+    return {"학번": "10305", "이름": "홍길동", "에세이텍스트": text}
+
+
+def _response(payload) -> MagicMock:
+    text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+    return MagicMock(text=text)
+
+
+def _ink() -> Image.Image:
+    """빈 페이지로 판정되지 않는 검은 이미지."""
+    return Image.new("RGB", (40, 30), "black")
+
+
+def _blank() -> Image.Image:
+    return Image.new("RGB", (40, 30), "white")
+
+
+# ---------------------------------------------------------------------------
+# build_batch_prompt / parse_batch_response 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestParseBatchResponse:
+    """build_batch_prompt, parse_batch_response 함수 테스트."""
+
+    def test_prompt_states_count_and_injection_defense(self) -> None:
+        """프롬프트에 이미지 수, JSON 배열 형식, prompt injection 방어 문구가 있다."""
+        prompt = build_batch_prompt(3)
+
+        assert "이미지 3장" in prompt
+        assert "3개의 객체를 담은 JSON 배열" in prompt
+        assert "prompt injection" in prompt
+        assert '[{"학번"' in prompt
+
+    def test_batch_schema_fixes_array_length(self) -> None:
+        """묶음 스키마는 OCR 응답 객체 정확히 count개의 배열이다."""
+        schema = build_batch_schema(3)
+
+        assert schema.type == types.Type.ARRAY
+        assert schema.items.required == ["학번", "이름", "에세이텍스트"]
+        assert (schema.min_items, schema.max_items) == (3, 3)
+
+    def test_valid_array(self) -> None:
+        """필수 키를 가진 객체 count개의 배열을 그대로 반환한다."""
+        payload = [_result("a"), _result("b")]
+
+        assert parse_batch_response(json.dumps(payload), 2) == payload
+
+    def test_array_in_code_fence(self) -> None:
+        """마크다운 코드 펜스 안의 배열도 파싱한다."""
+        text = "```json\n" + json.dumps([_result("a")]) + "\n```"
+
+        assert parse_batch_response(text, 1) == [_result("a")]
+
+    def test_wrong_length_is_invalid(self) -> None:
+        """배열 길이가 요청한 이미지 수와 다르면 None."""
+        assert parse_batch_response(json.dumps([_result("a")]), 2) is None
+
+    def test_missing_key_is_invalid(self) -> None:
+        """필수 키가 빠진 객체가 있으면 None."""
+        payload = [_result("a"), {"학번": "1", "이름": "x"}]
+
+        assert parse_batch_response(json.dumps(payload), 2) is None
+
+    def test_object_or_invalid_json_is_invalid(self) -> None:
+        """배열이 아니거나 JSON이 아니면 None."""
+        assert parse_batch_response(json.dumps(_result("a")), 1) is None
+        assert parse_batch_response("페이지 1: ...", 1) is None
+        assert parse_batch_response(None, 1) is None
+
+
+# ---------------------------------------------------------------------------
+# extract_text_from_batch 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr.config.get_genai_client")
+class TestExtractTextFromBatch:
+    """extract_text_from_batch 함수 테스트."""
+
+    def test_one_call_with_labelled_pages(self, mock_get_client: MagicMock) -> None:
+        """페이지 표시와 이미지를 번갈아 놓고 묶음 프롬프트를 붙여 한 번 호출한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = _response([_result("a"), _result("b")])
+        stats = [{}, {}]
+
+        results = extract_text_from_batch([_ink(), _ink()], stats)
+
+        assert results == [_result("a"), _result("b")]
+        generate.assert_called_once()
+        contents = generate.call_args.kwargs["contents"]
+        assert contents[0] == "페이지 1" and contents[2] == "페이지 2"
+        assert isinstance(contents[1], types.Part)
+        assert contents[4] == build_batch_prompt(2)
+        assert [s["batch_size"] for s in stats] == [2, 2]
+        assert "batch_fallback" not in stats[0]
+
+    def test_blank_pages_left_out_of_request(self, mock_get_client: MagicMock) -> None:
+        """빈 페이지는 요청에서 빼고 빈 결과를 채운다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = _response([_result("a"), _result("c")])
+
+        results = extract_text_from_batch(
+            [_ink(), _blank(), _ink()], [{}, {}, {}]
+        )
+
+        assert results[0] == _result("a") and results[2] == _result("c")
+        assert results[1] == {"학번": "", "이름": "", "에세이텍스트": ""}
+        assert generate.call_args.kwargs["contents"][-1] == build_batch_prompt(2)
+
+    def test_single_page_uses_single_prompt(self, mock_get_client: MagicMock) -> None:
+        """보낼 페이지가 한 장이면 단일 페이지 프롬프트로 호출한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = _response(_result("a"))
+
+        results = extract_text_from_batch([_ink(), _blank()], [{}, {}])
+
+        assert results[0] == _result("a")
+        assert generate.call_args.kwargs["contents"][1] == OCR_PROMPT
+
+    def test_invalid_batch_falls_back_to_single_calls(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """묶음 응답이 검증에 실패하면 페이지마다 단일 호출로 다시 OCR한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = [
+            _response([_result("a")]),
+            _response(_result("a")),
+            _response(_result("b")),
+        ]
+        stats = [{}, {}]
+
+        results = extract_text_from_batch([_ink(), _ink()], stats)
+
+        assert results == [_result("a"), _result("b")]
+        assert generate.call_count == 3
+        assert all(s["batch_fallback"] is True for s in stats)
+
+    @patch("src.ocr.config.OCR_RESPONSE_SCHEMA", True)
+    def test_batch_call_requests_array_schema(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """묶음 호출은 보낸 페이지 수 길이의 배열 스키마를 요청한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = _response([_result("a"), _result("b")])
+
+        extract_text_from_batch([_ink(), _ink()], [{}, {}])
+
+        generate_config = generate.call_args.kwargs["config"]
+        assert generate_config.response_mime_type == "application/json"
+        assert generate_config.response_schema.max_items == 2
+
+    def test_batch_input_tokens_split_across_pages(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """묶음 호출의 입력 토큰은 보낸 페이지에 나눠 기록하고 빈 페이지에는 없다."""
+        response = _response([_result("a"), _result("b")])
+        response.usage_metadata.prompt_token_count = 2001
+        mock_get_client.return_value.models.generate_content.return_value = response
+        stats = [{}, {}, {}]
+
+        extract_text_from_batch([_ink(), _blank(), _ink()], stats)
+
+        assert stats[0]["input_tokens"] == 1001
+        assert stats[2]["input_tokens"] == 1000
+        assert "input_tokens" not in stats[1]
+
+    def test_all_blank_makes_no_call(self, mock_get_client: MagicMock) -> None:
+        """모두 빈 페이지면 모델을 호출하지 않는다."""
+        results = extract_text_from_batch([_blank(), _blank()], [{}, {}])
+
+        assert all(r["에세이텍스트"] == "" for r in results)
+        mock_get_client.assert_not_called()
+
+
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr.config.get_genai_client")
+class TestExtractTextFromBatchAsync:
+    """extract_text_from_batch_async 함수 테스트."""
+
+    def test_batch_call_on_aio_client(self, mock_get_client: MagicMock) -> None:
+        """aio 클라이언트로 한 번 호출하고 동기 클라이언트는 쓰지 않는다."""
+        client = mock_get_client.return_value
+        client.aio.models.generate_content = AsyncMock(
+            return_value=_response([_result("a"), _result("b")])
+        )
+
+        results = asyncio.run(
+            extract_text_from_batch_async([_ink(), _ink()], [{}, {}])
+        )
+
+        assert results == [_result("a"), _result("b")]
+        client.aio.models.generate_content.assert_awaited_once()
+        client.models.generate_content.assert_not_called()
+
+    def test_fallback_calls_pages_on_aio_client(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """묶음 응답 검증 실패 시 페이지별 aio 호출로 다시 OCR한다."""
+        client = mock_get_client.return_value
+        client.aio.models.generate_content = AsyncMock(side_effect=[
+            _response("not json"),
+            _response(_result("a")),
+            _response(_result("b")),
+        ])
+        stats = [{}, {}]
+
+        results = asyncio.run(extract_text_from_batch_async([_ink(), _ink()], stats))
+
+        assert results == [_result("a"), _result("b")]
+        assert client.aio.models.generate_content.await_count == 3
+        assert stats[0]["batch_fallback"] is True
@@ -0,0 +1,176 @@
+"""ocr_cache 모듈 단위 테스트."""
+
+from unittest.mock import MagicMock, patch
+
+from google.genai import errors, types
+from PIL import Image
+
+from src import ocr_cache
+from src.ocr import OCR_PROMPT, extract_text_from_image
+from src.ocr_batch import extract_text_from_batch
+
+_RESULT = {"학번": "10305", "이름": "홍길동", "에세이텍스트": "에세이 본문"}
+_RESPONSE_TEXT = '{"학번": "10305", "이름": "홍길동", "에세이텍스트": "에세이 본문"}'
+
+
+def _part(data: bytes) -> types.Part:
+    return types.Part.from_bytes(data=data, mime_type="image/jpeg")
+
+
+# ---------------------------------------------------------------------------
+# cache_key / lookup / store 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestCacheKey:
+    """cache_key 함수 테스트."""
+
+    def test_same_inputs_same_key(self) -> None:
+        """같은 바이트, 프롬프트, 모델이면 같은 SHA-256 키."""
+        key = ocr_cache.cache_key(_part(b"page"), "prompt", "model")
+
+        assert key == ocr_cache.cache_key(_part(b"page"), "prompt", "model")
+        assert len(key) == 64
+
+    def test_any_input_change_changes_key(self) -> None:
+        """페이지 바이트, 프롬프트, 모델 중 하나라도 다르면 키가 다르다."""
+        base = ocr_cache.cache_key(_part(b"page"), "prompt", "model")
+
+        assert ocr_cache.cache_key(_part(b"page2"), "prompt", "model") != base
+        assert ocr_cache.cache_key(_part(b"page"), "prompt2", "model") != base
+        assert ocr_cache.cache_key(_part(b"page"), "prompt", "model2") != base
+        assert ocr_cache.cache_key(_part(b"pag"), "eprompt", "model") != base
+
+
+@patch("src.ocr_cache.config.OCR_CACHE_TTL_SECONDS", 60.0)
+@patch("src.ocr_cache.config.OCR_CACHE_MAX_BYTES", 10_000)
+@patch("src.ocr_cache.config.OCR_CACHE_ENABLED", True)
+class TestLookupStore:
+    """lookup, store, clear 함수 테스트."""
+
+    def test_miss_then_hit_returns_copy(self) -> None:
+        """없으면 None, 넣은 뒤에는 결과 사본을 반환한다."""
+        assert ocr_cache.lookup("k") is None
+
+        ocr_cache.store("k", _RESULT)
+        found = ocr_cache.lookup("k")
+        found["학번"] = "changed"
+
+        assert ocr_cache.lookup("k") == _RESULT
+
+    def test_expired_entry_dropped(self) -> None:
+        """TTL이 지난 항목은 None을 반환하고 캐시에서 뺀다."""
+        with patch("src.ocr_cache.time.monotonic", return_value=100.0):
+            ocr_cache.store("k", _RESULT)
+        with patch("src.ocr_cache.time.monotonic", return_value=159.0):
+            assert ocr_cache.lookup("k") == _RESULT
+        with patch("src.ocr_cache.time.monotonic", return_value=161.0):
+            assert ocr_cache.lookup("k") is None
+        assert ocr_cache.cache_bytes() == 0
+
+    def test_byte_budget_evicts_least_recently_used(self) -> None:
+        """바이트 예산을 넘으면 가장 오래 쓰지 않은 항목부터 버린다."""
+        size = ocr_cache._entry_size("a", _RESULT)
+        with patch("src.ocr_cache.config.OCR_CACHE_MAX_BYTES", size * 2):
+            ocr_cache.store("a", _RESULT)
+            ocr_cache.store("b", _RESULT)
+            ocr_cache.lookup("a")
+            ocr_cache.store("c", _RESULT)
+
+            assert ocr_cache.lookup("b") is None
+            assert ocr_cache.lookup("a") == _RESULT
+            assert ocr_cache.lookup("c") == _RESULT
+            assert ocr_cache.cache_bytes() == size * 2
+
+    def test_entry_larger_than_budget_not_stored(self) -> None:
+        """예산보다 큰 항목은 넣지 않는다."""
+        ocr_cache.store("big", {"에세이텍스트": "가" * 10_000})
+
+        assert ocr_cache.lookup("big") is None
+        assert ocr_cache.cache_bytes() == 0
+
+    def test_disabled_is_noop(self) -> None:
+        """OCR_CACHE_ENABLED가 꺼져 있으면 넣지도 찾지도 않는다."""
+        with patch("src.ocr_cache.config.OCR_CACHE_ENABLED", False):
+            ocr_cache.store("k", _RESULT)
+            assert ocr_cache.lookup("k") is None
+        assert ocr_cache.cache_bytes() == 0
+
+
+# ---------------------------------------------------------------------------
+# OCR 호출 경로의 캐시 적중
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_cache.config.OCR_CACHE_ENABLED", True)
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr.config.get_genai_client")
+class TestCachedOcr:
+    """extract_text_from_image/extract_text_from_batch의 캐시 사용 테스트."""
+
+    def test_same_page_reocr_skips_model_call(self, mock_get_client: MagicMock) -> None:
+        """같은 페이지를 다시 OCR하면 모델을 호출하지 않고 캐시 결과를 반환한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text=_RESPONSE_TEXT)
+        first: dict = {}
+        second: dict = {}
+
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"), first)
+        result = extract_text_from_image(Image.new("RGB", (40, 30), "black"), second)
+
+        assert result == _RESULT
+        assert generate.call_count == 1
+        assert "cache_hit" not in first and second["cache_hit"] is True
+
+    def test_media_resolution_change_misses_cache(
+        self, mock_get_client: MagicMock
+    ) -> None:
+        """media_resolution을 바꾸면 이전 해상도의 캐시 결과를 쓰지 않는다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text=_RESPONSE_TEXT)
+
+        with patch("src.ocr.config.OCR_MEDIA_RESOLUTION", "high"):
+            extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+        with patch("src.ocr.config.OCR_MEDIA_RESOLUTION", "low"):
+            extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+
+        assert generate.call_count == 2
+
+    @patch("src.ocr.config.OCR_MODEL_CHAIN", "gemini-3.1-pro-preview,gemini-3-flash-preview")
+    def test_fallback_model_result_not_cached(self, mock_get_client: MagicMock) -> None:
+        """대체 모델이 만든 결과는 캐시에 넣지 않아 다음 실행에서 첫 모델로 다시 OCR한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        overloaded = errors.ServerError(503, {"error": {"message": "overloaded"}})
+        generate.side_effect = [overloaded, MagicMock(text=_RESPONSE_TEXT)] * 2
+
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+
+        assert generate.call_count == 4
+
+    def test_parse_fallback_not_cached(self, mock_get_client: MagicMock) -> None:
+        """파싱 폴백 결과는 캐시에 넣지 않아 다음 실행에서 다시 OCR한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text="일반 텍스트")
+
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+
+        assert generate.call_count == 2
+
+    def test_batch_sends_only_uncached_pages(self, mock_get_client: MagicMock) -> None:
+        """묶음 OCR은 캐시에 있는 페이지를 요청에서 빼고 캐시 결과를 채운다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text=_RESPONSE_TEXT)
+        extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+        stats = [{}, {}]
+
+        results = extract_text_from_batch(
+            [Image.new("RGB", (40, 30), "black"), Image.new("RGB", (30, 40), "black")],
+            stats,
+        )
+
+        assert results == [_RESULT, _RESULT]
+        assert stats[0]["cache_hit"] is True
+        assert generate.call_args.kwargs["contents"][-1] == OCR_PROMPT
+        assert generate.call_count == 2
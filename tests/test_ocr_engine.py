@@ -0,0 +1,499 @@
+"""ocr_engine 모듈 단위 테스트."""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import pytest
+
+from src.ocr_engine import (
+    get_event_loop,
+    prefetch,
+    run_ordered,
+    run_ordered_async,
+)
+
+_TAG: contextvars.ContextVar[str | None] = contextvars.ContextVar("tag", default=None)
+
+
+class TestRunOrdered:
+    """run_ordered 함수 테스트."""
+
+    def test_returns_results_in_input_order(self) -> None:
+        """완료 순서와 무관하게 입력 순서대로 결과를 반환한다."""
+
+        def _work(x: int) -> int:
+            time.sleep(0.01 * (5 - x))
+            return x * 10
+
+        results, failures = run_ordered(_work, range(5), max_workers=5)
+
+        assert results == [0, 10, 20, 30, 40]
+        assert failures == {}
+
+    def test_empty_items(self) -> None:
+        """빈 입력은 빈 결과를 반환한다."""
+        results, failures = run_ordered(lambda x: x, [], max_workers=2)
+
+        assert results == []
+        assert failures == {}
+
+    def test_failures_tracked_per_index(self) -> None:
+        """실패한 항목은 인덱스별로 기록되고 결과는 None이 된다."""
+
+        def _work(x: int) -> int:
+            if x % 2:
+                raise ValueError(f"bad {x}")
+            return x
+
+        results, failures = run_ordered(_work, range(4), max_workers=2)
+
+        assert results == [0, None, 2, None]
+        assert set(failures) == {1, 3}
+        assert str(failures[3]) == "bad 3"
+
+    def test_concurrency_bounded_by_max_workers(self) -> None:
+        """동시에 실행되는 작업 수가 max_workers를 넘지 않는다."""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def _work(x: int) -> int:
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+            return x
+
+        run_ordered(_work, range(12), max_workers=3)
+
+        assert state["peak"] <= 3
+
+    def test_consumes_generator_lazily(self) -> None:
+        """제너레이터 입력은 대기 작업 수 한도 내에서만 미리 소비한다."""
+        produced: list[int] = []
+        release = threading.Event()
+
+        def _items():
+            for i in range(20):
+                produced.append(i)
+                yield i
+
+        def _work(x: int) -> int:
+            release.wait(1)
+            return x
+
+        thread = threading.Thread(
+            target=run_ordered, args=(_work, _items()), kwargs={"max_workers": 2}
+        )
+        thread.start()
+        time.sleep(0.1)
+        assert len(produced) <= 5
+        release.set()
+        thread.join()
+        assert len(produced) == 20
+
+    def test_on_done_called_for_every_item(self) -> None:
+        """각 항목 완료 시 on_done(index, result)가 호출자 스레드에서 호출된다."""
+        calls: list[tuple[int, object]] = []
+        caller = threading.get_ident()
+        threads: set[int] = set()
+
+        def _on_done(index: int, result: object) -> None:
+            threads.add(threading.get_ident())
+            calls.append((index, result))
+
+        run_ordered(lambda x: x + 1, [1, 2, 3], max_workers=2, on_done=_on_done)
+
+        assert sorted(calls) == [(0, 2), (1, 3), (2, 4)]
+        assert threads == {caller}
+
+    @patch("src.ocr_engine.config.OCR_MAX_WORKERS", 1)
+    def test_default_workers_from_config(self) -> None:
+        """max_workers 미지정 시 config.OCR_MAX_WORKERS를 사용한다."""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def _work(x: int) -> int:
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+            return x
+
+        run_ordered(_work, range(4))
+
+        assert state["peak"] == 1
+
+    def test_workers_inherit_caller_context(self) -> None:
+        """작업자 스레드는 호출자의 ContextVar 값을 본다 (작업자끼리 값은 섞이지 않음)."""
+        def _work(x: int) -> tuple[str | None, int]:
+            seen = _TAG.get()
+            _TAG.set(f"worker-{x}")
+            return seen, x
+
+        token = _TAG.set("job")
+        try:
+            results, _ = run_ordered(_work, range(4), max_workers=2)
+        finally:
+            _TAG.reset(token)
+
+        assert results == [("job", 0), ("job", 1), ("job", 2), ("job", 3)]
+
+
+class TestPrefetch:
+    """prefetch 함수 테스트."""
+
+    def test_yields_items_in_order(self) -> None:
+        """항목을 원래 순서대로 생성한다."""
+        assert list(prefetch(iter(range(10)), depth=3)) == list(range(10))
+
+    def test_producer_bounded_by_depth(self) -> None:
+        """소비자가 멈춰 있으면 생산자는 depth개 남짓까지만 미리 생성한다."""
+        produced: list[int] = []
+
+        def _items():
+            for i in range(50):
+                produced.append(i)
+                yield i
+
+        stream = prefetch(_items(), depth=3)
+        assert next(stream) == 0
+        time.sleep(0.1)
+
+        assert len(produced) <= 5
+        stream.close()
+
+    def test_producer_exception_reraised_in_consumer(self) -> None:
+        """생산자에서 발생한 예외를 소비자 쪽에서 다시 발생시킨다."""
+
+        def _items():
+            yield 1
+            raise ValueError("변환 실패")
+
+        stream = prefetch(_items(), depth=2)
+        assert next(stream) == 1
+        with pytest.raises(ValueError, match="변환 실패"):
+            next(stream)
+
+    def test_close_stops_producer(self) -> None:
+        """소비자가 순회를 중단하면 생산자도 더 이상 생성하지 않는다."""
+        produced: list[int] = []
+
+        def _items():
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        stream = prefetch(_items(), depth=2)
+        next(stream)
+        stream.close()
+        time.sleep(0.3)
+        count = len(produced)
+        time.sleep(0.2)
+
+        assert len(produced) == count < 1000
+
+    def test_feeds_run_ordered(self) -> None:
+        """run_ordered의 입력으로 사용해도 순서와 결과가 유지된다."""
+        results, failures = run_ordered(
+            lambda x: x * 2, prefetch(iter(range(20)), depth=4), max_workers=3
+        )
+
+        assert results == [x * 2 for x in range(20)]
+        assert failures == {}
+
+
+# ---------------------------------------------------------------------------
+# run_ordered_async 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestRunOrderedAsync:
+    """run_ordered_async 함수 테스트."""
+
+    def test_returns_results_in_input_order(self) -> None:
+        """완료 순서와 무관하게 입력 순서대로 결과를 반환한다."""
+
+        async def _work(x: int) -> int:
+            await asyncio.sleep(0.01 * (5 - x))
+            return x * 10
+
+        results, failures = run_ordered_async(_work, range(5), max_concurrency=5)
+
+        assert results == [0, 10, 20, 30, 40]
+        assert failures == {}
+
+    def test_empty_items(self) -> None:
+        """빈 입력은 빈 결과를 반환한다."""
+
+        async def _work(x: int) -> int:
+            return x
+
+        assert run_ordered_async(_work, [], max_concurrency=2) == ([], {})
+
+    def test_failures_tracked_per_index(self) -> None:
+        """실패한 항목은 결과가 None이고 예외가 인덱스별로 기록된다."""
+
+        async def _work(x: int) -> int:
+            if x == 1:
+                raise RuntimeError("boom")
+            return x
+
+        results, failures = run_ordered_async(_work, range(3), max_concurrency=3)
+
+        assert results == [0, None, 2]
+        assert list(failures) == [1]
+        assert str(failures[1]) == "boom"
+
+    def test_concurrency_bounded_by_semaphore(self) -> None:
+        """동시에 진행되는 코루틴 수가 max_concurrency를 넘지 않는다."""
+        state = {"running": 0, "peak": 0}
+
+        async def _work(x: int) -> int:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return x
+
+        run_ordered_async(_work, range(12), max_concurrency=3)
+
+        assert state["peak"] == 3
+
+    def test_hundreds_in_flight_use_few_threads(self) -> None:
+        """수백 개의 요청이 동시에 대기해도 스레드 수는 크게 늘지 않는다."""
+        state = {"running": 0, "peak": 0}
+        threads_before = threading.active_count()
+        threads_during: list[int] = []
+
+        async def _work(x: int) -> int:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.2)
+            threads_during.append(threading.active_count())
+            state["running"] -= 1
+            return x
+
+        start = time.monotonic()
+        results, _ = run_ordered_async(_work, range(300), max_concurrency=300)
+        elapsed = time.monotonic() - start
+
+        assert results == list(range(300))
+        assert state["peak"] >= 250
+        assert elapsed < 2
+        assert max(threads_during) - threads_before <= 40
+
+    def test_consumes_generator_lazily(self) -> None:
+        """세마포어 자리가 난 만큼만 제너레이터를 소비한다."""
+        produced: list[int] = []
+        release = threading.Event()
+
+        def _items():
+            for i in range(20):
+                produced.append(i)
+                yield i
+
+        async def _work(x: int) -> int:
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            return x
+
+        thread = threading.Thread(
+            target=run_ordered_async, args=(_work, _items()),
+            kwargs={"max_concurrency": 2},
+        )
+        thread.start()
+        time.sleep(0.1)
+        assert len(produced) <= 2
+        release.set()
+        thread.join()
+        assert len(produced) == 20
+
+    def test_item_exception_propagates(self) -> None:
+        """항목 생성 중 예외는 진행 중인 코루틴이 끝난 뒤 호출자에게 전파된다."""
+        finished: list[int] = []
+
+        def _items():
+            yield 0
+            raise ValueError("bad file")
+
+        async def _work(x: int) -> int:
+            await asyncio.sleep(0.05)
+            finished.append(x)
+            return x
+
+        with pytest.raises(ValueError, match="bad file"):
+            run_ordered_async(_work, _items(), max_concurrency=2)
+        assert finished == [0]
+
+    def test_on_done_called_on_caller_thread(self) -> None:
+        """각 항목 완료 시 on_done(index, result)가 호출자 스레드에서 호출된다."""
+        calls: list[tuple[int, object]] = []
+        caller = threading.get_ident()
+        threads: set[int] = set()
+
+        def _on_done(index: int, result: object) -> None:
+            threads.add(threading.get_ident())
+            calls.append((index, result))
+
+        async def _work(x: int) -> int:
+            return x + 1
+
+        run_ordered_async(_work, [1, 2, 3], max_concurrency=2, on_done=_on_done)
+
+        assert sorted(calls) == [(0, 2), (1, 3), (2, 4)]
+        assert threads == {caller}
+
+    def test_coroutines_inherit_caller_context(self) -> None:
+        """코루틴은 공용 루프에서 돌아도 호출자의 ContextVar 값을 본다."""
+        async def _work(x: int) -> str | None:
+            return _TAG.get()
+
+        token = _TAG.set("job")
+        try:
+            results, _ = run_ordered_async(_work, range(3))
+        finally:
+            _TAG.reset(token)
+
+        assert results == ["job", "job", "job"]
+
+    @patch("src.ocr_engine.config.OCR_ASYNC_CONCURRENCY", 1)
+    def test_default_concurrency_from_config(self) -> None:
+        """max_concurrency 미지정 시 config.OCR_ASYNC_CONCURRENCY를 사용한다."""
+        state = {"running": 0, "peak": 0}
+
+        async def _work(x: int) -> int:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return x
+
+        run_ordered_async(_work, range(4))
+
+        assert state["peak"] == 1
+
+    def test_event_loop_is_shared(self) -> None:
+        """모든 호출이 백그라운드 스레드의 같은 이벤트 루프에서 실행된다."""
+        loops: list[asyncio.AbstractEventLoop] = []
+
+        async def _work(x: int) -> int:
+            loops.append(asyncio.get_running_loop())
+            return x
+
+        run_ordered_async(_work, [1])
+        run_ordered_async(_work, [2])
+
+        assert loops[0] is loops[1] is get_event_loop()
+        assert get_event_loop().is_running()
+
+
+# ---------------------------------------------------------------------------
+# 작업 취소
+# ---------------------------------------------------------------------------
+
+
+class TestCancel:
+    """run_ordered / run_ordered_async의 취소 토큰과 호출자 예외 처리 테스트."""
+
+    def test_cancel_stops_pulling_and_skips_queued_work(self) -> None:
+        """취소되면 새 항목을 꺼내지 않고, 시작하지 않은 작업을 버리고 바로 돌아온다."""
+        cancel = threading.Event()
+        started: list[int] = []
+        pulled: list[int] = []
+
+        def _items():
+            for x in range(50):
+                pulled.append(x)
+                yield x
+
+        def _work(x: int) -> int:
+            started.append(x)
+            if x == 0:
+                cancel.set()
+            time.sleep(0.3)
+            return x
+
+        begin = time.monotonic()
+        with pytest.raises(CancelledError):
+            run_ordered(_work, _items(), max_workers=2, cancel=cancel)
+
+        assert time.monotonic() - begin < 0.25
+        assert len(pulled) <= 5
+        time.sleep(0.35)
+        assert 0 in started and len(started) <= 2
+
+    def test_caller_exception_does_not_wait_for_queue(self) -> None:
+        """on_done 콜백이 예외를 올리면 대기 중인 작업을 버리고 곧바로 전파한다."""
+        started: list[int] = []
+
+        def _work(x: int) -> int:
+            started.append(x)
+            time.sleep(0.05)
+            return x
+
+        def _on_done(index: int, _result: int) -> None:
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_ordered(_work, range(20), max_workers=2, on_done=_on_done)
+
+        time.sleep(0.15)
+        assert len(started) <= 4
+
+    def test_async_cancel_cancels_in_flight_coroutines(self) -> None:
+        """비동기 실행은 진행 중인 코루틴을 취소하여 끝까지 기다리지 않는다."""
+        cancel = threading.Event()
+        state = {"finished": 0, "cancelled": 0}
+
+        async def _work(x: int) -> int:
+            if x == 2:
+                cancel.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                state["cancelled"] += 1
+                raise
+            state["finished"] += 1
+            return x
+
+        begin = time.monotonic()
+        with pytest.raises(CancelledError):
+            run_ordered_async(_work, range(10), max_concurrency=3, cancel=cancel)
+
+        assert time.monotonic() - begin < 1
+        assert state == {"finished": 0, "cancelled": 3}
+
+    def test_cancel_after_last_item_raises(self) -> None:
+        """마지막 항목이 끝난 뒤 설정된 취소도 두 엔진 모두 결과 대신 CancelledError로 알린다."""
+
+        async def _work(x: int) -> int:
+            return x
+
+        for run, func in ((run_ordered, lambda x: x), (run_ordered_async, _work)):
+            cancel = threading.Event()
+            with pytest.raises(CancelledError):
+                run(func, range(2), cancel=cancel, on_done=lambda i, r: cancel.set())
+
+    def test_uncancelled_token_changes_nothing(self) -> None:
+        """설정되지 않은 토큰은 결과와 on_done 호출에 영향이 없다."""
+        cancel = threading.Event()
+        done: list[int] = []
+
+        async def _work(x: int) -> int:
+            return x
+
+        assert run_ordered(
+            lambda x: x * 2, range(4), max_workers=2, cancel=cancel,
+        ) == ([0, 2, 4, 6], {})
+        assert run_ordered_async(
+            _work, range(3), cancel=cancel, on_done=lambda i, r: done.append(i),
+        ) == ([0, 1, 2], {})
+        assert sorted(done) == [0, 1, 2]
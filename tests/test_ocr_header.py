@@ -0,0 +1,345 @@
+"""ocr_header 모듈 단위 테스트."""
+
+import asyncio
+import io
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from google.genai import errors, types
+from PIL import Image, ImageDraw
+
+from src import ocr_retry
+from src.ocr import MODEL_NAME, OCR_PROMPT
+from src.ocr_batch import TEXT_BATCH_PROMPT, build_batch_prompt
+from src.ocr_header import (
+    HEADER_MODEL_NAME,
+    HEADER_PROMPT,
+    TEXT_PROMPT,
+    extract_header,
+    extract_header_async,
+    extract_two_tier,
+    extract_two_tier_async,
+    extract_two_tier_batch,
+    extract_two_tier_batch_async,
+    parse_header_response,
+    parse_text_response,
+)
+
+MERGED = {"학번": "10305", "이름": "홍길동", "에세이텍스트": "에세이 본문"}
+
+
+def _response(payload, tokens: int | None = None) -> MagicMock:
+    text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+    response = MagicMock(text=text)
+    response.usage_metadata.prompt_token_count = tokens
+    return response
+
+
+def _sheet(body_top: int = 300) -> Image.Image:
+    """위쪽 머리글과 아래쪽 본문(body_top부터)에 글씨가 있는 답안지."""
+    image = Image.new("RGB", (400, 800), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, 360, 120), fill="black")
+    draw.rectangle((40, body_top, 360, 700), fill="black")
+    return image
+
+
+def _fake_generate(tokens: dict[str, int]):
+    """모델 이름에 따라 머리글 응답, 본문 응답, 본문 묶음 응답을 돌려주는 대체 함수.
+
+    묶음 응답의 에세이텍스트는 이미지 순서대로 "본문 N"이다.
+    """
+
+    def _generate(model, contents, config):
+        if model == HEADER_MODEL_NAME:
+            return _response({"학번": "10305", "이름": "홍길동"}, tokens.get(model))
+        if contents[-1] == TEXT_PROMPT:
+            return _response({"에세이텍스트": "에세이 본문"}, tokens.get(model))
+        count = sum(isinstance(item, types.Part) for item in contents)
+        payload = [{"에세이텍스트": f"본문 {n}"} for n in range(1, count + 1)]
+        return _response(payload, tokens.get(model))
+
+    return _generate
+
+
+def _decoded_size(part: types.Part) -> tuple[int, int]:
+    return Image.open(io.BytesIO(part.inline_data.data)).size
+
+
+def _assert_no_id_prompt(calls) -> None:
+    """본 모델 호출에는 학번/이름을 읽게 하는 프롬프트와 스키마 필드가 없다."""
+    for call in calls:
+        if call.kwargs["model"] != MODEL_NAME:
+            continue
+        contents = call.kwargs["contents"]
+        assert OCR_PROMPT not in contents and HEADER_PROMPT not in contents
+        schema = call.kwargs["config"].response_schema
+        fields = (schema.items or schema).properties
+        assert list(fields) == ["에세이텍스트"]
+
+
+# ---------------------------------------------------------------------------
+# parse_header_response / parse_text_response 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestParseResponses:
+    """parse_header_response, parse_text_response 함수 테스트."""
+
+    def test_header_fields_and_prompt(self) -> None:
+        """학번/이름만 꺼내고, 프롬프트에는 injection 방어 문구가 있다."""
+        text = '```json\n{"학번": "10305", "이름": "홍길동", "기타": "x"}\n```'
+
+        assert parse_header_response(text) == {"학번": "10305", "이름": "홍길동"}
+        assert "prompt injection" in HEADER_PROMPT
+        assert "prompt injection" in TEXT_PROMPT
+
+    def test_header_fallback_is_empty_and_recorded(self) -> None:
+        """머리글 파싱에 실패하면 빈 학번/이름과 parse_fallback."""
+        stats: dict = {}
+
+        assert parse_header_response("학번 10305", stats) == {"학번": "", "이름": ""}
+        assert stats["parse_fallback"] is True
+
+    def test_text_field(self) -> None:
+        """본문 응답에서 에세이텍스트를 꺼낸다."""
+        stats: dict = {}
+
+        assert parse_text_response('{"에세이텍스트": "본문"}', stats) == "본문"
+        assert stats == {}
+
+    def test_text_fallback_keeps_raw_text(self) -> None:
+        """본문 파싱에 실패하면 원문을 보존하고 parse_fallback을 기록한다."""
+        stats: dict = {}
+
+        assert parse_text_response("그냥 본문", stats) == "그냥 본문"
+        assert stats["parse_fallback"] is True
+
+
+# ---------------------------------------------------------------------------
+# extract_two_tier 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_header.config.OCR_HEADER_MEDIA_RESOLUTION", "low")
+@patch("src.ocr_header.config.OCR_HEADER_FRACTION", 0.25)
+@patch("src.ocr.config.OCR_MEDIA_RESOLUTION", "high")
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr_header.config.get_genai_client")
+class TestExtractTwoTier:
+    """extract_two_tier, extract_two_tier_async 함수 테스트."""
+
+    def test_header_and_text_calls_merged(self, mock_get_client: MagicMock) -> None:
+        """머리글은 빠른 모델에 낮은 해상도로, 본문은 본 모델로 보내고 결과를 합친다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _fake_generate({HEADER_MODEL_NAME: 70, MODEL_NAME: 1100})
+        stats: dict = {}
+
+        result = extract_two_tier(_sheet(), stats)
+
+        assert result == MERGED
+        calls = {c.kwargs["model"]: c.kwargs for c in generate.call_args_list}
+        header, text = calls[HEADER_MODEL_NAME], calls[MODEL_NAME]
+        assert header["contents"][1] == HEADER_PROMPT
+        assert header["config"].media_resolution == types.MediaResolution.MEDIA_RESOLUTION_LOW
+        assert text["contents"][1] == TEXT_PROMPT
+        assert text["config"].media_resolution == types.MediaResolution.MEDIA_RESOLUTION_HIGH
+        _, header_height = _decoded_size(header["contents"][0])
+        _, text_height = _decoded_size(text["contents"][0])
+        assert header_height < text_height / 2
+        assert stats["input_tokens"] == 1170
+        assert stats["header_pass"] is True
+
+    def test_pro_model_gets_no_id_prompt_and_calls_overlap(
+        self, mock_get_client: MagicMock,
+    ) -> None:
+        """본 모델에는 학번/이름 없는 본문 프롬프트만 가고, 두 호출은 겹쳐 돈다."""
+        fake = _fake_generate({})
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _generate(model, contents, config):
+            barrier.wait()  # 두 호출이 모두 진행 중이어야 통과한다
+            return fake(model, contents, config)
+
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _generate
+
+        assert extract_two_tier(_sheet()) == MERGED
+        assert sorted(c.kwargs["model"] for c in generate.call_args_list) == sorted(
+            [HEADER_MODEL_NAME, MODEL_NAME]
+        )
+        _assert_no_id_prompt(generate.call_args_list)
+
+    def test_async_calls_overlap_on_aio_client(self, mock_get_client: MagicMock) -> None:
+        """비동기 버전은 aio 클라이언트로 두 호출을 동시에 기다리고 같은 결과를 합친다."""
+        fake = _fake_generate({HEADER_MODEL_NAME: 70, MODEL_NAME: 1100})
+        started = {HEADER_MODEL_NAME: asyncio.Event(), MODEL_NAME: asyncio.Event()}
+
+        async def _generate(model, contents, config):
+            started[model].set()
+            other = MODEL_NAME if model == HEADER_MODEL_NAME else HEADER_MODEL_NAME
+            await asyncio.wait_for(started[other].wait(), 5)
+            return fake(model, contents, config)
+
+        client = mock_get_client.return_value
+        client.aio.models.generate_content = AsyncMock(side_effect=_generate)
+        stats: dict = {}
+
+        result = asyncio.run(extract_two_tier_async(_sheet(), stats))
+
+        assert result == MERGED
+        assert client.aio.models.generate_content.await_count == 2
+        client.models.generate_content.assert_not_called()
+        _assert_no_id_prompt(client.aio.models.generate_content.call_args_list)
+        assert stats["input_tokens"] == 1170
+
+    def test_blank_page_skips_both_calls(self, mock_get_client: MagicMock) -> None:
+        """빈 페이지는 두 호출 모두 생략한다."""
+        result = extract_two_tier(Image.new("RGB", (400, 800), "white"))
+
+        assert result == {"학번": "", "이름": "", "에세이텍스트": ""}
+        mock_get_client.assert_not_called()
+
+    def test_repeat_page_served_from_cache(self, mock_get_client: MagicMock) -> None:
+        """같은 페이지를 다시 2단 OCR하면 캐시 결과를 쓰고 호출하지 않는다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _fake_generate({})
+        stats: dict = {}
+
+        first = extract_two_tier(_sheet())
+        second = extract_two_tier(_sheet(), stats)
+
+        assert second == first
+        assert generate.call_count == 2
+        assert stats["cache_hit"] is True
+
+    @patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 30)
+    def test_header_call_follows_page_deadline(self, mock_get_client: MagicMock) -> None:
+        """보조 스레드의 머리글 호출도 페이지 작업의 마감을 요청 제한 시간으로 받는다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _fake_generate({})
+
+        ocr_retry.call_with_retry(extract_two_tier, _sheet())
+
+        timeouts = {
+            c.kwargs["model"]: c.kwargs["config"].http_options.timeout
+            for c in generate.call_args_list
+        }
+        assert 0 < timeouts[HEADER_MODEL_NAME] <= 30_000
+        assert 0 < timeouts[MODEL_NAME] <= 30_000
+
+    def test_overloaded_header_model_falls_back(self, mock_get_client: MagicMock) -> None:
+        """머리글 모델이 과부하(503)면 본 OCR 모델로 넘어가고 결과는 캐시하지 않는다."""
+        fake = _fake_generate({})
+
+        def _generate(model, contents, config):
+            if model == HEADER_MODEL_NAME:
+                raise errors.ServerError(503, {"error": {"message": "overloaded"}})
+            if contents[1] == HEADER_PROMPT:
+                return _response({"학번": "10305", "이름": "홍길동"})
+            return fake(model, contents, config)
+
+        mock_get_client.return_value.models.generate_content.side_effect = _generate
+        stats: dict = {}
+
+        result = extract_two_tier(_sheet(), stats)
+
+        assert result == MERGED
+        assert stats["model"] == MODEL_NAME
+        assert stats["model_fallback"] is True
+
+
+# ---------------------------------------------------------------------------
+# extract_two_tier_batch 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr_header.config.get_genai_client")
+class TestExtractTwoTierBatch:
+    """extract_two_tier_batch, extract_two_tier_batch_async 함수 테스트."""
+
+    def test_text_in_one_batch_call_headers_per_page(self, mock_get_client: MagicMock) -> None:
+        """본문은 본문 전용 묶음 호출 하나로, 머리글은 페이지마다 보내고 빈 페이지는 뺀다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _fake_generate({})
+        stats_list: list[dict] = [{}, {}, {}]
+        blank = Image.new("RGB", (400, 800), "white")
+
+        results = extract_two_tier_batch([_sheet(), blank, _sheet(400)], stats_list)
+
+        assert [r["에세이텍스트"] for r in results] == ["본문 1", "", "본문 2"]
+        assert results[0]["학번"] == results[2]["학번"] == "10305"
+        models = [c.kwargs["model"] for c in generate.call_args_list]
+        assert models.count(MODEL_NAME) == 1 and models.count(HEADER_MODEL_NAME) == 2
+        batch = next(c for c in generate.call_args_list if c.kwargs["model"] == MODEL_NAME)
+        assert batch.kwargs["contents"][-1] == build_batch_prompt(2, TEXT_BATCH_PROMPT)
+        _assert_no_id_prompt(generate.call_args_list)
+        assert stats_list[0]["batch_size"] == stats_list[2]["batch_size"] == 2
+        assert "batch_size" not in stats_list[1]
+
+    def test_invalid_batch_falls_back_per_page(self, mock_get_client: MagicMock) -> None:
+        """본문 묶음 응답이 검증에 실패하면 페이지마다 본문 프롬프트로 다시 보낸다."""
+        fake = _fake_generate({})
+
+        def _generate(model, contents, config):
+            if model == MODEL_NAME and contents[-1] != TEXT_PROMPT:
+                return _response('[{"본문": "x"}]')
+            return fake(model, contents, config)
+
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _generate
+        stats_list: list[dict] = [{}, {}]
+
+        results = extract_two_tier_batch([_sheet(), _sheet(400)], stats_list)
+
+        assert results == [MERGED, MERGED]
+        text_calls = [c for c in generate.call_args_list if c.kwargs["contents"][-1] == TEXT_PROMPT]
+        assert len(text_calls) == 2
+        assert all(stats["batch_fallback"] for stats in stats_list)
+
+    def test_async_batch(self, mock_get_client: MagicMock) -> None:
+        """비동기 버전도 본문 묶음 호출 하나와 페이지별 머리글 호출을 보낸다."""
+        client = mock_get_client.return_value
+        client.aio.models.generate_content = AsyncMock(side_effect=_fake_generate({}))
+
+        results = asyncio.run(
+            extract_two_tier_batch_async([_sheet(), _sheet(400)], [{}, {}])
+        )
+
+        assert [r["에세이텍스트"] for r in results] == ["본문 1", "본문 2"]
+        models = [c.kwargs["model"] for c in client.aio.models.generate_content.call_args_list]
+        assert models.count(MODEL_NAME) == 1 and models.count(HEADER_MODEL_NAME) == 2
+
+
+# ---------------------------------------------------------------------------
+# extract_header 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr_header.config.get_genai_client")
+class TestExtractHeader:
+    """extract_header, extract_header_async 함수 테스트."""
+
+    def test_header_only_call(self, mock_get_client: MagicMock) -> None:
+        """머리글 모델에 한 번만 보내 학번/이름을 읽고 header_pass를 기록한다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = _fake_generate({HEADER_MODEL_NAME: 70})
+        stats: dict = {}
+
+        result = extract_header(_sheet(), stats)
+
+        assert result == {"학번": "10305", "이름": "홍길동"}
+        assert [c.kwargs["model"] for c in generate.call_args_list] == [HEADER_MODEL_NAME]
+        assert generate.call_args.kwargs["contents"][1] == HEADER_PROMPT
+        assert stats["input_tokens"] == 70
+        assert stats["header_pass"] is True
+
+    def test_async_blank_page_makes_no_call(self, mock_get_client: MagicMock) -> None:
+        """비동기 버전도 빈 페이지는 호출 없이 빈 학번/이름을 반환한다."""
+        result = asyncio.run(extract_header_async(Image.new("RGB", (400, 800), "white")))
+
+        assert result == {"학번": "", "이름": ""}
+        mock_get_client.assert_not_called()
@@ -0,0 +1,261 @@
+"""ocr_offline 모듈 단위 테스트 (로컬 대역 서버 사용)."""
+
+import threading
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import pytest
+from google.genai import types
+from PIL import Image
+
+from src.ocr import MODEL_NAME, OCR_PROMPT, extract_text_from_image
+from src.ocr_header import HEADER_MODEL_NAME, HEADER_PROMPT
+from src.ocr_offline import ocr_files_offline
+from tests.genai_stub import error_response, text_response
+
+
+def _ink(width: int) -> Image.Image:
+    """빈 페이지로 판정되지 않는 검은 이미지 (너비로 페이지를 구분)."""
+    return Image.new("RGB", (width, 30), "black")
+
+
+def _echo_key(request: dict, metadata: dict) -> dict:
+    """요청 metadata의 key를 에세이텍스트로 돌려주는 응답."""
+    return text_response(
+        '{"학번": "10305", "이름": "홍길동", "에세이텍스트": "%s"}' % metadata["key"], 120
+    )
+
+
+def _run(genai_stub, pages_by_file: dict[str, list[Image.Image]], **kwargs):
+    """pages_by_file의 페이지를 iter_page_tasks 경로(PDF는 raster_pool)로 꺼내 오프라인 OCR한다."""
+
+    def _raster(docs, report=None, skip=None):
+        for data, count in docs:
+            yield from pages_by_file[data.decode()][:count]
+
+    with patch("src.ocr_offline.config.get_genai_client", genai_stub.client), patch(
+        "src.ocr_offline.file_handler.count_pages",
+        side_effect=lambda filename, _bytes: len(pages_by_file[filename]),
+    ), patch(
+        "src.ocr_pages.ocr.iter_file_pages",
+        side_effect=lambda filename, _bytes: list(pages_by_file[filename]),
+    ), patch("src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_raster):
+        return ocr_files_offline(
+            [(name, name.encode()) for name in pages_by_file], **kwargs
+        )
+
+
+def _texts(result) -> list[tuple[str, list[str]]]:
+    return [(name, [p["에세이텍스트"] for p in pages]) for name, pages in result]
+
+
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr_pages.config.DEDUP_ENABLED", False)
+@patch("src.ocr_pages.config.PDF_TEXT_ENABLED", False)
+@patch("src.ocr_pages.config.PDF_IMAGES_ENABLED", False)
+@patch("src.ocr_offline.config.OCR_OFFLINE_TIMEOUT_SECONDS", 30.0)
+@patch("src.ocr_offline.config.OCR_OFFLINE_POLL_SECONDS", 0.0)
+@patch("src.ocr_offline.config.OCR_OFFLINE_JOB_BYTES", 18_000_000)
+class TestOcrFilesOffline:
+    """ocr_files_offline 함수 테스트."""
+
+    def test_results_mapped_back_to_file_and_page(self, genai_stub) -> None:
+        """배치 작업 하나로 제출하고, 완료까지 폴링한 뒤 (파일, 페이지)로 되돌린다."""
+        genai_stub.responder = _echo_key
+        genai_stub.polls_until_done = 3
+        progress: list[tuple[int, int]] = []
+        report: list[dict] = []
+
+        result = _run(
+            genai_stub, {"a.pdf": [_ink(40), _ink(41)], "b.png": [_ink(42)]},
+            on_progress=lambda done, total: progress.append((done, total)),
+            page_report=report,
+        )
+
+        assert _texts(result) == [("a.pdf", ["0:0", "0:1"]), ("b.png", ["1:0"])]
+        assert result[0][1][0]["학번"] == "10305"
+        assert genai_stub.requests_log.count(("GET", "/v1beta/batches/job-1")) == 3
+        assert progress == [(0, 3), (3, 3)]
+        assert [(r["file"], r["page"]) for r in report] == [
+            ("a.pdf", 1), ("a.pdf", 2), ("b.png", 1),
+        ]
+        assert all(r["batch_job"] == "batches/job-1" for r in report)
+        assert all(r["input_tokens"] == 120 for r in report)
+        assert genai_stub.deleted_jobs == ["batches/job-1"]
+        assert genai_stub.cancelled_jobs == []
+
+    @patch("src.ocr.config.OCR_RESPONSE_SCHEMA", True)
+    def test_request_carries_model_prompt_and_schema(self, genai_stub) -> None:
+        """요청마다 업로드 인코딩한 이미지, OCR 프롬프트, 응답 스키마를 싣는다."""
+        genai_stub.responder = _echo_key
+
+        _run(genai_stub, {"a.png": [_ink(40)]})
+
+        job = genai_stub.jobs["batches/job-1"]
+        assert job["model"] == f"models/{MODEL_NAME}"
+        request = job["requests"][0]["request"]
+        parts = request["contents"][0]["parts"]
+        assert "inlineData" in parts[0]
+        assert parts[1]["text"] == OCR_PROMPT
+        assert request["generationConfig"]["responseMimeType"] == "application/json"
+
+    def test_blank_and_cached_pages_not_sent(self, genai_stub) -> None:
+        """빈 페이지와 OCR 캐시에 있는 페이지는 요청에 넣지 않는다."""
+        genai_stub.responder = _echo_key
+        cached = {"학번": "1", "이름": "캐시", "에세이텍스트": "cached"}
+        with patch("src.ocr.config.get_genai_client") as mock_client:
+            mock_client.return_value.models.generate_content.return_value.text = (
+                '{"학번": "1", "이름": "캐시", "에세이텍스트": "cached"}'
+            )
+            extract_text_from_image(_ink(41))
+
+        result = _run(genai_stub, {
+            "a.pdf": [_ink(40), Image.new("RGB", (40, 30), "white"), _ink(41)],
+        })
+
+        assert result[0][1] == [
+            {"학번": "10305", "이름": "홍길동", "에세이텍스트": "0:0"},
+            {"학번": "", "이름": "", "에세이텍스트": ""},
+            cached,
+        ]
+        assert len(genai_stub.jobs["batches/job-1"]["requests"]) == 1
+
+    def test_pages_routed_like_interactive_ocr(self, genai_stub) -> None:
+        """iter_page_tasks의 텍스트/중복 페이지는 대화형 OCR처럼 머리글 요청만 보내거나 요청하지 않는다."""
+        pages = [
+            (types.Part(text="타이핑한 본문"), {}),
+            (_ink(40), {}),
+            (_ink(40), {"duplicate_of": 1, "duplicate_exact": True}),
+            (_ink(41), {"duplicate_of": 1, "hash_distance": 1}),
+        ]
+
+        def _tasks(files_data, page_counts, owners, page_stats, raster_report):
+            raster_report.append({"doc": 0, "page": 2, "dpi": 200, "pixels": 1200})
+            for page, stats in pages:
+                owners.append(0)
+                page_stats.append(stats)
+                yield page, stats
+
+        def _respond(request: dict, metadata: dict) -> dict:
+            prompt = request["contents"][0]["parts"][-1]["text"]
+            if prompt == OCR_PROMPT:
+                return _echo_key(request, metadata)
+            return text_response('{"학번": "%s", "이름": "머리글"}' % metadata["key"])
+
+        genai_stub.responder = _respond
+        report: list[dict] = []
+        with patch("src.ocr_offline.ocr_pages.iter_page_tasks", side_effect=_tasks):
+            result = _run(genai_stub, {"a.pdf": [None] * 4}, page_report=report)
+
+        models = {name: job["model"] for name, job in genai_stub.jobs.items()}
+        assert models == {
+            "batches/job-1": f"models/{HEADER_MODEL_NAME}",
+            "batches/job-2": f"models/{MODEL_NAME}",
+        }
+        header_parts = [
+            r["request"]["contents"][0]["parts"]
+            for r in genai_stub.jobs["batches/job-1"]["requests"]
+        ]
+        assert "타이핑한 본문" in header_parts[0][0]["text"]
+        assert header_parts[1][-1]["text"] == HEADER_PROMPT
+        assert len(genai_stub.jobs["batches/job-2"]["requests"]) == 1
+        assert [(p["학번"], p["에세이텍스트"]) for p in result[0][1]] == [
+            ("0:0", "타이핑한 본문"), ("10305", "0:1"), ("10305", "0:1"), ("0:3", "0:1"),
+        ]
+        assert report[1]["dpi"] == 200
+        assert report[3]["duplicate_of"] == "a.pdf 2페이지"
+        assert report[3]["header_pass"] is True
+
+    def test_pages_split_across_jobs_by_byte_budget(self, genai_stub) -> None:
+        """인라인 크기 상한을 넘으면 여러 작업으로 나눠 제출한다."""
+        genai_stub.responder = _echo_key
+        pages = {"a.pdf": [_ink(40 + n) for n in range(5)]}
+
+        with patch("src.ocr_offline.config.OCR_OFFLINE_JOB_BYTES", 3_000):
+            result = _run(genai_stub, pages)
+
+        assert len(genai_stub.jobs) > 1
+        assert sum(len(job["requests"]) for job in genai_stub.jobs.values()) == 5
+        assert _texts(result) == [("a.pdf", [f"0:{n}" for n in range(5)])]
+
+    def test_failed_request_isolated(self, genai_stub) -> None:
+        """실패한 요청의 페이지만 빈 결과로 남기고 failed_pages에 기록한다."""
+        genai_stub.responder = lambda request, metadata: (
+            error_response(429, "quota") if metadata["key"] == "0:1"
+            else _echo_key(request, metadata)
+        )
+        failed: list[dict] = []
+        report: list[dict] = []
+
+        result = _run(
+            genai_stub, {"a.pdf": [_ink(40), _ink(41)]},
+            failed_pages=failed, page_report=report,
+        )
+
+        assert _texts(result) == [("a.pdf", ["0:0", ""])]
+        assert failed == [
+            {"file": "a.pdf", "page": 2, "error": "BatchRequestError: 429 quota"},
+        ]
+        assert report[1]["ocr_error"] == "BatchRequestError: 429 quota"
+
+    def test_failed_request_raises_without_failed_pages(self, genai_stub) -> None:
+        """failed_pages가 없으면 실패한 요청에서 RuntimeError를 올린다."""
+        genai_stub.responder = lambda request, metadata: error_response(400, "bad")
+
+        with pytest.raises(RuntimeError, match="a.pdf 1페이지"):
+            _run(genai_stub, {"a.pdf": [_ink(40)]})
+        assert genai_stub.deleted_jobs == ["batches/job-1"]
+
+    def test_failed_job_marks_all_its_pages(self, genai_stub) -> None:
+        """실패한 작업의 페이지는 모두 실패로 기록한다."""
+        genai_stub.failed_jobs.add("batches/job-1")
+        failed: list[dict] = []
+
+        _run(genai_stub, {"a.pdf": [_ink(40), _ink(41)]}, failed_pages=failed)
+
+        assert [f["page"] for f in failed] == [1, 2]
+        assert all("JOB_STATE_FAILED" in f["error"] for f in failed)
+
+    def test_timeout_raises(self, genai_stub) -> None:
+        """제한 시간 안에 끝나지 않으면 TimeoutError."""
+        genai_stub.polls_until_done = 10**6
+
+        with patch("src.ocr_offline.config.OCR_OFFLINE_TIMEOUT_SECONDS", 0.0):
+            with pytest.raises(TimeoutError, match="batches/job-1"):
+                _run(genai_stub, {"a.pdf": [_ink(40)]})
+
+    def test_timeout_cancels_and_deletes_running_job(self, genai_stub) -> None:
+        """제한 시간이 지나면 끝나지 않은 작업을 취소하고 삭제한 뒤 TimeoutError를 올린다."""
+        genai_stub.polls_until_done = 10**6
+
+        with patch("src.ocr_offline.config.OCR_OFFLINE_TIMEOUT_SECONDS", 0.0):
+            with pytest.raises(TimeoutError):
+                _run(genai_stub, {"a.pdf": [_ink(40)]})
+
+        assert genai_stub.cancelled_jobs == ["batches/job-1"]
+        assert genai_stub.deleted_jobs == ["batches/job-1"]
+
+    def test_cancel_token_stops_polling(self, genai_stub) -> None:
+        """취소 토큰이 설정되면 폴링을 멈추고 작업을 취소/삭제한 뒤 CancelledError를 올린다."""
+        genai_stub.polls_until_done = 10**6
+        cancel = threading.Event()
+
+        with patch("src.ocr_offline.config.OCR_OFFLINE_POLL_SECONDS", 30.0):
+            with pytest.raises(CancelledError):
+                _run(
+                    genai_stub, {"a.pdf": [_ink(40)]}, cancel=cancel,
+                    on_progress=lambda done, total: cancel.set(),
+                )
+
+        assert ("GET", "/v1beta/batches/job-1") not in genai_stub.requests_log
+        assert genai_stub.cancelled_jobs == ["batches/job-1"]
+        assert genai_stub.deleted_jobs == ["batches/job-1"]
+
+    def test_failed_cleanup_keeps_results(self, genai_stub) -> None:
+        """작업 삭제가 실패해도 결과는 그대로 돌려준다 (경고만 남김)."""
+        genai_stub.responder = _echo_key
+        genai_stub.fail_deletes = True
+
+        result = _run(genai_stub, {"a.png": [_ink(40)]})
+
+        assert _texts(result) == [("a.png", ["0:0"])]
@@ -0,0 +1,151 @@
+"""ocr_pages 모듈 단위 테스트."""
+
+from unittest.mock import patch
+
+import pytest
+from google.genai import types
+
+from src.ocr_pages import is_pdf, iter_page_tasks
+
+
+def _fake_raster(pages_by_file: dict[str, list[str]], asked: list[int] | None = None):
+    """PDF 바이트(=파일명)별 페이지 토큰을 문서 순서대로 생성하는 raster_pool 대체 함수.
+
+    skip(문서_인덱스)에 든 페이지는 생성하지 않고, 물어본 문서 인덱스를 asked에 남긴다.
+    """
+
+    def _iter(docs, report=None, skip=None):
+        for doc_index, (data, count) in enumerate(docs):
+            skipped = skip(doc_index) if skip is not None else set()
+            if asked is not None:
+                asked.append(doc_index)
+            tokens = pages_by_file[data.decode()]
+            yield from (tokens[n - 1] for n in range(1, count + 1) if n not in skipped)
+
+    return _iter
+
+
+def _collect(files: dict[str, list[str]], **patches):
+    """iter_page_tasks로 files의 페이지를 모두 꺼내 (페이지들, owners, page_stats)를 반환한다."""
+    owners: list[int] = []
+    page_stats: list[dict] = []
+    with patch(
+        "src.ocr_pages.ocr.iter_file_pages",
+        side_effect=lambda name, _data: list(files[name]),
+    ), patch(
+        "src.ocr_pages.raster_pool.iter_pdf_pages",
+        side_effect=patches.pop("raster", _fake_raster(files)),
+    ):
+        pages = list(iter_page_tasks(
+            [(name, name.encode()) for name in files],
+            [len(tokens) for tokens in files.values()],
+            owners,
+            page_stats,
+        ))
+    return pages, owners, page_stats
+
+
+@patch("src.ocr_pages.config.DEDUP_ENABLED", False)
+@patch("src.ocr_pages.config.PDF_TEXT_ENABLED", False)
+@patch("src.ocr_pages.config.PDF_IMAGES_ENABLED", False)
+class TestIterPageTasks:
+    """iter_page_tasks 함수 테스트 (페이지 토큰 문자열 사용)."""
+
+    def test_pages_in_file_order_with_owners(self) -> None:
+        """PDF와 이미지 파일의 페이지를 입력 순서대로 내보내고 파일 인덱스와 통계를 기록한다."""
+        files = {"a.pdf": ["a1", "a2"], "b.png": ["b1"], "c.pdf": ["c1"]}
+
+        pages, owners, page_stats = _collect(files)
+
+        assert [page for page, _ in pages] == ["a1", "a2", "b1", "c1"]
+        assert owners == [0, 0, 1, 2]
+        assert [stats for _, stats in pages] == page_stats == [{}, {}, {}, {}]
+        assert all(a is b for (_, a), b in zip(pages, page_stats))
+
+    def test_text_and_scan_pages_not_rasterized(self) -> None:
+        """텍스트 페이지와 스캔 페이지는 래스터화(skip)에서 빼고, pdftotext는 한 번만 부른다."""
+        files = {"a.pdf": ["typed", "a2", "scan"], "b.pdf": ["b1"]}
+        asked: list[int] = []
+        text = types.Part(text="typed")
+
+        def _text_pages(data, count, texts, layout):
+            return [text, None, None] if data == b"a.pdf" else [None] * count
+
+        with patch("src.ocr_pages.config.PDF_TEXT_ENABLED", True), patch(
+            "src.ocr_pages.pdf_text.extract_page_texts",
+            side_effect=lambda data, count: ["글자", "", ""][:count],
+        ) as mock_texts, patch(
+            "src.ocr_pages.pdf_text.text_pages", side_effect=_text_pages
+        ), patch(
+            "src.ocr_pages.pdf_images.scan_pages",
+            side_effect=lambda data, count, texts, skip, layout: {3: {}} if data == b"a.pdf" else {},
+        ) as mock_scan, patch(
+            "src.ocr_pages.pdf_images.iter_scan_pages",
+            side_effect=lambda data, scans: (page for page in ["scan"]),
+        ):
+            pages, _, _ = _collect(files, raster=_fake_raster(files, asked))
+
+        assert pages == [
+            (text, {}), ("a2", {}), ("scan", {"embedded_image": True}), ("b1", {}),
+        ]
+        assert asked == [0, 1]
+        assert mock_texts.call_count == 2
+        assert mock_scan.call_args_list[0].args[2:4] == (["글자", "", ""], {1})
+
+    def test_layout_read_once_per_document(self) -> None:
+        """이미지 목록과 페이지 크기는 문서마다 한 번 구해 텍스트/스캔 판정에 함께 넘기고,
+        후보 페이지가 없는 문서는 구하지 않는다."""
+        files = {"a.pdf": ["typed", "a2"], "b.pdf": ["b1"]}
+        layout = ({}, [None, None], [0, 0])
+        with patch("src.ocr_pages.config.PDF_TEXT_ENABLED", True), patch(
+            "src.ocr_pages.config.PDF_IMAGES_ENABLED", True
+        ), patch(
+            "src.ocr_pages.pdf_text.extract_page_texts",
+            side_effect=lambda data, count: ["글자", ""] if data == b"a.pdf" else ["짧음"],
+        ), patch(
+            "src.ocr_pages.pdf_text.has_text_layer", side_effect=lambda text: text == "글자"
+        ), patch(
+            "src.ocr_pages.pdf_images.page_layout", return_value=layout
+        ) as mock_layout, patch(
+            "src.ocr_pages.pdf_text.text_pages", side_effect=lambda data, count, *_: [None] * count
+        ) as mock_text, patch(
+            "src.ocr_pages.pdf_images.scan_pages", return_value={}
+        ) as mock_scan:
+            _collect(files)
+
+        mock_layout.assert_called_once_with(b"a.pdf", 2)
+        assert [c.args[3] for c in mock_text.call_args_list] == [layout, None]
+        assert [c.args[4] for c in mock_scan.call_args_list] == [layout, None]
+
+    @patch("src.ocr_pages.config.DEDUP_MAX_DISTANCE", 2)
+    def test_duplicate_points_at_page_index(self) -> None:
+        """해시하지 않는 텍스트 페이지가 앞에 있어도 중복 페이지는 원본의 페이지 인덱스를 가리킨다."""
+        files = {"a.pdf": ["typed"], "b.png": ["orig", "copy"]}
+        text = types.Part(text="typed")
+        # 클래스의 DEDUP_ENABLED=False 패치보다 나중에 적용되도록 본문에서 켠다
+        with patch("src.ocr_pages.config.DEDUP_ENABLED", True), patch(
+            "src.ocr_pages.config.PDF_TEXT_ENABLED", True
+        ), patch(
+            "src.ocr_pages.pdf_text.extract_page_texts", return_value=["글자"]
+        ), patch(
+            "src.ocr_pages.pdf_text.text_pages", return_value=[text]
+        ), patch(
+            "src.ocr_pages.pdf_images.scan_pages", return_value={}
+        ), patch(
+            "src.ocr_pages.page_hash.page_hash", side_effect=[0b1000, 0b1001]
+        ) as mock_hash, patch(
+            "src.ocr_pages.page_hash.content_digest", side_effect=lambda token: token
+        ):
+            _, _, page_stats = _collect(files)
+
+        assert mock_hash.call_count == 2
+        assert page_stats[2] == {"hash_distance": 1, "duplicate_of": 1}
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [("a.pdf", True), ("B.PDF", True), ("a.png", False), ("pdf", False)],
+)
+def test_is_pdf(filename: str, expected: bool) -> None:
+    """확장자(대소문자 무시)로 PDF 여부를 판정한다."""
+    assert is_pdf(filename) is expected
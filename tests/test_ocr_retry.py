@@ -0,0 +1,259 @@
+"""ocr_retry 모듈 단위 테스트."""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from google.genai import errors
+
+from src.ocr_retry import (
+    backoff_delay,
+    call_with_retry,
+    call_with_retry_async,
+    check_page,
+    is_transient,
+    should_fall_back,
+)
+
+
+def _api_error(code: int) -> errors.APIError:
+    cls = errors.ServerError if code >= 500 else errors.ClientError
+    return cls(code, {"error": {"message": "error", "status": "STATUS"}})
+
+
+# ---------------------------------------------------------------------------
+# is_transient / backoff_delay 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestIsTransient:
+    """is_transient 함수 테스트."""
+
+    @pytest.mark.parametrize("code", [408, 429, 500, 503, 504])
+    def test_retryable_status_codes(self, code: int) -> None:
+        """시간 초과, 요청 한도 초과, 5xx는 일시적 오류."""
+        assert is_transient(_api_error(code))
+
+    @pytest.mark.parametrize("code", [400, 401, 403, 404])
+    def test_client_errors_are_permanent(self, code: int) -> None:
+        """그 밖의 4xx는 영구적 오류."""
+        assert not is_transient(_api_error(code))
+
+    def test_network_errors_are_transient(self) -> None:
+        """httpx 전송 오류, TimeoutError, ConnectionError는 일시적 오류."""
+        assert is_transient(httpx.ReadTimeout("timeout"))
+        assert is_transient(httpx.ConnectError("refused"))
+        assert is_transient(TimeoutError())
+        assert is_transient(ConnectionResetError())
+
+    def test_other_exceptions_are_permanent(self) -> None:
+        """ValueError 같은 일반 예외는 영구적 오류."""
+        assert not is_transient(ValueError("bad image"))
+
+
+class TestShouldFallBack:
+    """should_fall_back 함수 테스트."""
+
+    def test_overload_and_timeouts_fall_back(self) -> None:
+        """429, 503, httpx 시간 초과, TimeoutError는 다음 모델로 넘어간다."""
+        assert should_fall_back(_api_error(429))
+        assert should_fall_back(_api_error(503))
+        assert should_fall_back(httpx.ReadTimeout("timeout"))
+        assert should_fall_back(TimeoutError())
+
+    @pytest.mark.parametrize("code", [400, 408, 500, 504])
+    def test_other_errors_stay_on_model(self, code: int) -> None:
+        """그 밖의 상태 코드와 연결 오류는 같은 모델에 남는다."""
+        assert not should_fall_back(_api_error(code))
+        assert not should_fall_back(httpx.ConnectError("refused"))
+
+
+@patch("src.ocr_retry.config.OCR_RETRY_MAX_SECONDS", 30.0)
+@patch("src.ocr_retry.config.OCR_RETRY_BASE_SECONDS", 2.0)
+class TestBackoffDelay:
+    """backoff_delay 함수 테스트."""
+
+    def test_delay_within_exponential_cap(self) -> None:
+        """대기 시간은 0 이상 min(상한, 기준 * 2^attempt) 이하이다."""
+        rng = random.Random(0)
+        for attempt, cap in [(0, 2.0), (1, 4.0), (2, 8.0), (5, 30.0)]:
+            delays = [backoff_delay(attempt, rng) for _ in range(200)]
+            assert all(0 <= d <= cap for d in delays)
+            assert max(delays) > cap / 2
+
+    def test_jitter_spreads_delays(self) -> None:
+        """같은 순번이라도 대기 시간이 흩어진다."""
+        rng = random.Random(1)
+
+        assert len({backoff_delay(3, rng) for _ in range(20)}) == 20
+
+
+# ---------------------------------------------------------------------------
+# call_with_retry 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_retry.config.OCR_RETRY_ATTEMPTS", 3)
+@patch("src.ocr_retry.time.sleep")
+class TestCallWithRetry:
+    """call_with_retry 함수 테스트."""
+
+    def test_transient_error_retried_until_success(self, mock_sleep: MagicMock) -> None:
+        """일시적 오류는 백오프 후 다시 시도하고 시도 횟수를 기록한다."""
+        func = MagicMock(side_effect=[_api_error(503), _api_error(429), "ok"])
+        stats: dict = {}
+
+        assert call_with_retry(func, "page", stats=stats, stats_list=[stats]) == "ok"
+        assert func.call_count == 3
+        func.assert_called_with("page", stats=stats)
+        assert mock_sleep.call_count == 2
+        assert stats == {"attempts": 3}
+
+    def test_permanent_error_not_retried(self, mock_sleep: MagicMock) -> None:
+        """영구적 오류는 다시 시도하지 않고 바로 올린다."""
+        func = MagicMock(side_effect=_api_error(400))
+        stats: dict = {}
+
+        with pytest.raises(errors.ClientError):
+            call_with_retry(func, stats_list=[stats])
+        assert func.call_count == 1
+        mock_sleep.assert_not_called()
+        assert stats == {}
+
+    def test_gives_up_after_max_attempts(self, mock_sleep: MagicMock) -> None:
+        """시도 횟수를 다 쓰면 마지막 예외를 올린다."""
+        func = MagicMock(side_effect=_api_error(503))
+
+        with pytest.raises(errors.ServerError):
+            call_with_retry(func)
+        assert func.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_first_success_records_nothing(self, mock_sleep: MagicMock) -> None:
+        """첫 호출에 성공하면 시도 횟수를 기록하지 않는다."""
+        stats: dict = {}
+
+        assert call_with_retry(lambda: 1, stats_list=[stats]) == 1
+        assert stats == {}
+
+
+@patch("src.ocr_retry.config.OCR_RETRY_ATTEMPTS", 3)
+@patch("src.ocr_retry.asyncio.sleep", new_callable=AsyncMock)
+class TestCallWithRetryAsync:
+    """call_with_retry_async 함수 테스트."""
+
+    def test_transient_error_retried_with_async_sleep(self, mock_sleep: AsyncMock) -> None:
+        """일시적 오류는 asyncio.sleep으로 기다린 뒤 다시 시도한다."""
+        func = AsyncMock(side_effect=[httpx.ReadTimeout("timeout"), "ok"])
+        stats: dict = {}
+
+        result = asyncio.run(call_with_retry_async(func, "page", stats_list=[stats]))
+
+        assert result == "ok"
+        assert func.await_count == 2
+        mock_sleep.assert_awaited_once()
+        assert stats == {"attempts": 2}
+
+    def test_permanent_error_not_retried(self, mock_sleep: AsyncMock) -> None:
+        """영구적 오류는 다시 시도하지 않는다."""
+        func = AsyncMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            asyncio.run(call_with_retry_async(func))
+        assert func.await_count == 1
+        mock_sleep.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# 페이지 마감과 작업 취소
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_retry.config.OCR_RETRY_BASE_SECONDS", 20.0)
+@patch("src.ocr_retry.config.OCR_RETRY_MAX_SECONDS", 20.0)
+@patch("src.ocr_retry.config.OCR_RETRY_ATTEMPTS", 3)
+class TestPageDeadline:
+    """call_with_retry의 페이지 마감(OCR_PAGE_DEADLINE_SECONDS)과 취소 토큰 테스트."""
+
+    def test_check_page_outside_task_has_no_limit(self) -> None:
+        """페이지 작업 밖에서는 남은 시간이 없다(None)."""
+        assert check_page() is None
+
+    def test_remaining_time_visible_inside_task(self) -> None:
+        """작업 안의 함수는 마감까지 남은 시간을 볼 수 있다."""
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 60.0):
+            remaining = call_with_retry(check_page)
+
+        assert 59 < remaining <= 60
+        assert check_page() is None
+
+    def test_backoff_past_deadline_gives_up(self) -> None:
+        """백오프가 마감을 넘기면 기다리지 않고 마지막 예외를 올린다."""
+        func = MagicMock(side_effect=_api_error(503))
+
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 5.0), patch(
+            "src.ocr_retry.random.uniform", return_value=10.0
+        ), patch("src.ocr_retry.time.sleep") as mock_sleep:
+            with pytest.raises(errors.ServerError):
+                call_with_retry(func)
+
+        assert func.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_deadline_passed_before_next_attempt(self) -> None:
+        """마감이 지난 뒤에는 다시 시도하지 않는다 (백오프 뒤 지났으면 TimeoutError)."""
+
+        def _slow():
+            time.sleep(0.06)
+            raise httpx.ReadTimeout("timeout")
+
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 0.05), patch(
+            "src.ocr_retry.random.uniform", return_value=0.0
+        ):
+            with pytest.raises(httpx.ReadTimeout):
+                call_with_retry(_slow)
+
+        func = MagicMock(side_effect=[_api_error(503), "ok"])
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 0.05), patch(
+            "src.ocr_retry.random.uniform", return_value=0.0
+        ), patch("src.ocr_retry.time.monotonic", side_effect=[0.0, 0.0, 0.0, 1.0]):
+            with pytest.raises(TimeoutError, match="제한 시간"):
+                call_with_retry(func)
+        assert func.call_count == 1
+
+    def test_cancel_wakes_backoff_and_stops(self) -> None:
+        """취소 토큰이 설정되면 백오프 중에 깨어나 다음 시도 없이 CancelledError."""
+        cancel = threading.Event()
+
+        def _fail():
+            threading.Timer(0.05, cancel.set).start()
+            raise _api_error(503)
+
+        func = MagicMock(side_effect=_fail)
+        started = time.monotonic()
+        with patch("src.ocr_retry.config.OCR_PAGE_DEADLINE_SECONDS", 0.0):
+            with pytest.raises(CancelledError):
+                call_with_retry(func, cancel=cancel)
+
+        assert func.call_count == 1
+        assert time.monotonic() - started < 1
+
+    def test_cancelled_before_start_never_calls(self) -> None:
+        """이미 취소된 작업은 함수를 부르지 않는다 (비동기도 같음)."""
+        cancel = threading.Event()
+        cancel.set()
+        func = MagicMock()
+        async_func = AsyncMock()
+
+        with pytest.raises(CancelledError):
+            call_with_retry(func, cancel=cancel)
+        with pytest.raises(CancelledError):
+            asyncio.run(call_with_retry_async(async_func, cancel=cancel))
+
+        func.assert_not_called()
+        async_func.assert_not_awaited()
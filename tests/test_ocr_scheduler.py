@@ -0,0 +1,1106 @@
+"""ocr_scheduler 모듈 단위 테스트."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import errors, types
+
+from src.ocr_scheduler import ocr_files
+from src.submission import build_submissions
+
+
+def _page(text: str) -> dict:
+    return {"학번": "", "이름": "", "에세이텍스트": text}
+
+
+def _fake_load(pages_by_file: dict[str, list[str]]):
+    """파일명별 페이지 토큰(문자열)을 반환하는 iter_file_pages 대체 함수."""
+    return lambda filename, _bytes: list(pages_by_file[filename])
+
+
+def _fake_count(pages_by_file: dict[str, list[str]]):
+    return lambda filename, _bytes: len(pages_by_file[filename])
+
+
+def _fake_raster(pages_by_file: dict[str, list[str]]):
+    """PDF 바이트(=파일명)별 페이지 토큰을 문서 순서대로 생성하는 raster_pool 대체 함수.
+
+    skip에 든 페이지(텍스트 페이지)는 생성하지 않는다.
+    """
+
+    def _iter(docs, report=None, skip=None):
+        for doc_index, (data, count) in enumerate(docs):
+            assert count == len(pages_by_file[data.decode()])
+            kept = [
+                n for n in range(1, count + 1)
+                if skip is None or n not in skip(doc_index)
+            ]
+            if report is not None:
+                report.extend(
+                    {"doc": doc_index, "page": n, "dpi": 150, "pixels": 100}
+                    for n in kept
+                )
+            yield from (pages_by_file[data.decode()][n - 1] for n in kept)
+
+    return _iter
+
+
+@pytest.fixture(autouse=True)
+def _no_pdf_layers():
+    """토큰 PDF에 pdftotext/pdfimages를 부르지 않도록 텍스트 레이어와 내장 이미지 추출을 끈다."""
+    with patch("src.ocr_scheduler.config.PDF_TEXT_ENABLED", False), patch(
+        "src.ocr_scheduler.config.PDF_IMAGES_ENABLED", False
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _token_digests():
+    """토큰 페이지의 내용 요약: dup1/dup2는 orig를 바이트 그대로 다시 올린 페이지."""
+    with patch(
+        "src.ocr_pages.page_hash.content_digest",
+        side_effect=lambda token: _DIGESTS.get(token, token),
+    ):
+        yield
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+class TestOcrFiles:
+    """ocr_files 함수 테스트."""
+
+    def _patch(self, pages_by_file, extract):
+        return (
+            patch("src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)),
+            patch("src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)),
+            patch(
+                "src.ocr_scheduler.ocr.extract_text_from_image",
+                side_effect=lambda page, stats=None: extract(page),
+            ),
+            patch("src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)),
+        )
+
+    def test_regroups_results_per_file_in_page_order(self) -> None:
+        """페이지 결과를 입력 파일 순서와 페이지 순서대로 다시 묶는다."""
+        pages = {"a.pdf": ["a1", "a2", "a3"], "b.png": ["b1"], "c.pdf": ["c1", "c2"]}
+
+        def _extract(token):
+            time.sleep(0.01 if token.endswith("1") else 0)
+            return _page(token)
+
+        p1, p2, p3, p4 = self._patch(pages, _extract)
+        with p1, p2, p3, p4:
+            result = ocr_files(
+                [("a.pdf", b"a.pdf"), ("b.png", b"b"), ("c.pdf", b"c.pdf")]
+            )
+
+        assert [name for name, _ in result] == ["a.pdf", "b.png", "c.pdf"]
+        assert [p["에세이텍스트"] for p in result[0][1]] == ["a1", "a2", "a3"]
+        assert [p["에세이텍스트"] for p in result[1][1]] == ["b1"]
+        assert [p["에세이텍스트"] for p in result[2][1]] == ["c1", "c2"]
+
+    def test_pages_from_different_files_share_one_pool(self) -> None:
+        """큰 PDF의 페이지와 작은 이미지가 같은 작업자 풀에서 동시에 처리된다."""
+        pages = {"big.pdf": [f"p{i}" for i in range(6)], "photo.jpg": ["img"]}
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def _extract(token):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return _page(token)
+
+        p1, p2, p3, p4 = self._patch(pages, _extract)
+        with p1, p2, p3, p4:
+            start = time.monotonic()
+            ocr_files([("big.pdf", b"big.pdf"), ("photo.jpg", b"y")], max_workers=7)
+            elapsed = time.monotonic() - start
+
+        assert state["peak"] == 7
+        assert elapsed < 0.2
+
+    def test_progress_reports_completed_pages_of_total(self) -> None:
+        """on_progress는 시작 시 (0, 전체) 후 페이지 완료마다 호출된다."""
+        pages = {"a.pdf": ["a1", "a2"], "b.png": ["b1"]}
+        calls: list[tuple[int, int]] = []
+
+        p1, p2, p3, p4 = self._patch(pages, _page)
+        with p1, p2, p3, p4:
+            ocr_files(
+                [("a.pdf", b"a.pdf"), ("b.png", b"b")],
+                on_progress=lambda cur, tot: calls.append((cur, tot)),
+            )
+
+        assert calls == [(0, 3), (1, 3), (2, 3), (3, 3)]
+
+    def test_empty_files_data(self) -> None:
+        """빈 입력은 빈 결과를 반환한다."""
+        assert ocr_files([]) == []
+
+    def test_page_failure_raises(self) -> None:
+        """OCR 실패 페이지가 있으면 예외를 발생시킨다."""
+        pages = {"a.pdf": ["ok", "bad"]}
+
+        def _extract(token):
+            if token == "bad":
+                raise RuntimeError("503")
+            return _page(token)
+
+        p1, p2, p3, p4 = self._patch(pages, _extract)
+        with p1, p2, p3, p4, pytest.raises(RuntimeError, match="503"):
+            ocr_files([("a.pdf", b"a.pdf")])
+
+    def test_invalid_file_type_raises_value_error(self) -> None:
+        """지원하지 않는 파일 형식은 ValueError를 발생시킨다."""
+        with patch("src.ocr_scheduler.file_handler.count_pages", return_value=1):
+            with pytest.raises(ValueError, match="지원하지 않는 파일 형식"):
+                ocr_files([("notes.txt", b"t")])
+
+    def test_interleaves_pdfs_and_images_in_file_order(self) -> None:
+        """PDF 페이지(래스터 풀)와 이미지 페이지가 섞여도 파일별로 올바르게 묶인다."""
+        pages = {"x.pdf": ["x1", "x2"], "y.jpg": ["y1"], "z.pdf": ["z1"]}
+
+        p1, p2, p3, p4 = self._patch(pages, _page)
+        with p1, p2, p3, p4:
+            result = ocr_files(
+                [("x.pdf", b"x.pdf"), ("y.jpg", b"y"), ("z.pdf", b"z.pdf")]
+            )
+
+        assert [[p["에세이텍스트"] for p in ps] for _, ps in result] == [
+            ["x1", "x2"], ["y1"], ["z1"],
+        ]
+
+    def test_page_report_lists_dpi_per_pdf_page(self) -> None:
+        """page_report에 파일/페이지별 항목과 PDF 페이지의 선택 DPI를 기록한다."""
+        pages = {"x.pdf": ["x1", "x2"], "y.jpg": ["y1"]}
+        report: list[dict] = []
+
+        p1, p2, p3, p4 = self._patch(pages, _page)
+        with p1, p2, p3, p4:
+            ocr_files(
+                [("x.pdf", b"x.pdf"), ("y.jpg", b"y")], page_report=report
+            )
+
+        assert report == [
+            {"file": "x.pdf", "page": 1, "dpi": 150, "pixels": 100},
+            {"file": "x.pdf", "page": 2, "dpi": 150, "pixels": 100},
+            {"file": "y.jpg", "page": 1},
+        ]
+
+    def test_page_report_includes_worker_stats(self) -> None:
+        """OCR 작업자가 stats에 기록한 값(업로드 바이트 등)이 page_report에 합쳐진다."""
+        pages = {"a.png": ["a1"], "b.png": ["b1"]}
+        report: list[dict] = []
+
+        def _extract(token, stats=None):
+            stats["upload_bytes"] = len(token) * 10
+            return _page(token)
+
+        p1, p2, p3, p4 = self._patch(pages, _page)
+        with p1, p2, p4, patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=_extract
+        ):
+            ocr_files([("a.png", b"a"), ("b.png", b"b")], page_report=report)
+
+        assert [r["upload_bytes"] for r in report] == [20, 20]
+
+    def test_on_skip_counts_blank_pages_before_progress(self) -> None:
+        """빈 페이지가 끝날 때마다 누적 건너뛴 수로 on_skip을 진행률 알림보다 먼저 호출한다."""
+        pages = {"a.pdf": ["text", "blank1", "blank2"]}
+        events: list[tuple] = []
+
+        def _extract(token, stats=None):
+            if token.startswith("blank"):
+                stats["blank"] = True
+            return _page("")
+
+        p1, p2, p3, p4 = self._patch(pages, _page)
+        with p1, p2, p4, patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=_extract
+        ):
+            ocr_files(
+                [("a.pdf", b"a.pdf")], max_workers=1,
+                on_progress=lambda done, total: events.append(("progress", done)),
+                on_skip=lambda count: events.append(("skip", count)),
+            )
+
+        assert [e for e in events if e[0] == "skip"] == [("skip", 1), ("skip", 2)]
+        assert [e[1] for e in events if e[0] == "progress"] == [0, 1, 2, 3]
+        for i, event in enumerate(events):
+            if event[0] == "skip":
+                assert events[i + 1][0] == "progress"
+
+
+# ---------------------------------------------------------------------------
+# 비동기(aio 클라이언트) 경로
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", True)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+class TestOcrFilesAsync:
+    """config.OCR_ASYNC일 때 ocr_files가 코루틴 경로를 쓰는지 테스트."""
+
+    def test_regroups_async_results_with_progress(self) -> None:
+        """extract_text_from_image_async 결과를 파일별로 묶고 진행률을 알린다."""
+        pages = {"a.pdf": ["a1", "a2"], "b.png": ["b1"]}
+        progress: list[int] = []
+
+        async def _extract(token, stats=None):
+            await asyncio.sleep(0.02 if token == "a1" else 0)
+            stats["upload_bytes"] = 1
+            return _page(token)
+
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image_async", side_effect=_extract
+        ), patch("src.ocr_scheduler.ocr.extract_text_from_image") as mock_sync:
+            result = ocr_files(
+                [("a.pdf", b"a.pdf"), ("b.png", b"b")],
+                on_progress=lambda done, total: progress.append(done),
+            )
+
+        assert result == [
+            ("a.pdf", [_page("a1"), _page("a2")]), ("b.png", [_page("b1")]),
+        ]
+        assert progress == [0, 1, 2, 3]
+        mock_sync.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# 중복 페이지 재사용
+# ---------------------------------------------------------------------------
+
+# 페이지 토큰별 가짜 해시: 거리 dup1/orig=2, near/orig=12, other/orig=200,
+# sheet_b/sheet_a=3 (같은 양식에 머리글만 다른 두 학생의 답안지)
+_HASHES = {
+    "orig": 0,
+    "dup1": 0b11,
+    "dup2": 0b111,
+    "near": (1 << 12) - 1,
+    "other": (1 << 200) - 1,
+    "sheet_a": ((1 << 40) - 1) << 300,
+    "sheet_b": (((1 << 40) - 1) << 300) | 0b111,
+}
+_DIGESTS = {"dup1": "orig", "dup2": "orig"}
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_MAX_DISTANCE", 10)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", True)
+@patch("src.ocr_pages.page_hash.page_hash", side_effect=lambda token: _HASHES[token])
+class TestDuplicatePages:
+    """ocr_files의 지각 해시 기반 중복 페이지 재사용 테스트."""
+
+    def _run(self, pages_by_file, extract, report=None, header=None):
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=extract
+        ) as mock_extract, patch(
+            "src.ocr_scheduler.ocr_header.extract_header", side_effect=header
+        ) as mock_header:
+            files = [(name, name.encode()) for name in pages_by_file]
+            result = ocr_files(files, page_report=report)
+        self.mock_header = mock_header
+        return result, mock_extract
+
+    def test_duplicate_across_files_reuses_ocr_result(self, _mock_hash) -> None:
+        """다른 파일의 거의 같은 페이지는 모델 호출 없이 원본 결과를 받는다."""
+        report: list[dict] = []
+        result, mock_extract = self._run(
+            {"a.pdf": ["orig", "other"], "b.png": ["dup1"]},
+            lambda token, stats=None: _page(token),
+            report,
+        )
+
+        assert mock_extract.call_count == 2
+        self.mock_header.assert_not_called()
+        assert result[1][1] == [_page("orig")]
+        assert report[2]["duplicate_of"] == "a.pdf 1페이지"
+        assert report[2]["duplicate_exact"] is True
+        assert report[2]["hash_distance"] == 2
+
+    def test_same_template_different_header_keeps_own_id(self, _mock_hash) -> None:
+        """같은 양식에 머리글만 다른 페이지는 본문만 재사용하고 학번/이름은 따로 읽는다."""
+        report: list[dict] = []
+        students = {
+            "sheet_a": {"학번": "10101", "이름": "김철수"},
+            "sheet_b": {"학번": "10102", "이름": "이영희"},
+        }
+        result, mock_extract = self._run(
+            {"a.png": ["sheet_a"], "b.png": ["sheet_b"]},
+            lambda token, stats=None: {**students[token], "에세이텍스트": "빈 양식"},
+            report,
+            header=lambda token, stats=None: students[token],
+        )
+
+        assert mock_extract.call_count == 1
+        assert [c.args[0] for c in self.mock_header.call_args_list] == ["sheet_b"]
+        assert result[1][1] == [{"학번": "10102", "이름": "이영희", "에세이텍스트": "빈 양식"}]
+        assert report[1]["duplicate_of"] == "a.png 1페이지"
+        assert "duplicate_exact" not in report[1]
+        submissions, _ = build_submissions(result)
+        assert [s["학번"] for s in submissions] == ["10101", "10102"]
+
+    def test_distance_above_threshold_is_ocrd(self, _mock_hash) -> None:
+        """해밍 거리가 임계값을 넘으면 별도로 OCR하고 거리만 기록한다."""
+        report: list[dict] = []
+        result, mock_extract = self._run(
+            {"a.png": ["orig"], "b.png": ["near"]},
+            lambda token, stats=None: _page(token),
+            report,
+        )
+
+        assert mock_extract.call_count == 2
+        assert result[1][1] == [_page("near")]
+        assert "duplicate_of" not in report[1]
+        assert report[1]["hash_distance"] == 12
+
+    def test_chained_duplicates_point_to_first_page(self, _mock_hash) -> None:
+        """중복의 중복도 처음 나온 원본 페이지를 가리킨다."""
+        report: list[dict] = []
+        result, mock_extract = self._run(
+            {"a.pdf": ["orig", "dup1", "dup2"]},
+            lambda token, stats=None: _page(token),
+            report,
+        )
+
+        assert mock_extract.call_count == 1
+        assert result[0][1] == [_page("orig")] * 3
+        assert [r.get("duplicate_of") for r in report] == [
+            None, "a.pdf 1페이지", "a.pdf 1페이지",
+        ]
+
+    def test_failed_original_fails_duplicate(self, _mock_hash) -> None:
+        """원본 페이지 OCR이 실패하면 예외가 전파된다."""
+
+        def _extract(token, stats=None):
+            raise RuntimeError("API 오류")
+
+        with pytest.raises(RuntimeError, match="API 오류"):
+            self._run({"a.png": ["orig"], "b.png": ["dup1"]}, _extract)
+
+    def test_duplicate_of_blank_page_is_marked_blank(self, _mock_hash) -> None:
+        """빈 원본 페이지의 중복도 빈 페이지로 표시된다."""
+        report: list[dict] = []
+
+        def _extract(token, stats=None):
+            stats["blank"] = True
+            return _page("")
+
+        self._run({"a.png": ["orig"], "b.png": ["dup1"]}, _extract, report)
+
+        assert report[1]["blank"] is True
+
+
+# ---------------------------------------------------------------------------
+# 다중 페이지 묶음 OCR
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+@patch("src.ocr_scheduler.config.OCR_BATCH_TARGET_SECONDS", 60.0)
+@patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 3)
+class TestBatchedPages:
+    """config.OCR_BATCH_SIZE > 1일 때 ocr_files의 묶음 OCR 테스트."""
+
+    def _run(self, pages_by_file, extract, **kwargs):
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.ocr_batch.extract_text_from_batch", side_effect=extract
+        ) as mock_batch, patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image"
+        ) as mock_single:
+            files = [(name, name.encode()) for name in pages_by_file]
+            result = ocr_files(files, **kwargs)
+        mock_single.assert_not_called()
+        return result, mock_batch
+
+    def test_pages_across_files_batched_and_regrouped(self) -> None:
+        """파일 경계를 넘어 페이지를 묶고, 결과는 파일별 페이지 순서로 되돌린다."""
+        pages = {"a.pdf": ["a1", "a2"], "b.png": ["b1"], "c.pdf": ["c1", "c2"]}
+        progress: list[int] = []
+
+        result, mock_batch = self._run(
+            pages,
+            lambda images, stats_list: [_page(token) for token in images],
+            on_progress=lambda done, total: progress.append(done),
+        )
+
+        assert [call.args[0] for call in mock_batch.call_args_list] == [
+            ["a1", "a2", "b1"], ["c1", "c2"],
+        ]
+        assert result == [
+            ("a.pdf", [_page("a1"), _page("a2")]),
+            ("b.png", [_page("b1")]),
+            ("c.pdf", [_page("c1"), _page("c2")]),
+        ]
+        assert progress == [0, 1, 2, 3, 4, 5]
+
+    def test_slow_batches_shrink_batch_size(self) -> None:
+        """페이지당 응답 시간이 목표를 넘으면 이후 묶음 크기를 줄인다."""
+        pages = {"a.pdf": [f"p{i}" for i in range(12)]}
+
+        def _extract(images, stats_list):
+            time.sleep(0.02 * len(images))
+            return [_page(token) for token in images]
+
+        with patch("src.ocr_scheduler.config.OCR_BATCH_TARGET_SECONDS", 0.03):
+            result, mock_batch = self._run(pages, _extract, max_workers=1)
+
+        sizes = [len(call.args[0]) for call in mock_batch.call_args_list]
+        assert sizes[0] == 3
+        assert sizes[-1] == 1
+        assert sum(sizes) == 12
+        assert [p["에세이텍스트"] for p in result[0][1]] == pages["a.pdf"]
+
+    @patch("src.ocr_scheduler.config.DEDUP_MAX_DISTANCE", 10)
+    @patch("src.ocr_pages.page_hash.page_hash", side_effect=lambda token: _HASHES[token])
+    def test_header_only_duplicate_left_out_of_batch(self, _mock_hash) -> None:
+        """머리글만 읽는 중복 페이지는 묶음에서 빠지고 바이트까지 같은 중복은 호출하지 않는다."""
+        pages = {"a.pdf": ["sheet_a", "orig"], "b.png": ["sheet_b", "dup1"]}
+
+        with patch("src.ocr_scheduler.config.DEDUP_ENABLED", True), patch(
+            "src.ocr_scheduler.ocr_header.extract_header",
+            side_effect=lambda token, stats=None: {"학번": "10102", "이름": "이영희"},
+        ) as mock_header:
+            result, mock_batch = self._run(
+                pages, lambda images, stats_list: [_page(token) for token in images],
+            )
+
+        assert [call.args[0] for call in mock_batch.call_args_list] == [["sheet_a", "orig"]]
+        assert [c.args[0] for c in mock_header.call_args_list] == ["sheet_b"]
+        assert result[1][1] == [
+            {"학번": "10102", "이름": "이영희", "에세이텍스트": "sheet_a"}, _page("orig"),
+        ]
+
+    def test_batch_failure_raises(self) -> None:
+        """묶음 호출이 실패하면 그 묶음 페이지의 예외가 전파된다."""
+
+        def _extract(images, stats_list):
+            raise RuntimeError("503")
+
+        with pytest.raises(RuntimeError, match="503"):
+            self._run({"a.pdf": ["a1", "a2"]}, _extract)
+
+    def test_page_report_includes_batch_stats(self) -> None:
+        """묶음 크기와 폴백 여부가 페이지 리포트에 기록된다."""
+        report: list[dict] = []
+
+        def _extract(images, stats_list):
+            for stats in stats_list:
+                stats.update(batch_size=len(images), batch_fallback=True)
+            return [_page(token) for token in images]
+
+        self._run({"a.pdf": ["a1", "a2"]}, _extract, page_report=report)
+
+        assert [r["batch_size"] for r in report] == [2, 2]
+        assert all(r["batch_fallback"] for r in report)
+
+
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+@patch("src.ocr_scheduler.config.OCR_TWO_TIER", True)
+class TestTwoTierPages:
+    """config.OCR_TWO_TIER일 때 ocr_files가 2단 OCR을 쓰는지 테스트."""
+
+    def _files(self, pages_by_file):
+        return patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        )
+
+    @patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 1)
+    @patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+    def test_pages_use_two_tier(self) -> None:
+        """묶음을 쓰지 않으면 페이지마다 extract_two_tier를 호출한다."""
+        pages = {"a.png": ["a1"], "b.png": ["b1"]}
+        load, count = self._files(pages)
+        with load, count, patch(
+            "src.ocr_scheduler.ocr_header.extract_two_tier",
+            side_effect=lambda image, stats: _page(image),
+        ) as mock_two_tier:
+            result = ocr_files([(name, name.encode()) for name in pages])
+
+        assert result == [("a.png", [_page("a1")]), ("b.png", [_page("b1")])]
+        assert mock_two_tier.call_count == 2
+
+    @patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 3)
+    @patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+    def test_batches_use_two_tier_batch(self) -> None:
+        """묶음 크기가 1보다 크면 묶음마다 extract_two_tier_batch를 호출하고 단일 묶음 OCR은 쓰지 않는다."""
+        pages = {"a.png": ["a1", "a2"], "b.png": ["b1"]}
+        load, count = self._files(pages)
+        with load, count, patch(
+            "src.ocr_scheduler.ocr_header.extract_two_tier_batch",
+            side_effect=lambda images, stats_list: [_page(i) for i in images],
+        ) as mock_two_tier, patch(
+            "src.ocr_scheduler.ocr_batch.extract_text_from_batch"
+        ) as mock_batch:
+            result = ocr_files([(name, name.encode()) for name in pages])
+
+        assert result == [
+            ("a.png", [_page("a1"), _page("a2")]), ("b.png", [_page("b1")]),
+        ]
+        assert [c.args[0] for c in mock_two_tier.call_args_list] == [["a1", "a2", "b1"]]
+        mock_batch.assert_not_called()
+
+    @patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 1)
+    @patch("src.ocr_scheduler.config.OCR_ASYNC", True)
+    def test_async_pages_use_two_tier_async(self) -> None:
+        """비동기 경로는 extract_two_tier_async를 기다린다."""
+
+        async def _two_tier(image, stats):
+            return _page(image)
+
+        pages = {"a.png": ["a1"]}
+        load, count = self._files(pages)
+        with load, count, patch(
+            "src.ocr_scheduler.ocr_header.extract_two_tier_async", side_effect=_two_tier
+        ) as mock_two_tier:
+            result = ocr_files([("a.png", b"a")])
+
+        assert result == [("a.png", [_page("a1")])]
+        mock_two_tier.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# 페이지 재시도와 실패 격리
+# ---------------------------------------------------------------------------
+
+
+def _server_error() -> errors.ServerError:
+    return errors.ServerError(503, {"error": {"message": "overloaded", "status": "UNAVAILABLE"}})
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+@patch("src.ocr_retry.config.OCR_RETRY_ATTEMPTS", 3)
+@patch("src.ocr_retry.time.sleep")
+class TestPageFailures:
+    """ocr_files의 페이지 재시도와 failed_pages 실패 격리 테스트."""
+
+    def _run(self, pages_by_file, extract, **kwargs):
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=extract
+        ) as mock_extract:
+            files = [(name, name.encode()) for name in pages_by_file]
+            result = ocr_files(files, **kwargs)
+        return result, mock_extract
+
+    def test_transient_error_retried_and_recovered(self, mock_sleep) -> None:
+        """일시적 오류가 난 페이지는 다시 시도하여 결과를 얻고 시도 횟수를 기록한다."""
+        calls: dict[str, int] = {}
+        report: list[dict] = []
+
+        def _extract(token, stats=None):
+            calls[token] = calls.get(token, 0) + 1
+            if token == "a2" and calls[token] == 1:
+                raise _server_error()
+            return _page(token)
+
+        result, _ = self._run(
+            {"a.pdf": ["a1", "a2"]}, _extract, page_report=report
+        )
+
+        assert result == [("a.pdf", [_page("a1"), _page("a2")])]
+        assert report[1]["attempts"] == 2
+        assert "attempts" not in report[0]
+        mock_sleep.assert_called_once()
+
+    def test_failed_page_isolated_and_listed(self, mock_sleep) -> None:
+        """재시도 후에도 실패한 페이지만 빈 결과로 남기고 failed_pages에 기록한다."""
+        failed: list[dict] = []
+        report: list[dict] = []
+
+        def _extract(token, stats=None):
+            if token == "a2":
+                raise _server_error()
+            return _page(token)
+
+        result, mock_extract = self._run(
+            {"a.pdf": ["a1", "a2", "a3"], "b.png": ["b1"]},
+            _extract, failed_pages=failed, page_report=report,
+        )
+
+        assert result == [
+            ("a.pdf", [_page("a1"), {"학번": "", "이름": "", "에세이텍스트": ""}, _page("a3")]),
+            ("b.png", [_page("b1")]),
+        ]
+        assert failed == [{"file": "a.pdf", "page": 2, "error": "ServerError: 503 UNAVAILABLE. "
+                           "{'error': {'message': 'overloaded', 'status': 'UNAVAILABLE'}}"}]
+        assert mock_extract.call_count == 3 + 3
+        assert report[1]["attempts"] == 3
+
+    def test_permanent_error_isolated_without_retry(self, mock_sleep) -> None:
+        """영구적 오류는 다시 시도하지 않고 그 페이지만 실패로 기록한다."""
+        failed: list[dict] = []
+
+        def _extract(token, stats=None):
+            if token == "b1":
+                raise ValueError("손상된 이미지")
+            return _page(token)
+
+        result, mock_extract = self._run(
+            {"a.png": ["a1"], "b.png": ["b1"]}, _extract, failed_pages=failed
+        )
+
+        assert result[0] == ("a.png", [_page("a1")])
+        assert failed == [{"file": "b.png", "page": 1, "error": "ValueError: 손상된 이미지"}]
+        assert mock_extract.call_count == 2
+        mock_sleep.assert_not_called()
+
+    def test_without_failed_pages_raises(self, mock_sleep) -> None:
+        """failed_pages가 없으면 기존처럼 가장 앞 실패 페이지의 예외를 올린다."""
+
+        def _extract(token, stats=None):
+            raise ValueError(token)
+
+        with pytest.raises(ValueError, match="a1"):
+            self._run({"a.pdf": ["a1", "a2"]}, _extract)
+
+
+# ---------------------------------------------------------------------------
+# 파일별 완료 통지 (on_file_done)
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+@patch("src.ocr_retry.config.OCR_RETRY_ATTEMPTS", 1)
+class TestFileDone:
+    """ocr_files의 on_file_done 파일별 완료 통지 테스트."""
+
+    def _run(self, pages_by_file, extract, **kwargs):
+        done: list[tuple[int, str, list[dict]]] = []
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=extract
+        ):
+            files = [(name, name.encode()) for name in pages_by_file]
+            result = ocr_files(
+                files, on_file_done=lambda *args: done.append(args), **kwargs
+            )
+        return result, done
+
+    def test_finished_file_notified_before_job_ends(self) -> None:
+        """먼저 끝난 파일은 큰 파일의 페이지가 남아 있어도 바로 통지된다."""
+        pages = {"big.pdf": [f"p{i}" for i in range(4)], "photo.png": ["img"]}
+
+        def _extract(token, stats=None):
+            time.sleep(0 if token == "img" else 0.05)
+            return _page(token)
+
+        result, done = self._run(pages, _extract, max_workers=5)
+
+        assert [(index, name) for index, name, _ in done] == [(1, "photo.png"), (0, "big.pdf")]
+        assert done[0][2] == [_page("img")]
+        assert done[1][2] == result[0][1]
+
+    def test_notification_precedes_remaining_pages(self) -> None:
+        """파일 통지는 다른 파일의 페이지가 끝나기 전에 일어난다."""
+        pages = {"big.pdf": ["p0", "p1"], "photo.png": ["img"]}
+        events: list[str] = []
+
+        def _extract(token, stats=None):
+            time.sleep(0 if token == "img" else 0.05)
+            return _page(token)
+
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=_extract
+        ):
+            ocr_files(
+                [(name, name.encode()) for name in pages], max_workers=3,
+                on_progress=lambda current, total: events.append(f"page {current}"),
+                on_file_done=lambda index, name, _pages: events.append(name),
+            )
+
+        assert events == ["page 0", "page 1", "photo.png", "page 2", "page 3", "big.pdf"]
+
+    @patch("src.ocr_scheduler.config.DEDUP_MAX_DISTANCE", 10)
+    @patch("src.ocr_pages.page_hash.page_hash", side_effect=lambda token: _HASHES[token])
+    def test_duplicate_page_waits_for_original(self, _mock_hash) -> None:
+        """중복 페이지만 남은 파일은 다른 파일의 원본 페이지가 끝난 뒤 원본 결과로 통지된다."""
+
+        def _extract(token, stats=None):
+            time.sleep(0.05 if token == "orig" else 0)
+            return _page(token)
+
+        with patch("src.ocr_scheduler.config.DEDUP_ENABLED", True):
+            result, done = self._run(
+                {"a.pdf": ["orig", "other"], "b.png": ["dup1"]}, _extract, max_workers=3,
+            )
+
+        assert [name for _, name, _ in done] == ["a.pdf", "b.png"]
+        assert dict((name, pages) for _, name, pages in done) == dict(result)
+        assert dict(result)["b.png"] == [_page("orig")]
+
+    def test_failed_page_notified_as_blank_when_isolated(self) -> None:
+        """failed_pages가 있으면 실패 페이지를 빈 결과로 채워 통지하고, 없으면 통지하지 않는다."""
+
+        def _extract(token, stats=None):
+            if token == "a2":
+                raise ValueError(token)
+            return _page(token)
+
+        pages = {"a.pdf": ["a1", "a2"], "b.png": ["b1"]}
+        _, done = self._run(pages, _extract, failed_pages=[])
+        assert sorted(done) == [
+            (0, "a.pdf", [_page("a1"), {"학번": "", "이름": "", "에세이텍스트": ""}]),
+            (1, "b.png", [_page("b1")]),
+        ]
+
+        notified: list[str] = []
+        with pytest.raises(ValueError, match="a2"), patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image", side_effect=_extract
+        ):
+            ocr_files(
+                [(name, name.encode()) for name in pages],
+                on_file_done=lambda index, name, _pages: notified.append(name),
+            )
+        assert notified == ["b.png"]
+
+    @patch("src.ocr_scheduler.config.OCR_BATCH_TARGET_SECONDS", 60.0)
+    @patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 2)
+    def test_batched_pages_notified_with_page_results(self) -> None:
+        """묶음 OCR에서도 파일 통지에 페이지별 결과가 담긴다."""
+        pages = {"a.pdf": ["a1"], "b.png": ["b1"], "c.pdf": ["c1"]}
+        with patch(
+            "src.ocr_scheduler.ocr_batch.extract_text_from_batch",
+            side_effect=lambda images, stats_list: [_page(token) for token in images],
+        ):
+            result, done = self._run(pages, lambda token, stats=None: _page(token))
+
+        assert sorted(done) == [
+            (index, name, file_pages)
+            for index, (name, file_pages) in enumerate(result)
+        ]
+
+
+# ---------------------------------------------------------------------------
+# 작업 취소
+# ---------------------------------------------------------------------------
+
+
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+class TestJobCancel:
+    """ocr_files의 작업 취소 토큰 테스트."""
+
+    def _patches(self, pages_by_file, extract):
+        return (
+            patch("src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)),
+            patch("src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)),
+            patch("src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)),
+            patch("src.ocr_scheduler.ocr.extract_text_from_image", side_effect=extract),
+        )
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_cancel_stops_job_between_pages(self, use_async: bool) -> None:
+        """취소되면 남은 페이지를 OCR하지 않고 CancelledError를 올린다."""
+        pages = {"a.pdf": [f"p{i}" for i in range(20)]}
+        cancel = threading.Event()
+        seen: list[str] = []
+
+        def _extract(token, stats=None):
+            seen.append(token)
+            if token == "p1":
+                cancel.set()
+            time.sleep(0.02)
+            return _page(token)
+
+        async def _extract_async(token, stats=None):
+            return _extract(token, stats)
+
+        p1, p2, p3, p4 = self._patches(pages, _extract)
+        with p1, p2, p3, p4, patch(
+            "src.ocr_scheduler.config.OCR_ASYNC", use_async
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image_async", side_effect=_extract_async,
+        ):
+            with pytest.raises(CancelledError):
+                ocr_files([("a.pdf", b"a.pdf")], max_workers=2, cancel=cancel)
+
+        assert len(seen) < 6
+
+    @patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+    def test_caller_exception_sets_token(self) -> None:
+        """호출자 콜백이 예외로 작업을 끝내면 토큰이 설정되어 작업자의 재시도가 멈춘다."""
+        pages = {"a.pdf": ["a1", "a2", "a3"]}
+        cancel = threading.Event()
+
+        def _on_progress(current: int, total: int) -> None:
+            if current == 1:
+                raise KeyboardInterrupt
+
+        p1, p2, p3, p4 = self._patches(pages, _page)
+        with p1, p2, p3, p4:
+            with pytest.raises(KeyboardInterrupt):
+                ocr_files(
+                    [("a.pdf", b"a.pdf")], max_workers=1, cancel=cancel,
+                    on_progress=_on_progress,
+                )
+
+        assert cancel.is_set()
+
+
+# ---------------------------------------------------------------------------
+# 텍스트 레이어 페이지 테스트
+# ---------------------------------------------------------------------------
+
+
+def _text_layer(texts_by_file: dict[str, dict[int, str]]):
+    """PDF 바이트(=파일명)별로 지정한 페이지(0부터)만 텍스트 Part인 text_pages 대체 함수."""
+
+    def _pages(data, count, _texts=None, _layout=None):
+        texts = texts_by_file.get(data.decode(), {})
+        return [
+            types.Part(text=texts[n]) if n in texts else None for n in range(count)
+        ]
+
+    return _pages
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+class TestTextLayerPages:
+    """텍스트 레이어가 있는 PDF 페이지(pdf_text) 처리 테스트."""
+
+    def _run(self, pages_by_file, texts_by_file, **kwargs):
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_fake_raster(pages_by_file)
+        ), patch(
+            "src.ocr_pages.pdf_text.text_pages", side_effect=_text_layer(texts_by_file)
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image",
+            side_effect=lambda token, stats=None: _page(token),
+        ) as mock_image, patch(
+            "src.ocr_scheduler.ocr_batch.extract_text_from_batch",
+            side_effect=lambda images, stats_list: [_page(token) for token in images],
+        ) as mock_batch, patch(
+            "src.ocr_scheduler.pdf_text.extract_text_page",
+            side_effect=lambda page, stats=None: _page(page.text),
+        ) as mock_text, patch(
+            "src.ocr_scheduler.pdf_text.extract_text_page_async",
+            AsyncMock(side_effect=lambda page, stats=None: _page(page.text)),
+        ):
+            files = [(name, name.encode()) for name in pages_by_file]
+            result = ocr_files(files, **kwargs)
+        return result, mock_image, mock_batch, mock_text
+
+    def test_text_pages_skip_rasterizing_and_image_ocr(self) -> None:
+        """텍스트 페이지는 래스터화/이미지 OCR 없이 텍스트 경로로 처리되고 순서가 유지된다."""
+        report: list[dict] = []
+        result, mock_image, _, mock_text = self._run(
+            {"a.pdf": ["a1", "unrendered", "a3"], "b.png": ["b1"]},
+            {"a.pdf": {1: "typed"}},
+            page_report=report,
+        )
+
+        assert result == [
+            ("a.pdf", [_page("a1"), _page("typed"), _page("a3")]),
+            ("b.png", [_page("b1")]),
+        ]
+        assert sorted(c.args[0] for c in mock_image.call_args_list) == ["a1", "a3", "b1"]
+        assert mock_text.call_count == 1
+        assert "dpi" in report[0] and "dpi" not in report[1]
+
+    def test_duplicate_index_after_text_page(self) -> None:
+        """해시하지 않는 텍스트 페이지가 앞에 있어도 중복 페이지는 올바른 원본을 가리킨다."""
+        report: list[dict] = []
+        with patch("src.ocr_scheduler.config.DEDUP_ENABLED", True), patch(
+            "src.ocr_pages.page_hash.page_hash", side_effect=lambda token: _HASHES[token]
+        ):
+            result, mock_image, _, _ = self._run(
+                {"a.pdf": ["unrendered", "orig", "dup1"]},
+                {"a.pdf": {0: "typed"}},
+                page_report=report,
+            )
+
+        assert result[0][1] == [_page("typed"), _page("orig"), _page("orig")]
+        assert mock_image.call_count == 1
+        assert report[2]["duplicate_of"] == "a.pdf 2페이지"
+
+    def test_layers_detected_per_document_when_reached(self) -> None:
+        """텍스트/스캔 판정은 모든 문서를 먼저 하지 않고 문서마다 그 페이지가 필요할 때 한다."""
+        pages_by_file = {"a.pdf": ["a1", "a2"], "b.pdf": ["unrendered", "b2"]}
+        events: list[str] = []
+        detect = _text_layer({"b.pdf": {0: "typed"}})
+        raster = _fake_raster(pages_by_file)
+
+        def _detect(data, count, texts=None, layout=None):
+            events.append(f"detect {data.decode()}")
+            return detect(data, count)
+
+        def _rendered(docs, report=None, skip=None):
+            for page in raster(docs, report, skip):
+                events.append(f"render {page}")
+                yield page
+
+        with patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch(
+            "src.ocr_pages.raster_pool.iter_pdf_pages", side_effect=_rendered
+        ), patch(
+            "src.ocr_pages.pdf_text.text_pages", side_effect=_detect
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image",
+            side_effect=lambda token, stats=None: _page(token),
+        ), patch(
+            "src.ocr_scheduler.pdf_text.extract_text_page",
+            side_effect=lambda page, stats=None: _page(page.text),
+        ):
+            result = ocr_files([(name, name.encode()) for name in pages_by_file])
+
+        assert events == [
+            "detect a.pdf", "render a1", "render a2", "detect b.pdf", "render b2",
+        ]
+        assert result[1] == ("b.pdf", [_page("typed"), _page("b2")])
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_text_pages_left_out_of_image_batches(self, use_async: bool) -> None:
+        """묶음 OCR에서 텍스트 페이지는 이미지 묶음 요청에 넣지 않고 따로 처리한다."""
+        with patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 3), patch(
+            "src.ocr_scheduler.config.OCR_ASYNC", use_async
+        ), patch(
+            "src.ocr_scheduler.ocr_batch.extract_text_from_batch_async",
+            AsyncMock(side_effect=lambda images, stats_list: [_page(t) for t in images]),
+        ) as mock_batch_async:
+            result, _, mock_batch, _ = self._run(
+                {"a.pdf": ["a1", "unrendered", "a3"]}, {"a.pdf": {1: "typed"}},
+            )
+
+        batches = mock_batch_async.call_args_list if use_async else mock_batch.call_args_list
+        assert [c.args[0] for c in batches] == [["a1", "a3"]]
+        assert result == [("a.pdf", [_page("a1"), _page("typed"), _page("a3")])]
+
+
+# ---------------------------------------------------------------------------
+# 내장 스캔 이미지 페이지 테스트
+# ---------------------------------------------------------------------------
+
+
+def _embedded(pages_by_file: dict[str, list[str]], scans_by_file: dict[str, set[int]]):
+    """PDF 바이트(=파일명)별로 지정한 페이지(1부터)를 스캔 페이지로 고르는
+    scan_pages 대체 함수와, 그 페이지 토큰을 순서대로 내는 iter_scan_pages 대체 함수."""
+
+    def _scan(data, count, _texts, skip, _layout=None):
+        return {n: {"color": "gray"} for n in scans_by_file.get(data.decode(), set())}
+
+    def _extract(data, scans):
+        yield from (pages_by_file[data.decode()][n - 1] for n in sorted(scans))
+
+    return _scan, _extract
+
+
+@patch("src.ocr_scheduler.config.OCR_ASYNC", False)
+@patch("src.ocr_scheduler.config.DEDUP_ENABLED", False)
+class TestEmbeddedScanPages:
+    """전체 페이지 스캔 JPEG로 된 PDF 페이지(pdf_images) 처리 테스트."""
+
+    def _run(self, pages_by_file, scans_by_file, texts_by_file=None, **kwargs):
+        scan, extract = _embedded(pages_by_file, scans_by_file)
+        raster = MagicMock(side_effect=_fake_raster(pages_by_file))
+        with patch(
+            "src.ocr_pages.ocr.iter_file_pages", side_effect=_fake_load(pages_by_file)
+        ), patch(
+            "src.ocr_scheduler.file_handler.count_pages", side_effect=_fake_count(pages_by_file)
+        ), patch("src.ocr_pages.raster_pool.iter_pdf_pages", raster), patch(
+            "src.ocr_pages.pdf_text.text_pages",
+            side_effect=_text_layer(texts_by_file or {}),
+        ), patch(
+            "src.ocr_scheduler.pdf_text.extract_text_page",
+            side_effect=lambda page, stats=None: _page(page.text),
+        ), patch(
+            "src.ocr_pages.pdf_images.scan_pages", side_effect=scan
+        ) as mock_scan, patch(
+            "src.ocr_pages.pdf_images.iter_scan_pages", side_effect=extract
+        ), patch(
+            "src.ocr_scheduler.ocr.extract_text_from_image",
+            side_effect=lambda token, stats=None: _page(token),
+        ):
+            files = [(name, name.encode()) for name in pages_by_file]
+            result = ocr_files(files, **kwargs)
+        return result, raster, mock_scan
+
+    def test_scan_pages_extracted_not_rendered(self) -> None:
+        """스캔 페이지는 래스터화하지 않고 꺼낸 이미지를 OCR하며 순서와 리포트가 맞는다."""
+        report: list[dict] = []
+        result, raster, _ = self._run(
+            {"a.pdf": ["a1", "scan2", "a3"], "b.pdf": ["scan1"]},
+            {"a.pdf": {2}, "b.pdf": {1}},
+            page_report=report,
+        )
+
+        assert result == [
+            ("a.pdf", [_page("a1"), _page("scan2"), _page("a3")]),
+            ("b.pdf", [_page("scan1")]),
+        ]
+        skip = raster.call_args.kwargs["skip"]
+        assert [skip(0), skip(1)] == [{2}, {1}]
+        assert [entry.get("embedded_image", False) for entry in report] == [
+            False, True, False, True,
+        ]
+        assert "dpi" in report[0] and "dpi" not in report[1]
+
+    def test_text_pages_not_offered_as_scans(self) -> None:
+        """텍스트 레이어 페이지는 scan_pages에서 빼고, 래스터화에서는 둘 다 뺀다."""
+        result, raster, mock_scan = self._run(
+            {"a.pdf": ["unrendered", "scan2", "a3"]},
+            {"a.pdf": {2}},
+            {"a.pdf": {0: "typed"}},
+        )
+
+        assert result == [("a.pdf", [_page("typed"), _page("scan2"), _page("a3")])]
+        assert mock_scan.call_args.args[3] == {1}
+        assert raster.call_args.kwargs["skip"](0) == {1, 2}
@@ -0,0 +1,237 @@
+"""ocr_uploads 모듈 단위 테스트 (로컬 대역 서버 사용)."""
+
+import contextvars
+import io
+import logging
+import threading
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import pytest
+from google.genai import types
+from PIL import Image
+
+from src import ocr_uploads
+from src.ocr import extract_text_from_image
+from src.ocr_scheduler import ocr_files
+from tests.genai_stub import error_response, text_response
+
+_RESULT = {"학번": "10305", "이름": "홍길동", "에세이텍스트": "본문"}
+_OK = text_response('{"학번": "10305", "이름": "홍길동", "에세이텍스트": "본문"}', 100)
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), "black").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _part(data: bytes) -> types.Part:
+    return types.Part.from_bytes(data=data, mime_type="image/jpeg")
+
+
+def _image_part(request: dict) -> dict:
+    """요청의 첫 이미지 Part (wire 형식)."""
+    return next(
+        part for part in request["contents"][0]["parts"]
+        if "fileData" in part or "inlineData" in part
+    )
+
+
+def _answers(*payloads: dict):
+    """호출 순서대로 payloads를 돌려주는 content_responder."""
+    queue = list(payloads)
+    return lambda model, request: queue.pop(0)
+
+
+def _other_job(data: bytes, release: threading.Event) -> tuple[threading.Thread, list]:
+    """다른 스레드(다른 사용자 세션)에서 업로드 작업을 열어 data를 올리고
+    release가 설정될 때까지 작업을 붙잡는다. 올린 파일 이름을 리스트로 돌려준다."""
+    uploaded = threading.Event()
+    names: list[str] = []
+
+    def _run() -> None:
+        with ocr_uploads.upload_job():
+            names.append(ocr_uploads.file_part(_part(data))[1])
+            uploaded.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    assert uploaded.wait(5)
+    return thread, names
+
+
+@pytest.fixture
+def stub(genai_stub):
+    """config.get_genai_client를 로컬 대역 서버 클라이언트로 바꾸고 Files API를 켠다."""
+    with patch("src.config.get_genai_client", genai_stub.client), patch(
+        "src.ocr.config.OCR_FILES_API", True
+    ):
+        yield genai_stub
+
+
+@patch("src.ocr.config.BLANK_SKIP_ENABLED", True)
+@patch("src.ocr.config.OCR_MODEL_CHAIN", "")
+class TestFilesApiOcr:
+    """Files API 업로드 재사용 OCR 흐름 테스트."""
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    @patch("src.ocr_retry.asyncio.sleep")
+    @patch("src.ocr_retry.time.sleep")
+    @patch("src.ocr_retry.config.OCR_RETRY_ATTEMPTS", 3)
+    @patch("src.ocr_scheduler.config.OCR_BATCH_SIZE", 1)
+    def test_retry_reuses_upload_and_deletes_at_job_end(
+        self, _sleep, _async_sleep, stub, use_async: bool,
+    ) -> None:
+        """재시도는 같은 파일 URI를 참조하고, 파일은 작업이 끝나면 삭제된다."""
+        stub.content_responder = _answers(
+            error_response(503, "overloaded"), _OK["response"]
+        )
+        report: list[dict] = []
+
+        with patch("src.ocr_scheduler.config.OCR_ASYNC", use_async):
+            result = ocr_files([("a.png", _png())], page_report=report)
+
+        assert result == [("a.png", [_RESULT])]
+        parts = [_image_part(request) for _, request in stub.generate_log]
+        assert len(parts) == 2 and parts[0] == parts[1] and "fileData" in parts[0]
+        assert stub.requests_log.count(("POST", "/upload/v1beta/files")) == 2
+        assert stub.deleted == ["files/file-1"] and stub.files == {}
+        assert report[0]["upload_file"] == "files/file-1"
+        assert report[0]["attempts"] == 2
+
+    def test_model_fallback_reuses_upload(self, stub) -> None:
+        """다음 모델로 넘어가도 다시 올리지 않고 같은 파일을 참조한다."""
+        stub.content_responder = _answers(
+            error_response(429, "quota"), _OK["response"]
+        )
+
+        with patch(
+            "src.ocr.config.OCR_MODEL_CHAIN",
+            "gemini-3.1-pro-preview,gemini-3-flash-preview",
+        ), ocr_uploads.upload_job():
+            extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+
+        assert [model for model, _ in stub.generate_log] == [
+            "gemini-3.1-pro-preview", "gemini-3-flash-preview",
+        ]
+        parts = [_image_part(request) for _, request in stub.generate_log]
+        assert parts[0] == parts[1] and "fileData" in parts[0]
+        assert stub.deleted == ["files/file-1"]
+
+    def test_outside_job_sends_inline(self, stub) -> None:
+        """업로드 작업 밖에서는 올리지 않고 인라인으로 보낸다."""
+        stub.content_responder = _answers(_OK["response"])
+
+        assert extract_text_from_image(Image.new("RGB", (40, 30), "black")) == _RESULT
+
+        assert "inlineData" in _image_part(stub.generate_log[0][1])
+        assert stub.files == {} and stub.deleted == []
+
+    def test_page_checked_before_upload(self, stub) -> None:
+        """페이지 마감을 넘었거나 취소된 페이지는 올리기 전에 멈춘다."""
+        with patch(
+            "src.ocr.ocr_retry.check_page", side_effect=TimeoutError("마감")
+        ), ocr_uploads.upload_job(), pytest.raises(TimeoutError):
+            extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+
+        assert stub.requests_log == [] and stub.files == {}
+
+    def test_delete_failure_is_logged(self, stub, caplog) -> None:
+        """삭제에 실패해도 작업은 끝나고 경고만 남긴다."""
+        stub.content_responder = _answers(_OK["response"])
+        stub.fail_deletes = True
+
+        with caplog.at_level(logging.WARNING, logger="src.ocr_uploads"):
+            with ocr_uploads.upload_job():
+                extract_text_from_image(Image.new("RGB", (40, 30), "black"))
+
+        assert "files/file-1" in caplog.text
+        assert ocr_uploads.uploaded_count() == 0
+
+
+class TestUploadRegistry:
+    """file_part / upload_contents / upload_job 등록부 테스트."""
+
+    def test_file_shared_by_jobs_deleted_after_last(self, stub) -> None:
+        """동시에 도는 두 작업이 같은 파일을 쓰면 둘 다 끝나야 삭제한다."""
+        release = threading.Event()
+        thread, names = _other_job(b"page", release)
+
+        with ocr_uploads.upload_job():
+            part, name = ocr_uploads.file_part(_part(b"page"))
+        assert name == names[0] and stub.deleted == []
+
+        release.set()
+        thread.join(5)
+        assert stub.deleted == [name]
+        assert part.file_data.file_uri.endswith(name)
+        assert len(stub.requests_log) == 3  # 업로드 시작, 전송, 삭제
+
+    def test_file_owned_only_by_its_job(self, stub) -> None:
+        """다른 작업이 진행 중이어도 자기 작업이 끝나면 자기 파일만 삭제한다."""
+        release = threading.Event()
+        thread, names = _other_job(b"a", release)
+
+        with ocr_uploads.upload_job():
+            assert ocr_uploads.active()
+            _, name = ocr_uploads.file_part(_part(b"b"))
+        assert stub.deleted == [name] and not ocr_uploads.active()
+        with pytest.raises(RuntimeError):
+            ocr_uploads.file_part(_part(b"b"))
+
+        release.set()
+        thread.join(5)
+        assert stub.deleted == [name, names[0]]
+        assert ocr_uploads.uploaded_count() == 0
+
+    def test_upload_finished_after_job_end_is_deleted(self, stub) -> None:
+        """작업이 끝난 뒤에 끝난 작업자의 업로드는 등록하지 않고 바로 삭제한다."""
+        started = threading.Event()
+        release = threading.Event()
+        upload = ocr_uploads._upload
+        errors: list[BaseException] = []
+
+        def _slow_upload(data: bytes, mime_type: str) -> types.File:
+            started.set()
+            assert release.wait(5)
+            return upload(data, mime_type)
+
+        def _worker() -> None:
+            try:
+                ocr_uploads.file_part(_part(b"late"))
+            except BaseException as exc:  # noqa: BLE001
+                errors.append(exc)
+
+        with patch("src.ocr_uploads._upload", side_effect=_slow_upload):
+            with ocr_uploads.upload_job():
+                # 취소 뒤 ocr_engine이 기다리지 않고 남겨 둔 작업자 스레드
+                thread = threading.Thread(target=contextvars.copy_context().run, args=(_worker,))
+                thread.start()
+                assert started.wait(5)
+            assert stub.deleted == []
+            release.set()
+            thread.join(5)
+
+        assert stub.deleted == ["files/file-1"]
+        assert ocr_uploads.uploaded_count() == 0
+        assert [type(exc) for exc in errors] == [CancelledError]
+        with ocr_uploads.upload_job():
+            ended_job = contextvars.copy_context()
+        with pytest.raises(CancelledError):
+            ended_job.run(ocr_uploads.file_part, _part(b"late"))
+        assert len(stub.requests_log) == 3  # 늦은 업로드 시작, 전송, 삭제만
+
+    def test_upload_contents_records_file_per_page(self, stub) -> None:
+        """묶음 contents의 이미지 Part만 바꾸고 페이지마다 파일 이름을 기록한다."""
+        stats_list: list[dict] = [{}, {}]
+
+        with ocr_uploads.upload_job():
+            contents = ocr_uploads.upload_contents(
+                ["페이지 1", _part(b"a"), "페이지 2", _part(b"b"), "prompt"], stats_list
+            )
+
+        assert contents[0::2] == ["페이지 1", "페이지 2", "prompt"]
+        assert all(part.file_data is not None for part in contents[1::2])
+        assert [s["upload_file"] for s in stats_list] == ["files/file-1", "files/file-2"]
@@ -0,0 +1,157 @@
+"""page_hash 모듈 단위 테스트."""
+
+import io
+import random
+from unittest.mock import patch
+
+import pytest
+from google.genai import types
+from PIL import Image, ImageDraw, ImageEnhance
+
+from src.page_hash import content_digest, dhash, hamming, nearest, page_hash, phash
+
+
+def _answer_sheet(seed: int) -> Image.Image:
+    """같은 인쇄 양식(테두리, 괘선)에 seed별로 다른 손글씨 획이 있는 답안지."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (1200, 1600), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 1179, 1579), outline="black", width=4)
+    for y in range(300, 1500, 60):
+        draw.line((80, y, 1120, y), fill=(150, 150, 150), width=2)
+    for y in range(270, 1470, 60):
+        x = 90
+        end = rng.randint(300, 1100)
+        while x < end:
+            width = rng.randint(10, 40)
+            draw.line(
+                (x, y + rng.randint(-8, 8), x + width, y + rng.randint(-8, 8)),
+                fill=(30, 30, 30), width=4,
+            )
+            x += width + rng.randint(5, 25)
+    return image
+
+
+def _jpeg_part(image: Image.Image, quality: int = 60) -> types.Part:
+    buffer = io.BytesIO()
+    image.convert("L").save(buffer, "JPEG", quality=quality)
+    return types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+
+
+# ---------------------------------------------------------------------------
+# phash / dhash 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.page_hash.config.DEDUP_HASH_SIZE", 16)
+class TestPhash:
+    """phash 함수 테스트."""
+
+    def test_hash_fits_in_size_squared_bits(self) -> None:
+        """해시는 hash_size² - 1 비트 안에 들어간다."""
+        assert phash(_answer_sheet(1)).bit_length() <= 255
+        assert phash(_answer_sheet(1), hash_size=8).bit_length() <= 63
+
+    def test_same_image_same_hash(self) -> None:
+        """같은 이미지는 같은 해시를 갖는다."""
+        assert phash(_answer_sheet(1)) == phash(_answer_sheet(1))
+
+    def test_rescan_like_changes_stay_close(self) -> None:
+        """밝기 변화, 축소, JPEG 재압축에도 해밍 거리가 작다."""
+        original = phash(_answer_sheet(1))
+        brighter = ImageEnhance.Brightness(_answer_sheet(1)).enhance(1.1)
+        smaller = _answer_sheet(1).resize((900, 1200))
+
+        assert hamming(original, phash(brighter)) <= 20
+        assert hamming(original, phash(smaller)) <= 20
+        assert hamming(original, phash(_jpeg_part(_answer_sheet(1)))) <= 20
+
+    def test_different_handwriting_on_same_form_is_far(self) -> None:
+        """같은 양식이라도 손글씨가 다른 답안지는 해밍 거리가 크다."""
+        original = phash(_answer_sheet(1))
+        for seed in (2, 3, 4):
+            assert hamming(original, phash(_answer_sheet(seed))) > 50
+
+
+@patch("src.page_hash.config.DEDUP_HASH_SIZE", 16)
+class TestDhash:
+    """dhash 함수 테스트."""
+
+    def test_hash_fits_in_size_squared_bits(self) -> None:
+        """해시는 hash_size² 비트 안에 들어간다."""
+        assert dhash(_answer_sheet(1)).bit_length() <= 256
+        assert dhash(_answer_sheet(1), hash_size=8).bit_length() <= 64
+
+    def test_same_image_same_hash_and_different_far(self) -> None:
+        """같은 이미지는 같은 해시, 다른 답안지는 먼 해시를 갖는다."""
+        original = dhash(_answer_sheet(1))
+
+        assert dhash(_answer_sheet(1)) == original
+        assert hamming(original, dhash(_answer_sheet(2))) > 50
+
+    def test_part_is_decoded(self) -> None:
+        """이미지 Part도 디코딩하여 원본과 가까운 해시를 계산한다."""
+        part = _jpeg_part(_answer_sheet(3), quality=90)
+
+        assert hamming(dhash(part), dhash(_answer_sheet(3))) <= 30
+
+
+class TestPageHash:
+    """page_hash 함수 테스트."""
+
+    @pytest.mark.parametrize("method, func", [("phash", phash), ("dhash", dhash)])
+    def test_dispatches_on_config_method(self, method, func) -> None:
+        """config.DEDUP_METHOD에 따라 해시 함수를 고른다."""
+        with patch("src.page_hash.config.DEDUP_METHOD", method):
+            assert page_hash(_answer_sheet(1)) == func(_answer_sheet(1))
+
+    def test_unknown_method_raises(self) -> None:
+        """지원하지 않는 방식이면 ValueError."""
+        with patch("src.page_hash.config.DEDUP_METHOD", "ahash"):
+            with pytest.raises(ValueError, match="ahash"):
+                page_hash(_answer_sheet(1))
+
+
+class TestContentDigest:
+    """content_digest 함수 테스트."""
+
+    def test_same_pixels_same_digest(self) -> None:
+        """픽셀이 같은 페이지는 같은 요약, 같은 Part 바이트도 같은 요약."""
+        part = _jpeg_part(_answer_sheet(1))
+
+        assert content_digest(_answer_sheet(1)) == content_digest(_answer_sheet(1))
+        assert content_digest(part) == content_digest(_jpeg_part(_answer_sheet(1)))
+
+    def test_one_pixel_changes_digest(self) -> None:
+        """지각 해시가 같아도 픽셀 하나가 다르면 요약이 다르다."""
+        changed = _answer_sheet(1)
+        changed.putpixel((5, 5), 0)
+
+        assert phash(changed) == phash(_answer_sheet(1))
+        assert content_digest(changed) != content_digest(_answer_sheet(1))
+
+
+# ---------------------------------------------------------------------------
+# hamming / nearest 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestNearest:
+    """hamming, nearest 함수 테스트."""
+
+    def test_hamming_counts_differing_bits(self) -> None:
+        """다른 비트 수를 센다."""
+        assert hamming(0b1010, 0b0110) == 2
+        assert hamming(5, 5) == 0
+
+    def test_empty_returns_none(self) -> None:
+        """비교할 이전 해시가 없으면 None."""
+        assert nearest([], 7) is None
+
+    def test_returns_closest_index_and_distance(self) -> None:
+        """가장 가까운 해시의 인덱스와 거리를 반환한다."""
+        assert nearest([0b1111, 0b0001, 0b0111], 0b0011) == (1, 1)
+
+    def test_tie_prefers_earlier_page(self) -> None:
+        """거리가 같으면 앞선 페이지를 고른다."""
+        assert nearest([0b01, 0b10], 0b00) == (0, 1)
@@ -0,0 +1,361 @@
+"""pdf_images 모듈 단위 테스트."""
+
+import io
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.genai import types
+from PIL import Image
+
+from src.pdf_images import (
+    drawn_pages,
+    extract_jpegs,
+    has_drawing,
+    is_full_page_jpeg,
+    iter_scan_pages,
+    page_image,
+    page_layout,
+    scan_pages,
+)
+
+_A4 = (595.276, 841.89)
+
+_LIST_OUTPUT = (
+    "page   num  type   width height color comp bpc  enc interp  object ID x-ppi y-ppi size ratio\n"
+    "--------------------------------------------------------------------------------------------\n"
+    "   1     0 image    2480  3508  gray    1   8  jpeg   no         7  0   300   300  512K  6.0%\n"
+    "   2     1 image    2480  3508  rgb     3   8  image  no        12  0   300   300  2.1M  8.0%\n"
+    "   3     2 image     600   400  rgb     3   8  jpeg   no        17  0   300   300   40K  5.5%\n"
+    "   4     3 image    1654  2339  gray    1   8  jpeg   no        22  0   200   200  300K  7.9%\n"
+)
+
+
+def _write_svg(args: list[str], page_svg) -> subprocess.CompletedProcess:
+    """pdftocairo -svg -f -l처럼 구간 페이지를 한 SVG 파일로 쓴다.
+
+    여러 페이지면 <pageSet> 안에 페이지마다 <page>를 두고, page_svg(페이지)가 그 내용이다.
+    """
+    first, last = int(args[args.index("-f") + 1]), int(args[args.index("-l") + 1])
+    if first == last:
+        svg = f"<svg>{page_svg(first)}</svg>"
+    else:
+        pages = "".join(f"<page>{page_svg(page)}</page>" for page in range(first, last + 1))
+        svg = f"<svg>{_GLYPHS}<pageSet>{pages}</pageSet></svg>"
+    Path(args[-1]).write_text(svg, encoding="utf-8")
+    return subprocess.CompletedProcess(args, 0, stdout=b"", stderr=b"")
+
+
+def _tools(listing: str, shapes: dict[int, str] | None = None):
+    """pdfimages -list에는 listing을, pdftocairo -svg에는 스캔 이미지와
+    shapes[페이지]를 그린 SVG 파일을 내는 subprocess.run 대체 함수."""
+
+    def _run(args, **kwargs):
+        if args[0] == "pdftocairo":
+            return _write_svg(args, lambda page: (
+                f'<g><image width="2480" height="3508"/>{(shapes or {}).get(page, "")}</g>'
+            ))
+        return subprocess.CompletedProcess(args, 0, stdout=listing.encode(), stderr=b"")
+
+    return _run
+
+
+def _jpeg(size: tuple[int, int], mode: str = "L") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, "white").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _image(**overrides) -> dict:
+    image = {
+        "type": "image", "width": 2480, "height": 3508, "color": "gray",
+        "bpc": 8, "enc": "jpeg", "x_ppi": 300.0, "y_ppi": 300.0,
+    }
+    image.update(overrides)
+    return image
+
+
+# ---------------------------------------------------------------------------
+# is_full_page_jpeg / scan_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestScanPages:
+    """is_full_page_jpeg, scan_pages 함수 테스트."""
+
+    @pytest.mark.parametrize(
+        ("images", "rotation", "expected"),
+        [
+            ([_image()], 0, True),
+            ([_image(color="rgb")], 0, True),
+            ([_image(), _image(type="smask")], 0, False),
+            ([_image(enc="image")], 0, False),
+            ([_image(color="cmyk")], 0, False),
+            ([_image(width=600, height=400)], 0, False),
+            ([_image()], 90, False),
+            ([], 0, False),
+        ],
+    )
+    def test_full_page_jpeg_rules(self, images, rotation, expected) -> None:
+        """전체 페이지를 덮는 8비트 흑백/RGB JPEG 한 장이고 회전이 없을 때만 스캔 페이지다."""
+        assert is_full_page_jpeg(images, _A4, rotation) is expected
+
+    @patch("src.pdf_images.config.PDF_IMAGES_ENABLED", True)
+    @patch(
+        "src.pdf_images.file_handler.pdf_page_geometry",
+        return_value=([_A4] * 4, [0] * 4),
+    )
+    @patch("src.pdf_images.subprocess.run")
+    def test_picks_scan_pages_from_list(
+        self, mock_run: MagicMock, mock_geometry: MagicMock,
+    ) -> None:
+        """pdfimages -list 출력에서 스캔 페이지만 고르고 skip 페이지는 뺀다 (pdfinfo 한 번)."""
+        mock_run.side_effect = _tools(_LIST_OUTPUT)
+
+        scans = scan_pages(b"%PDF", 4, [""] * 4, skip={4})
+
+        assert sorted(scans) == [1]
+        assert scans[1]["color"] == "gray"
+        assert mock_run.call_args_list[0].args[0][:2] == ["pdfimages", "-list"]
+        mock_geometry.assert_called_once_with(b"%PDF", 4)
+
+    @patch("src.pdf_images.config.PDF_IMAGES_ENABLED", True)
+    @patch(
+        "src.pdf_images.file_handler.pdf_page_geometry",
+        return_value=([_A4] * 3, [0] * 3),
+    )
+    @patch("src.pdf_images.subprocess.run")
+    def test_text_or_drawing_keeps_page_rasterized(
+        self, mock_run: MagicMock, _geometry: MagicMock,
+    ) -> None:
+        """스캔 JPEG 한 장이어도 글자(pdftotext)나 다른 그리기(주석 획)가 있으면 고르지 않는다."""
+        full_page = _LIST_OUTPUT.splitlines()[2]
+        listing = "\n".join(
+            _LIST_OUTPUT.splitlines()[:2]
+            + [full_page.replace("   1     0", f"   {n}     {n - 1}", 1) for n in (1, 2, 3)]
+        )
+        ink = '<path style="fill:none;stroke:rgb(100%,0%,0%);" d="M 1 1 L 9 9"/>'
+        mock_run.side_effect = _tools(listing, {3: ink})
+
+        scans = scan_pages(b"%PDF", 3, ["", "스캐너가 입힌 글자", ""])
+
+        assert sorted(scans) == [1]
+        cairo = [c.args[0] for c in mock_run.call_args_list if c.args[0][0] == "pdftocairo"]
+        assert [args[args.index("-f") + 1] for args in cairo] == ["1", "3"]
+
+    @patch("src.pdf_images.config.PDF_IMAGES_ENABLED", True)
+    @patch(
+        "src.pdf_images.file_handler.pdf_page_geometry",
+        return_value=([_A4] * 4, [0] * 4),
+    )
+    @patch("src.pdf_images.subprocess.run")
+    def test_layout_read_once_and_reused(
+        self, mock_run: MagicMock, mock_geometry: MagicMock,
+    ) -> None:
+        """page_layout으로 미리 구한 목록과 크기를 넘기면 pdfimages와 pdfinfo를 다시 부르지 않는다."""
+        mock_run.side_effect = _tools(_LIST_OUTPUT)
+
+        layout = page_layout(b"%PDF", 4)
+        scans = scan_pages(b"%PDF", 4, [""] * 4, skip={4}, layout=layout)
+
+        assert sorted(scans) == [1]
+        assert layout[1:] == ([_A4] * 4, [0] * 4)
+        assert [c.args[0][0] for c in mock_run.call_args_list].count("pdfimages") == 1
+        mock_geometry.assert_called_once_with(b"%PDF", 4)
+
+    @patch("src.pdf_images.file_handler.pdf_page_geometry")
+    @patch("src.pdf_images.subprocess.run")
+    def test_layout_without_images_skips_pdfinfo(
+        self, mock_run: MagicMock, mock_geometry: MagicMock,
+    ) -> None:
+        """이미지가 없는 문서의 page_layout은 pdfinfo를 부르지 않는다 (크기 None, 회전 0)."""
+        mock_run.side_effect = _tools(_LIST_OUTPUT.splitlines()[0])
+
+        assert page_layout(b"%PDF", 2) == ({}, [None, None], [0, 0])
+        mock_geometry.assert_not_called()
+
+    @patch("src.pdf_images.config.PDF_IMAGES_ENABLED", True)
+    @patch("src.pdf_images.file_handler.pdf_page_geometry")
+    @patch("src.pdf_images.subprocess.run", side_effect=FileNotFoundError("pdfimages"))
+    def test_missing_pdfimages_falls_back(
+        self, _run: MagicMock, mock_geometry: MagicMock,
+    ) -> None:
+        """pdfimages가 없으면 스캔 페이지가 없고(래스터화 경로) pdfinfo도 부르지 않는다."""
+        assert scan_pages(b"%PDF", 2, ["", ""]) == {}
+        mock_geometry.assert_not_called()
+
+    @patch("src.pdf_images.subprocess.run")
+    def test_disabled_or_all_skipped_makes_no_call(self, mock_run: MagicMock) -> None:
+        """꺼져 있거나 모든 페이지를 건너뛰거나 모든 페이지에 글자가 있으면 pdfimages를 부르지 않는다."""
+        with patch("src.pdf_images.config.PDF_IMAGES_ENABLED", False):
+            assert scan_pages(b"%PDF", 2, ["", ""]) == {}
+        with patch("src.pdf_images.config.PDF_IMAGES_ENABLED", True):
+            assert scan_pages(b"%PDF", 2, ["", ""], skip={1, 2}) == {}
+            assert scan_pages(b"%PDF", 2, ["글자", "글자"]) == {}
+        mock_run.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# has_drawing / drawn_pages 테스트
+# ---------------------------------------------------------------------------
+
+_GLYPHS = (
+    '<defs><g><symbol id="glyph0-1"><path style="stroke:none;" d="M 1 0 L 1 -7 Z"/>'
+    '</symbol></g></defs><g style="fill:rgb(0%,0%,0%);"><use xlink:href="#glyph0-1"/></g>'
+)
+
+
+class TestDrawnPages:
+    """has_drawing, drawn_pages 함수 테스트."""
+
+    @pytest.mark.parametrize(
+        ("shape", "expected"),
+        [
+            ("", False),
+            ('<rect width="595" height="842" fill="rgb(100%, 100%, 100%)" stroke="none"/>', False),
+            ('<path fill="none" stroke-width="2" stroke="rgb(0%, 0%, 100%)" d="M 1 1"/>', True),
+            ('<path style="fill:rgb(0%,0%,0%);stroke:none;" d="M 72 90 L 300 90 Z"/>', True),
+            ('<image width="100" height="100" xlink:href="data:image/png;base64,AA"/>', True),
+        ],
+    )
+    def test_drawing_rules(self, shape: str, expected: bool) -> None:
+        """글리프(<defs>)와 흰 배경은 그리기가 아니고, 선, 채운 도형, 이미지는 그리기다."""
+        assert has_drawing(f"<svg>{_GLYPHS}{shape}</svg>") is expected
+
+    def test_scan_image_ignored_when_images_off(self) -> None:
+        """images=False면 선 없는 이미지와 이미지 패턴 채우기는 무시하고 다른 그리기만 본다."""
+        scan = (
+            '<image width="2480" height="3508" xlink:href="data:image/jpeg;base64,AA"/>'
+            '<rect width="595" height="842" style="fill:url(#pattern0);stroke:none;"/>'
+        )
+        ink = '<path style="fill:none;stroke:rgb(0%,0%,0%);" d="M 1 1 L 9 9"/>'
+        assert has_drawing(f"<svg>{scan}</svg>") is True
+        assert has_drawing(f"<svg>{scan}</svg>", images=False) is False
+        assert has_drawing(f"<svg>{scan}{ink}</svg>", images=False) is True
+
+    @patch("src.pdf_images.subprocess.run")
+    def test_one_run_per_page_range(self, mock_run: MagicMock) -> None:
+        """연속 페이지 구간마다 pdftocairo -svg를 한 번 불러 페이지별로 판정한다."""
+        shape = '<path style="stroke:rgb(0%,0%,0%);" d="M 1 1"/>'
+        mock_run.side_effect = lambda args, **kwargs: _write_svg(
+            args, lambda page: f"{_GLYPHS}{shape}" if page in (2, 6) else _GLYPHS
+        )
+
+        with patch("src.pdf_images.config.PDF_CHUNK_PAGES", 3):
+            assert drawn_pages(b"%PDF", [6, 1, 2, 3, 4]) == {2, 6}
+        assert [c.args[0][:6] for c in mock_run.call_args_list] == [
+            ["pdftocairo", "-svg", "-f", "1", "-l", "3"],
+            ["pdftocairo", "-svg", "-f", "4", "-l", "4"],
+            ["pdftocairo", "-svg", "-f", "6", "-l", "6"],
+        ]
+
+    @patch("src.pdf_images.subprocess.run")
+    def test_failure_marks_remaining_pages_drawn(self, mock_run: MagicMock) -> None:
+        """pdftocairo가 실패하면 그 구간부터 남은 페이지를 모두 그리기로 본다."""
+        def _run(args, **kwargs):
+            if args[args.index("-f") + 1] == "3":
+                raise subprocess.TimeoutExpired(args, 60)
+            return _write_svg(args, lambda page: _GLYPHS)
+        mock_run.side_effect = _run
+
+        assert drawn_pages(b"%PDF", [1, 3, 5]) == {3, 5}
+        assert mock_run.call_count == 2
+
+    @patch("src.pdf_images.subprocess.run")
+    def test_unsplit_output_marks_run_drawn(self, mock_run: MagicMock) -> None:
+        """구간 출력의 <page> 수가 페이지 수와 다르면 그 구간을 그리기로 본다."""
+        def _run(args, **kwargs):
+            Path(args[-1]).write_text(f"<svg>{_GLYPHS}</svg>", encoding="utf-8")
+            return subprocess.CompletedProcess(args, 0, stdout=b"", stderr=b"")
+        mock_run.side_effect = _run
+
+        assert drawn_pages(b"%PDF", [1, 2, 4]) == {1, 2}
+
+
+# ---------------------------------------------------------------------------
+# extract_jpegs / iter_scan_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+def _write_outputs(jpegs_by_page: dict[int, bytes]):
+    """pdfimages -j -p처럼 출력 접두어 옆에 <접두어>-<페이지>-<번호>.jpg를 쓰는 run 대체 함수."""
+
+    def _run(args, **kwargs):
+        first, last = int(args[args.index("-f") + 1]), int(args[args.index("-l") + 1])
+        prefix = Path(args[-1])
+        for page in range(first, last + 1):
+            if page in jpegs_by_page:
+                Path(f"{prefix}-{page:03d}-{page - 1:03d}.jpg").write_bytes(
+                    jpegs_by_page[page]
+                )
+        return subprocess.CompletedProcess(args, 0, stdout=b"", stderr=b"")
+
+    return _run
+
+
+class TestExtractJpegs:
+    """extract_jpegs, iter_scan_pages 함수 테스트."""
+
+    @patch("src.pdf_images.subprocess.run")
+    def test_reads_raw_jpeg_bytes_per_page(self, mock_run: MagicMock) -> None:
+        """-j -p로 구간의 JPEG 스트림을 그대로 꺼내 페이지 번호별로 읽는다."""
+        mock_run.side_effect = _write_outputs({2: b"jpeg-2", 3: b"jpeg-3"})
+
+        assert extract_jpegs(b"%PDF", 2, 3) == {2: b"jpeg-2", 3: b"jpeg-3"}
+        args = mock_run.call_args.args[0]
+        assert args[:3] == ["pdfimages", "-j", "-p"]
+        assert args[3:7] == ["-f", "2", "-l", "3"]
+
+    @patch("src.pdf_images.raster_pool.render_window")
+    @patch("src.pdf_images.subprocess.run")
+    def test_chunks_runs_and_renders_missing_page(
+        self, mock_run: MagicMock, mock_render: MagicMock,
+    ) -> None:
+        """연속 페이지를 구간 크기씩 꺼내고, 꺼내지 못한 페이지만 래스터화한다."""
+        page = _jpeg((100, 140))
+        mock_run.side_effect = _write_outputs({1: page, 2: page, 5: page})
+        mock_render.return_value = ["rendered-3"]
+        scans = {n: _image(width=100, height=140) for n in (1, 2, 3, 5)}
+
+        pages = list(iter_scan_pages(b"%PDF", scans, chunk_size=2))
+
+        ranges = [
+            (c.args[0][c.args[0].index("-f") + 1], c.args[0][c.args[0].index("-l") + 1])
+            for c in mock_run.call_args_list
+        ]
+        assert ranges == [("1", "2"), ("3", "3"), ("5", "5")]
+        assert [p.inline_data.data for p in (pages[0], pages[1], pages[3])] == [page] * 3
+        assert pages[2] == "rendered-3"
+        mock_render.assert_called_once_with(b"%PDF", 3, 3)
+
+
+# ---------------------------------------------------------------------------
+# page_image 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.pdf_images.config.UPLOAD_GRAYSCALE", True)
+@patch("src.pdf_images.config.UPLOAD_MAX_EDGE", 2000)
+class TestPageImage:
+    """page_image 함수 테스트."""
+
+    def test_fitting_gray_jpeg_passed_through(self) -> None:
+        """업로드 설정에 맞는 흑백 JPEG는 바이트 그대로 image/jpeg Part가 된다."""
+        data = _jpeg((1400, 2000))
+
+        page = page_image(data, _image(width=1400, height=2000))
+
+        assert isinstance(page, types.Part)
+        assert page.inline_data.data == data
+        assert page.inline_data.mime_type == "image/jpeg"
+
+    def test_oversized_color_jpeg_draft_decoded(self) -> None:
+        """큰 컬러 JPEG는 draft 모드로 필요한 크기의 흑백으로만 디코딩한다."""
+        data = _jpeg((4000, 3000), "RGB")
+
+        page = page_image(data, _image(width=4000, height=3000, color="rgb"))
+
+        assert isinstance(page, Image.Image)
+        assert page.mode == "L"
+        assert page.size == (2000, 1500)
@@ -0,0 +1,261 @@
+"""pdf_text 모듈 단위 테스트."""
+
+import asyncio
+import json
+import subprocess
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import errors, types
+from PIL import Image
+
+from src import ocr_retry
+from src.ocr import MODEL_NAME
+from src.ocr_header import HEADER_MODEL_NAME
+from src.pdf_text import (
+    extract_page_texts,
+    extract_text_page,
+    extract_text_page_async,
+    has_text_layer,
+    is_text_page,
+    text_pages,
+)
+
+_ESSAY = "학번 10305 이름 홍길동\n" + "디지털로 작성한 에세이 본문입니다. " * 20
+
+
+def _completed(stdout: str) -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess([], 0, stdout=stdout.encode(), stderr=b"")
+
+
+# pdftocairo -svg 출력: 글리프는 <defs>에 있고 <use>로 참조한다. 흰 배경은 그리기가 아니다.
+_TYPED_SVG = (
+    '<svg><defs><g><symbol id="glyph0-1"><path style="stroke:none;" d="M 1 0 L 1 -7 Z"/>'
+    '</symbol></g></defs><g id="surface1"><rect x="0" y="0" width="595" height="842" '
+    'style="fill:rgb(100%,100%,100%);fill-opacity:1;stroke:none;"/>'
+    '<g style="fill:rgb(0%,0%,0%);"><use xlink:href="#glyph0-1" x="72" y="72"/></g></g></svg>'
+)
+# 태블릿 필기: 글자 위에 선으로 그린 획
+_INKED_SVG = _TYPED_SVG.replace(
+    "</g></svg>",
+    '<path style="fill:none;stroke-width:2;stroke:rgb(0%,0%,100%);" '
+    'd="M 100 200 C 120 210 140 190 160 200"/></g></svg>',
+)
+_SCAN_LIST = (
+    "page   num  type   width height color comp bpc  enc interp  object ID x-ppi y-ppi size ratio\n"
+    "--------------------------------------------------------------------------------------------\n"
+    "   1     0 image    2480  3508  gray    1   8  jpeg   no         7  0   300   300  512K  6.0%\n"
+)
+
+
+def _poppler(text: str, images: str = "", svgs: dict[int, str] | None = None):
+    """명령별로 응답하는 subprocess.run 대체 함수 (pdftotext, pdfimages -list, pdftocairo -svg)."""
+    def _run(args, **kwargs):
+        if args[0] == "pdftocairo":
+            first, last = int(args[args.index("-f") + 1]), int(args[args.index("-l") + 1])
+            pages = [(svgs or {}).get(page, _TYPED_SVG) for page in range(first, last + 1)]
+            svg = pages[0] if first == last else (
+                "<svg><pageSet>" + "".join(f"<page>{page}</page>" for page in pages)
+                + "</pageSet></svg>"
+            )
+            Path(args[-1]).write_text(svg, encoding="utf-8")
+            return _completed("")
+        return _completed(text if args[0] == "pdftotext" else images)
+    return _run
+
+
+def _response(payload: dict, tokens: int | None = None) -> MagicMock:
+    response = MagicMock(text=json.dumps(payload, ensure_ascii=False))
+    response.usage_metadata.prompt_token_count = tokens
+    return response
+
+
+# ---------------------------------------------------------------------------
+# extract_page_texts / text_pages 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.pdf_text.config.PDF_TEXT_ENABLED", True)
+@patch("src.pdf_text.config.PDF_TEXT_MIN_CHARS", 10)
+@patch("src.pdf_text.subprocess.run")
+class TestTextPages:
+    """extract_page_texts, has_text_layer, text_pages, is_text_page 함수 테스트."""
+
+    def test_pages_split_on_form_feed(self, mock_run: MagicMock) -> None:
+        """pdftotext 출력을 폼 피드로 나누고 PDF 바이트는 표준 입력으로 넘긴다."""
+        mock_run.return_value = _completed("  첫 페이지 \n\f\f셋째 페이지\n\f")
+
+        texts = extract_page_texts(b"%PDF", 3)
+
+        assert texts == ["첫 페이지", "", "셋째 페이지"]
+        args, kwargs = mock_run.call_args
+        assert args[0][0] == "pdftotext"
+        assert args[0][-2:] == ["-", "-"]
+        assert kwargs["input"] == b"%PDF"
+
+    def test_short_output_padded(self, mock_run: MagicMock) -> None:
+        """출력 페이지가 모자라면 빈 문자열로 채워 페이지 수를 맞춘다."""
+        mock_run.return_value = _completed("한 페이지\f")
+
+        assert extract_page_texts(b"%PDF", 3) == ["한 페이지", "", ""]
+
+    def test_missing_or_failing_pdftotext_falls_back(self, mock_run: MagicMock) -> None:
+        """pdftotext가 없거나 실패하면 모든 페이지가 빈 문자열이다 (래스터화 경로)."""
+        mock_run.side_effect = FileNotFoundError("pdftotext")
+        assert extract_page_texts(b"%PDF", 2) == ["", ""]
+
+        mock_run.side_effect = subprocess.CalledProcessError(1, "pdftotext")
+        assert extract_page_texts(b"%PDF", 2) == ["", ""]
+
+    def test_min_chars_ignore_whitespace(self, mock_run: MagicMock) -> None:
+        """공백을 뺀 글자 수가 기준 이상인 페이지만 텍스트 Part가 된다."""
+        mock_run.side_effect = _poppler("가 나 다 라 마 바 사\f가나다라마바사아자차\f\f")
+
+        pages = text_pages(b"%PDF", 3)
+
+        assert not has_text_layer("가 나 다 라 마 바 사")
+        assert pages[0] is None and pages[2] is None
+        assert pages[1].text == "가나다라마바사아자차"
+        assert is_text_page(pages[1])
+
+    @patch("src.pdf_text.file_handler.pdf_page_sizes", return_value=[(595.276, 841.89)] * 2)
+    def test_searchable_scan_goes_to_image_path(
+        self, _sizes: MagicMock, mock_run: MagicMock,
+    ) -> None:
+        """OCR 텍스트를 입힌 스캔(페이지를 덮는 이미지)은 글자가 있어도 텍스트 페이지가 아니다."""
+        mock_run.side_effect = _poppler(f"{_ESSAY}\f{_ESSAY}", images=_SCAN_LIST)
+
+        pages = text_pages(b"%PDF", 2)
+
+        assert pages[0] is None and pages[1].text == _ESSAY.strip()
+        cairo = [c.args[0] for c in mock_run.call_args_list if c.args[0][0] == "pdftocairo"]
+        assert [args[args.index("-f") + 1] for args in cairo] == ["2"]
+
+    def test_tablet_annotated_worksheet_goes_to_image_path(self, mock_run: MagicMock) -> None:
+        """인쇄된 학습지 위에 태블릿으로 필기한 페이지(글자 외의 선)는 텍스트 페이지가 아니다."""
+        mock_run.side_effect = _poppler(f"{_ESSAY}\f{_ESSAY}", svgs={1: _INKED_SVG})
+
+        pages = text_pages(b"%PDF", 2)
+
+        assert pages[0] is None and pages[1].text == _ESSAY.strip()
+
+    def test_unreadable_page_content_goes_to_image_path(self, mock_run: MagicMock) -> None:
+        """pdftocairo가 없으면 글자가 있어도 이미지 경로로 보낸다."""
+        def _run(args, **kwargs):
+            if args[0] == "pdftocairo":
+                raise FileNotFoundError("pdftocairo")
+            return _poppler(_ESSAY)(args, **kwargs)
+        mock_run.side_effect = _run
+
+        assert text_pages(b"%PDF", 1) == [None]
+
+    def test_disabled_skips_pdftotext(self, mock_run: MagicMock) -> None:
+        """config.PDF_TEXT_ENABLED가 꺼져 있으면 pdftotext를 부르지 않는다."""
+        with patch("src.pdf_text.config.PDF_TEXT_ENABLED", False):
+            assert text_pages(b"%PDF", 2) == [None, None]
+        mock_run.assert_not_called()
+
+    def test_image_pages_are_not_text_pages(self, mock_run: MagicMock) -> None:
+        """이미지 Part와 PIL Image는 텍스트 페이지가 아니다."""
+        image_part = types.Part.from_bytes(data=b"jpeg", mime_type="image/jpeg")
+
+        assert not is_text_page(image_part)
+        assert not is_text_page(Image.new("L", (4, 4)))
+        assert is_text_page(types.Part(text=_ESSAY))
+
+
+# ---------------------------------------------------------------------------
+# extract_text_page 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.pdf_text.config.PDF_TEXT_HEADER", True)
+@patch("src.pdf_text.config.PDF_TEXT_HEADER_CHARS", 30)
+@patch("src.pdf_text.config.get_genai_client")
+class TestExtractTextPage:
+    """extract_text_page, extract_text_page_async 함수 테스트."""
+
+    def test_text_kept_and_header_read_by_fast_model(self, mock_get_client: MagicMock) -> None:
+        """본문은 페이지 텍스트 그대로, 학번/이름은 앞부분 텍스트만 빠른 모델로 읽는다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = _response({"학번": "10305", "이름": "홍길동"}, 120)
+        stats: dict = {}
+
+        result = extract_text_page(types.Part(text=_ESSAY), stats)
+
+        assert result == {"학번": "10305", "이름": "홍길동", "에세이텍스트": _ESSAY}
+        request = generate.call_args.kwargs
+        assert request["model"] == HEADER_MODEL_NAME
+        [prompt] = request["contents"]
+        assert "prompt injection" in prompt
+        assert f"<content>{_ESSAY[:30]}</content>" in prompt
+        assert request["config"].media_resolution is None
+        assert stats["text_layer"] is True
+        assert stats["text_chars"] == len(_ESSAY)
+        assert stats["input_tokens"] == 120
+
+    def test_header_disabled_makes_no_call(self, mock_get_client: MagicMock) -> None:
+        """머리글 호출을 끄면 모델을 부르지 않고 학번/이름을 빈 값으로 둔다."""
+        with patch("src.pdf_text.config.PDF_TEXT_HEADER", False):
+            result = extract_text_page(types.Part(text=_ESSAY))
+
+        assert result == {"학번": "", "이름": "", "에세이텍스트": _ESSAY}
+        mock_get_client.assert_not_called()
+
+    def test_repeat_page_served_from_cache(self, mock_get_client: MagicMock) -> None:
+        """같은 페이지 텍스트는 캐시 결과를 쓰고 다시 호출하지 않는다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.return_value = _response({"학번": "10305", "이름": "홍길동"})
+        stats: dict = {}
+
+        first = extract_text_page(types.Part(text=_ESSAY))
+        second = extract_text_page(types.Part(text=_ESSAY), stats)
+
+        assert second == first
+        assert generate.call_count == 1
+        assert stats["cache_hit"] is True
+
+    def test_async_uses_aio_client(self, mock_get_client: MagicMock) -> None:
+        """비동기 버전은 aio 클라이언트로 머리글 호출을 보낸다."""
+        client = mock_get_client.return_value
+        client.aio.models.generate_content = AsyncMock(
+            return_value=_response({"학번": "10305", "이름": "홍길동"})
+        )
+
+        result = asyncio.run(extract_text_page_async(types.Part(text=_ESSAY)))
+
+        assert result["학번"] == "10305"
+        assert result["에세이텍스트"] == _ESSAY
+        client.models.generate_content.assert_not_called()
+
+    def test_overloaded_header_model_falls_back(self, mock_get_client: MagicMock) -> None:
+        """머리글 모델이 과부하(503)면 ocr.generate_ocr의 대체 순서로 본 OCR 모델에 보낸다."""
+        generate = mock_get_client.return_value.models.generate_content
+        generate.side_effect = [
+            errors.ServerError(503, {"error": {"message": "overloaded"}}),
+            _response({"학번": "10305", "이름": "홍길동"}),
+        ]
+        stats: dict = {}
+
+        result = extract_text_page(types.Part(text=_ESSAY + "대체"), stats)
+
+        assert result["학번"] == "10305"
+        assert [c.kwargs["model"] for c in generate.call_args_list] == [
+            HEADER_MODEL_NAME, MODEL_NAME,
+        ]
+        assert stats["model_fallback"] is True
+
+    def test_cancelled_job_makes_no_call(self, mock_get_client: MagicMock) -> None:
+        """진행 중인 페이지 작업이 취소되면 머리글 호출(ocr.generate_ocr) 전에 멈춘다."""
+        cancel = threading.Event()
+        cancel.set()
+        token = ocr_retry._page_limits.set((None, cancel))
+        try:
+            with pytest.raises(CancelledError):
+                extract_text_page(types.Part(text=_ESSAY + "취소"))
+        finally:
+            ocr_retry._page_limits.reset(token)
+        mock_get_client.return_value.models.generate_content.assert_not_called()
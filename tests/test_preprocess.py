@@ -0,0 +1,426 @@
+"""preprocess 모듈 단위 테스트."""
+
+import io
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from google.genai import types
+from PIL import Image, ImageDraw, JpegImagePlugin
+
+from src.preprocess import (
+    crop_header,
+    crop_margins,
+    encode_for_upload,
+    fit_long_edge,
+    ink_bbox,
+    ink_density,
+    is_blank,
+    open_image,
+    sdk_default_size,
+)
+
+
+def _decode(part: types.Part) -> Image.Image:
+    return Image.open(io.BytesIO(part.inline_data.data))
+
+
+def _noisy_photo(width: int, height: int) -> Image.Image:
+    """PNG로는 잘 압축되지 않는 사진 같은 RGB 이미지."""
+    return Image.effect_noise((width, height), 64).convert("RGB")
+
+
+def _jpeg_bytes(image: Image.Image, orientation: int | None = None) -> bytes:
+    """이미지를 JPEG 바이트로 저장한다 (orientation이 있으면 EXIF 방향 태그 포함)."""
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    image.save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def _answer_sheet(border: bool = True) -> Image.Image:
+    """넓은 여백, 인쇄 테두리, (300~880, 400~1000) 영역의 글씨가 있는 답안지."""
+    image = Image.new("RGB", (1200, 1600), "white")
+    draw = ImageDraw.Draw(image)
+    if border:
+        draw.rectangle((20, 20, 1179, 1579), outline="black", width=4)
+    for y in range(400, 1001, 30):
+        for x in range(300, 900, 40):
+            draw.line((x, y, x + 20, y), fill=(40, 40, 40), width=3)
+    return image
+
+
+# ---------------------------------------------------------------------------
+# ink_density / is_blank 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.preprocess.config.BLANK_THRESHOLD", 160)
+class TestInkDensity:
+    """ink_density 함수 테스트."""
+
+    def test_fraction_of_dark_pixels(self) -> None:
+        """임계값 미만 밝기 픽셀의 비율을 반환한다."""
+        gray = np.full((10, 10), 255, dtype=np.uint8)
+        gray[:2, :5] = 100
+        gray[5, 5] = 160
+
+        assert ink_density(gray) == pytest.approx(0.10)
+
+    def test_empty_array_is_zero(self) -> None:
+        """빈 배열은 0을 반환한다."""
+        assert ink_density(np.zeros((0, 0), dtype=np.uint8)) == 0.0
+
+
+@patch("src.preprocess.config.BLANK_THRESHOLD", 160)
+@patch("src.preprocess.config.BLANK_MAX_INK", 0.002)
+class TestIsBlank:
+    """is_blank 함수 테스트."""
+
+    def test_blank_back_with_show_through_is_blank(self) -> None:
+        """비침(연회색)과 먼지 몇 점만 있는 뒷면은 빈 페이지다."""
+        image = Image.new("L", (800, 1000), 245)
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((100, 100, 700, 400), fill=215)
+        draw.point([(50, 50), (60, 900)], fill=0)
+        stats: dict = {}
+
+        assert is_blank(image, stats) is True
+        assert stats["blank"] is True
+        assert stats["ink_density"] < 0.002
+
+    def test_written_page_is_not_blank(self) -> None:
+        """글씨가 있는 답안지는 빈 페이지가 아니다."""
+        stats: dict = {}
+
+        assert is_blank(_answer_sheet(border=False), stats) is False
+        assert "blank" not in stats
+
+    def test_encoded_part_is_decoded(self) -> None:
+        """이미지 Part도 디코딩하여 판정한다."""
+        buffer = io.BytesIO()
+        Image.new("L", (100, 100), 255).save(buffer, "JPEG")
+        part = types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+
+        assert is_blank(part) is True
+
+    def test_color_jpeg_part_decodes_luma_only(self) -> None:
+        """컬러 JPEG Part는 draft로 원본 크기의 휘도만 디코딩하고 같은 판정을 낸다."""
+        image = _answer_sheet(border=False).convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=95)
+        part = types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+        decoded = Image.open(io.BytesIO(buffer.getvalue()))
+        expected: dict = {}
+        is_blank(decoded.convert("L"), expected)
+        stats: dict = {}
+
+        with patch.object(
+            JpegImagePlugin.JpegImageFile, "draft", autospec=True,
+            side_effect=JpegImagePlugin.JpegImageFile.draft,
+        ) as mock_draft:
+            assert is_blank(part, stats) is False
+
+        assert mock_draft.call_args.args[1:] == ("L", image.size)
+        assert abs(stats["ink_density"] - expected["ink_density"]) < 0.001
+
+
+# ---------------------------------------------------------------------------
+# ink_bbox 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.preprocess.config.AUTOCROP_THRESHOLD", 128)
+@patch("src.preprocess.config.AUTOCROP_MIN_INK", 0.01)
+@patch("src.preprocess.config.AUTOCROP_LINE_RATIO", 0.6)
+class TestInkBbox:
+    """ink_bbox 함수 테스트 (NumPy 배열 입력)."""
+
+    def test_finds_ink_region(self) -> None:
+        """잉크가 있는 행/열 범위를 (left, top, right, bottom)으로 반환한다."""
+        gray = np.full((100, 200), 255, dtype=np.uint8)
+        gray[30:60, 50:120] = 0
+
+        assert ink_bbox(gray) == (50, 30, 120, 60)
+
+    def test_blank_page_returns_none(self) -> None:
+        """잉크가 없으면 None을 반환한다."""
+        assert ink_bbox(np.full((50, 50), 250, dtype=np.uint8)) is None
+
+    def test_ignores_printed_border_lines(self) -> None:
+        """행/열 대부분을 차지하는 테두리 선은 잉크 영역에서 제외한다."""
+        gray = np.full((100, 200), 255, dtype=np.uint8)
+        gray[[2, 97], :] = 0
+        gray[:, [2, 197]] = 0
+        gray[40:50, 80:100] = 0
+
+        assert ink_bbox(gray) == (80, 40, 100, 50)
+
+    def test_ignores_isolated_specks(self) -> None:
+        """최소 비율에 못 미치는 먼지 한 점은 경계에 포함하지 않는다."""
+        gray = np.full((200, 200), 255, dtype=np.uint8)
+        gray[40:50, 80:100] = 0
+        gray[190, 190] = 0
+
+        assert ink_bbox(gray) == (80, 40, 100, 50)
+
+
+# ---------------------------------------------------------------------------
+# crop_margins 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestCropMargins:
+    """crop_margins 함수 테스트."""
+
+    @patch("src.preprocess.config.AUTOCROP_PADDING", 16)
+    def test_crops_to_ink_with_padding(self) -> None:
+        """테두리와 여백을 잘라 글씨 영역 + 여유 여백만 남긴다."""
+        stats: dict = {}
+        cropped = crop_margins(_answer_sheet(), stats)
+
+        width, height = cropped.size
+        assert 600 <= width <= 630
+        assert 620 <= height <= 650
+        assert 0 < stats["crop_area"] < 0.25
+
+    def test_blank_page_unchanged(self) -> None:
+        """잉크가 없는 페이지는 원본을 그대로 반환한다."""
+        image = Image.new("RGB", (600, 800), "white")
+
+        assert crop_margins(image) is image
+
+    def test_full_page_content_unchanged(self) -> None:
+        """가장자리까지 글씨가 있으면 원본을 그대로 반환한다."""
+        image = Image.new("L", (200, 200), 255)
+        draw = ImageDraw.Draw(image)
+        for y in range(0, 200, 10):
+            for x in range(0, 200, 20):
+                draw.line((x, y, x + 8, y), fill=0, width=2)
+
+        assert crop_margins(image) is image
+
+
+# ---------------------------------------------------------------------------
+# crop_header 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestCropHeader:
+    """crop_header 함수 테스트."""
+
+    def test_keeps_top_fraction(self) -> None:
+        """페이지 위쪽 비율만큼만 남긴다."""
+        assert crop_header(Image.new("RGB", (1200, 1600)), 0.25).size == (1200, 400)
+
+    def test_decodes_part_and_clamps_fraction(self) -> None:
+        """이미지 Part는 디코딩하여 자르고, 비율은 0~1로 제한하되 한 줄은 남긴다."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (100, 80), "white").save(buffer, "JPEG")
+        part = types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+
+        assert crop_header(part, 2.0).size == (100, 80)
+        assert crop_header(part, 0.0).size == (100, 1)
+
+
+# ---------------------------------------------------------------------------
+# fit_long_edge 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestFitLongEdge:
+    """fit_long_edge 함수 테스트."""
+
+    def test_scales_long_edge_keeping_ratio(self) -> None:
+        """긴 변을 상한으로 줄이고 가로세로 비율을 유지한다."""
+        resized = fit_long_edge(Image.new("RGB", (4000, 3000)), 2000)
+
+        assert resized.size == (2000, 1500)
+
+    def test_small_image_unchanged(self) -> None:
+        """상한보다 작은 이미지는 그대로 반환한다."""
+        image = Image.new("RGB", (800, 600))
+
+        assert fit_long_edge(image, 2000) is image
+
+    def test_zero_disables_cap(self) -> None:
+        """상한이 0이면 크기를 바꾸지 않는다."""
+        image = Image.new("RGB", (4000, 3000))
+
+        assert fit_long_edge(image, 0) is image
+
+
+# ---------------------------------------------------------------------------
+# open_image 테스트
+# ---------------------------------------------------------------------------
+
+
+@patch("src.preprocess.config.JPEG_DRAFT_ENABLED", True)
+@patch("src.preprocess.config.UPLOAD_GRAYSCALE", True)
+@patch("src.preprocess.config.UPLOAD_MAX_EDGE", 1000)
+class TestOpenImage:
+    """open_image 함수 테스트."""
+
+    def test_large_jpeg_draft_decoded_to_upload_edge(self) -> None:
+        """큰 JPEG는 긴 변이 상한 이상인 가장 작은 배율의 흑백으로 디코딩한다."""
+        image = open_image(_jpeg_bytes(Image.new("RGB", (4000, 3000), "white")))
+
+        assert image.size == (1000, 750)
+        assert image.mode == "L"
+
+    def test_exif_orientation_applied(self) -> None:
+        """EXIF 방향(6 = 시계 방향 90도 회전 필요)을 줄인 이미지에 적용한다."""
+        photo = Image.new("RGB", (4000, 2000), "white")
+        photo.paste((0, 0, 0), (0, 0, 2000, 2000))
+
+        image = open_image(_jpeg_bytes(photo, orientation=6))
+
+        assert image.size == (500, 1000)
+        assert image.getpixel((250, 250)) < 64
+        assert image.getpixel((250, 750)) > 192
+        assert image.getexif().get(0x0112, 1) == 1
+
+    def test_draft_disabled_decodes_full_size(self) -> None:
+        """draft를 끄면 원래 크기와 색으로 디코딩한다."""
+        with patch("src.preprocess.config.JPEG_DRAFT_ENABLED", False):
+            image = open_image(_jpeg_bytes(Image.new("RGB", (4000, 3000), "white")))
+
+        assert image.size == (4000, 3000)
+        assert image.mode == "RGB"
+
+    def test_png_unchanged(self) -> None:
+        """PNG는 줄이지 않고 그대로 연다."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (3000, 2000), "white").save(buffer, "PNG")
+
+        image = open_image(buffer.getvalue())
+
+        assert image.size == (3000, 2000)
+        assert image.format == "PNG"
+
+
+# ---------------------------------------------------------------------------
+# sdk_default_size 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestSdkDefaultSize:
+    """sdk_default_size 함수 테스트."""
+
+    def test_bytes_opened_image_measured_as_png(self) -> None:
+        """바이트에서 연 이미지는 SDK처럼 PNG 크기로 측정한다."""
+        image = _noisy_photo(64, 48)
+        png = io.BytesIO()
+        image.save(png, "PNG")
+
+        assert sdk_default_size(image) == len(png.getvalue())
+
+
+# ---------------------------------------------------------------------------
+# encode_for_upload 테스트
+# ---------------------------------------------------------------------------
+
+
+class TestEncodeForUpload:
+    """encode_for_upload 함수 테스트 (config 값을 patch)."""
+
+    @patch("src.preprocess.config.UPLOAD_FORMAT", "jpeg")
+    @patch("src.preprocess.config.UPLOAD_GRAYSCALE", True)
+    @patch("src.preprocess.config.UPLOAD_MAX_EDGE", 1000)
+    def test_grayscale_jpeg_with_long_edge_cap(self) -> None:
+        """긴 변 상한을 적용한 흑백 JPEG Part를 만든다."""
+        part = encode_for_upload(_noisy_photo(3000, 2000))
+
+        assert part.inline_data.mime_type == "image/jpeg"
+        decoded = _decode(part)
+        assert decoded.size == (1000, 667)
+        assert decoded.mode == "L"
+
+    @pytest.mark.parametrize("fmt,mime", [("webp", "image/webp"), ("png", "image/png")])
+    def test_output_format_choice(self, fmt: str, mime: str) -> None:
+        """UPLOAD_FORMAT으로 WebP/PNG 출력을 고를 수 있다."""
+        with patch("src.preprocess.config.UPLOAD_FORMAT", fmt):
+            part = encode_for_upload(Image.new("RGB", (32, 32), "white"))
+
+        assert part.inline_data.mime_type == mime
+        assert _decode(part).format == fmt.upper()
+
+    @patch("src.preprocess.config.UPLOAD_FORMAT", "jpeg")
+    @patch("src.preprocess.config.UPLOAD_GRAYSCALE", False)
+    def test_color_kept_when_grayscale_off(self) -> None:
+        """흑백 옵션을 끄면 색상을 유지한다 (JPEG는 RGB로 변환)."""
+        part = encode_for_upload(Image.new("RGBA", (32, 32), "red"))
+
+        assert _decode(part).mode == "RGB"
+
+    @patch("src.preprocess.config.UPLOAD_MEASURE_SAVINGS", True)
+    def test_records_bytes_saved(self) -> None:
+        """stats에 전송 바이트, SDK 기본 인코딩 바이트, 절감 바이트를 기록한다."""
+        image = _noisy_photo(1200, 900)
+        stats: dict = {}
+
+        part = encode_for_upload(image, stats)
+
+        assert stats["upload_bytes"] == len(part.inline_data.data)
+        assert stats["baseline_bytes"] == sdk_default_size(image)
+        assert stats["bytes_saved"] == stats["baseline_bytes"] - stats["upload_bytes"]
+        assert stats["bytes_saved"] > 0
+
+    @patch("src.preprocess.config.UPLOAD_FORMAT", "jpeg")
+    @patch("src.preprocess.config.AUTOCROP_ENABLED", False)
+    def test_measurement_does_not_change_upload(self) -> None:
+        """SDK 기본 PNG가 더 작은 깨끗한 페이지도 측정 여부와 관계없이 같은 JPEG를 보낸다."""
+        image = Image.new("L", (400, 560), "white")
+        stats: dict = {}
+
+        with patch("src.preprocess.config.UPLOAD_MEASURE_SAVINGS", False):
+            plain = encode_for_upload(image)
+        with patch("src.preprocess.config.UPLOAD_MEASURE_SAVINGS", True):
+            part = encode_for_upload(image, stats)
+
+        assert part.inline_data.mime_type == "image/jpeg"
+        assert part.inline_data.data == plain.inline_data.data
+        assert stats["baseline_bytes"] == sdk_default_size(image)
+        assert stats["bytes_saved"] == stats["baseline_bytes"] - stats["upload_bytes"] < 0
+
+    @patch("src.preprocess.config.UPLOAD_MEASURE_SAVINGS", False)
+    @patch("src.preprocess.sdk_default_encoding")
+    def test_measurement_can_be_disabled(self, mock_encoding) -> None:
+        """측정을 끄면 SDK 기본 인코딩을 계산하지 않는다."""
+        stats: dict = {}
+        encode_for_upload(Image.new("RGB", (32, 32)), stats)
+
+        mock_encoding.assert_not_called()
+        assert set(stats) == {"upload_bytes"}
+
+    def test_encoded_part_passed_through(self) -> None:
+        """이미 인코딩된 Part는 재인코딩 없이 그대로 반환한다."""
+        part = types.Part.from_bytes(data=b"\xff\xd8jpeg", mime_type="image/jpeg")
+        stats: dict = {}
+
+        assert encode_for_upload(part, stats) is part
+        assert stats == {"upload_bytes": 6}
+
+    @patch("src.preprocess.config.AUTOCROP_ENABLED", True)
+    @patch("src.preprocess.config.UPLOAD_MAX_EDGE", 0)
+    def test_crops_margins_before_encoding(self) -> None:
+        """AUTOCROP_ENABLED이면 여백을 자른 뒤 인코딩한다."""
+        part = encode_for_upload(_answer_sheet())
+
+        assert _decode(part).size[0] < 700
+
+    @patch("src.preprocess.config.AUTOCROP_ENABLED", False)
+    @patch("src.preprocess.config.UPLOAD_MAX_EDGE", 0)
+    def test_autocrop_can_be_disabled(self) -> None:
+        """AUTOCROP_ENABLED가 꺼져 있으면 자르지 않는다."""
+        part = encode_for_upload(_answer_sheet())
+
+        assert _decode(part).size == (1200, 1600)
+
+    @patch("src.preprocess.config.UPLOAD_FORMAT", "bmp")
+    def test_unknown_format_raises_value_error(self) -> None:
+        """지원하지 않는 형식은 ValueError를 발생시킨다."""
+        with pytest.raises(ValueError, match="지원하지 않는 업로드 형식"):
+            encode_for_upload(Image.new("RGB", (8, 8)))
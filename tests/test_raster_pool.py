@@ -0,0 +1,484 @@
+"""raster_pool 모듈 단위 테스트."""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+from google.genai import types
+
+from src.raster_pool import (
+    choose_dpi,
+    default_processes,
+    drop_pages,
+    iter_pdf_pages,
+    new_executor,
+    plan_page_dpis,
+    plan_windows,
+    render_jpeg_window,
+    render_window,
+    shared_executor,
+    split_by_dpi,
+)
+
+A4 = (595.276, 841.89)
+A6 = (297.638, 420.945)
+
+
+def _fake_convert(pdf, first_page, last_page, thread_count, dpi=200):
+    """PDF 바이트(또는 그 바이트를 쓴 파일 경로) 뒤에 페이지 번호를 붙인 토큰을 돌려준다."""
+    data = Path(pdf).read_bytes() if isinstance(pdf, str) else pdf
+    return [f"{data.decode()}{n}" for n in range(first_page, last_page + 1)]
+
+
+class TestRenderWindow:
+    """render_window 함수 테스트."""
+
+    @patch("src.raster_pool.convert_from_bytes")
+    def test_passes_window_and_thread_count(self, mock_convert: MagicMock) -> None:
+        """구간과 thread_count를 convert_from_bytes에 전달한다."""
+        mock_convert.return_value = ["img"]
+
+        assert render_window(b"pdf", 3, 6, thread_count=2) == ["img"]
+        mock_convert.assert_called_once_with(
+            b"pdf", first_page=3, last_page=6, thread_count=2, dpi=200
+        )
+
+    @patch("src.raster_pool.convert_from_bytes")
+    def test_passes_chosen_dpi(self, mock_convert: MagicMock) -> None:
+        """선택된 DPI를 convert_from_bytes에 전달한다."""
+        render_window(b"pdf", 1, 1, dpi=150)
+
+        assert mock_convert.call_args.kwargs["dpi"] == 150
+
+
+class TestRenderJpegWindow:
+    """render_jpeg_window 함수 테스트."""
+
+    @staticmethod
+    def _fake_poppler(seen: dict):
+        def _convert(pdf_bytes, **kwargs):
+            folder = kwargs["output_folder"]
+            seen["kwargs"] = kwargs
+            seen["folder"] = folder
+            seen["mode"] = stat.S_IMODE(os.stat(folder).st_mode)
+            paths = []
+            for n in range(kwargs["first_page"], kwargs["last_page"] + 1):
+                path = os.path.join(folder, f"page-{n}.jpg")
+                with open(path, "wb") as f:
+                    f.write(b"\xff\xd8jpeg" + str(n).encode())
+                paths.append(path)
+            return paths
+
+        return _convert
+
+    @patch("src.raster_pool.config.RASTER_JPEG_LONG_EDGE", 1600)
+    @patch("src.raster_pool.config.RASTER_JPEG_QUALITY", 70)
+    def test_requests_grayscale_jpeg_from_pdftocairo(self) -> None:
+        """pdftocairo에 흑백 JPEG, 긴 변 크기, 경로 반환을 요청한다."""
+        seen: dict = {}
+        with patch("src.raster_pool.convert_from_bytes", side_effect=self._fake_poppler(seen)):
+            render_jpeg_window(b"pdf", 2, 3, thread_count=2)
+
+        kwargs = seen["kwargs"]
+        assert kwargs["fmt"] == "jpeg"
+        assert kwargs["grayscale"] is True
+        assert kwargs["size"] == 1600
+        assert kwargs["use_pdftocairo"] is True
+        assert kwargs["paths_only"] is True
+        assert kwargs["jpegopt"]["quality"] == 70
+        assert kwargs["thread_count"] == 2
+
+    def test_chosen_dpi_replaces_long_edge_size(self) -> None:
+        """DPI가 정해지면 긴 변 크기 대신 그 DPI로 변환한다."""
+        seen: dict = {}
+        with patch("src.raster_pool.convert_from_bytes", side_effect=self._fake_poppler(seen)):
+            render_jpeg_window(b"pdf", 1, 1, dpi=150)
+
+        assert seen["kwargs"]["dpi"] == 150
+        assert seen["kwargs"]["size"] is None
+
+    def test_returns_jpeg_parts_without_decoding(self) -> None:
+        """poppler가 쓴 JPEG 바이트를 그대로 image/jpeg Part로 반환한다."""
+        seen: dict = {}
+        with patch("src.raster_pool.convert_from_bytes", side_effect=self._fake_poppler(seen)):
+            parts = render_jpeg_window(b"pdf", 1, 2)
+
+        assert [p.inline_data.data for p in parts] == [b"\xff\xd8jpeg1", b"\xff\xd8jpeg2"]
+        assert all(p.inline_data.mime_type == "image/jpeg" for p in parts)
+
+    def test_private_temp_dir_removed_after_read(self) -> None:
+        """비공개(0700) 임시 디렉터리를 사용하고 읽은 뒤 삭제한다."""
+        seen: dict = {}
+        with patch("src.raster_pool.convert_from_bytes", side_effect=self._fake_poppler(seen)):
+            render_jpeg_window(b"pdf", 1, 1)
+
+        assert seen["mode"] == 0o700
+        assert not os.path.exists(seen["folder"])
+
+    @patch("src.raster_pool.os.path.isdir", return_value=True)
+    @patch("src.raster_pool.os.access", return_value=True)
+    @patch("src.raster_pool.tempfile.TemporaryDirectory")
+    def test_uses_tmpfs_when_available(
+        self, mock_tmp: MagicMock, _access: MagicMock, _isdir: MagicMock
+    ) -> None:
+        """/dev/shm이 있으면 그 아래에 임시 디렉터리를 만든다."""
+        mock_tmp.return_value.__enter__.return_value = "/dev/shm/x"
+        with patch("src.raster_pool.convert_from_bytes", return_value=[]):
+            render_jpeg_window(b"pdf", 1, 1)
+
+        assert mock_tmp.call_args.kwargs["dir"] == "/dev/shm"
+
+
+class TestChooseDpi:
+    """choose_dpi 함수 테스트."""
+
+    @patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 3_000_000)
+    @patch("src.raster_pool.config.RASTER_MAX_DPI", 300)
+    def test_hits_pixel_budget(self) -> None:
+        """선택한 DPI의 픽셀 수가 예산 이하이면서 근접한다."""
+        dpi = choose_dpi(*A4)
+        pixels = (A4[0] / 72 * dpi) * (A4[1] / 72 * dpi)
+
+        assert dpi == 176
+        assert 0.98 * 3_000_000 < pixels <= 3_000_000
+
+    @patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 3_000_000)
+    @patch("src.raster_pool.config.RASTER_MAX_DPI", 200)
+    def test_small_page_capped_at_max_dpi(self) -> None:
+        """작은 페이지는 RASTER_MAX_DPI를 넘지 않는다."""
+        assert choose_dpi(*A6) == 200
+
+    @patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 1_000_000)
+    @patch("src.raster_pool.config.RASTER_MIN_DPI", 100)
+    def test_large_page_floored_at_min_dpi(self) -> None:
+        """큰 페이지(A3 등)도 RASTER_MIN_DPI 미만으로 내려가지 않는다."""
+        assert choose_dpi(841.89, 1190.55) == 100
+
+
+class TestPlanPageDpis:
+    """plan_page_dpis 함수 테스트."""
+
+    @patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 3_000_000)
+    @patch("src.raster_pool.config.RASTER_MAX_DPI", 200)
+    @patch("src.raster_pool.file_handler.pdf_page_sizes")
+    def test_per_page_dpi_and_report(self, mock_sizes: MagicMock) -> None:
+        """페이지 크기별 DPI를 정하고 페이지별 선택 결과를 report에 기록한다."""
+        mock_sizes.side_effect = lambda data, count: {b"a": [A4, A6], b"b": [None]}[data]
+        report: list[dict] = []
+
+        dpis = plan_page_dpis([(b"a", 2), (b"b", 1)], report)
+
+        assert dpis == [[176, 200], [None]]
+        assert [(r["doc"], r["page"], r["dpi"]) for r in report] == [
+            (0, 1, 176), (0, 2, 200),
+        ]
+        assert report[0]["pixels"] == round(A4[0] / 72 * 176) * round(A4[1] / 72 * 176)
+
+    @patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 0)
+    @patch("src.raster_pool.file_handler.pdf_page_sizes")
+    def test_disabled_budget_skips_pdfinfo(self, mock_sizes: MagicMock) -> None:
+        """예산이 0이면 페이지 크기를 읽지 않고 기본 해상도(None)를 쓴다."""
+        assert plan_page_dpis([(b"a", 2)]) == [[None, None]]
+        mock_sizes.assert_not_called()
+
+
+class TestSplitByDpi:
+    """split_by_dpi 함수 테스트."""
+
+    def test_uniform_dpi_keeps_windows(self) -> None:
+        """DPI가 같은 구간은 그대로 둔다."""
+        assert split_by_dpi([(0, 1, 4)], [[150] * 4]) == [(0, 1, 4, 150)]
+
+    def test_splits_where_dpi_changes(self) -> None:
+        """DPI가 바뀌는 지점에서 구간을 나눈다."""
+        windows = [(0, 1, 3), (0, 4, 4), (1, 1, 2)]
+        dpis = [[150, 200, 200, 150], [None, None]]
+
+        assert split_by_dpi(windows, dpis) == [
+            (0, 1, 1, 150), (0, 2, 3, 200), (0, 4, 4, 150), (1, 1, 2, None),
+        ]
+
+
+class TestDropPages:
+    """drop_pages 함수 테스트."""
+
+    def test_splits_around_skipped_pages(self) -> None:
+        """건너뛸 페이지를 빼고 남은 연속 페이지로 구간을 나눈다 (DPI 유지)."""
+        windows = [(0, 1, 4, 150), (0, 5, 6, 200), (1, 1, 2, None)]
+
+        assert drop_pages(windows, [{2, 5, 6}, set()]) == [
+            (0, 1, 1, 150), (0, 3, 4, 150), (1, 1, 2, None),
+        ]
+
+    def test_fully_skipped_document_has_no_windows(self) -> None:
+        """모든 페이지를 건너뛰는 문서는 구간이 남지 않는다."""
+        assert drop_pages([(0, 1, 3, None)], [{1, 2, 3}]) == []
+
+
+class TestPlanWindows:
+    """plan_windows 함수 테스트."""
+
+    def test_splits_each_document_into_windows(self) -> None:
+        """문서별로 chunk_size 구간을 만든다."""
+        assert plan_windows([5, 2], 2) == [
+            (0, 1, 2), (0, 3, 4), (0, 5, 5), (1, 1, 2),
+        ]
+
+    def test_skips_empty_documents(self) -> None:
+        """페이지가 없는 문서는 구간을 만들지 않는다."""
+        assert plan_windows([0, 1], 4) == [(1, 1, 1)]
+
+
+class TestDefaultProcesses:
+    """default_processes 함수 테스트."""
+
+    @patch("src.raster_pool.config.RASTER_PROCESSES", 3)
+    def test_explicit_config(self) -> None:
+        """RASTER_PROCESSES가 지정되면 그대로 사용한다."""
+        assert default_processes() == 3
+
+    @patch("src.raster_pool.config.RASTER_PROCESSES", 0)
+    @patch("src.raster_pool.config.RASTER_THREAD_COUNT", 2)
+    @patch("src.raster_pool.os.cpu_count", return_value=8)
+    def test_cores_divided_by_thread_count(self, _cpu: MagicMock) -> None:
+        """자동 설정 시 코어 수를 구간당 poppler 스레드 수로 나눈다."""
+        assert default_processes() == 4
+
+
+class TestNewExecutor:
+    """new_executor 함수 테스트."""
+
+    def test_uses_spawn_process_pool(self) -> None:
+        """spawn 방식의 프로세스 풀을 만든다."""
+        executor = new_executor(2)
+        try:
+            assert isinstance(executor, ProcessPoolExecutor)
+            assert executor._mp_context.get_start_method() == "spawn"
+        finally:
+            executor.shutdown()
+
+
+class TestSharedExecutor:
+    """shared_executor 함수 테스트."""
+
+    @patch("src.raster_pool._executor", None)
+    @patch("src.raster_pool.new_executor", side_effect=lambda workers: MagicMock())
+    def test_reused_until_worker_count_changes(self, mock_new: MagicMock) -> None:
+        """같은 작업자 수면 같은 풀을 재사용하고, 바뀌면 이전 풀을 닫고 새로 만든다."""
+        first = shared_executor(2)
+
+        assert shared_executor(2) is first
+        replaced = shared_executor(3)
+        assert replaced is not first
+        first.shutdown.assert_called_once()
+        assert [c.args[0] for c in mock_new.call_args_list] == [2, 3]
+
+    @patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 0)
+    @patch("src.raster_pool.new_executor")
+    def test_broken_pool_discarded(self, mock_new: MagicMock) -> None:
+        """공용 풀이 깨지면(BrokenProcessPool) 버려 다음 호출이 새 풀을 만든다."""
+        broken = MagicMock()
+        broken.submit.return_value.result.side_effect = BrokenProcessPool("dead")
+        mock_new.side_effect = [broken, MagicMock()]
+        with patch("src.raster_pool._executor", None):
+            with pytest.raises(BrokenProcessPool):
+                list(iter_pdf_pages([(b"a", 1)], processes=1))
+            assert shared_executor(1) is not broken
+
+        assert mock_new.call_count == 2
+
+
+@patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 0)
+class TestIterPdfPages:
+    """iter_pdf_pages 함수 테스트 (스레드 풀 주입, convert_from_path mock).
+
+    페이지 크기 조회(pdfinfo)가 필요 없도록 기본적으로 픽셀 예산을 끈다.
+    """
+
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_yields_pages_in_document_and_page_order(self, _mock: MagicMock) -> None:
+        """여러 문서의 페이지를 문서 순서, 페이지 순서대로 생성한다."""
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            pages = list(iter_pdf_pages(
+                [(b"a", 5), (b"b", 1), (b"c", 3)],
+                processes=3, chunk_size=2, executor=pool,
+            ))
+
+        assert pages == ["a1", "a2", "a3", "a4", "a5", "b1", "c1", "c2", "c3"]
+
+    def test_windows_of_different_documents_render_in_parallel(self) -> None:
+        """서로 다른 문서의 구간이 동시에 변환된다."""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def _slow(pdf, first_page, last_page, thread_count, dpi=200):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return _fake_convert(pdf, first_page, last_page, thread_count, dpi)
+
+        docs = [(f"d{i}".encode(), 2) for i in range(4)]
+        with patch("src.raster_pool.convert_from_path", side_effect=_slow):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                pages = list(iter_pdf_pages(
+                    docs, processes=4, chunk_size=2, executor=pool
+                ))
+
+        assert len(pages) == 8
+        assert state["peak"] == 4
+
+    @patch("src.raster_pool.config.RASTER_THREAD_COUNT", 3)
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_thread_count_from_config(self, mock_convert: MagicMock) -> None:
+        """구간 변환에 config.RASTER_THREAD_COUNT를 사용한다."""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            list(iter_pdf_pages([(b"a", 1)], processes=1, executor=pool))
+
+        assert mock_convert.call_args.kwargs["thread_count"] == 3
+
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_lookahead_bounded_by_workers(self, mock_convert: MagicMock) -> None:
+        """첫 페이지를 받을 때까지 작업자 수만큼의 구간만 제출한다."""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            stream = iter_pdf_pages(
+                [(b"a", 20)], processes=2, chunk_size=1, executor=pool
+            )
+            assert next(stream) == "a1"
+            time.sleep(0.05)
+            assert mock_convert.call_count <= 2
+            stream.close()
+
+    @patch("src.raster_pool.shared_executor")
+    def test_no_documents_creates_no_pool(self, mock_shared: MagicMock) -> None:
+        """변환할 페이지가 없으면 공용 풀을 가져오지 않는다."""
+        assert list(iter_pdf_pages([])) == []
+        assert list(iter_pdf_pages([(b"a", 2)], skip=lambda doc: {1, 2})) == []
+        mock_shared.assert_not_called()
+
+    def test_pdf_written_once_and_passed_by_path(self) -> None:
+        """PDF는 문서마다 임시 파일에 한 번 쓰고 구간마다 그 경로를 넘기며, 문서를 다 내보내면 지운다."""
+        seen: list[str] = []
+
+        def _convert(pdf, first_page, last_page, thread_count, dpi=200):
+            seen.append(pdf)
+            return _fake_convert(pdf, first_page, last_page, thread_count, dpi)
+
+        with patch("src.raster_pool.convert_from_path", side_effect=_convert), \
+                ThreadPoolExecutor(max_workers=1) as pool:
+            stream = iter_pdf_pages(
+                [(b"a", 3), (b"b", 1)], processes=1, chunk_size=1, executor=pool,
+            )
+            assert [next(stream) for _ in range(3)] == ["a1", "a2", "a3"]
+            assert next(stream) == "b1"
+            assert not Path(seen[0]).exists()
+            assert list(stream) == []
+
+        assert len(set(seen[:3])) == 1 and seen[3] != seen[0]
+        assert all(isinstance(path, str) for path in seen)
+        assert not Path(seen[3]).parent.exists()
+
+    @patch("src.raster_pool.file_handler.pdf_page_sizes", return_value=[A4])
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_dpis_planned_per_document_when_reached(
+        self, _convert: MagicMock, mock_sizes: MagicMock
+    ) -> None:
+        """페이지 크기(pdfinfo)는 문서마다 그 문서의 첫 구간이 필요해질 때 읽는다."""
+        budget = patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 3_000_000)
+        with budget, ThreadPoolExecutor(max_workers=1) as pool:
+            pages = iter_pdf_pages(
+                [(b"a", 1), (b"b", 1)], processes=1, chunk_size=1, executor=pool,
+            )
+            assert next(pages) == "a1"
+            assert [c.args[0] for c in mock_sizes.call_args_list] == [b"a"]
+            assert list(pages) == ["b1"]
+
+        assert [c.args[0] for c in mock_sizes.call_args_list] == [b"a", b"b"]
+
+    @patch("src.raster_pool.config.RASTER_OUTPUT", "jpeg")
+    @patch("src.raster_pool.render_jpeg_window")
+    def test_jpeg_output_mode_uses_jpeg_renderer(self, mock_jpeg: MagicMock) -> None:
+        """RASTER_OUTPUT이 jpeg이면 흑백 JPEG 변환기를 사용한다."""
+        part = types.Part.from_bytes(data=b"j", mime_type="image/jpeg")
+        mock_jpeg.return_value = [part]
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pages = list(iter_pdf_pages([(b"a", 1)], processes=1, executor=pool))
+
+        assert pages == [part]
+        mock_jpeg.assert_called_once()
+
+    @patch("src.raster_pool.config.RASTER_MAX_DPI", 200)
+    @patch("src.raster_pool.file_handler.pdf_page_sizes", return_value=[A4, A4, A6])
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_renders_each_page_at_chosen_dpi(
+        self, mock_convert: MagicMock, _sizes: MagicMock
+    ) -> None:
+        """페이지별로 선택한 DPI로 변환하고 선택 결과를 report에 남긴다."""
+        report: list[dict] = []
+        budget = patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 3_000_000)
+        with budget, ThreadPoolExecutor(max_workers=1) as pool:
+            pages = list(iter_pdf_pages(
+                [(b"a", 3)], processes=1, chunk_size=4, executor=pool,
+                report=report,
+            ))
+
+        assert pages == ["a1", "a2", "a3"]
+        calls = [
+            (c.kwargs["first_page"], c.kwargs["last_page"], c.kwargs["dpi"])
+            for c in mock_convert.call_args_list
+        ]
+        assert calls == [(1, 2, 176), (3, 3, 200)]
+        assert [r["dpi"] for r in report] == [176, 176, 200]
+
+    @patch(
+        "src.raster_pool.file_handler.pdf_page_sizes",
+        side_effect=lambda data, count: [A4] * count,
+    )
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_skipped_pages_not_rendered_or_reported(
+        self, mock_convert: MagicMock, _sizes: MagicMock
+    ) -> None:
+        """skip의 페이지(텍스트 페이지)는 변환하지 않고 report에도 넣지 않는다."""
+        report: list[dict] = []
+        budget = patch("src.raster_pool.config.RASTER_PIXEL_BUDGET", 3_000_000)
+        with budget, ThreadPoolExecutor(max_workers=1) as pool:
+            pages = list(iter_pdf_pages(
+                [(b"a", 3), (b"b", 1)], processes=1, chunk_size=4, executor=pool,
+                report=report, skip=[{2}, {1}].__getitem__,
+            ))
+
+        assert pages == ["a1", "a3"]
+        assert [
+            (c.kwargs["first_page"], c.kwargs["last_page"])
+            for c in mock_convert.call_args_list
+        ] == [(1, 1), (3, 3)]
+        assert [(r["doc"], r["page"]) for r in report] == [(0, 1), (0, 3)]
+
+    @patch("src.raster_pool.convert_from_path", side_effect=_fake_convert)
+    def test_skip_asked_per_document_when_reached(self, _convert: MagicMock) -> None:
+        """skip은 문서마다 그 문서의 첫 구간을 제출할 때 한 번만 부른다."""
+        asked: list[int] = []
+
+        def _skip(doc_index: int) -> set[int]:
+            asked.append(doc_index)
+            return set()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pages = iter_pdf_pages(
+                [(b"a", 3), (b"b", 1)], processes=1, chunk_size=2, executor=pool,
+                skip=_skip,
+            )
+            assert next(pages) == "a1"
+            assert asked == [0]
+            assert list(pages) == ["a2", "a3", "b1"]
+
+        assert asked == [0, 1]
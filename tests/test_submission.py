@@ -177,6 +177,29 @@ class TestBuildSubmissions:
         assert submissions[0]["학번"] == "10305"
         assert len(unidentified) == 0
 
+    def test_identical_submission_dropped_and_reported(self):
+        """내용이 모두 같은 제출물은 한 번만 남기고 파일명을 duplicates에 기록한다."""
+        page = {"학번": "10305", "이름": "홍길동", "에세이텍스트": "같은 에세이"}
+        duplicates: list[str] = []
+        submissions, unidentified = build_submissions(
+            [("a.pdf", [page]), ("scan/a.pdf", [dict(page)])],
+            duplicates=duplicates,
+        )
+
+        assert submissions == [page]
+        assert unidentified == []
+        assert duplicates == ["scan/a.pdf"]
+
+    def test_same_student_different_text_kept(self):
+        """학번이 같아도 에세이텍스트가 다르면 둘 다 남긴다."""
+        file_ocr_results = [
+            ("a.pdf", [{"학번": "10305", "이름": "홍길동", "에세이텍스트": "초안"}]),
+            ("b.pdf", [{"학번": "10305", "이름": "홍길동", "에세이텍스트": "수정본"}]),
+        ]
+        submissions, _ = build_submissions(file_ocr_results)
+
+        assert len(submissions) == 2
+
 
 class TestFormatSubmissionsForDisplay:
     """format_submissions_for_display 함수 테스트."""